@@ -187,7 +187,12 @@ def create_app(config_object=DevelopmentConfig):
                 )
                 logger.scheduler_status(enabled=True, dev_mode=dev_mode)
             else:
-                logger.info("Scheduler initialized but not running")
+                from .utils.leader_election import is_leader
+
+                if is_leader():
+                    logger.info("Scheduler initialized but not running")
+                else:
+                    logger.info("Scheduler owned by another worker process")
         else:
             logger.info("Scheduler disabled")
 
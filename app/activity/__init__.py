@@ -15,6 +15,7 @@ from flask import Flask
 
 from app.models import ActivitySession, ActivitySnapshot
 from app.services.activity import ActivityService
+from app.utils.leader_election import leader_election
 
 from .monitoring.monitor import WebSocketMonitor
 
@@ -46,11 +47,7 @@ def init_app(app: Flask) -> None:
         logger.debug("Activity monitoring already initialized, skipping")
         return
 
-    logger.info("Initializing activity monitoring")
-    monitor = WebSocketMonitor(app)
-    app.extensions["activity_monitor"] = monitor
-
-    def delayed_start():
+    def delayed_start(monitor: WebSocketMonitor):
         import time
 
         time.sleep(2)
@@ -68,7 +65,16 @@ def init_app(app: Flask) -> None:
 
         monitor.start_monitoring()
 
-    threading.Thread(target=delayed_start, daemon=True).start()
+    # Collectors run only in the elected leader process so that several
+    # Gunicorn workers don't poll the same servers and duplicate sessions.
+    logger.info("Initializing activity monitoring")
+
+    def start_as_leader():
+        monitor = WebSocketMonitor(app)
+        app.extensions["activity_monitor"] = monitor
+        threading.Thread(target=delayed_start, args=(monitor,), daemon=True).start()
+
+    leader_election.on_elected(start_as_leader)
 
     logger.info("Activity monitoring initialized")
 
@@ -40,6 +40,7 @@ except ImportError:
 from app.activity.domain.models import ActivityQuery
 from app.models import ActivitySession, ActivitySnapshot
 from app.services.activity import ActivityService
+from app.services.activity.rollups import ActivityRollupService
 from app.services.historical import HistoricalDataService
 
 # Create blueprint
@@ -65,7 +66,11 @@ def _activity_settings_template() -> str:
 
 def _default_monitor_status() -> dict[str, object]:
     """Provide a fallback monitor status structure."""
-    return {"monitoring_enabled": False, "connection_status": {}}
+    return {
+        "monitoring_enabled": False,
+        "connection_status": {},
+        "ingestion_stats": {},
+    }
 
 
 def _load_monitor_status() -> dict[str, object]:
@@ -74,6 +79,7 @@ def _load_monitor_status() -> dict[str, object]:
     return {
         "monitoring_enabled": monitor is not None,
         "connection_status": monitor.get_connection_status() if monitor else {},
+        "ingestion_stats": monitor.get_ingestion_stats() if monitor else {},
     }
 
 
@@ -193,6 +199,7 @@ def _delete_all_activity_data() -> int:
     try:
         deleted_snapshots = ActivitySnapshot.query.delete()
         deleted_sessions = ActivitySession.query.delete()
+        ActivityRollupService().clear()
         db.session.commit()
         return (deleted_snapshots or 0) + (deleted_sessions or 0)
     except Exception as exc:
@@ -242,9 +249,10 @@ def dashboard_tab():
 
         # Get query parameters
         days = int(request.args.get("days", 7))
+        server_id = request.args.get("server_id", type=int)
 
         # Get enhanced activity statistics
-        stats = activity_service.get_dashboard_stats(days=days)
+        stats = activity_service.get_dashboard_stats(days=days, server_id=server_id)
 
         return render_template("activity/dashboard_tab.html", stats=stats, days=days)
 
@@ -456,8 +464,9 @@ def activity_stats():
     try:
         activity_service = ActivityService()
         days = int(request.args.get("days", 7))
+        server_id = request.args.get("server_id", type=int)
 
-        stats = activity_service.get_activity_stats(days=days)
+        stats = activity_service.get_activity_stats(days=days, server_id=server_id)
         return jsonify(stats)
 
     except Exception as e:
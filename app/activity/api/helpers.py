@@ -41,7 +41,11 @@ def activity_settings_template() -> str:
 
 def default_monitor_status() -> dict[str, object]:
     """Provide a fallback monitor status structure."""
-    return {"monitoring_enabled": False, "connection_status": {}}
+    return {
+        "monitoring_enabled": False,
+        "connection_status": {},
+        "ingestion_stats": {},
+    }
 
 
 def load_monitor_status() -> dict[str, object]:
@@ -50,6 +54,7 @@ def load_monitor_status() -> dict[str, object]:
     return {
         "monitoring_enabled": monitor is not None,
         "connection_status": monitor.get_connection_status() if monitor else {},
+        "ingestion_stats": monitor.get_ingestion_stats() if monitor else {},
     }
 
 
@@ -164,6 +169,9 @@ def delete_all_activity_data() -> int:
     try:
         deleted_snapshots = ActivitySnapshot.query.delete() if ActivitySnapshot else 0
         deleted_sessions = ActivitySession.query.delete() if ActivitySession else 0
+        from app.services.activity.rollups import ActivityRollupService
+
+        ActivityRollupService().clear()
         db.session.commit()
         return (deleted_snapshots or 0) + (deleted_sessions or 0)
     except Exception as exc:
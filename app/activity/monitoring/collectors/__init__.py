@@ -2,20 +2,23 @@
 Activity collectors for different media server types.
 
 Provides specialized collectors for activity monitoring:
-- JellyfinCollector: Uses WebSocket API for real-time events
-- EmbyCollector: Uses WebSocket API for real-time events
+- PlexCollector: Uses the notification WebSocket, polling while disconnected
+- JellyfinCollector: Uses WebSocket session updates, polling while disconnected
+- EmbyCollector: Jellyfin collector using Emby's WebSocket endpoint
 - AudiobookshelfCollector: Uses REST API polling for activity monitoring
-- PollingCollector: Generic polling collector used for Plex and other servers
+- PollingCollector: Generic polling collector for other servers
 """
 
 from .audiobookshelf import AudiobookshelfCollector
 from .emby import EmbyCollector
 from .jellyfin import JellyfinCollector
+from .plex import PlexCollector
 from .polling import PollingCollector
 
 __all__ = [
     "AudiobookshelfCollector",
     "EmbyCollector",
     "JellyfinCollector",
+    "PlexCollector",
     "PollingCollector",
 ]
@@ -6,7 +6,7 @@ from datetime import UTC, datetime
 from typing import Any
 
 from ...domain.models import ActivityEvent
-from ..monitor import BaseCollector
+from ..monitor import BaseCollector, fresh_app_context
 
 
 class AudiobookshelfCollector(BaseCollector):
@@ -27,13 +27,7 @@ class AudiobookshelfCollector(BaseCollector):
 
         while self.running and not self._stop_event.is_set():
             try:
-                # Get current sessions from API
-                client = self._get_media_client()
-                if client:
-                    sessions = client.now_playing()
-                    self._process_sessions(sessions)
-                else:
-                    self.logger.warning("No media client available")
+                self._poll_sessions()
 
                 # Wait for next poll interval
                 self._stop_event.wait(self.poll_interval)
@@ -45,6 +39,15 @@ class AudiobookshelfCollector(BaseCollector):
                 # Wait longer on error
                 self._stop_event.wait(min(60, self.poll_interval * 2))
 
+    @fresh_app_context
+    def _poll_sessions(self):
+        """Get current sessions from the API and process them."""
+        client = self._get_media_client()
+        if client:
+            self._process_sessions(client.now_playing())
+        else:
+            self.logger.warning("No media client available")
+
     def _process_sessions(self, sessions):
         """Process current sessions from REST API."""
         self.logger.debug(f"Processing {len(sessions)} sessions from API")
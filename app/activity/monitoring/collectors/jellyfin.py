@@ -1,54 +1,187 @@
 """
-Jellyfin activity collector using Sessions API polling.
+Jellyfin activity collector using the server WebSocket.
 
-Polls Jellyfin's Sessions API to monitor active playback sessions.
+Subscribes to ``Sessions`` updates on ``/socket`` (``SessionsStart``), so
+events are only produced when playback changes. ``PlaybackStart`` and
+``PlaybackStopped`` messages trigger an immediate reconciliation against the
+Sessions API, which also runs every ``reconcile_interval`` as a safety net.
+While the socket is down the collector polls the Sessions API and retries the
+connection with exponential backoff.
 """
 
+import json
+import time
 from datetime import UTC, datetime
 from typing import Any
+from urllib.parse import urlencode, urlsplit, urlunsplit
+
+import websocket
 
 from ...domain.models import ActivityEvent
-from ..monitor import BaseCollector
+from ..monitor import BaseCollector, fresh_app_context
+
+# Start immediately, then at most one ``Sessions`` message every 1.5 seconds.
+SESSIONS_SUBSCRIPTION = "0,1500"
 
 
 class JellyfinCollector(BaseCollector):
-    """Jellyfin activity collector using Sessions API polling."""
+    """Jellyfin activity collector using WebSocket session updates."""
+
+    product = "Jellyfin"
+    socket_path = "/socket"
 
     def __init__(self, server, event_callback):
         super().__init__(server, event_callback)
         self.active_sessions: dict[str, dict[str, Any]] = {}
+        self.ws: websocket.WebSocket | None = None
+        self.connected = False
+        self.poll_interval = 10  # seconds, while the socket is down
+        self.reconcile_interval = 300  # seconds, while the socket is up
+        self.progress_interval = 60  # seconds between progress events
+        self.keepalive_interval = 30  # seconds, adjusted by ForceKeepAlive
+        self.connect_timeout = 10  # seconds
+        self.recv_timeout = 1  # seconds between housekeeping checks
+        self.reconnect_min_delay = 1  # seconds
+        self.reconnect_max_delay = 60  # seconds
+        self._last_poll = 0.0
+        self._last_progress: dict[str, float] = {}
 
     def _collect_loop(self):
-        """Main collection loop using Jellyfin Sessions API polling."""
-        self.logger.info("Starting Jellyfin Sessions API polling")
+        """Listen for session updates, polling while disconnected."""
+        self.logger.info(f"Starting {self.product} WebSocket monitoring")
+        delay = self.reconnect_min_delay
 
         while self.running and not self._stop_event.is_set():
             try:
-                client = self._get_media_client()
-                if client:
-                    self.logger.debug("Polling Jellyfin Sessions API...")
-                    sessions = client.now_playing()
-
-                    if sessions:
-                        self.logger.info(f"Found {len(sessions)} active sessions")
-                        for i, session in enumerate(sessions):
-                            self.logger.debug(
-                                f"Session {i + 1}: {session.get('user_name', 'Unknown')} - {session.get('media_title', 'Unknown')}"
-                            )
-                    else:
-                        self.logger.debug("No active sessions found")
-
-                    self._process_sessions(sessions)
-                else:
-                    self.logger.warning("Failed to get media client for polling")
+                self.ws = self._connect()
+            except Exception as e:
+                self.logger.warning(
+                    f"{self.product} WebSocket unavailable, retrying in {delay}s: {e}"
+                )
+                self.error_count += 1
+                self._poll_while_disconnected(delay)
+                delay = min(delay * 2, self.reconnect_max_delay)
+                continue
+
+            delay = self.reconnect_min_delay
+            self.connected = True
+            self.logger.info(f"Connected to {self.product} WebSocket")
+            try:
+                self._listen(self.ws)
+            except Exception as e:
+                if self.running and not self._stop_event.is_set():
+                    self.logger.warning(f"{self.product} WebSocket closed: {e}")
+                    self.error_count += 1
+            finally:
+                self._close()
+
+    def _connect(self) -> websocket.WebSocket:
+        ws = websocket.create_connection(
+            self._socket_url(), timeout=self.connect_timeout
+        )
+        ws.settimeout(self.recv_timeout)
+        self._send(ws, "SessionsStart", SESSIONS_SUBSCRIPTION)
+        return ws
+
+    def _socket_url(self) -> str:
+        parts = urlsplit(self.server.url.rstrip("/"))
+        scheme = "wss" if parts.scheme == "https" else "ws"
+        query = urlencode(
+            {
+                "api_key": self.server.api_key or "",
+                "deviceId": f"wizarr-activity-{self.server.id}",
+            }
+        )
+        return urlunsplit(
+            (scheme, parts.netloc, parts.path + self.socket_path, query, "")
+        )
+
+    def _listen(self, ws: websocket.WebSocket):
+        now = time.monotonic()
+        last_keepalive = self._last_poll = now
+        while self.running and not self._stop_event.is_set():
+            try:
+                message = ws.recv()
+            except websocket.WebSocketTimeoutException:
+                pass
+            else:
+                if not message:
+                    raise websocket.WebSocketConnectionClosedException(
+                        "Connection closed by server"
+                    )
+                self._handle_message(ws, message)
+
+            now = time.monotonic()
+            if now - last_keepalive >= self.keepalive_interval:
+                self._send(ws, "KeepAlive")
+                last_keepalive = now
+            if now - self._last_poll >= self.reconcile_interval:
+                self._reconcile()
+
+    @fresh_app_context
+    def _handle_message(self, ws: websocket.WebSocket, message: str | bytes):
+        try:
+            payload = json.loads(message)
+        except ValueError:
+            self.logger.debug(f"Ignoring non-JSON {self.product} message")
+            return
+
+        message_type = payload.get("MessageType")
+        data = payload.get("Data")
+        if message_type == "Sessions" and isinstance(data, list):
+            client = self._get_media_client()
+            if client:
+                self._last_poll = time.monotonic()
+                self._process_sessions(client.parse_sessions(data))
+        elif message_type in ("PlaybackStart", "PlaybackStopped", "SessionEnded"):
+            self._reconcile()
+        elif message_type == "ForceKeepAlive":
+            if isinstance(data, int | float) and data > 0:
+                self.keepalive_interval = max(data / 2, 1)
+            self._send(ws, "KeepAlive")
 
-                # Poll every 10 seconds for responsive monitoring
-                self._stop_event.wait(10)
+    @staticmethod
+    def _send(ws: websocket.WebSocket, message_type: str, data: Any = None):
+        message: dict[str, Any] = {"MessageType": message_type}
+        if data is not None:
+            message["Data"] = data
+        ws.send(json.dumps(message))
 
+    def _close(self):
+        self.connected = False
+        ws, self.ws = self.ws, None
+        if ws is not None:
+            try:
+                ws.close()
             except Exception as e:
-                self.logger.error(f"Jellyfin API polling error: {e}", exc_info=True)
-                self.error_count += 1
-                self._stop_event.wait(30)  # Wait longer on error
+                self.logger.debug(f"Error closing {self.product} WebSocket: {e}")
+
+    # ------------------------------------------------------------------
+    # Sessions API polling
+    # ------------------------------------------------------------------
+    @fresh_app_context
+    def _reconcile(self):
+        """Poll the Sessions API and fold the result into tracked sessions."""
+        self._last_poll = time.monotonic()
+        try:
+            client = self._get_media_client()
+            if not client:
+                self.logger.warning("Failed to get media client for polling")
+                return
+            self._process_sessions(client.now_playing())
+        except Exception as e:
+            self.logger.error(f"{self.product} API polling error: {e}", exc_info=True)
+            self.error_count += 1
+
+    def _poll_while_disconnected(self, wait: float):
+        """Wait ``wait`` seconds before reconnecting, polling meanwhile."""
+        waited = 0.0
+        while waited < wait and self.running and not self._stop_event.is_set():
+            if time.monotonic() - self._last_poll >= self.poll_interval:
+                self._reconcile()
+            step = min(wait - waited, self.poll_interval)
+            self._stop_event.wait(step)
+            waited += step
 
     def _process_sessions(self, sessions):
         """Process sessions from Jellyfin API and emit events."""
@@ -87,7 +220,7 @@ class JellyfinCollector(BaseCollector):
                             self._emit_session_event(session_data, "session_pause")
                         else:
                             self._emit_session_event(session_data, "session_resume")
-                    else:
+                    elif self._progress_due(session_id):
                         # Regular progress update
                         self._emit_session_event(session_data, "session_progress")
 
@@ -100,8 +233,18 @@ class JellyfinCollector(BaseCollector):
             old_session = self.active_sessions.pop(session_id)
             self._emit_session_event(old_session, "session_end")
 
+    def _progress_due(self, session_id: str) -> bool:
+        last = self._last_progress.get(session_id)
+        return last is None or time.monotonic() - last >= self.progress_interval
+
     def _emit_session_event(self, session_data: dict[str, Any], event_type: str):
         """Convert session data to ActivityEvent and emit."""
+        session_id = session_data.get("session_id", "")
+        if event_type == "session_end":
+            self._last_progress.pop(session_id, None)
+        else:
+            self._last_progress[session_id] = time.monotonic()
+
         try:
             # For session_end events, use position_ms (last known playback position)
             # as the watched duration rather than duration_ms (total file runtime from
@@ -161,10 +304,15 @@ class JellyfinCollector(BaseCollector):
 
         except Exception as e:
             self.logger.error(
-                f"Failed to emit Jellyfin session event: {e}", exc_info=True
+                f"Failed to emit {self.product} session event: {e}", exc_info=True
             )
 
+    def is_connected(self) -> bool:
+        """Check if the WebSocket is up."""
+        return super().is_connected() and self.connected
+
     def stop(self):
-        """Stop the Jellyfin collector."""
+        """Stop the collector and close the WebSocket."""
         super().stop()
-        self.logger.info("Jellyfin collector stopped")
+        self._close()
+        self.logger.info(f"{self.product} collector stopped")
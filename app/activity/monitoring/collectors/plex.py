@@ -0,0 +1,198 @@
+"""
+Plex activity collector using the notification WebSocket.
+
+Subscribes to ``/:/websockets/notifications`` and feeds ``playing`` alerts
+into :class:`SessionManager`, which turns them into session events. While the
+socket is down the collector polls ``/status/sessions`` like
+:class:`PollingCollector` and retries the connection with exponential
+backoff. Sessions are handed between the two trackers so that a reconnect
+neither restarts nor loses them.
+"""
+
+import json
+import time
+from datetime import UTC, datetime
+from typing import Any
+from urllib.parse import urlsplit, urlunsplit
+
+import websocket
+
+from ..monitor import BaseCollector, fresh_app_context
+from ..session_manager import SessionManager
+from .polling import PollingCollector
+
+NOTIFICATIONS_PATH = "/:/websockets/notifications"
+
+
+class PlexCollector(BaseCollector):
+    """Plex activity collector using real-time notifications."""
+
+    def __init__(self, server, event_callback):
+        super().__init__(server, event_callback)
+        self.session_manager = SessionManager(
+            event_callback=self._emit_event, client_provider=self._get_media_client
+        )
+        self.fallback = PollingCollector(server, self._emit_event)
+        self.ws: websocket.WebSocket | None = None
+        self.connected = False
+        self.connect_timeout = 10  # seconds
+        self.recv_timeout = 1  # seconds between stop checks
+        self.ping_interval = 30  # seconds of silence before pinging
+        self.reconnect_min_delay = 1  # seconds
+        self.reconnect_max_delay = 60  # seconds
+        self._last_poll = 0.0
+
+    def _collect_loop(self):
+        """Listen for notifications, polling while disconnected."""
+        self.logger.info(f"Starting Plex notification listener for {self.server.name}")
+        delay = self.reconnect_min_delay
+
+        while self.running and not self._stop_event.is_set():
+            try:
+                self.ws = self._connect()
+            except Exception as e:
+                self.logger.warning(
+                    f"Plex notification socket unavailable, retrying in {delay}s: {e}"
+                )
+                self.error_count += 1
+                self._poll_while_disconnected(delay)
+                delay = min(delay * 2, self.reconnect_max_delay)
+                continue
+
+            delay = self.reconnect_min_delay
+            self._on_connected()
+            try:
+                self._listen(self.ws)
+            except Exception as e:
+                if self.running and not self._stop_event.is_set():
+                    self.logger.warning(f"Plex notification socket closed: {e}")
+                    self.error_count += 1
+            finally:
+                self._close()
+
+            if self.running and not self._stop_event.is_set():
+                self._on_disconnected()
+
+    def _connect(self) -> websocket.WebSocket:
+        ws = websocket.create_connection(
+            self._notifications_url(),
+            timeout=self.connect_timeout,
+            header=[f"X-Plex-Token: {self.server.api_key or ''}"],
+        )
+        ws.settimeout(self.recv_timeout)
+        return ws
+
+    def _notifications_url(self) -> str:
+        parts = urlsplit(self.server.url.rstrip("/"))
+        scheme = "wss" if parts.scheme == "https" else "ws"
+        path = parts.path + NOTIFICATIONS_PATH
+        return urlunsplit((scheme, parts.netloc, path, "", ""))
+
+    def _listen(self, ws: websocket.WebSocket):
+        last_message = time.monotonic()
+        while self.running and not self._stop_event.is_set():
+            try:
+                message = ws.recv()
+            except websocket.WebSocketTimeoutException:
+                if time.monotonic() - last_message >= self.ping_interval:
+                    ws.ping()  # Raises once the connection has silently died
+                    last_message = time.monotonic()
+                continue
+
+            if not message:
+                raise websocket.WebSocketConnectionClosedException(
+                    "Connection closed by server"
+                )
+            last_message = time.monotonic()
+            self._handle_message(message)
+
+    @fresh_app_context
+    def _handle_message(self, message: str | bytes):
+        try:
+            payload = json.loads(message)
+        except ValueError:
+            self.logger.debug("Ignoring non-JSON Plex notification")
+            return
+
+        container = payload.get("NotificationContainer")
+        if isinstance(container, dict):
+            self.session_manager.process_alert(container, self.server.id)
+
+    def _close(self):
+        self.connected = False
+        ws, self.ws = self.ws, None
+        if ws is not None:
+            try:
+                ws.close()
+            except Exception as e:
+                self.logger.debug(f"Error closing Plex notification socket: {e}")
+
+    # ------------------------------------------------------------------
+    # Polling fallback
+    # ------------------------------------------------------------------
+    def _poll_while_disconnected(self, wait: float):
+        """Poll (at most every ``poll_interval``) and wait before reconnecting."""
+        if time.monotonic() - self._last_poll >= self.fallback.poll_interval:
+            self._last_poll = time.monotonic()
+            self.fallback._poll_sessions()
+        self._stop_event.wait(wait)
+
+    def _on_connected(self):
+        """Hand sessions found by polling over to the session manager."""
+        self.connected = True
+        self._last_poll = 0.0
+        self.logger.info(f"Connected to Plex notifications for {self.server.name}")
+
+        for session_key, data in self.fallback.active_sessions.items():
+            paused = data.get("state") == "paused"
+            self.session_manager.adopt_session(
+                session_key,
+                {
+                    "username": data.get("user_name", "Unknown"),
+                    "user_id": data.get("user_id"),
+                    "full_title": data.get("media_title", "Unknown"),
+                    "media_type": data.get("media_type"),
+                    "rating_key": data.get("media_id"),
+                    "device": data.get("device_name"),
+                    "player": data.get("client"),
+                    "platform": data.get("platform"),
+                    "server_id": self.server.id,
+                    "state": "paused" if paused else "playing",
+                    "view_offset": data.get("position_ms"),
+                    "started_at": data.get("_started_at_ts") or datetime.now(UTC),
+                    "last_update": datetime.now(UTC),
+                    "paused_at": datetime.now(UTC) if paused else None,
+                },
+            )
+        self.fallback.active_sessions.clear()
+
+    def _on_disconnected(self):
+        """Hand sessions tracked from notifications over to polling."""
+        for session_key, data in self.session_manager.release_sessions().items():
+            record: dict[str, Any] = {
+                "session_id": session_key,
+                "user_name": data.get("username", "Unknown"),
+                "user_id": data.get("user_id"),
+                "media_title": data.get("full_title", "Unknown"),
+                "media_type": data.get("media_type"),
+                "media_id": data.get("rating_key"),
+                "device_name": data.get("device"),
+                "client": data.get("player"),
+                "platform": data.get("platform"),
+                "state": data.get("state", "playing"),
+                "position_ms": data.get("view_offset"),
+                "_started_at_ts": data.get("started_at"),
+                "_last_position_ms": data.get("view_offset"),
+            }
+            self.fallback.active_sessions[session_key] = record
+
+    def is_connected(self) -> bool:
+        """Check if the notification socket is up."""
+        return super().is_connected() and self.connected
+
+    def stop(self):
+        """Stop the Plex collector and close the notification socket."""
+        super().stop()
+        self._close()
+        self.session_manager.cleanup_all_sessions()
+        self.logger.info("Plex collector stopped")
@@ -9,7 +9,7 @@ from datetime import UTC, datetime
 from typing import Any
 
 from ...domain.models import ActivityEvent
-from ..monitor import BaseCollector
+from ..monitor import BaseCollector, fresh_app_context
 
 
 class PollingCollector(BaseCollector):
@@ -35,6 +35,7 @@ class PollingCollector(BaseCollector):
                 # Wait longer on error
                 self._stop_event.wait(60)
 
+    @fresh_app_context
     def _poll_sessions(self):
         """Poll server for current sessions."""
         try:
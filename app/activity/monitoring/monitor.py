@@ -5,6 +5,7 @@ Manages real-time connections to media servers for activity monitoring
 using WebSocket APIs where available, with fallback to polling.
 """
 
+import functools
 import threading
 import time
 from collections.abc import Callable
@@ -15,22 +16,45 @@ from typing import Any, Optional
 import structlog
 
 try:
-    from flask import Flask
+    from flask import Flask, has_app_context
 
     from app.extensions import db
     from app.models import MediaServer
 except ImportError:  # pragma: no cover
     Flask = None  # type: ignore
+    has_app_context = None  # type: ignore
     MediaServer = None  # type: ignore
     db = None  # type: ignore
 
 from app.activity.domain.models import ActivityEvent
 from app.services.activity import ActivityService
+from app.services.activity.write_buffer import ActivityWriteBuffer
+from app.services.media.client_cache import credentials_fingerprint
 
 # Global app instance for background thread access
 _app_instance = None
 
 
+def fresh_app_context(method):
+    """Run a collector method, e.g. one poll or message, in its own app context.
+
+    Collectors live as long as the process, so they must not hold one context
+    (and with it one scoped DB session and pooled connection) for their whole
+    run. Popping the context removes the session, so the next unit of work
+    reads fresh rows. Calls made inside an existing context reuse it.
+    """
+
+    @functools.wraps(method)
+    def wrapper(*args, **kwargs):
+        app = _app_instance
+        if app is None or has_app_context():
+            return method(*args, **kwargs)
+        with app.app_context():
+            return method(*args, **kwargs)
+
+    return wrapper
+
+
 class WebSocketMonitor:
     """Manages WebSocket connections to media servers for real-time activity monitoring."""
 
@@ -40,6 +64,7 @@ class WebSocketMonitor:
         _app_instance = app  # Store globally for background thread access
         self.logger = structlog.get_logger(__name__)
         self.activity_service = ActivityService()
+        self.write_buffer = ActivityWriteBuffer(app, self.activity_service.ingestion)
         self.connections: dict[int, BaseCollector] = {}
         self.executor = None  # Initialize later when actually needed
         self.monitoring = False
@@ -56,6 +81,7 @@ class WebSocketMonitor:
 
         self.monitoring = True
         self.logger.info("Starting activity monitoring")
+        self.write_buffer.start()
 
         # Initialize executor if not already done
         if self.executor is None:
@@ -84,6 +110,7 @@ class WebSocketMonitor:
                 self.logger.error(f"Error stopping collector: {e}")
 
         self.connections.clear()
+        self.write_buffer.stop()
         if self.executor:
             self.executor.shutdown(wait=True)
             self.executor = None
@@ -113,8 +140,13 @@ class WebSocketMonitor:
                 # Tables not created yet (fresh install or tests)
                 return
 
-            # Get all active media servers
-            servers = db.session.query(MediaServer).filter_by(verified=True).all()
+            # Get all active media servers, refreshing rows loaded earlier
+            servers = (
+                db.session.query(MediaServer)
+                .filter_by(verified=True)
+                .execution_options(populate_existing=True)
+                .all()
+            )
             current_server_ids = {server.id for server in servers}
             active_collector_ids = set(self.connections.keys())
 
@@ -124,6 +156,18 @@ class WebSocketMonitor:
                 collector.stop()
                 self.logger.info(f"Stopped monitoring server {server_id}")
 
+            # Restart collectors whose server was edited; their connections
+            # were opened with the old URL or credentials.
+            for server in servers:
+                collector = self.connections.get(server.id)
+                if collector and collector.credentials != credentials_fingerprint(
+                    server
+                ):
+                    self.connections.pop(server.id).stop()
+                    self.logger.info(
+                        f"Server {server.id} settings changed, restarting collector"
+                    )
+
             # Add collectors for new servers
             for server in servers:
                 if server.id not in self.connections:
@@ -188,12 +232,10 @@ class WebSocketMonitor:
             )
 
             if server.server_type == "plex":
-                self.logger.info("Creating PollingCollector for Plex...")
-                from .collectors.polling import PollingCollector
+                self.logger.info("Creating PlexCollector...")
+                from .collectors.plex import PlexCollector
 
-                collector = PollingCollector(server, self._on_activity_event)
-                self.logger.info(f"PollingCollector created for Plex: {collector}")
-                return collector
+                return PlexCollector(server, self._on_activity_event)
             if server.server_type == "jellyfin":
                 self.logger.info("Creating JellyfinCollector...")
                 from .collectors.jellyfin import JellyfinCollector
@@ -222,17 +264,23 @@ class WebSocketMonitor:
             return None
 
     def _on_activity_event(self, event: ActivityEvent):
-        """Handle activity events from collectors."""
+        """Queue activity events from collectors for batched persistence."""
         try:
-            with self.app.app_context():
-                session = self.activity_service.record_activity_event(event)
-                if session:
-                    self.logger.debug(
-                        f"Recorded activity event: {event.event_type} for {event.user_name}"
-                    )
+            if self.write_buffer.submit(event):
+                self.logger.debug(
+                    f"Queued activity event: {event.event_type} for {event.user_name}"
+                )
+            else:
+                self.logger.debug(
+                    f"Activity buffer full, dropped {event.event_type} for {event.session_id}"
+                )
         except Exception as e:
             self.logger.error(f"Failed to handle activity event: {e}", exc_info=True)
 
+    def get_ingestion_stats(self) -> dict[str, Any]:
+        """Get write-behind buffer metrics."""
+        return self.write_buffer.get_stats()
+
     def get_connection_status(self) -> dict[int, dict[str, Any]]:
         """Get status of all monitoring connections."""
         status = {}
@@ -253,6 +301,7 @@ class BaseCollector:
         self, server: MediaServer, event_callback: Callable[[ActivityEvent], None]
     ):
         self.server = server
+        self.credentials = credentials_fingerprint(server)
         self.event_callback = event_callback
         self.logger = structlog.get_logger(
             f"activity.collector.{getattr(server, 'server_type', 'unknown')}"
@@ -320,11 +369,11 @@ class BaseCollector:
             self.error_count += 1
 
     def _get_media_client(self):
-        """Get media client for this server."""
+        """Get the shared, long-lived media client for this server."""
         try:
-            from app.services.media.service import get_client_for_media_server
+            from app.services.media.client_cache import MediaClientCache
 
-            return get_client_for_media_server(self.server)
+            return MediaClientCache.get(self.server)
         except Exception as e:
             self.logger.error(f"Failed to get media client: {e}")
             return None
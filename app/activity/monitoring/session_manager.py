@@ -39,9 +39,11 @@ class SessionTransition:
 class SessionManager:
     """Manages session lifecycle with state transitions and automatic cleanup."""
 
-    def __init__(self, event_callback=None):
+    def __init__(self, event_callback=None, client_provider=None):
         self.logger = structlog.get_logger(__name__)
         self.event_callback = event_callback  # Callback to emit events properly
+        # Returns the collector's shared media client for session lookups
+        self.client_provider = client_provider
         self.active_sessions: dict[str, dict[str, Any]] = {}
         self.session_timers: dict[str, Any] = {}
         self._lock = Lock()  # Protect shared state from race conditions
@@ -751,6 +753,35 @@ class SessionManager:
             self.active_sessions.clear()
             self.session_timers.clear()
 
+    def release_sessions(self) -> dict[str, dict[str, Any]]:
+        """Stop tracking all started sessions and return them.
+
+        Used when another tracker (e.g. polling) takes over the sessions.
+        """
+        with self._lock:
+            released = {
+                key: dict(data)
+                for key, data in self.active_sessions.items()
+                if data.get("started_at") is not None
+            }
+        self.cleanup_all_sessions()
+        return released
+
+    def adopt_session(self, session_key: str, session_data: dict[str, Any]):
+        """Track a session that was started elsewhere without emitting a start."""
+        session_key = str(session_key)
+        with self._lock:
+            self.active_sessions[session_key] = {
+                "session_key": session_key,
+                "state": SessionState.PLAYING.value,
+                "paused_counter": 0,
+                "paused_at": None,
+                "needs_enrichment": False,
+                **session_data,
+            }
+        # Ends that happened while nobody was listening surface as stale.
+        self._schedule_cleanup(session_key)
+
     def _extract_session_data_from_plex(
         self, plex_session, server_id: int
     ) -> dict[str, Any]:
@@ -834,17 +865,19 @@ class SessionManager:
 
             def _do_session_lookup():
                 """Helper function to perform the actual session lookup."""
+                from app.extensions import db
                 from app.models import MediaServer
-                from app.services.media.service import get_client_for_media_server
+                from app.services.media.client_cache import MediaClientCache
 
-                # Get the server
-                server = MediaServer.query.get(server_id)
-                if not server:
-                    self.logger.warning(f"Server {server_id} not found")
-                    return {}
+                if self.client_provider is not None:
+                    client = self.client_provider()
+                else:
+                    server = db.session.get(MediaServer, server_id)
+                    if not server:
+                        self.logger.warning(f"Server {server_id} not found")
+                        return {}
+                    client = MediaClientCache.get(server)
 
-                # Get the media client
-                client = get_client_for_media_server(server)
                 if not client or not hasattr(client, "server"):
                     self.logger.warning(f"No valid client for server {server_id}")
                     return {}
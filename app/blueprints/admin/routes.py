@@ -94,7 +94,9 @@ def now_playing_cards():
             # Generate token for artwork_url
             if session.get("artwork_url"):
                 session["artwork_token"] = ImageProxyService.generate_token(
-                    session["artwork_url"], server_id
+                    session["artwork_url"],
+                    server_id,
+                    width=ImageProxyService.THUMBNAIL_WIDTH,
                 )
 
             # Generate token for thumbnail_url
@@ -106,7 +108,9 @@ def now_playing_cards():
             # Generate token for fallback_artwork_url
             if session.get("fallback_artwork_url"):
                 session["fallback_artwork_token"] = ImageProxyService.generate_token(
-                    session["fallback_artwork_url"], server_id
+                    session["fallback_artwork_url"],
+                    server_id,
+                    width=ImageProxyService.THUMBNAIL_WIDTH,
                 )
 
         return render_template("admin/now_playing_cards.html", sessions=sessions)
@@ -21,6 +21,7 @@ from app.models import (
     User,
     WebAuthnCredential,
 )
+from app.services.api_key_auth import ApiKeyAuthenticator
 from app.services.invites import create_invite
 from app.services.media.service import (
     delete_user,
@@ -29,6 +30,7 @@ from app.services.media.service import (
     list_users_all_servers,
 )
 from app.services.server_name_resolver import get_display_name_info
+from app.services.user_directory import MAX_PER_PAGE, UserDirectory, UserListQuery
 
 from .models import (
     admin_list_model,
@@ -79,22 +81,15 @@ def require_api_key(f):
             logger.warning("API request without API key from %s", request.remote_addr)
             abort(401, error="Unauthorized")
 
-        # Type assertion since we've already checked that auth_key exists
-        assert isinstance(auth_key, str)
-
-        # Hash the provided key to compare with stored hash
-        key_hash = hashlib.sha256(auth_key.encode("utf-8")).hexdigest()
-        api_key = ApiKey.query.filter_by(key_hash=key_hash, is_active=True).first()
+        # Cached lookup; last_used_at is recorded in coalesced batches
+        api_key = ApiKeyAuthenticator.authenticate(auth_key)
 
         if not api_key:
             logger.warning(
                 "API request with invalid API key from %s", request.remote_addr
             )
             abort(401, error="Unauthorized")
-
-        # Update last used timestamp
-        api_key.last_used_at = datetime.datetime.now(datetime.UTC)
-        db.session.commit()
+            return None  # Type narrowing: unreachable but helps type checker
 
         logger.info(
             "API request authenticated with key '%s' from %s",
@@ -127,22 +122,15 @@ def require_api_key_or_session(f):
             )
             abort(401, error="Unauthorized - API key or session required")
 
-        # Type assertion since we've already checked that auth_key exists
-        assert isinstance(auth_key, str)
-
-        # Hash the provided key to compare with stored hash
-        key_hash = hashlib.sha256(auth_key.encode("utf-8")).hexdigest()
-        api_key = ApiKey.query.filter_by(key_hash=key_hash, is_active=True).first()
+        # Cached lookup; last_used_at is recorded in coalesced batches
+        api_key = ApiKeyAuthenticator.authenticate(auth_key)
 
         if not api_key:
             logger.warning(
                 "API request with invalid API key from %s", request.remote_addr
             )
             abort(401, error="Unauthorized")
-
-        # Update last used timestamp
-        api_key.last_used_at = datetime.datetime.now(datetime.UTC)
-        db.session.commit()
+            return None  # Type narrowing: unreachable but helps type checker
 
         logger.info(
             "API request authenticated with key '%s' from %s",
@@ -316,58 +304,48 @@ class UsersListResource(Resource):
         params={
             "username": "Filter by username (exact match)",
             "email": "Filter by email address (exact match)",
+            "server_id": "Filter by media server ID",
+            "page": "Page number (enables pagination)",
+            "per_page": f"Page size (default 50, max {MAX_PER_PAGE})",
+            "sync": "Set to true to sync users from every media server first",
         },
     )
     @api.marshal_with(user_list_model)
+    @api.response(304, "Not modified (If-None-Match matched the ETag)")
     @api.response(401, "Invalid or missing API key", error_model)
     @api.response(500, "Internal server error", error_model)
     @require_api_key
     def get(self):
-        """List all users across all media servers. Supports filtering by username or email."""
-        try:
-            # Get query parameters
-            username_filter = request.args.get("username")
-            email_filter = request.args.get("email")
+        """List users known to Wizarr across all media servers.
+
+        Served from the local database, which the background user sync keeps
+        current; pass ``sync=true`` to pull from every media server first.
+        Supports filtering, pagination and ETag revalidation.
+        """
+        query = UserListQuery(
+            username=request.args.get("username"),
+            email=request.args.get("email"),
+            server_id=request.args.get("server_id", type=int),
+            page=request.args.get("page", type=int),
+            per_page=request.args.get("per_page", type=int),
+        )
 
+        try:
             logger.info(
-                "API: Listing all users (username=%s, email=%s)",
-                username_filter,
-                email_filter,
+                "API: Listing users (username=%s, email=%s, server_id=%s)",
+                query.username,
+                query.email,
+                query.server_id,
             )
-            users_by_server = list_users_all_servers()
-
-            # Format response
-            users_list = []
-            for server_id, users in users_by_server.items():
-                # Get server info
-                server = db.session.get(MediaServer, server_id)
-                if not server:
-                    continue
-
-                for user in users:
-                    # Apply filters if specified
-                    if username_filter and user.username != username_filter:
-                        continue
-                    if email_filter and user.email != email_filter:
-                        continue
-
-                    users_list.append(
-                        {
-                            "id": user.id,
-                            "username": user.username,
-                            "email": user.email,
-                            "server": server.name,
-                            "server_type": server.server_type,
-                            "expires": user.expires.isoformat()
-                            if user.expires
-                            else None,
-                            "created_at": user.created_at.isoformat()
-                            if hasattr(user, "created_at") and user.created_at
-                            else None,
-                        }
-                    )
-
-            return {"users": users_list, "count": len(users_list)}
+            if request.args.get("sync", "").lower() in ("1", "true", "yes"):
+                list_users_all_servers()
+                UserDirectory.invalidate()
+
+            listing = UserDirectory.list_users(query)
+            headers = {"ETag": f'"{listing.etag}"', "Cache-Control": "no-cache"}
+            if request.if_none_match.contains(listing.etag):
+                return {}, 304, headers
+            return listing.payload, 200, headers
 
         except Exception as e:
             logger.error("Error listing users: %s", str(e))
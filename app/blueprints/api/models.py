@@ -50,11 +50,29 @@ user_model = api.model(
     },
 )
 
+user_sync_status_model = api.model(
+    "UserSyncStatus",
+    {
+        "id": fields.Integer(description="Media server ID"),
+        "name": fields.String(description="Media server name"),
+        "last_synced_at": fields.DateTime(
+            description="When users were last synced from this server"
+        ),
+    },
+)
+
 user_list_model = api.model(
     "UserList",
     {
         "users": fields.List(fields.Nested(user_model)),
-        "count": fields.Integer(description="Total number of users"),
+        "count": fields.Integer(description="Number of users in this response"),
+        "total": fields.Integer(description="Total number of matching users"),
+        "page": fields.Integer(description="Current page (when paginated)"),
+        "per_page": fields.Integer(description="Page size (when paginated)"),
+        "servers": fields.List(
+            fields.Nested(user_sync_status_model),
+            description="Sync freshness per media server",
+        ),
     },
 )
 
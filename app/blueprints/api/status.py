@@ -1,11 +1,10 @@
 import datetime
-import hashlib
 import logging
 
 from flask import Blueprint, jsonify, request
 
-from app.extensions import db
-from app.models import ApiKey, Invitation, User
+from app.models import Invitation, User
+from app.services.api_key_auth import ApiKeyAuthenticator
 
 status_bp = Blueprint("status", __name__, url_prefix="/api")
 
@@ -19,14 +18,10 @@ def authenticate_api_key():
     if not auth_key:
         return False, None
 
-    # Hash the provided key to compare with stored hash
-    key_hash = hashlib.sha256(auth_key.encode()).hexdigest()
-    api_key = ApiKey.query.filter_by(key_hash=key_hash, is_active=True).first()
+    # Cached lookup; last_used_at is recorded in coalesced batches
+    api_key = ApiKeyAuthenticator.authenticate(auth_key)
 
     if api_key:
-        # Update last used timestamp
-        api_key.last_used_at = datetime.datetime.now(datetime.UTC)
-        db.session.commit()
         return True, api_key
 
     return False, None
@@ -28,6 +28,7 @@ from app.models import (
     invitation_servers,
     invitation_users,
 )
+from app.services.media.http_pool import HttpSessionRegistry
 from app.services.media.service import (
     list_users_for_server,
     scan_libraries_for_server,
@@ -215,6 +216,7 @@ def edit_server(server_id):
             for lib in Library.query.filter_by(server_id=server.id):
                 lib.enabled = lib.external_id in chosen
         db.session.commit()
+        HttpSessionRegistry.invalidate(server.id)
         return redirect(url_for("media_servers.list_servers"))
     # GET → modal
     return render_template("modals/edit-server.html", server=server, error="")
@@ -291,6 +293,7 @@ def delete_server():
             # Database CASCADE constraints handle all dependent records automatically
             db.session.delete(server)
             db.session.commit()
+            HttpSessionRegistry.invalidate(server_id)
     if request.headers.get("HX-Request"):
         servers = MediaServer.query.order_by(MediaServer.name).all()
         return render_template("settings/servers.html", servers=servers)
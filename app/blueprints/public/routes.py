@@ -1,3 +1,6 @@
+from collections.abc import Iterator
+from contextlib import ExitStack
+from itertools import chain
 from pathlib import Path
 
 import structlog
@@ -9,16 +12,19 @@ from flask import (
     redirect,
     render_template,
     request,
+    send_file,
     send_from_directory,
     session,
     url_for,
 )
 from flask_babel import gettext as _
+from werkzeug.http import parse_date
 
 from app.extensions import db, limiter
-from app.models import Invitation, MediaServer, Settings, User
+from app.models import Invitation, MediaServer, User
 from app.services.invites import is_invite_valid
 from app.services.media.plex import PlexInvitationError, handle_oauth_token
+from app.services.settings_cache import SettingsCache
 
 public_bp = Blueprint("public", __name__)
 
@@ -67,8 +73,7 @@ def _apply_safe_media_user_policy(
 @public_bp.route("/")
 def root():
     # check if admin_username exists
-    admin_setting = Settings.query.filter_by(key="admin_username").first()
-    if not admin_setting:
+    if SettingsCache.get("admin_username") is None:
         return redirect("/setup/")  # installation wizard
     return redirect("/admin")
 
@@ -169,8 +174,7 @@ def join():
                     code=code,
                     error=e.message,
                 )
-                name_setting = Settings.query.filter_by(key="server_name").first()
-                server_name = name_setting.value if name_setting else None
+                server_name = SettingsCache.get("server_name")
 
                 return render_template(
                     "user-plex-login.html",
@@ -186,8 +190,7 @@ def join():
                     code=code,
                     error=str(e),
                 )
-                name_setting = Settings.query.filter_by(key="server_name").first()
-                server_name = name_setting.value if name_setting else None
+                server_name = SettingsCache.get("server_name")
 
                 return render_template(
                     "user-plex-login.html",
@@ -240,8 +243,7 @@ def join():
             server_name = resolve_invitation_server_name(servers)
         except ImportError:
             # Fallback to legacy approach if resolver not available
-            name_setting = Settings.query.filter_by(key="server_name").first()
-            server_name = name_setting.value if name_setting else "Media Server"
+            server_name = SettingsCache.get("server_name", "Media Server")
 
         form = JoinForm()
         form.code.data = code
@@ -463,14 +465,100 @@ def password_prompt(code):
     return render_template("choose-password.html", code=code)
 
 
-def _image_proxy_response(data: bytes, content_type: str) -> Response:
-    """Build a browser-safe, cacheable response for proxied image bytes."""
-    response = Response(data, content_type=content_type)
-    response.headers["Cache-Control"] = "public, max-age=3600"
+def _apply_image_cache_headers(
+    response: Response, etag: str | None, last_modified: str | None
+) -> Response:
+    """Add browser caching and hardening headers to an image-proxy response."""
+    from app.services.image_proxy import ImageProxyService
+
+    response.headers["Cache-Control"] = (
+        f"public, max-age={ImageProxyService.browser_max_age()}"
+    )
     response.headers["X-Content-Type-Options"] = "nosniff"
+    if etag:
+        response.headers["ETag"] = etag
+    if last_modified:
+        response.headers["Last-Modified"] = last_modified
     return response
 
 
+def _image_not_modified(etag: str | None, last_modified: str | None) -> bool:
+    """Whether the browser's conditional headers match the cached image."""
+    if request.if_none_match:
+        # If-None-Match takes precedence over If-Modified-Since (RFC 9110).
+        return bool(etag) and request.if_none_match.contains(etag.strip('"'))
+    if last_modified and request.if_modified_since:
+        modified = parse_date(last_modified)
+        return modified is not None and modified <= request.if_modified_since
+    return False
+
+
+def _image_proxy_response(
+    data: bytes,
+    content_type: str,
+    etag: str | None = None,
+    last_modified: str | None = None,
+) -> Response:
+    """Build a browser-safe, cacheable response for proxied image bytes."""
+    if _image_not_modified(etag, last_modified):
+        return _apply_image_cache_headers(Response(status=304), etag, last_modified)
+    response = Response(data, content_type=content_type)
+    return _apply_image_cache_headers(response, etag, last_modified)
+
+
+def _image_proxy_disk_response(entry) -> Response | None:
+    """Serve a disk-cached image via ``send_file`` (sendfile under Gunicorn)."""
+    from app.services.image_disk_cache import ImageDiskCache
+    from app.services.image_proxy import ImageProxyService
+
+    etag = ImageProxyService.strong_etag(entry.digest) if entry.digest else None
+    if _image_not_modified(etag, entry.last_modified):
+        return _apply_image_cache_headers(
+            Response(status=304), etag, entry.last_modified
+        )
+
+    handle = ImageDiskCache.open(entry)
+    if handle is None:
+        return None
+    response = send_file(
+        handle, mimetype=entry.content_type, conditional=False, etag=False
+    )
+    return _apply_image_cache_headers(response, etag, entry.last_modified)
+
+
+def _stream_image_proxy_body(
+    upstream: ExitStack,
+    body: Iterator[bytes],
+    prefix: list[bytes],
+    disk_writer,
+):
+    """Relay an upstream image body chunk by chunk, teeing it to the disk cache.
+
+    Runs after the response has started, so an upstream exceeding the byte cap
+    can only be cut short; the partial body is never cached.
+    """
+    from app.services.image_proxy import ImageProxyService
+
+    max_bytes = ImageProxyService.IMAGE_PROXY_MAX_BYTES
+    total = 0
+    try:
+        for chunk in chain(prefix, body):
+            total += len(chunk)
+            if total > max_bytes:
+                if disk_writer:
+                    disk_writer.abort()
+                return
+            if disk_writer:
+                disk_writer.write(chunk)
+            yield chunk
+        if disk_writer:
+            disk_writer.commit()
+    finally:
+        if disk_writer:
+            disk_writer.abort()  # No-op once committed
+        upstream.close()
+
+
 # ─── Image proxy to allow internal artwork URLs ─────────────────────────────
 @public_bp.route("/image-proxy")
 def image_proxy():
@@ -479,6 +567,11 @@ def image_proxy():
 
     This prevents SSRF attacks by not exposing the underlying URL.
     Only accepts signed tokens generated by ImageProxyService.
+
+    Small images are buffered and cached in memory and on disk; bodies larger
+    than ``IMAGE_PROXY_STREAM_THRESHOLD`` are relayed in chunks while being
+    teed into the disk cache, so big artwork costs no RAM per request.
+    Thumbnail tokens are served as resized variants (see image_resize).
     """
     from app.services.image_proxy import ImageProxyService
 
@@ -494,75 +587,179 @@ def image_proxy():
         if not mapping:
             return Response(status=403)  # Invalid or expired token
 
-        # Cache hits still require a currently valid token. In particular, this
-        # keeps cached image bytes from bypassing token expiry or SECRET_KEY
-        # removal/rotation.
-        cached_image = ImageProxyService.get_cached_image(token)
-        if cached_image:
-            return _image_proxy_response(
-                cached_image["data"], cached_image["content_type"]
+        variant = ImageProxyService.plan_variant(mapping, request.headers.get("Accept"))
+        response = _image_proxy_variant(token, mapping, variant)
+    except Exception:
+        return Response(status=502)
+
+    if variant.negotiated and response.status_code in (200, 304):
+        response.vary.add("Accept")
+    return response
+
+
+def _image_proxy_variant(token: str, mapping: dict, variant) -> Response:
+    """Serve one image variant from the cache tiers or the upstream server."""
+    from app.services.image_disk_cache import ImageDiskCache
+    from app.services.image_proxy import ImageProxyService
+    from app.services.image_resize import resize_image
+
+    # Each variant (size, quality, negotiated format) is cached separately.
+    cache_token = f"{token}:{variant.key}" if variant.key else token
+
+    # Cache hits still require a currently valid token. In particular, this
+    # keeps cached image bytes from bypassing token expiry or SECRET_KEY
+    # removal/rotation.
+    cached_image = ImageProxyService.get_cached_image(cache_token)
+    if cached_image:
+        return _image_proxy_response(
+            cached_image["data"],
+            cached_image["content_type"],
+            cached_image["etag"],
+            cached_image["last_modified"],
+        )
+
+    url = mapping["url"]
+    server_id = mapping.get("server_id")
+
+    # The disk tier is shared by every worker and keyed by upstream URL, so
+    # it survives token rotation and restarts. Fresh entries are served
+    # straight from disk; stale ones are revalidated below.
+    disk_entry = ImageDiskCache.lookup(url, server_id, variant.key)
+    if disk_entry and disk_entry.is_fresh(ImageProxyService.IMAGE_CACHE_EXPIRY):
+        disk_response = _image_proxy_disk_response(disk_entry)
+        if disk_response is not None:
+            return disk_response
+
+    # Locally resized variants are stored re-encoded, so upstream validators
+    # no longer describe the cached bytes; refetch instead of revalidating.
+    fetch_url = variant.fetch_url
+    headers = ImageProxyService.get_server_headers(server_id, fetch_url).copy()
+    if disk_entry and not variant.local_format:
+        headers.update(disk_entry.validators())
+
+    # Fetch the image using a pooled session to reuse TCP/TLS handshakes.
+    # Artwork endpoints return the image directly, so redirects are not
+    # followed: that keeps the authenticated header from being replayed to
+    # another host if an upstream ever returns a 3xx.
+    session = ImageProxyService.get_session(fetch_url, server_id)
+    max_bytes = ImageProxyService.IMAGE_PROXY_MAX_BYTES
+    # Local resizing needs the whole original, which the byte cap bounds.
+    stream_threshold = (
+        max_bytes
+        if variant.local_format
+        else ImageProxyService.IMAGE_PROXY_STREAM_THRESHOLD
+    )
+    with ExitStack() as upstream:
+        r = upstream.enter_context(
+            session.get(
+                fetch_url,
+                headers=headers,
+                timeout=(5, 15),
+                allow_redirects=False,
+                stream=True,
             )
+        )
 
-        url = mapping["url"]
-        server_id = mapping.get("server_id")
-
-        # Prepare headers for authenticated requests (cached per server)
-        headers = ImageProxyService.get_server_headers(server_id, url).copy()
-
-        # Fetch the image using a pooled session to reuse TCP/TLS handshakes.
-        # Artwork endpoints return the image directly, so redirects are not
-        # followed: that keeps the authenticated header from being replayed to
-        # another host if an upstream ever returns a 3xx.
-        session = ImageProxyService.get_session(url, server_id)
-        max_bytes = ImageProxyService.IMAGE_PROXY_MAX_BYTES
-        with session.get(
-            url,
-            headers=headers,
-            timeout=(5, 15),
-            allow_redirects=False,
-            stream=True,
-        ) as r:
-            r.raise_for_status()
-
-            # Redirects are intentionally not followed; treat an unfollowed 3xx
-            # as an upstream failure rather than serving its body. Log it so blank
-            # artwork from a redirect-fronted upstream is diagnosable.
-            if r.status_code >= 300:
-                structlog.get_logger().warning(
-                    "image-proxy upstream returned a redirect; not following",
-                    status=r.status_code,
-                )
-                return Response(status=502)
+        # Upstream confirmed the stale copy is still current.
+        if r.status_code == 304 and disk_entry:
+            ImageDiskCache.mark_revalidated(disk_entry)
+            disk_response = _image_proxy_disk_response(disk_entry)
+            if disk_response is not None:
+                return disk_response
+            return Response(status=502)
+
+        r.raise_for_status()
+
+        # Redirects are intentionally not followed; treat an unfollowed 3xx
+        # as an upstream failure rather than serving its body. Log it so blank
+        # artwork from a redirect-fronted upstream is diagnosable.
+        if r.status_code >= 300:
+            structlog.get_logger().warning(
+                "image-proxy upstream returned a redirect; not following",
+                status=r.status_code,
+            )
+            return Response(status=502)
 
-            # Reject early on an honest Content-Length, then enforce a hard byte
-            # cap while streaming so a large or malicious upstream cannot exhaust
-            # memory on this unauthenticated route.
-            declared_length = r.headers.get("Content-Length")
-            if declared_length is not None:
-                try:
-                    if int(declared_length) > max_bytes:
-                        return Response(status=502)
-                except ValueError:
-                    pass  # Unparseable header; the streaming cap below still applies.
-
-            chunks: list[bytes] = []
-            total = 0
-            for chunk in r.iter_content(64 * 1024):
-                total += len(chunk)
-                if total > max_bytes:
+        # Reject early on an honest Content-Length, then enforce a hard byte
+        # cap while reading so a large or malicious upstream cannot exhaust
+        # memory on this unauthenticated route.
+        declared_length = r.headers.get("Content-Length")
+        if declared_length is not None:
+            try:
+                if int(declared_length) > max_bytes:
                     return Response(status=502)
-                chunks.append(chunk)
+            except ValueError:
+                pass  # Unparseable header; the streaming cap below still applies.
+
+        content_type = r.headers.get("Content-Type", "image/jpeg")
+        upstream_etag = r.headers.get("ETag")
+        last_modified = r.headers.get("Last-Modified")
+
+        # Buffer up to the streaming threshold. Most posters end here and
+        # get a complete 200 with a strong ETag; anything bigger is
+        # relayed in chunks below.
+        body = r.iter_content(64 * 1024)
+        chunks: list[bytes] = []
+        total = 0
+        exhausted = True
+        for chunk in body:
+            total += len(chunk)
+            if total > max_bytes:
+                return Response(status=502)
+            chunks.append(chunk)
+            if total >= stream_threshold:
+                exhausted = False
+                break
+
+        if not exhausted:
+            disk_writer = ImageDiskCache.writer(
+                url,
+                server_id,
+                content_type,
+                etag=upstream_etag,
+                last_modified=last_modified,
+                variant=variant.key,
+            )
+            # The generator now owns the upstream connection and closes it.
+            response = Response(
+                _stream_image_proxy_body(upstream.pop_all(), body, chunks, disk_writer),
+                content_type=content_type,
+            )
+            return _apply_image_cache_headers(response, None, last_modified)
 
-            image_data = b"".join(chunks)
-            content_type = r.headers.get("Content-Type", "image/jpeg")
+    image_data = b"".join(chunks)
 
-        # Cache the image
-        ImageProxyService.cache_image(token, image_data, content_type)
+    disk_variant = variant.key
+    if variant.local_format:
+        resized = resize_image(image_data, variant)
+        if resized is not None:
+            image_data, content_type = resized
+            upstream_etag = None
+        else:
+            # Serving the original: never cache it as the sized variant.
+            cache_token, disk_variant = None, ""
 
-        return _image_proxy_response(image_data, content_type)
+    # Cache the image in both tiers
+    etag = (
+        ImageProxyService.cache_image(
+            cache_token, image_data, content_type, last_modified
+        )
+        if cache_token
+        else None
+    )
+    disk_entry = ImageDiskCache.store(
+        url,
+        server_id,
+        image_data,
+        content_type,
+        etag=upstream_etag,
+        last_modified=last_modified,
+        variant=disk_variant,
+    )
+    if etag is None and disk_entry and disk_entry.digest:
+        etag = ImageProxyService.strong_etag(disk_entry.digest)
 
-    except Exception:
-        return Response(status=502)
+    return _image_proxy_response(image_data, content_type, etag, last_modified)
 
 
 # ─── Password Reset ──────────────────────────────────────────────────────────
@@ -405,6 +405,8 @@ def ldap_settings():
         config.group_member_attribute = form.group_member_attribute.data
         config.allow_admin_bind = form.allow_admin_bind.data
         config.admin_group_dn = form.admin_group_dn.data
+        # The next user sync searches the whole directory again
+        config.users_synced_until = None
 
         db.session.commit()
         flash(_("LDAP configuration saved successfully"), "success")
@@ -539,8 +541,8 @@ def sync_all_ldap_users():
     This imports all new LDAP users that don't exist in Wizarr yet,
     then returns the updated unified user list.
     """
-    from app.models import LDAPConfiguration, User
-    from app.services.ldap.user_sync import import_ldap_user, list_ldap_users
+    from app.models import LDAPConfiguration
+    from app.services.ldap.user_sync import sync_ldap_directory
 
     ldap_config = LDAPConfiguration.query.filter_by(enabled=True).first()
     if not ldap_config:
@@ -550,8 +552,8 @@ def sync_all_ldap_users():
             message=_("LDAP is not configured"),
         )
 
-    # Get all LDAP users
-    success, result = list_ldap_users()
+    # A manual sync always searches the whole directory
+    success, result = sync_ldap_directory()
     if not success:
         return render_template(
             "_partials/ldap_alert.html",
@@ -559,32 +561,9 @@ def sync_all_ldap_users():
             message=_("Failed to list LDAP users: %(error)s", error=result),
         )
 
-    ldap_users = result
-
-    # Import each user that doesn't exist yet
-    imported_count = 0
-    skipped_count = 0
-    errors: list[str] = []
-
-    for ldap_user in ldap_users:
-        username = ldap_user["username"]
-
-        # Check if user already exists
-        existing = User.query.filter_by(username=username).first()
-        if existing:
-            skipped_count += 1
-            continue
-
-        # Import the user
-        import_success, import_msg = import_ldap_user(username)
-        if import_success:
-            imported_count += 1
-        else:
-            errors.append(f"{username}: {import_msg}")
-
     return render_template(
         "_partials/ldap_user_sync_result.html",
-        imported_count=imported_count,
-        skipped_count=skipped_count,
-        errors=errors,
+        imported_count=result["imported"],
+        skipped_count=result["skipped"],
+        errors=[],
     )
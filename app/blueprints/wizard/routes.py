@@ -1,7 +1,6 @@
 from pathlib import Path
 
 import frontmatter
-import markdown
 from flask import (
     Blueprint,
     abort,
@@ -22,13 +21,13 @@ from app.extensions import db
 from app.models import (
     Invitation,
     MediaServer,
-    Settings,
     WizardBundle,
     WizardBundleStep,
     WizardStep,
 )
 from app.services.invite_code_manager import InviteCodeManager
 from app.services.ombi_client import run_all_importers
+from app.services.settings_cache import SettingsCache
 
 wizard_bp = Blueprint("wizard", __name__, url_prefix="/wizard")
 BASE_DIR = Path(__file__).resolve().parent.parent.parent.parent / "wizard_steps"
@@ -43,10 +42,10 @@ def restrict_wizard():
     Requirement 13.2: Session expiration checks with user-friendly error messages.
     """
     # Determine if the Wizard ACL is enabled (default: True)
-    acl_row = Settings.query.filter_by(key="wizard_acl_enabled").first()
+    acl_value = SettingsCache.get("wizard_acl_enabled")
     acl_enabled = True  # default behaviour – restrict access
-    if acl_row and acl_row.value is not None:
-        acl_enabled = str(acl_row.value).lower() != "false"
+    if acl_value is not None:
+        acl_enabled = str(acl_value).lower() != "false"
 
     # Skip further checks if the ACL feature is disabled
     if not acl_enabled:
@@ -138,7 +137,9 @@ def _settings() -> dict[str, str | None]:
     }
 
     data: dict[str, str | None] = {
-        s.key: s.value for s in Settings.query.all() if s.key not in LEGACY_KEYS
+        key: value
+        for key, value in SettingsCache.all().items()
+        if key not in LEGACY_KEYS
     }
 
     # ------------------------------------------------------------------
@@ -284,10 +285,8 @@ def _render(post, ctx: dict, server_type: str | None = None) -> str:
     Handles rendering errors gracefully by logging and returning error message.
     Requirement 13.6: Graceful degradation for missing/broken steps.
     """
-    from app.services.wizard_widgets import (
-        process_card_delimiters,
-        process_widget_placeholders,
-    )
+    from app.services.wizard_render_cache import WizardRenderCache
+    from app.services.wizard_widgets import process_widget_placeholders
 
     try:
         # Jinja templates inside the markdown files expect a top-level
@@ -301,26 +300,22 @@ def _render(post, ctx: dict, server_type: str | None = None) -> str:
         if server_type is not None:
             render_ctx["server_type"] = server_type
 
-        # FIRST: Process card delimiters (|||) BEFORE widget placeholders
-        content_with_cards = process_card_delimiters(post.content)
+        # Card delimiters and Jinja compilation are cached per step source;
+        # widget placeholders come back as sentinels kept out of the template
+        compiled = WizardRenderCache.compile(post.content)
 
-        # SECOND: Process widget placeholders BEFORE Jinja rendering
-        # This prevents Jinja from trying to parse {{ widget:... }} syntax
-        content_with_widgets = content_with_cards
-        if server_type:
-            content_with_widgets = process_widget_placeholders(
-                content_with_cards, server_type, context=render_ctx
-            )
+        # Only the per-invite context and the widgets render per request
+        rendered_content = compiled.template.render(**render_ctx)
+        html = WizardRenderCache.markdown(rendered_content)
 
-        # THEN: Render Jinja templates in the processed content
-        env = current_app.jinja_env.overlay(autoescape=False)
-        template = env.from_string(content_with_widgets)
-        rendered_content = template.render(**render_ctx)
+        def _widget(placeholder: str) -> str:
+            if not server_type:
+                return ""
+            return process_widget_placeholders(
+                placeholder, server_type, context=render_ctx
+            )
 
-        # Use simple markdown configuration - HTML should pass through by default
-        return markdown.markdown(
-            rendered_content, extensions=["fenced_code", "tables", "attr_list"]
-        )
+        return WizardRenderCache.fill_widgets(html, compiled.widgets, _widget)
     except Exception as e:
         current_app.logger.error(
             f"Error rendering wizard step for {server_type}: {e}", exc_info=True
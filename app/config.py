@@ -114,6 +114,13 @@ class BaseConfig:
     FORCE_LANGUAGE = os.getenv("FORCE_LANGUAGE")
     # Scheduler
     SCHEDULER_API_ENABLED = True
+    # Image proxy disk cache (shared by all workers; 0 disables it)
+    IMAGE_DISK_CACHE_DIR = os.getenv(
+        "IMAGE_DISK_CACHE_DIR", str(DATABASE_DIR / "image_cache")
+    )
+    IMAGE_DISK_CACHE_MAX_BYTES = int(
+        os.getenv("IMAGE_DISK_CACHE_MAX_BYTES", str(512 * 1024 * 1024))
+    )
     # SQLAlchemy
     SQLALCHEMY_DATABASE_URI = f"sqlite:///{DATABASE_DIR / 'database.db'}"
     SQLALCHEMY_TRACK_MODIFICATIONS = False
@@ -1,17 +1,14 @@
 import os
 
-from app.extensions import db
-from app.models import Settings
+from app.services.settings_cache import SettingsCache
 
 
 def inject_server_name():
     from sqlalchemy.exc import OperationalError, PendingRollbackError
 
     try:
-        # Use no_autoflush to prevent triggering pending session changes
-        with db.session.no_autoflush:
-            setting = Settings.query.filter_by(key="server_name").first()
-            server_name = setting.value if setting else "Wizarr"
+        # Served from memory; only reloads when settings change
+        server_name = SettingsCache.get("server_name", "Wizarr")
     except (OperationalError, PendingRollbackError) as e:
         if "database is locked" in str(e).lower():
             # Fallback to default if database is locked
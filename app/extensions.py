@@ -56,7 +56,7 @@ def init_extensions(app):
     sess.init_app(app)
     babel.init_app(app, locale_selector=_select_locale)
 
-    # Scheduler initialization - Flask-APScheduler handles Gunicorn properly
+    # Scheduler initialization - started only in the elected leader process
     should_skip_scheduler = (
         "pytest" in os.getenv("_", "")
         or os.getenv("PYTEST_CURRENT_TEST")
@@ -103,6 +103,66 @@ def init_extensions(app):
             replace_existing=True,
         )
 
+        # Keep the local user table in sync so API reads never fan out to
+        # every media server
+        from app.tasks.user_sync import (
+            _get_user_sync_interval,
+            sync_media_server_users,
+        )
+
+        scheduler.add_job(
+            id="sync_media_server_users",
+            func=lambda: sync_media_server_users(app),
+            trigger="interval",
+            minutes=_get_user_sync_interval(),
+            replace_existing=True,
+        )
+
+        # Historical imports run here rather than in per-request threads, so
+        # a restart resumes them from their checkpoints
+        from app.tasks.historical_import import (
+            _get_historical_import_poll_interval,
+            run_historical_imports,
+        )
+
+        scheduler.add_job(
+            id="run_historical_imports",
+            func=lambda: run_historical_imports(app),
+            trigger="interval",
+            seconds=_get_historical_import_poll_interval(),
+            replace_existing=True,
+        )
+
+        # Pull plays newer than each server's high-water mark so history
+        # stays complete across downtime
+        from app.tasks.history_sync import (
+            _get_history_sync_interval,
+            sync_recent_history,
+        )
+
+        scheduler.add_job(
+            id="sync_recent_history",
+            func=lambda: sync_recent_history(app),
+            trigger="interval",
+            minutes=_get_history_sync_interval(),
+            replace_existing=True,
+        )
+
+        # Keep wizard widget data (recently added media) cached so wizard
+        # pages never wait on a media server
+        from app.tasks.wizard_widgets import (
+            _get_wizard_widget_refresh_interval,
+            refresh_wizard_widgets,
+        )
+
+        scheduler.add_job(
+            id="refresh_wizard_widgets",
+            func=lambda: refresh_wizard_widgets(app),
+            trigger="interval",
+            minutes=_get_wizard_widget_refresh_interval(),
+            replace_existing=True,
+        )
+
         # Add LDAP user sync task (only if LDAP is configured)
         from app.tasks.ldap_sync import _get_ldap_sync_interval, sync_ldap_users
 
@@ -124,17 +184,11 @@ def init_extensions(app):
         # Note: WAL auto-checkpoints every 1000 pages (~4MB) automatically.
         # Manual checkpoint jobs can be added here if needed for large .db-wal files.
 
-        # Start the scheduler - Flask-APScheduler handles Gunicorn coordination
-        try:
-            if not scheduler.running:
-                scheduler.start()
-                app.logger.info("APScheduler started successfully")
-            else:
-                app.logger.info("APScheduler already running")
-        except Exception as e:
-            app.logger.warning(f"Failed to start APScheduler: {e}")
+        # Only the elected leader process runs scheduled jobs; other Gunicorn
+        # workers keep the jobs registered and take over if the leader dies.
+        from app.utils.leader_election import leader_election
 
-    # Continue with remaining extensions
+        leader_election.on_elected(lambda: _start_scheduler(app))
 
     # Continue with remaining extensions
     htmx.init_app(app)
@@ -159,6 +213,18 @@ def init_extensions(app):
             app.logger.info("Initial manifest fetch failed: %s", e)
 
 
+def _start_scheduler(app):
+    """Start the APScheduler in this process."""
+    try:
+        if not scheduler.running:
+            scheduler.start()
+            app.logger.info("APScheduler started successfully")
+        else:
+            app.logger.info("APScheduler already running")
+    except Exception as e:
+        app.logger.warning(f"Failed to start APScheduler: {e}")
+
+
 @login_manager.user_loader
 def load_user(user_id):
     """Translate *user_id* from the session back into a user instance.
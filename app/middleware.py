@@ -1,7 +1,7 @@
 # app/middleware.py
 from flask import current_app, redirect, request, url_for
 
-from app.models import Settings
+from app.services.settings_cache import SettingsCache
 
 
 def require_onboarding():
@@ -18,8 +18,7 @@ def require_onboarding():
         return None
 
     # Check if an admin user exists
-    admin_setting = Settings.query.filter_by(key="admin_username").first()
-    if not admin_setting or not admin_setting.value:
+    if not SettingsCache.get("admin_username"):
         return redirect(url_for("setup.onboarding"))
     return None
     # Allow access to the application even if no MediaServer has been configured yet.
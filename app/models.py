@@ -276,10 +276,10 @@ class User(db.Model, UserMixin):
         """Set list of accessible library names. None means full access."""
         import json
 
-        if libraries is None or not libraries:
-            self.accessible_libraries = None
-        else:
-            self.accessible_libraries = json.dumps(libraries)
+        value = json.dumps(libraries) if libraries else None
+        # Skip no-op writes so unchanged users are not marked dirty
+        if self.accessible_libraries != value:
+            self.accessible_libraries = value
 
     def update_standardized_metadata(self, details):
         """Update user with standardized metadata from MediaUserDetails."""
@@ -450,6 +450,11 @@ class MediaServer(db.Model):
     created_at = db.Column(
         db.DateTime, default=lambda: datetime.now(UTC), nullable=False
     )
+    # When the user list was last pulled from the server (None = never)
+    last_synced_at = db.Column(db.DateTime, nullable=True)
+    # Newest play imported from the server's watch history; delta syncs
+    # fetch only history after this mark (None = never imported)
+    history_synced_until = db.Column(db.DateTime, nullable=True)
 
     # Reverse relationship for multi-server invites
     invites = db.relationship(
@@ -790,6 +795,10 @@ class ActivitySession(db.Model):
         db.DateTime, nullable=False, index=True, default=lambda: datetime.now(UTC)
     )
     active = db.Column(db.Boolean, nullable=False, default=True, index=True)
+    # Set once an ended session has been counted in the activity rollups.
+    rolled_up = db.Column(
+        db.Boolean, nullable=False, default=False, server_default=db.false(), index=True
+    )
     duration_ms = db.Column(db.BigInteger, nullable=True)
     device_name = db.Column(db.String, nullable=True)
     client_name = db.Column(db.String, nullable=True)
@@ -983,6 +992,7 @@ class HistoricalImportJob(db.Model):
     total_processed = db.Column(db.Integer, nullable=False, default=0)
     total_stored = db.Column(db.Integer, nullable=False, default=0)
     error_message = db.Column(db.Text, nullable=True)
+    checkpoint = db.Column(db.Text, nullable=True)
     created_at = db.Column(
         db.DateTime, default=lambda: datetime.now(UTC), nullable=False
     )
@@ -1034,6 +1044,55 @@ class HistoricalImportJob(db.Model):
     def status_label(self) -> str:
         return self.status.replace("_", " ").title()
 
+    def get_checkpoint(self) -> dict[str, Any]:
+        if not self.checkpoint:
+            return {}
+        try:
+            return json.loads(self.checkpoint)
+        except (json.JSONDecodeError, TypeError):
+            return {}
+
+    def set_checkpoint(self, checkpoint: dict[str, Any] | None):
+        self.checkpoint = json.dumps(checkpoint) if checkpoint else None
+
+
+class WidgetDataCache(db.Model):
+    """Media-server data behind a wizard widget, refreshed in the background.
+
+    Wizard pages render widgets from these rows instead of calling the media
+    server, so a slow server never slows an invitee's page down.
+    """
+
+    __tablename__ = "widget_data_cache"
+
+    id = db.Column(db.Integer, primary_key=True)
+    server_id = db.Column(
+        db.Integer,
+        db.ForeignKey("media_server.id", ondelete="CASCADE"),
+        nullable=False,
+    )
+    widget = db.Column(db.String(64), nullable=False)
+    payload = db.Column(db.Text, nullable=False, default="[]")
+    refreshed_at = db.Column(
+        db.DateTime, default=lambda: datetime.now(UTC), nullable=False
+    )
+
+    __table_args__ = (
+        db.UniqueConstraint("server_id", "widget", name="uq_widget_data_server"),
+    )
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+
+    def get_payload(self) -> Any:
+        try:
+            return json.loads(self.payload or "[]")
+        except (json.JSONDecodeError, TypeError):
+            return []
+
+    def set_payload(self, payload: Any):
+        self.payload = json.dumps(payload)
+
 
 class ActivitySnapshot(db.Model):
     __tablename__ = "activity_snapshot"
@@ -1100,6 +1159,106 @@ class ActivitySnapshot(db.Model):
         }
 
 
+class ActivityDailyRollup(db.Model):
+    """Ended sessions per day, server, user and media type.
+
+    Maintained by :mod:`app.services.activity.rollups` so dashboards never
+    scan ``activity_session``. ``media_type`` is ``""`` when unknown.
+    """
+
+    __tablename__ = "activity_daily_rollup"
+
+    id = db.Column(db.Integer, primary_key=True)
+    day = db.Column(db.Date, nullable=False, index=True)
+    server_id = db.Column(
+        db.Integer,
+        db.ForeignKey("media_server.id", ondelete="CASCADE"),
+        nullable=False,
+    )
+    user_name = db.Column(db.String, nullable=False)
+    media_type = db.Column(db.String, nullable=False, default="")
+    sessions = db.Column(db.Integer, nullable=False, default=0)
+    watched_sessions = db.Column(db.Integer, nullable=False, default=0)
+    watch_ms = db.Column(db.BigInteger, nullable=False, default=0)
+
+    __table_args__ = (
+        db.UniqueConstraint(
+            "day",
+            "server_id",
+            "user_name",
+            "media_type",
+            name="uq_activity_daily_rollup_key",
+        ),
+    )
+
+
+class ActivityContentRollup(db.Model):
+    """Ended sessions per day, server and title (episodes under their series)."""
+
+    __tablename__ = "activity_content_rollup"
+
+    id = db.Column(db.Integer, primary_key=True)
+    day = db.Column(db.Date, nullable=False, index=True)
+    server_id = db.Column(
+        db.Integer,
+        db.ForeignKey("media_server.id", ondelete="CASCADE"),
+        nullable=False,
+    )
+    title = db.Column(db.String, nullable=False)
+    content_type = db.Column(db.String, nullable=False)
+    plays = db.Column(db.Integer, nullable=False, default=0)
+    watch_ms = db.Column(db.BigInteger, nullable=False, default=0)
+
+    __table_args__ = (
+        db.UniqueConstraint(
+            "day",
+            "server_id",
+            "title",
+            "content_type",
+            name="uq_activity_content_rollup_key",
+        ),
+    )
+
+
+class ActivityHourlyRollup(db.Model):
+    """Ended sessions per day, server and UTC start hour.
+
+    The weekday histogram is derived from ``day``.
+    """
+
+    __tablename__ = "activity_hourly_rollup"
+
+    id = db.Column(db.Integer, primary_key=True)
+    day = db.Column(db.Date, nullable=False, index=True)
+    server_id = db.Column(
+        db.Integer,
+        db.ForeignKey("media_server.id", ondelete="CASCADE"),
+        nullable=False,
+    )
+    hour = db.Column(db.Integer, nullable=False)
+    sessions = db.Column(db.Integer, nullable=False, default=0)
+
+    __table_args__ = (
+        db.UniqueConstraint(
+            "day", "server_id", "hour", name="uq_activity_hourly_rollup_key"
+        ),
+    )
+
+
+class ActivityRollupState(db.Model):
+    """Single-row bookkeeping for the activity rollups.
+
+    ``rebuild_requested`` is set when rolled-up sessions are deleted (which
+    rollups cannot subtract) and cleared by the next full rebuild.
+    """
+
+    __tablename__ = "activity_rollup_state"
+
+    id = db.Column(db.Integer, primary_key=True)
+    rebuild_requested = db.Column(db.Boolean, nullable=False, default=False)
+    rebuilt_at = db.Column(db.DateTime, nullable=True)
+
+
 # ────────────────────────────────────────────────────────────────────────────
 # LDAP/OIDC Integration Models (2025-12)
 # ────────────────────────────────────────────────────────────────────────────
@@ -1142,6 +1301,10 @@ class LDAPConfiguration(db.Model):
     admin_group_dn = db.Column(db.String, nullable=True)
     allow_admin_bind = db.Column(db.Boolean, default=False, nullable=False)
 
+    # Newest modifyTimestamp seen by user sync; scheduled syncs only search
+    # for entries changed since then. Cleared whenever the config is saved.
+    users_synced_until = db.Column(db.DateTime, nullable=True)
+
     created_at = db.Column(
         db.DateTime, default=lambda: datetime.now(UTC), nullable=False
     )
@@ -58,11 +58,15 @@ class ActivityService:
         return self.queries.get_server_activity(server_id, days)
 
     # Analytics -------------------------------------------------------
-    def get_activity_stats(self, days: int = 30) -> dict[str, Any]:
-        return self.analytics.get_activity_stats(days)
-
-    def get_dashboard_stats(self, days: int = 7) -> dict[str, Any]:
-        return self.analytics.get_dashboard_stats(days)
+    def get_activity_stats(
+        self, days: int = 30, server_id: int | None = None
+    ) -> dict[str, Any]:
+        return self.analytics.get_activity_stats(days, server_id)
+
+    def get_dashboard_stats(
+        self, days: int = 7, server_id: int | None = None
+    ) -> dict[str, Any]:
+        return self.analytics.get_dashboard_stats(days, server_id)
 
     # Maintenance -----------------------------------------------------
     def cleanup_old_activity(self, retention_days: int = 90) -> int:
@@ -0,0 +1,275 @@
+"""
+Single-pass aggregation engine for activity statistics.
+
+The dashboard, ``/activity/stats`` and ``ActivityQueryService`` all need the
+same counters: totals, distinct users, watch time and day/hour/weekday
+buckets. Rather than one aggregate query per counter, each rollup table is
+streamed once for the window and every counter is folded from the same rows in
+Python. The sessions still playing, which rollups do not hold yet, come from
+one small query over active sessions.
+
+Results are cached per ``(days, server_id)`` for ``ACTIVITY_STATS_CACHE_SECONDS``.
+Commits that start, end or roll up sessions drop the cache at once in the
+committing process; other workers pick the change up when their entry expires.
+"""
+
+from __future__ import annotations
+
+import os
+import threading
+import time
+from dataclasses import dataclass, field
+from datetime import UTC, date, datetime, timedelta
+from typing import ClassVar
+
+from sqlalchemy import event, func, select
+from sqlalchemy.orm import Session
+
+try:
+    from app.extensions import db  # type: ignore
+except ImportError:  # pragma: no cover - during unit tests
+    db = None  # type: ignore
+
+from app.models import (
+    ActivityContentRollup,
+    ActivityDailyRollup,
+    ActivityHourlyRollup,
+    ActivitySession,
+)
+
+# Rows fetched per round trip while streaming a rollup table.
+STREAM_BATCH_SIZE = 1000
+
+
+@dataclass
+class ActivityAggregate:
+    """Every counter for one window, folded from a single pass per table.
+
+    ``users``, ``content`` and ``servers`` map to ``[sessions, watch_ms]``.
+    ``weekdays`` starts on Sunday, like ``strftime("%w")``.
+    """
+
+    start_day: date | None = None
+    total_sessions: int = 0
+    watched_sessions: int = 0
+    watch_ms: int = 0
+    playing: int = 0
+    users: dict[str, list[int]] = field(default_factory=dict)
+    media_types: dict[str, int] = field(default_factory=dict)
+    content: dict[tuple[str, str], list[int]] = field(default_factory=dict)
+    servers: dict[int, list[int]] = field(default_factory=dict)
+    server_users: dict[int, set[str]] = field(default_factory=dict)
+    days: dict[date, int] = field(default_factory=dict)
+    hours: list[int] = field(default_factory=lambda: [0] * 24)
+    weekdays: list[int] = field(default_factory=lambda: [0] * 7)
+
+    def add_sessions(
+        self,
+        *,
+        day: date,
+        server_id: int,
+        user_name: str,
+        media_type: str | None,
+        sessions: int,
+        watched: int = 0,
+        watch_ms: int = 0,
+    ) -> None:
+        self.total_sessions += sessions
+        self.watched_sessions += watched
+        self.watch_ms += watch_ms
+        user = self.users.setdefault(user_name, [0, 0])
+        user[0] += sessions
+        user[1] += watch_ms
+        server = self.servers.setdefault(server_id, [0, 0])
+        server[0] += sessions
+        server[1] += watch_ms
+        self.server_users.setdefault(server_id, set()).add(user_name)
+        if media_type:
+            self.media_types[media_type] = (
+                self.media_types.get(media_type, 0) + sessions
+            )
+        self.days[day] = self.days.get(day, 0) + sessions
+
+    def add_hour(self, day: date, hour: int, sessions: int) -> None:
+        self.hours[hour] += sessions
+        self.weekdays[(day.weekday() + 1) % 7] += sessions
+
+    def add_content(
+        self, title: str, content_type: str, plays: int, watch_ms: int = 0
+    ) -> None:
+        totals = self.content.setdefault((title, content_type), [0, 0])
+        totals[0] += plays
+        totals[1] += watch_ms
+
+
+@dataclass(frozen=True)
+class _Entry:
+    aggregate: ActivityAggregate
+    computed_at: float
+
+
+class ActivityAggregationEngine:
+    """Compute and cache :class:`ActivityAggregate` per window and server."""
+
+    _cache: ClassVar[dict[tuple[str, int, int | None], _Entry]] = {}
+    _lock: ClassVar[threading.Lock] = threading.Lock()
+
+    TTL_SECONDS = float(os.getenv("ACTIVITY_STATS_CACHE_SECONDS", "30"))
+
+    @classmethod
+    def aggregate(cls, days: int, server_id: int | None = None) -> ActivityAggregate:
+        """Return the aggregate for the last ``days`` days (0 = all time)."""
+        # Keyed by database so test apps with their own databases never mix.
+        key = (str(db.engine.url), days, server_id)  # type: ignore
+        now = time.monotonic()
+        with cls._lock:
+            entry = cls._cache.get(key)
+        if entry is not None and now - entry.computed_at < cls.TTL_SECONDS:
+            return entry.aggregate
+
+        aggregate = cls.compute(days, server_id)
+        with cls._lock:
+            cls._cache[key] = _Entry(aggregate, now)
+        return aggregate
+
+    @classmethod
+    def compute(cls, days: int, server_id: int | None = None) -> ActivityAggregate:
+        """Build the aggregate from the rollups and the sessions still playing."""
+        start_day = (datetime.now(UTC) - timedelta(days=days)).date() if days else None
+        aggregate = ActivityAggregate(start_day=start_day)
+
+        daily = ActivityDailyRollup
+        for row in cls._stream(
+            select(
+                daily.day,
+                daily.server_id,
+                daily.user_name,
+                daily.media_type,
+                daily.sessions,
+                daily.watched_sessions,
+                daily.watch_ms,
+            ),
+            daily,
+            start_day,
+            server_id,
+        ):
+            aggregate.add_sessions(
+                day=row.day,
+                server_id=row.server_id,
+                user_name=row.user_name,
+                media_type=row.media_type,
+                sessions=row.sessions,
+                watched=row.watched_sessions,
+                watch_ms=row.watch_ms,
+            )
+
+        hourly = ActivityHourlyRollup
+        for row in cls._stream(
+            select(
+                hourly.day, hourly.hour, func.sum(hourly.sessions).label("n")
+            ).group_by(hourly.day, hourly.hour),
+            hourly,
+            start_day,
+            server_id,
+        ):
+            aggregate.add_hour(row.day, int(row.hour), int(row.n or 0))
+
+        content = ActivityContentRollup
+        for row in cls._stream(
+            select(
+                content.title,
+                content.content_type,
+                func.sum(content.plays).label("plays"),
+                func.sum(content.watch_ms).label("watch_ms"),
+            ).group_by(content.title, content.content_type),
+            content,
+            start_day,
+            server_id,
+        ):
+            aggregate.add_content(
+                row.title, row.content_type, int(row.plays or 0), int(row.watch_ms or 0)
+            )
+
+        cls._add_playing(aggregate, start_day, server_id)
+        return aggregate
+
+    @classmethod
+    def invalidate(cls) -> None:
+        with cls._lock:
+            cls._cache.clear()
+
+    # ------------------------------------------------------------------
+    # Helpers
+    # ------------------------------------------------------------------
+    @staticmethod
+    def _stream(stmt, model, start_day: date | None, server_id: int | None):
+        if start_day:
+            stmt = stmt.where(model.day >= start_day)
+        if server_id is not None:
+            stmt = stmt.where(model.server_id == server_id)
+        return db.session.execute(  # type: ignore
+            stmt.execution_options(yield_per=STREAM_BATCH_SIZE)
+        )
+
+    @staticmethod
+    def _add_playing(
+        aggregate: ActivityAggregate, start_day: date | None, server_id: int | None
+    ) -> None:
+        from app.services.activity.analytics import ActivityAnalyticsService
+        from app.services.activity.rollups import content_key_exprs
+
+        title, content_type = content_key_exprs()
+        stmt = select(
+            ActivitySession.server_id,
+            ActivitySession.user_name,
+            ActivitySession.media_type,
+            ActivitySession.started_at,
+            title.label("title"),
+            content_type.label("content_type"),
+        ).where(
+            ActivitySession.active.is_(True),
+            ActivityAnalyticsService._valid_for_statistics_filter(),
+        )
+        if server_id is not None:
+            stmt = stmt.where(ActivitySession.server_id == server_id)
+
+        for row in db.session.execute(stmt):  # type: ignore
+            aggregate.playing += 1
+            started_at = row.started_at
+            if start_day is not None and started_at.date() < start_day:
+                continue
+            aggregate.add_sessions(
+                day=started_at.date(),
+                server_id=row.server_id,
+                user_name=row.user_name,
+                media_type=row.media_type,
+                sessions=1,
+            )
+            aggregate.add_hour(started_at.date(), started_at.hour, 1)
+            aggregate.add_content(row.title, row.content_type, 1)
+
+
+def mark_stats_stale(session=None) -> None:
+    """Drop cached aggregates once the current transaction commits."""
+    session = session if session is not None else db.session  # type: ignore
+    session.info["activity_stats_stale"] = True
+
+
+def _after_commit(session) -> None:
+    if session.info.pop("activity_stats_stale", False):
+        ActivityAggregationEngine.invalidate()
+
+
+def _after_rollback(session) -> None:
+    session.info.pop("activity_stats_stale", None)
+
+
+event.listen(Session, "after_commit", _after_commit)
+event.listen(Session, "after_rollback", _after_rollback)
+
+
+__all__ = [
+    "ActivityAggregate",
+    "ActivityAggregationEngine",
+    "mark_stats_stale",
+]
@@ -4,8 +4,12 @@ Utilities for resolving Wizarr users and identities for activity sessions.
 
 from __future__ import annotations
 
-from sqlalchemy import func
-from sqlalchemy.orm import joinedload
+import threading
+import time
+
+import structlog
+from sqlalchemy import event
+from sqlalchemy.orm import Session, joinedload
 
 try:
     from app.extensions import db  # type: ignore
@@ -13,12 +17,18 @@ except ImportError:  # pragma: no cover
     db = None  # type: ignore
 
 try:
-    from app.models import Identity, User
+    from app.models import Identity, MediaServer, User
 except ImportError:  # pragma: no cover - during testing without app context
     Identity = None  # type: ignore
+    MediaServer = None  # type: ignore
     User = None  # type: ignore
 
 
+logger = structlog.get_logger(__name__)
+
+_Resolution = tuple[int | None, int | None, str | None]
+
+
 def _normalise(value: str | None) -> str | None:
     if value is None:
         return None
@@ -34,11 +44,110 @@ def _identity_display_name(
     return fallback
 
 
+class IdentityIndex:
+    """Per-process ``(server_id, normalised name) -> identity`` lookup table.
+
+    Resolving a session used to cost up to three ``lower(...)`` queries, and
+    ingestion plus the history pages resolve the same handful of names over
+    and over. The index loads every user of a server once and answers from
+    memory afterwards. Local ``User``/``Identity`` writes invalidate it via a
+    flush hook; the TTL bounds staleness for writes made by other workers or
+    through bulk statements that bypass the ORM unit of work.
+    """
+
+    def __init__(self, ttl_seconds: float = 60.0):
+        self.ttl_seconds = ttl_seconds
+        self._lock = threading.Lock()
+        self._servers: dict[int, tuple[float, dict[str, _Resolution]]] = {}
+
+    def lookup(self, server_id: int, normalised_name: str) -> _Resolution | None:
+        return self._names_for(server_id).get(normalised_name)
+
+    def invalidate(self, server_id: int | None = None) -> None:
+        with self._lock:
+            if server_id is None:
+                self._servers.clear()
+            else:
+                self._servers.pop(server_id, None)
+
+    def _names_for(self, server_id: int) -> dict[str, _Resolution]:
+        now = time.monotonic()
+        with self._lock:
+            cached = self._servers.get(server_id)
+            if cached and now - cached[0] < self.ttl_seconds:
+                return cached[1]
+
+        names = self._load(server_id)
+        with self._lock:
+            self._servers[server_id] = (now, names)
+        return names
+
+    @staticmethod
+    def _load(server_id: int) -> dict[str, _Resolution]:
+        users = (
+            db.session.query(User)  # type: ignore
+            .filter(User.server_id == server_id)  # type: ignore
+            .options(joinedload(User.identity))  # type: ignore
+            .order_by(User.id.asc())  # type: ignore
+            .all()
+        )
+
+        by_username: dict[str, _Resolution] = {}
+        by_nickname: dict[str, _Resolution] = {}
+        by_primary_username: dict[str, _Resolution] = {}
+
+        for user in users:
+            resolution = (
+                user.id,
+                user.identity_id if user.identity_id else None,
+                _identity_display_name(user.identity, user.username),
+            )
+            identity = user.identity
+            if key := _normalise(user.username):
+                by_username.setdefault(key, resolution)
+            if identity and (key := _normalise(identity.nickname)):
+                by_nickname.setdefault(key, resolution)
+            if identity and (key := _normalise(identity.primary_username)):
+                by_primary_username.setdefault(key, resolution)
+
+        # Later dicts win: username beats nickname beats primary username,
+        # matching the precedence of the original per-event queries.
+        return {**by_primary_username, **by_nickname, **by_username}
+
+
+identity_index = IdentityIndex()
+
+
+def _invalidate_on_flush(session, _flush_context) -> None:
+    """Drop cached identities when users or identities change locally."""
+    if User is None or Identity is None:
+        return
+    for obj in (*session.new, *session.dirty, *session.deleted):
+        if isinstance(obj, User):
+            identity_index.invalidate(obj.server_id)
+        elif isinstance(obj, Identity | MediaServer):
+            identity_index.invalidate()
+            return
+
+
+def _invalidate_on_bulk_write(orm_execute_state) -> None:
+    """Bulk ``query.update()``/``query.delete()`` never reach the flush hook."""
+    if not (orm_execute_state.is_update or orm_execute_state.is_delete):
+        return
+    mapper = orm_execute_state.bind_mapper
+    if mapper is not None and mapper.class_ in (User, Identity, MediaServer):
+        identity_index.invalidate()
+
+
+event.listen(Session, "after_flush", _invalidate_on_flush)
+event.listen(Session, "do_orm_execute", _invalidate_on_bulk_write)
+
+
 def resolve_user_identity(
     server_id: int,
     _external_user_id: str | None,
     external_user_name: str | None,
-) -> tuple[int | None, int | None, str | None]:
+) -> _Resolution:
     """
     Resolve an activity event user to a Wizarr user and identity.
 
@@ -47,52 +156,16 @@ def resolve_user_identity(
     if db is None or User is None or Identity is None or server_id is None:
         return None, None, external_user_name
 
-    query = (
-        db.session.query(User)
-        .filter(User.server_id == server_id)
-        .options(joinedload(User.identity))  # type: ignore
-    )
-
-    match: User | None = None
-
     normalised_name = _normalise(external_user_name)
+    match = (
+        identity_index.lookup(server_id, normalised_name) if normalised_name else None
+    )
 
-    if normalised_name:
-        match = (
-            query.filter(func.lower(User.username) == normalised_name)
-            .order_by(User.id.asc())
-            .first()
-        )
-
-    if not match and normalised_name:
-        match = (
-            query.join(Identity, User.identity, isouter=True)  # type: ignore
-            .filter(func.lower(Identity.nickname) == normalised_name)
-            .order_by(User.id.asc())
-            .first()
-        )
-
-    if not match and normalised_name:
-        match = (
-            query.join(Identity, User.identity, isouter=True)  # type: ignore
-            .filter(func.lower(Identity.primary_username) == normalised_name)
-            .order_by(User.id.asc())
-            .first()
-        )
-
-    display_name = None
-    wizarr_user_id = None
-    identity_id = None
-
-    if match:
-        wizarr_user_id = match.id
-        identity_id = match.identity_id if match.identity_id else None
-        display_name = _identity_display_name(match.identity, match.username)  # type: ignore
-
-    if not display_name:
-        display_name = external_user_name
+    if not match:
+        return None, None, external_user_name
 
-    return wizarr_user_id, identity_id, display_name
+    wizarr_user_id, identity_id, display_name = match
+    return wizarr_user_id, identity_id, display_name or external_user_name
 
 
 def apply_identity_resolution(session) -> bool:
@@ -129,3 +202,23 @@ def apply_identity_resolution(session) -> bool:
     session._resolved_identity_name = display_name or session.user_name
 
     return changed
+
+
+def apply_identity_resolution_bulk(sessions) -> bool:
+    """Resolve identities for many sessions, loading each server once.
+
+    A session that fails to resolve is skipped without affecting the others.
+
+    Returns True if any session was modified.
+    """
+    changed = False
+    for session in sessions:
+        try:
+            changed |= apply_identity_resolution(session)
+        except Exception as exc:
+            logger.debug(
+                "identity_resolution_skipped",
+                session_id=getattr(session, "id", None),
+                error=str(exc),
+            )
+    return changed
@@ -7,6 +7,7 @@ keeping session grouping and identity resolution concerns encapsulated.
 
 from __future__ import annotations
 
+import threading
 import time
 from datetime import UTC, datetime
 
@@ -20,7 +21,9 @@ except ImportError:  # pragma: no cover - during unit tests
 
 from app.activity.domain.models import ActivityEvent
 from app.models import ActivitySession, ActivitySnapshot
+from app.services.activity.aggregation import mark_stats_stale
 from app.services.activity.identity_resolution import apply_identity_resolution
+from app.services.activity.rollups import ActivityRollupService
 
 
 class ActivityIngestionService:
@@ -28,6 +31,19 @@ class ActivityIngestionService:
 
     def __init__(self):
         self.logger = structlog.get_logger(__name__)
+        self.rollups = ActivityRollupService()
+        # One service serves the write buffer and the request threads, so the
+        # batch depth is tracked per thread.
+        self._batch = threading.local()
+
+    @property
+    def _batch_depth(self) -> int:
+        """While > 0, handlers stage changes and leave the commit to the batch."""
+        return getattr(self._batch, "depth", 0)
+
+    @_batch_depth.setter
+    def _batch_depth(self, value: int) -> None:
+        self._batch.depth = value
 
     def _commit_with_retry(self, max_retries: int = 3, base_delay: float = 0.1) -> bool:
         """
@@ -111,10 +127,52 @@ class ActivityIngestionService:
             return handler(event)
 
         except Exception as exc:  # pragma: no cover - defensive rollback
+            if self._batch_depth:
+                # Let the batch roll back and replay; a rollback here would
+                # silently discard the events staged before this one.
+                raise
             self.logger.error("Failed to record activity event: %s", exc, exc_info=True)
             db.session.rollback()  # type: ignore
             return None
 
+    def record_activity_events(self, events: list[ActivityEvent]) -> int:
+        """Record several events in a single transaction.
+
+        Used by the write-behind buffer so that a burst of progress ticks
+        costs one SQLite commit instead of one per event. If the batch fails
+        as a whole it is replayed event by event so a single bad event can't
+        drop the others.
+
+        Returns:
+            Number of events that produced a session.
+        """
+        if db is None or not events:
+            return 0
+
+        recorded = 0
+        self._batch_depth += 1
+        try:
+            for event in events:
+                if self.record_activity_event(event) is not None:
+                    recorded += 1
+            committed = True
+        except Exception as exc:
+            self.logger.warning("Batched activity ingestion failed: %s", exc)
+            committed = False
+        finally:
+            self._batch_depth -= 1
+
+        if committed and self._commit_with_retry():
+            return recorded
+
+        self.logger.warning(
+            "Replaying %d batched activity events individually", len(events)
+        )
+        db.session.rollback()  # type: ignore
+        return sum(
+            1 for event in events if self.record_activity_event(event) is not None
+        )
+
     # ------------------------------------------------------------------
     # Event handlers
     # ------------------------------------------------------------------
@@ -172,7 +230,8 @@ class ActivityIngestionService:
         if event.position_ms is not None and event.state:
             self._create_snapshot(session.id, event)
 
-        self._commit_with_retry()
+        mark_stats_stale()
+        self._commit_unless_batched()
         self.logger.info(
             "Started tracking session %s for user %s",
             event.session_id,
@@ -258,7 +317,7 @@ class ActivityIngestionService:
             self._create_snapshot(session.id, event)
 
         self._assign_session_identity(updated_session)
-        self._commit_with_retry()
+        self._commit_unless_batched()
         return updated_session
 
     def _handle_session_end(self, event: ActivityEvent) -> ActivitySession | None:
@@ -288,7 +347,8 @@ class ActivityIngestionService:
             self._create_snapshot(session.id, event)
 
         self._assign_session_identity(session)
-        self._commit_with_retry()
+        self.rollups.roll_up([session.id])
+        self._commit_unless_batched()
 
         self.logger.info(
             "Closed session %s for user %s", event.session_id, event.user_name
@@ -298,6 +358,12 @@ class ActivityIngestionService:
     # ------------------------------------------------------------------
     # Helpers
     # ------------------------------------------------------------------
+    def _commit_unless_batched(self) -> None:
+        if self._batch_depth:
+            db.session.flush()  # type: ignore
+            return
+        self._commit_with_retry()
+
     def _assign_session_identity(self, session: ActivitySession) -> bool:
         try:
             return bool(apply_identity_resolution(session))
@@ -6,7 +6,7 @@ These helpers support scheduled jobs that clean up or reconcile sessions.
 
 from __future__ import annotations
 
-from datetime import UTC, datetime, timedelta
+from datetime import UTC, datetime, time, timedelta
 
 import structlog
 
@@ -16,6 +16,7 @@ except ImportError:  # pragma: no cover - during tests
     db = None  # type: ignore
 
 from app.models import ActivitySession
+from app.services.activity.rollups import HANDLED_OPTION, ActivityRollupService
 
 
 class ActivityMaintenanceService:
@@ -23,6 +24,7 @@ class ActivityMaintenanceService:
 
     def __init__(self):
         self.logger = structlog.get_logger(__name__)
+        self.rollups = ActivityRollupService()
 
     def cleanup_old_activity(self, retention_days: int = 90) -> int:
         """Delete activity sessions older than the retention window."""
@@ -30,12 +32,16 @@ class ActivityMaintenanceService:
             return 0
 
         try:
-            cutoff_date = datetime.now(UTC) - timedelta(days=retention_days)
+            # Whole days, so the matching rollup days can simply be dropped.
+            cutoff_day = (datetime.now(UTC) - timedelta(days=retention_days)).date()
+            cutoff_date = datetime.combine(cutoff_day, time.min, tzinfo=UTC)
             deleted_count = (
                 db.session.query(ActivitySession)  # type: ignore
                 .filter(ActivitySession.started_at < cutoff_date)
+                .execution_options(**{HANDLED_OPTION: True})
                 .delete()
             )
+            self.rollups.clear(before=cutoff_day)
 
             db.session.commit()  # type: ignore
             self.logger.info("Cleaned up %s old activity sessions", deleted_count)
@@ -74,6 +80,7 @@ class ActivityMaintenanceService:
                 ended_count += 1
 
             if ended_count:
+                self.rollups.roll_up(session.id for session in stale_sessions)
                 db.session.commit()  # type: ignore
 
             self.logger.info("Ended %s stale activity sessions", ended_count)
@@ -126,6 +133,7 @@ class ActivityMaintenanceService:
                         ended_count += 1
 
             if ended_count or recovered_count:
+                self.rollups.roll_up(session.id for session in active_sessions)
                 db.session.commit()  # type: ignore
                 self.logger.info(
                     "Session recovery completed: %s recovered, %s ended",
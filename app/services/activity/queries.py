@@ -21,7 +21,13 @@ from sqlalchemy import or_
 
 from app.activity.domain.models import ActivityQuery
 from app.models import ActivitySession
-from app.services.activity.identity_resolution import apply_identity_resolution
+from app.services.activity.aggregation import (
+    ActivityAggregate,
+    ActivityAggregationEngine,
+)
+from app.services.activity.identity_resolution import (
+    apply_identity_resolution_bulk,
+)
 
 
 class ActivityQueryService:
@@ -158,11 +164,10 @@ class ActivityQueryService:
                 raw_sessions.append(session_obj)
 
             identity_updates = False
-            for session in raw_sessions:
-                try:
-                    identity_updates |= bool(apply_identity_resolution(session))
-                except Exception as exc:  # pragma: no cover - defensive
-                    self.logger.debug("Identity resolution skipped: %s", exc)
+            try:
+                identity_updates = apply_identity_resolution_bulk(raw_sessions)
+            except Exception as exc:  # pragma: no cover - defensive
+                self.logger.debug("Identity resolution skipped: %s", exc)
 
             if identity_updates:
                 try:
@@ -235,6 +240,12 @@ class ActivityQueryService:
         sessions, _ = self.get_activity_sessions(query)
         return sessions
 
+    def get_activity_aggregate(
+        self, days: int = 30, server_id: int | None = None
+    ) -> ActivityAggregate:
+        """Return the cached single-pass aggregate for the requested window."""
+        return ActivityAggregationEngine.aggregate(days, server_id)
+
     # -------------------------------------------------------------------------
     # Helpers
     # -------------------------------------------------------------------------
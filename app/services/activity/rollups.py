@@ -0,0 +1,343 @@
+"""
+Pre-aggregated activity rollups for dashboards.
+
+Dashboard statistics used to run about ten aggregate scans over
+``activity_session`` per page load. Ended sessions are now folded into three
+small tables instead:
+
+* ``activity_daily_rollup``: day × server × user × media type counters.
+* ``activity_content_rollup``: day × server × title play counts.
+* ``activity_hourly_rollup``: day × server × start hour counters.
+
+Sessions are rolled up once, when they end (``ActivitySession.rolled_up``
+marks them). Ingestion rolls up each session in the transaction that ends it;
+the ``activity_rollups`` job picks up everything else, e.g. historical imports.
+Rollups cannot subtract, so deleting rolled-up sessions, or changing a column
+they are grouped or summed by (e.g. identity resolution renaming the user),
+requests a full rebuild, which the job performs on its next run.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Iterable
+from datetime import UTC, date, datetime
+
+import structlog
+from sqlalchemy import (
+    and_,
+    case,
+    delete,
+    event,
+    extract,
+    func,
+    insert,
+    inspect,
+    or_,
+    select,
+    update,
+)
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.orm import Session
+
+try:
+    from app.extensions import db  # type: ignore
+except ImportError:  # pragma: no cover - during unit tests
+    db = None  # type: ignore
+
+from app.models import (
+    ActivityContentRollup,
+    ActivityDailyRollup,
+    ActivityHourlyRollup,
+    ActivityRollupState,
+    ActivitySession,
+    User,
+)
+from app.services.activity.aggregation import mark_stats_stale
+
+ROLLUP_MODELS = (ActivityDailyRollup, ActivityContentRollup, ActivityHourlyRollup)
+
+# Session columns the rollups are grouped, filtered or summed by.
+ROLLUP_SOURCE_FIELDS = (
+    "server_id",
+    "user_name",
+    "media_type",
+    "media_title",
+    "series_name",
+    "device_name",
+    "started_at",
+    "duration_ms",
+)
+
+# Lets a bulk delete that updates the rollups itself skip the rebuild request.
+HANDLED_OPTION = "activity_rollup_handled"
+
+
+def watch_time_expr():
+    """Watch time a session contributes: its duration once it has ended."""
+    return case(
+        (
+            and_(
+                ActivitySession.active.is_(False),
+                ActivitySession.duration_ms.is_not(None),
+                ActivitySession.duration_ms > 0,
+            ),
+            ActivitySession.duration_ms,
+        ),
+        else_=0,
+    )
+
+
+def content_key_exprs():
+    """Return ``(title, content_type)`` with episodes collapsed to their series."""
+    media_type_lower = func.lower(func.coalesce(ActivitySession.media_type, ""))
+    series_condition = or_(
+        ActivitySession.series_name.is_not(None),
+        media_type_lower.in_(("episode", "season", "series")),
+    )
+    title = case(
+        (
+            series_condition,
+            func.coalesce(ActivitySession.series_name, ActivitySession.media_title),
+        ),
+        else_=ActivitySession.media_title,
+    )
+    content_type = case(
+        (series_condition, "Series"),
+        (media_type_lower == "movie", "Movie"),
+        else_=func.coalesce(ActivitySession.media_type, "Unknown"),
+    )
+    return title, content_type
+
+
+class ActivityRollupService:
+    """Maintain the activity rollup tables."""
+
+    def __init__(self):
+        self.logger = structlog.get_logger(__name__)
+
+    # ------------------------------------------------------------------
+    # Incremental maintenance
+    # ------------------------------------------------------------------
+    def roll_up(self, session_ids: Iterable[int] | None = None) -> int:
+        """Fold ended, not yet rolled-up sessions into the rollups.
+
+        Runs in the caller's transaction and does not commit. With
+        ``session_ids`` only those sessions are considered.
+
+        Returns:
+            Number of sessions marked as rolled up.
+        """
+        if db is None:
+            return 0
+
+        pending = and_(
+            ActivitySession.active.is_(False), ActivitySession.rolled_up.is_(False)
+        )
+        if session_ids is not None:
+            ids = list(session_ids)
+            if not ids:
+                return 0
+            pending = and_(pending, ActivitySession.id.in_(ids))
+
+        db.session.flush()  # type: ignore
+        self._add_sessions(pending)
+        result = db.session.execute(  # type: ignore
+            update(ActivitySession).where(pending).values(rolled_up=True)
+        )
+        if result.rowcount:
+            mark_stats_stale()
+        return result.rowcount or 0
+
+    def run(self) -> dict[str, int | bool]:
+        """Rebuild if one was requested, otherwise roll up pending sessions.
+
+        Commits. Used by the scheduled ``activity_rollups`` job.
+        """
+        if db is None:
+            return {"rebuilt": False, "rolled_up": 0}
+
+        try:
+            state = db.session.get(ActivityRollupState, 1)  # type: ignore
+            if state is None or state.rebuild_requested:
+                return {"rebuilt": True, "rolled_up": self.rebuild()}
+
+            rolled_up = self.roll_up()
+            db.session.commit()  # type: ignore
+            return {"rebuilt": False, "rolled_up": rolled_up}
+        except Exception:
+            db.session.rollback()  # type: ignore
+            raise
+
+    def rebuild(self) -> int:
+        """Recompute every rollup from ``activity_session`` and commit."""
+        if db is None:
+            return 0
+
+        self.clear()
+        db.session.execute(  # type: ignore
+            update(ActivitySession)
+            .where(ActivitySession.rolled_up.is_(True))
+            .values(rolled_up=False)
+            .execution_options(synchronize_session=False)
+        )
+        rolled_up = self.roll_up()
+        self._set_state(
+            db.session,  # type: ignore
+            rebuild_requested=False,
+            rebuilt_at=datetime.now(UTC),
+        )
+        db.session.commit()  # type: ignore
+        self.logger.info("Rebuilt activity rollups from %s sessions", rolled_up)
+        return rolled_up
+
+    def clear(self, before: date | None = None) -> None:
+        """Delete rollup rows (older than ``before`` if given); no commit."""
+        mark_stats_stale()
+        for model in ROLLUP_MODELS:
+            stmt = delete(model)
+            if before is not None:
+                stmt = stmt.where(model.day < before)
+            db.session.execute(stmt)  # type: ignore
+
+    # ------------------------------------------------------------------
+    # Helpers
+    # ------------------------------------------------------------------
+    def _add_sessions(self, pending) -> None:
+        from app.services.activity.analytics import ActivityAnalyticsService
+
+        where = and_(pending, ActivityAnalyticsService._valid_for_statistics_filter())
+        day = func.date(ActivitySession.started_at)
+        watch_ms = watch_time_expr()
+        watched = case((watch_ms > 0, 1), else_=0)
+        media_type = func.coalesce(ActivitySession.media_type, "")
+        title, content_type = content_key_exprs()
+        hour = extract("hour", ActivitySession.started_at)
+        count = func.count(ActivitySession.id)
+
+        self._upsert(
+            ActivityDailyRollup,
+            ["day", "server_id", "user_name", "media_type"],
+            select(
+                day,
+                ActivitySession.server_id,
+                ActivitySession.user_name,
+                media_type,
+                count,
+                func.sum(watched),
+                func.sum(watch_ms),
+            )
+            .where(where)
+            .group_by(
+                day, ActivitySession.server_id, ActivitySession.user_name, media_type
+            ),
+            ["sessions", "watched_sessions", "watch_ms"],
+        )
+        self._upsert(
+            ActivityContentRollup,
+            ["day", "server_id", "title", "content_type"],
+            select(
+                day,
+                ActivitySession.server_id,
+                title,
+                content_type,
+                count,
+                func.sum(watch_ms),
+            )
+            .where(where)
+            .group_by(day, ActivitySession.server_id, title, content_type),
+            ["plays", "watch_ms"],
+        )
+        self._upsert(
+            ActivityHourlyRollup,
+            ["day", "server_id", "hour"],
+            select(day, ActivitySession.server_id, hour, count)
+            .where(where)
+            .group_by(day, ActivitySession.server_id, hour),
+            ["sessions"],
+        )
+
+    @staticmethod
+    def _upsert(model, keys: list[str], select, counters: list[str]) -> None:
+        # SQLite needs the SELECT to carry a WHERE clause here, which ours do.
+        stmt = sqlite_insert(model.__table__).from_select([*keys, *counters], select)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=keys,
+            set_={
+                name: model.__table__.c[name] + stmt.excluded[name] for name in counters
+            },
+        )
+        db.session.execute(stmt)  # type: ignore
+
+    @staticmethod
+    def _set_state(session, **values) -> None:
+        table = ActivityRollupState.__table__
+        result = session.execute(update(table).where(table.c.id == 1).values(**values))
+        if result.rowcount == 0:
+            session.execute(insert(table).values(id=1, **values))
+
+
+def _deletes_rolled_up_sessions(session) -> bool:
+    # Deleting a user cascades to their sessions inside the database.
+    return any(
+        isinstance(obj, User) or (isinstance(obj, ActivitySession) and obj.rolled_up)
+        for obj in session.deleted
+    )
+
+
+def _changes_rolled_up_sessions(session) -> bool:
+    for obj in session.dirty:
+        if not isinstance(obj, ActivitySession):
+            continue
+        attrs = inspect(obj).attrs
+        # Whether the rollups already counted the session's stored values.
+        rolled_up = attrs.rolled_up.history
+        if not any(rolled_up.deleted or rolled_up.unchanged):
+            continue
+        if any(attrs[name].history.has_changes() for name in ROLLUP_SOURCE_FIELDS):
+            return True
+    return False
+
+
+def _makes_rollups_stale(session) -> bool:
+    return _deletes_rolled_up_sessions(session) or _changes_rolled_up_sessions(session)
+
+
+def _track_flush(session, _flush_context, _instances) -> None:
+    if _makes_rollups_stale(session):
+        session.info["activity_rollup_stale"] = True
+
+
+def _track_bulk_delete(orm_execute_state) -> None:
+    if not orm_execute_state.is_delete:
+        return
+    if orm_execute_state.execution_options.get(HANDLED_OPTION):
+        return
+    mapper = orm_execute_state.bind_mapper
+    if mapper is not None and mapper.class_ in (ActivitySession, User):
+        orm_execute_state.session.info["activity_rollup_stale"] = True
+
+
+def _request_rebuild(session) -> None:
+    # ``before_commit`` runs ahead of the final flush, so check pending
+    # changes as well as what earlier flushes recorded.
+    stale = session.info.pop("activity_rollup_stale", False)
+    if stale or _makes_rollups_stale(session):
+        ActivityRollupService._set_state(session, rebuild_requested=True)
+
+
+def _after_rollback(session) -> None:
+    session.info.pop("activity_rollup_stale", None)
+
+
+event.listen(Session, "before_flush", _track_flush)
+event.listen(Session, "do_orm_execute", _track_bulk_delete)
+event.listen(Session, "before_commit", _request_rebuild)
+event.listen(Session, "after_rollback", _after_rollback)
+
+
+__all__ = [
+    "HANDLED_OPTION",
+    "ActivityRollupService",
+    "content_key_exprs",
+    "watch_time_expr",
+]
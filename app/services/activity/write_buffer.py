@@ -0,0 +1,220 @@
+"""
+Write-behind buffer between activity collectors and the ingestion service.
+
+Collectors emit a progress tick for every active stream on every poll. Writing
+each one straight to SQLite means a SELECT plus a commit (and an fsync) per
+tick, so the buffer coalesces progress events per ``(server_id, session_id)``
+and hands the survivors to :class:`ActivityIngestionService` in one
+transaction every ``flush_interval_ms``. Session start/end events wake the
+flusher immediately so the dashboard still sees them promptly.
+"""
+
+from __future__ import annotations
+
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import TYPE_CHECKING, Any
+
+import structlog
+
+from app.activity.domain.models import ActivityEvent
+
+if TYPE_CHECKING:
+    from flask import Flask
+
+    from app.services.activity.ingestion import ActivityIngestionService
+
+# Events that change a session's lifecycle are never coalesced or dropped.
+URGENT_EVENT_TYPES = frozenset({"session_start", "session_end"})
+
+
+def _env_int(name: str, default: int) -> int:
+    try:
+        return int(os.getenv(name, default))
+    except (TypeError, ValueError):
+        return default
+
+
+class ActivityWriteBuffer:
+    """Coalesce activity events in memory and persist them in batches."""
+
+    def __init__(
+        self,
+        app: Flask,
+        ingestion: ActivityIngestionService,
+        flush_interval_ms: int | None = None,
+        max_pending: int | None = None,
+    ):
+        self.app = app
+        self.ingestion = ingestion
+        self.flush_interval_ms = (
+            flush_interval_ms
+            if flush_interval_ms is not None
+            else _env_int("ACTIVITY_FLUSH_INTERVAL_MS", 1000)
+        )
+        self.max_pending = (
+            max_pending
+            if max_pending is not None
+            else _env_int("ACTIVITY_QUEUE_MAX", 5000)
+        )
+        self.logger = structlog.get_logger(__name__)
+
+        self._pending: OrderedDict[tuple[int, str], list[ActivityEvent]] = OrderedDict()
+        self._pending_count = 0
+        self._lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._stop_event = threading.Event()
+        self._thread: threading.Thread | None = None
+        self._flush_lock = threading.Lock()
+
+        self._stats: dict[str, Any] = {
+            "submitted": 0,
+            "coalesced": 0,
+            "dropped": 0,
+            "flushed_events": 0,
+            "flush_count": 0,
+            "flush_failures": 0,
+            "high_water_mark": 0,
+            "last_flush_ms": 0.0,
+            "max_flush_ms": 0.0,
+        }
+
+    # ------------------------------------------------------------------
+    # Lifecycle
+    # ------------------------------------------------------------------
+    def start(self) -> None:
+        """Start the background flusher thread."""
+        if self._thread and self._thread.is_alive():
+            return
+        self._stop_event.clear()
+        self._thread = threading.Thread(
+            target=self._flush_loop, name="activity-write-buffer", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self, timeout: float = 5.0) -> None:
+        """Stop the flusher and persist everything still queued."""
+        self._stop_event.set()
+        self._wakeup.set()
+        if self._thread:
+            self._thread.join(timeout=timeout)
+            self._thread = None
+        self.flush()
+
+    # ------------------------------------------------------------------
+    # Producer side
+    # ------------------------------------------------------------------
+    def submit(self, event: ActivityEvent) -> bool:
+        """Queue *event* for persistence.
+
+        Returns False when a progress event was dropped because the buffer is
+        full; lifecycle events are always accepted.
+        """
+        key = (event.server_id, event.session_id)
+        urgent = event.event_type in URGENT_EVENT_TYPES
+
+        with self._lock:
+            self._stats["submitted"] += 1
+            queued = self._pending.get(key)
+
+            if (
+                event.event_type == "session_progress"
+                and queued
+                and queued[-1].event_type == "session_progress"
+            ):
+                queued[-1] = event
+                self._stats["coalesced"] += 1
+                return True
+
+            if not urgent and self._pending_count >= self.max_pending:
+                self._stats["dropped"] += 1
+                return False
+
+            if queued is None:
+                self._pending[key] = [event]
+            else:
+                queued.append(event)
+            self._pending_count += 1
+            self._stats["high_water_mark"] = max(
+                self._stats["high_water_mark"], self._pending_count
+            )
+
+        if urgent:
+            self._wakeup.set()
+        return True
+
+    # ------------------------------------------------------------------
+    # Consumer side
+    # ------------------------------------------------------------------
+    def flush(self) -> int:
+        """Persist every queued event in one transaction.
+
+        Returns:
+            Number of events handed to the ingestion service.
+        """
+        with self._flush_lock:
+            with self._lock:
+                if not self._pending:
+                    return 0
+                batch = [event for events in self._pending.values() for event in events]
+                self._pending.clear()
+                self._pending_count = 0
+
+            started = time.perf_counter()
+            try:
+                with self.app.app_context():
+                    self.ingestion.record_activity_events(batch)
+            except Exception as exc:
+                self.logger.error(
+                    "Failed to flush %d activity events: %s",
+                    len(batch),
+                    exc,
+                    exc_info=True,
+                )
+                with self._lock:
+                    self._stats["flush_failures"] += 1
+                return 0
+
+            elapsed_ms = (time.perf_counter() - started) * 1000
+            with self._lock:
+                self._stats["flushed_events"] += len(batch)
+                self._stats["flush_count"] += 1
+                self._stats["last_flush_ms"] = round(elapsed_ms, 2)
+                self._stats["max_flush_ms"] = round(
+                    max(self._stats["max_flush_ms"], elapsed_ms), 2
+                )
+            return len(batch)
+
+    def _flush_loop(self) -> None:
+        interval = max(self.flush_interval_ms, 0) / 1000
+        while not self._stop_event.is_set():
+            # Urgent events set the wakeup flag; otherwise wait one interval.
+            self._wakeup.wait(interval)
+            self._wakeup.clear()
+            try:
+                self.flush()
+            except Exception as exc:  # pragma: no cover - defensive
+                self.logger.error("Activity flush loop error: %s", exc, exc_info=True)
+
+    # ------------------------------------------------------------------
+    # Metrics
+    # ------------------------------------------------------------------
+    def get_stats(self) -> dict[str, Any]:
+        """Return back-pressure metrics for sizing the buffer."""
+        with self._lock:
+            stats = dict(self._stats)
+            stats["pending"] = self._pending_count
+            stats["pending_sessions"] = len(self._pending)
+        stats["max_pending"] = self.max_pending
+        stats["flush_interval_ms"] = self.flush_interval_ms
+        stats["avg_batch_size"] = (
+            round(stats["flushed_events"] / stats["flush_count"], 2)
+            if stats["flush_count"]
+            else 0.0
+        )
+        return stats
+
+
+__all__ = ["ActivityWriteBuffer"]
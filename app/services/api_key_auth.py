@@ -0,0 +1,202 @@
+"""
+Cached API key authentication.
+
+The API decorators used to query ``ApiKey`` and commit a ``last_used_at``
+update on every request, so each automated call became a SQLite write
+transaction. :class:`ApiKeyAuthenticator` keeps valid key hashes in a short-TTL
+per-process cache and coalesces ``last_used_at`` updates: a key is written at
+most once per ``LAST_USED_INTERVAL`` seconds and later uses inside that window
+are flushed in one batch by a background thread. Unflushed uses are lost on
+shutdown, which costs at most one interval of ``last_used_at`` precision.
+
+Revocation is immediate for changes made through the ORM in this process (a
+flush hook clears the cache) and bounded by ``API_KEY_CACHE_TTL`` for
+changes made by other workers.
+"""
+
+from __future__ import annotations
+
+import datetime
+import hashlib
+import logging
+import os
+import threading
+import time
+from dataclasses import dataclass
+from typing import ClassVar
+
+from flask import current_app
+from sqlalchemy import event, update
+from sqlalchemy.orm import Session
+
+from app.extensions import db
+from app.models import ApiKey
+
+logger = logging.getLogger("wizarr.api")
+
+
+@dataclass(frozen=True)
+class AuthenticatedKey:
+    """The parts of an ``ApiKey`` row that callers need after authentication."""
+
+    id: int
+    name: str
+
+
+def _env_seconds(name: str, default: float) -> float:
+    try:
+        return float(os.getenv(name, default))
+    except (TypeError, ValueError):
+        return default
+
+
+class ApiKeyAuthenticator:
+    """Process-wide API key cache with batched ``last_used_at`` writes."""
+
+    _valid: ClassVar[dict[str, tuple[AuthenticatedKey, float]]] = {}
+    _pending: ClassVar[dict[int, datetime.datetime]] = {}
+    _last_written: ClassVar[dict[int, float]] = {}
+    _lock: ClassVar[threading.Lock] = threading.Lock()
+    _flusher: ClassVar[threading.Thread | None] = None
+    _app: ClassVar = None
+
+    CACHE_TTL = _env_seconds("API_KEY_CACHE_TTL", 30.0)
+    LAST_USED_INTERVAL = _env_seconds("API_KEY_LAST_USED_INTERVAL", 60.0)
+
+    @staticmethod
+    def hash_key(raw_key: str) -> str:
+        return hashlib.sha256(raw_key.encode("utf-8")).hexdigest()
+
+    @classmethod
+    def authenticate(cls, raw_key: str | None) -> AuthenticatedKey | None:
+        """Return the active key matching *raw_key*, or None.
+
+        Unknown keys are never cached, so guessing keys cannot grow the cache.
+        """
+        if not raw_key:
+            return None
+        key_hash = cls.hash_key(raw_key)
+        now = time.monotonic()
+
+        with cls._lock:
+            cached = cls._valid.get(key_hash)
+        if cached and cached[1] > now:
+            key = cached[0]
+        else:
+            row = ApiKey.query.filter_by(key_hash=key_hash, is_active=True).first()
+            if row is None:
+                cls.invalidate(key_hash)
+                return None
+            key = AuthenticatedKey(id=row.id, name=row.name)
+            with cls._lock:
+                cls._valid[key_hash] = (key, now + cls.CACHE_TTL)
+
+        cls.mark_used(key.id)
+        return key
+
+    @classmethod
+    def mark_used(cls, key_id: int) -> None:
+        """Record a use of *key_id*, writing it at most once per interval."""
+        used_at = datetime.datetime.now(datetime.UTC)
+        now = time.monotonic()
+        with cls._lock:
+            last = cls._last_written.get(key_id)
+            write_now = last is None or now - last >= cls.LAST_USED_INTERVAL
+            if write_now:
+                cls._last_written[key_id] = now
+                cls._pending.pop(key_id, None)
+            else:
+                cls._pending[key_id] = used_at
+
+        if write_now:
+            cls._write({key_id: used_at})
+        else:
+            cls._ensure_flusher()
+
+    @classmethod
+    def invalidate(cls, key_hash: str | None = None) -> None:
+        """Forget a cached key (or every key when *key_hash* is None)."""
+        with cls._lock:
+            if key_hash is None:
+                cls._valid.clear()
+            else:
+                cls._valid.pop(key_hash, None)
+
+    @classmethod
+    def flush(cls) -> int:
+        """Write pending ``last_used_at`` values in one transaction."""
+        with cls._lock:
+            pending, cls._pending = cls._pending, {}
+            now = time.monotonic()
+            for key_id in pending:
+                cls._last_written[key_id] = now
+        if pending:
+            cls._write(pending)
+        return len(pending)
+
+    @classmethod
+    def _write(cls, used: dict[int, datetime.datetime]) -> None:
+        try:
+            for key_id, used_at in used.items():
+                db.session.execute(
+                    update(ApiKey)
+                    .where(ApiKey.id == key_id)
+                    .values(last_used_at=used_at)
+                )
+            db.session.commit()
+        except Exception as exc:
+            db.session.rollback()
+            logger.warning("Failed to record API key usage: %s", exc)
+
+    @classmethod
+    def _ensure_flusher(cls) -> None:
+        with cls._lock:
+            if cls._flusher is not None and cls._flusher.is_alive():
+                return
+            cls._app = current_app._get_current_object()  # type: ignore[attr-defined]
+            cls._flusher = threading.Thread(
+                target=cls._flush_loop, name="api-key-usage", daemon=True
+            )
+            cls._flusher.start()
+
+    @classmethod
+    def _flush_loop(cls) -> None:
+        while True:
+            time.sleep(cls.LAST_USED_INTERVAL)
+            cls._flush_in_app()
+
+    @classmethod
+    def _flush_in_app(cls) -> None:
+        app = cls._app
+        if app is None or not cls._pending:
+            return
+        with app.app_context():
+            cls.flush()
+
+    @classmethod
+    def reset(cls) -> None:
+        """Drop cached keys and unflushed usage (used by tests)."""
+        with cls._lock:
+            cls._valid.clear()
+            cls._pending.clear()
+            cls._last_written.clear()
+
+    @classmethod
+    def _reset_after_fork(cls) -> None:
+        # Pending writes belong to the parent; the flusher thread did not fork.
+        cls._lock = threading.Lock()
+        cls._pending = {}
+        cls._flusher = None
+
+
+def _invalidate_on_flush(session, _flush_context) -> None:
+    """Drop cached keys that were revoked, deleted or edited in this process."""
+    if any(isinstance(obj, ApiKey) for obj in (*session.dirty, *session.deleted)):
+        ApiKeyAuthenticator.invalidate()
+
+
+event.listen(Session, "after_flush", _invalidate_on_flush)
+os.register_at_fork(after_in_child=ApiKeyAuthenticator._reset_after_fork)
+
+
+__all__ = ["ApiKeyAuthenticator", "AuthenticatedKey"]
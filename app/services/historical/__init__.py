@@ -5,12 +5,15 @@ This service handles importing historical viewing data from media servers
 into the ActivitySession model for unified analytics.
 """
 
+import os
 import threading
-from datetime import UTC, datetime
+import time
+from datetime import UTC, datetime, timedelta
 from typing import Any
 
 import structlog
 from flask import current_app
+from sqlalchemy import select, update
 
 from app.models import ActivitySession, HistoricalImportJob, MediaServer, db
 from app.services.historical.importers import (
@@ -18,9 +21,31 @@ from app.services.historical.importers import (
     JellyfinHistoricalImporter,
     PlexHistoricalImporter,
 )
+from app.services.historical.importers.base import BaseHistoricalImporter
 
 logger = structlog.get_logger(__name__)
 
+# Rows inserted per transaction; also bounds the SQL parameters in the
+# duplicate lookup well below SQLite's limit.
+IMPORT_CHUNK_SIZE = 2000
+
+# A running job untouched for this long is treated as abandoned and resumed
+# from its checkpoint; running jobs touch the row at least every heartbeat.
+JOB_STALE_SECONDS = int(os.getenv("HISTORICAL_IMPORT_STALE_SECONDS", "600"))
+JOB_HEARTBEAT_SECONDS = 60
+
+# Delta syncs re-read this much history before the high-water mark, and
+# start this far back on servers that have never been imported.
+DELTA_OVERLAP = timedelta(minutes=10)
+DELTA_INITIAL_HOURS = int(os.getenv("HISTORY_DELTA_INITIAL_HOURS", "24"))
+
+HISTORY_IMPORTERS: dict[str, type[BaseHistoricalImporter]] = {
+    "plex": PlexHistoricalImporter,
+    "jellyfin": JellyfinHistoricalImporter,
+    "emby": JellyfinHistoricalImporter,
+    "audiobookshelf": AudiobookShelfHistoricalImporter,
+}
+
 
 class HistoricalDataService:
     """Service for importing and managing historical viewing data."""
@@ -32,7 +57,12 @@ class HistoricalDataService:
             raise ValueError(f"Media server {server_id} not found")
 
     def start_async_import(self, days_back: int, max_results: int | None = None):
-        """Launch a background job to import historical data."""
+        """Queue a background job to import historical data.
+
+        Queued jobs are run by the scheduler's ``run_historical_imports`` task
+        in the leader process, or in a background thread when the scheduler
+        is disabled; see :meth:`run_pending_jobs`.
+        """
         job = HistoricalImportJob(
             server_id=self.server_id,
             days_back=days_back,
@@ -42,16 +72,7 @@ class HistoricalDataService:
         db.session.add(job)
         db.session.commit()
 
-        app = current_app._get_current_object()  # type: ignore
-
-        worker = threading.Thread(
-            target=self._run_import_job,
-            args=(app, job.id, self.server_id, days_back, max_results),
-            name=f"historical-import-{job.id}",
-            daemon=True,
-        )
-        worker.start()
-
+        _wake_import_worker()
         return job
 
     def import_history(
@@ -78,6 +99,58 @@ class HistoricalDataService:
 
         raise ValueError(f"Historical import not supported for {server_type!r}")
 
+    def sync_recent_history(self) -> dict[str, Any]:
+        """Import only plays newer than the server's high-water mark.
+
+        The mark is ``MediaServer.history_synced_until``: the newest play
+        stored by a completed import or delta sync. Servers without one start
+        from their newest stored session, or from ``HISTORY_DELTA_INITIAL_HOURS``
+        ago. A short overlap re-reads plays recorded just before the mark;
+        those are dropped by the usual duplicate check.
+        """
+        importer_class = HISTORY_IMPORTERS.get(
+            (self.media_server.server_type or "").lower()
+        )
+        if importer_class is None:
+            raise ValueError(
+                f"Historical import not supported for {self.media_server.server_type!r}"
+            )
+
+        mark = self.media_server.history_synced_until or self._newest_session_start()
+        if mark is None:
+            mark = datetime.now(UTC) - timedelta(hours=DELTA_INITIAL_HOURS)
+        if mark.tzinfo is None:
+            mark = mark.replace(tzinfo=UTC)
+
+        importer = importer_class(self.server_id, self.media_server)
+        return self._run_importer(
+            importer,
+            days_back=0,
+            max_results=None,
+            job_id=None,
+            since=mark - DELTA_OVERLAP,
+        )
+
+    def _newest_session_start(self) -> datetime | None:
+        return (
+            db.session.query(db.func.max(ActivitySession.started_at))
+            .filter(ActivitySession.server_id == self.server_id)
+            .scalar()
+        )
+
+    def _advance_high_water_mark(self, newest: datetime | None) -> None:
+        if newest is None:
+            return
+        server = db.session.get(MediaServer, self.server_id)
+        if server is None:
+            return
+        current = server.history_synced_until
+        if current is not None and current.tzinfo is None:
+            current = current.replace(tzinfo=UTC)
+        if current is None or newest > current:
+            server.history_synced_until = newest
+            db.session.commit()
+
     def import_plex_history(
         self,
         days_back: int = 30,
@@ -97,34 +170,7 @@ class HistoricalDataService:
     ) -> dict[str, Any]:
         """Import historical viewing data from Plex."""
         importer = PlexHistoricalImporter(self.server_id, self.media_server)
-        result = importer.import_history(
-            days_back, max_results, job_id, self._update_job
-        )
-
-        if result["success"]:
-            stored_count = self._store_activity_sessions(
-                result["sessions"], job_id=job_id
-            )
-            if job_id is not None:
-                self._update_job(
-                    job_id,
-                    total_processed=result["total_processed"],
-                    total_stored=stored_count,
-                )
-            return {
-                **result,
-                "total_stored": stored_count,
-            }
-        if job_id is not None:
-            self._update_job(
-                job_id,
-                status=HistoricalImportJob.STATUS_FAILED,
-                error_message=result["error"],
-            )
-        return {
-            **result,
-            "total_stored": 0,
-        }
+        return self._run_importer(importer, days_back, max_results, job_id)
 
     def _import_jellyfin_history(
         self,
@@ -134,24 +180,7 @@ class HistoricalDataService:
     ) -> dict[str, Any]:
         """Import historical playback data from Jellyfin/Emby."""
         importer = JellyfinHistoricalImporter(self.server_id, self.media_server)
-        result = importer.import_history(
-            days_back, max_results, job_id, self._update_job
-        )
-
-        stored_count = self._store_activity_sessions(result["sessions"], job_id=job_id)
-
-        if job_id is not None:
-            self._update_job(
-                job_id,
-                total_fetched=result["total_fetched"],
-                total_processed=result["total_processed"],
-                total_stored=stored_count,
-            )
-
-        return {
-            **result,
-            "total_stored": stored_count,
-        }
+        return self._run_importer(importer, days_back, max_results, job_id)
 
     def _import_audiobookshelf_history(
         self,
@@ -161,64 +190,144 @@ class HistoricalDataService:
     ) -> dict[str, Any]:
         """Import historical listening session data from AudiobookShelf."""
         importer = AudiobookShelfHistoricalImporter(self.server_id, self.media_server)
-        result = importer.import_history(
-            days_back, max_results, job_id, self._update_job
-        )
+        return self._run_importer(importer, days_back, max_results, job_id)
 
-        if not result["success"]:
+    def _run_importer(
+        self,
+        importer: BaseHistoricalImporter,
+        days_back: int,
+        max_results: int | None,
+        job_id: int | None,
+        since: datetime | None = None,
+    ) -> dict[str, Any]:
+        """Stream *importer* pages into the database in chunked transactions.
+
+        Chunks hold whole pages, so the importer's checkpoint after the last
+        page in a chunk is exactly where a resumed job must continue. It is
+        written to the job in the same transaction as the chunk's sessions.
+        A run that fetched everything advances the delta-sync high-water mark.
+        """
+        checkpoint = None
+        stored_count = 0
+        if job_id is not None:
+            job = db.session.get(HistoricalImportJob, job_id)
+            if job is not None:
+                checkpoint = job.get_checkpoint() or None
+                stored_count = job.total_stored if checkpoint else 0
+
+        error: str | None = None
+        chunk: list[ActivitySession] = []
+        last_beat = time.monotonic()
+
+        def store_chunk() -> int:
+            progress = None
             if job_id is not None:
-                self._update_job(
-                    job_id,
-                    status=HistoricalImportJob.STATUS_FAILED,
-                    error_message=result["error"],
-                )
-            return {
-                **result,
-                "total_stored": 0,
-            }
+                progress = {
+                    "total_fetched": importer.total_fetched,
+                    "total_processed": importer.total_processed,
+                    "checkpoint": importer.snapshot(),
+                }
+            return self._store_activity_sessions(
+                chunk, job_id=job_id, progress=progress
+            )
+
+        try:
+            for page in importer.iter_pages(
+                days_back, max_results, checkpoint, since=since
+            ):
+                chunk.extend(page)
+                if len(chunk) >= IMPORT_CHUNK_SIZE:
+                    stored_count += store_chunk()
+                    chunk = []
+                    last_beat = time.monotonic()
+                elif (
+                    job_id is not None
+                    and time.monotonic() - last_beat >= JOB_HEARTBEAT_SECONDS
+                ):
+                    # Slow servers can take a while to fill a chunk; keep the
+                    # job from looking abandoned to run_pending_jobs.
+                    self._update_job(job_id)
+                    last_beat = time.monotonic()
+            stored_count += store_chunk()
+        except Exception as exc:
+            logger.error(
+                "historical_import_failed",
+                server_id=self.server_id,
+                error=str(exc),
+            )
+            db.session.rollback()
+            error = str(exc)
 
-        stored_count = self._store_activity_sessions(result["sessions"], job_id=job_id)
+        if error is None and importer.complete:
+            self._advance_high_water_mark(importer.newest_viewed_at)
 
         if job_id is not None:
-            self._update_job(
-                job_id,
-                total_fetched=result["total_fetched"],
-                total_processed=result["total_processed"],
-                total_stored=stored_count,
-            )
+            fields: dict[str, Any] = {
+                "total_fetched": importer.total_fetched,
+                "total_processed": importer.total_processed,
+            }
+            if error is not None:
+                fields.update(
+                    status=HistoricalImportJob.STATUS_FAILED, error_message=error
+                )
+            self._update_job(job_id, **fields)
 
-        return {
-            **result,
+        result: dict[str, Any] = {
+            "success": error is None,
+            "total_fetched": importer.total_fetched,
+            "total_processed": importer.total_processed,
             "total_stored": stored_count,
+            "date_range": importer.date_range(),
         }
+        if error is not None:
+            result["error"] = error
+        return result
 
     def _store_activity_sessions(
-        self, sessions: list, job_id: int | None = None
+        self,
+        sessions: list[ActivitySession],
+        job_id: int | None = None,
+        progress: dict[str, Any] | None = None,
     ) -> int:
-        """Store activity sessions in the database."""
-        stored_count = 0
-
+        """Insert one chunk of sessions in a single transaction.
+
+        Sessions whose ``(server_id, session_id)`` already exists, or that
+        repeat within the chunk, are skipped using one set-based lookup. If the
+        bulk commit fails the chunk is retried row by row so a single bad
+        session cannot discard the rest. *progress* is applied to the job in
+        the same transaction, with ``total_stored`` advanced by the rows stored.
+        """
+        existing = self._existing_session_ids({s.session_id for s in sessions})
+        fresh: list[ActivitySession] = []
         for session in sessions:
-            try:
-                # Check if session already exists
-                existing = (
-                    ActivitySession.query.filter_by(
-                        session_id=session.session_id, server_id=session.server_id
-                    )
-                    .with_entities(ActivitySession.id)
-                    .first()
-                )
+            if session.session_id in existing:
+                continue
+            existing.add(session.session_id)
+            fresh.append(session)
 
-                if existing:
-                    continue
+        if not fresh and progress is None:
+            return 0
+
+        try:
+            db.session.add_all(fresh)
+            self._record_progress(job_id, progress, len(fresh))
+            db.session.commit()
+            return len(fresh)
+        except Exception as exc:
+            logger.warning(
+                "session_chunk_store_failed",
+                server_id=self.server_id,
+                chunk_size=len(fresh),
+                error=str(exc),
+            )
+            db.session.rollback()
 
+        stored_count = 0
+        for session in fresh:
+            try:
                 db.session.add(session)
                 db.session.commit()
                 stored_count += 1
-
-                if job_id is not None and stored_count % 25 == 0:
-                    self._update_job(job_id, total_stored=stored_count)
-
             except Exception as exc:
                 logger.warning(
                     "session_store_failed",
@@ -227,13 +336,35 @@ class HistoricalDataService:
                     error=str(exc),
                 )
                 db.session.rollback()
-                if job_id is not None:
-                    self._update_job(job_id, error_message=str(exc))
+        self._record_progress(job_id, progress, stored_count)
+        db.session.commit()
+        return stored_count
 
-        if job_id is not None:
-            self._update_job(job_id, total_stored=stored_count)
+    @staticmethod
+    def _record_progress(
+        job_id: int | None, progress: dict[str, Any] | None, stored: int
+    ) -> None:
+        if job_id is None or progress is None:
+            return
+        job = db.session.get(HistoricalImportJob, job_id)
+        if job is None:
+            return
+        job.total_fetched = progress["total_fetched"]
+        job.total_processed = progress["total_processed"]
+        job.total_stored = (job.total_stored or 0) + stored
+        job.set_checkpoint(progress["checkpoint"])
+        job.updated_at = datetime.now(UTC)
 
-        return stored_count
+    def _existing_session_ids(self, session_ids: set[str]) -> set[str]:
+        if not session_ids:
+            return set()
+        rows = db.session.execute(
+            select(ActivitySession.session_id).where(
+                ActivitySession.server_id == self.server_id,
+                ActivitySession.session_id.in_(session_ids),
+            )
+        )
+        return set(rows.scalars())
 
     @staticmethod
     def _update_job(job_id: int, **fields) -> None:
@@ -247,73 +378,123 @@ class HistoricalDataService:
         job.updated_at = datetime.now(UTC)
         db.session.commit()
 
+    @classmethod
+    def run_pending_jobs(cls) -> int:
+        """Run queued jobs, and resume abandoned ones, until none are left.
+
+        A job is abandoned when it is still ``running`` but has not been
+        touched for ``HISTORICAL_IMPORT_STALE_SECONDS``, e.g. because the
+        process running it was restarted. It resumes from its checkpoint.
+        """
+        processed = 0
+        while (job_id := cls._claim_next_job()) is not None:
+            cls.run_job(job_id)
+            processed += 1
+        return processed
+
     @staticmethod
-    def _run_import_job(
-        app,
-        job_id: int,
-        server_id: int,
-        days_back: int,
-        max_results: int | None,
-    ) -> None:
-        """Background worker wrapper for historical imports."""
-        with app.app_context():
-            job = HistoricalImportJob.query.get(job_id)
-            if not job:
-                logger.error("import_job_not_found", job_id=job_id)
-                return
+    def _claim_next_job() -> int | None:
+        stale_before = datetime.now(UTC) - timedelta(seconds=JOB_STALE_SECONDS)
+        candidates = (
+            HistoricalImportJob.query.filter(
+                db.or_(
+                    HistoricalImportJob.status == HistoricalImportJob.STATUS_QUEUED,
+                    db.and_(
+                        HistoricalImportJob.status
+                        == HistoricalImportJob.STATUS_RUNNING,
+                        HistoricalImportJob.updated_at < stale_before,
+                    ),
+                )
+            )
+            .order_by(HistoricalImportJob.created_at)
+            .with_entities(
+                HistoricalImportJob.id,
+                HistoricalImportJob.status,
+                HistoricalImportJob.updated_at,
+            )
+            .all()
+        )
+        for job_id, status, updated_at in candidates:
+            # Conditional update so a job is only ever claimed once.
+            claimed = db.session.execute(
+                update(HistoricalImportJob)
+                .where(
+                    HistoricalImportJob.id == job_id,
+                    HistoricalImportJob.status == status,
+                    HistoricalImportJob.updated_at == updated_at,
+                )
+                .values(
+                    status=HistoricalImportJob.STATUS_RUNNING,
+                    updated_at=datetime.now(UTC),
+                )
+            )
+            db.session.commit()
+            if claimed.rowcount:
+                if status == HistoricalImportJob.STATUS_RUNNING:
+                    logger.info("import_job_resumed", job_id=job_id)
+                return job_id
+        return None
 
-            job.status = HistoricalImportJob.STATUS_RUNNING
+    @staticmethod
+    def run_job(job_id: int) -> None:
+        """Run (or resume) a historical import job in the current app context."""
+        job = db.session.get(HistoricalImportJob, job_id)
+        if not job:
+            logger.error("import_job_not_found", job_id=job_id)
+            return
+
+        job.status = HistoricalImportJob.STATUS_RUNNING
+        job.error_message = None
+        if not job.checkpoint:
             job.started_at = datetime.now(UTC)
-            job.error_message = None
             job.total_fetched = 0
             job.total_processed = 0
             job.total_stored = 0
+        job.updated_at = datetime.now(UTC)
+        db.session.commit()
+
+        try:
+            service = HistoricalDataService(job.server_id)
+            result = service.import_history(
+                days_back=job.days_back,
+                max_results=job.max_results,
+                job_id=job_id,
+            )
+            job = db.session.get(HistoricalImportJob, job_id)
+            if not job:
+                return
+            if result.get("success"):
+                job.status = HistoricalImportJob.STATUS_COMPLETED
+            else:
+                job.status = HistoricalImportJob.STATUS_FAILED
+                job.error_message = result.get("error")
+            job.total_fetched = result.get("total_fetched", job.total_fetched)
+            job.total_processed = result.get("total_processed", job.total_processed)
+            job.total_stored = result.get("total_stored", job.total_stored)
             job.updated_at = datetime.now(UTC)
             db.session.commit()
-
-            service = HistoricalDataService(server_id)
-
-            try:
-                result = service.import_history(
-                    days_back=days_back,
-                    max_results=max_results,
-                    job_id=job_id,
-                )
-                job = HistoricalImportJob.query.get(job_id)
-                if not job:
-                    return
-                if result.get("success"):
-                    job.status = HistoricalImportJob.STATUS_COMPLETED
-                else:
-                    job.status = HistoricalImportJob.STATUS_FAILED
-                    job.error_message = result.get("error")
-                job.total_fetched = result.get("total_fetched", job.total_fetched)
-                job.total_processed = result.get("total_processed", job.total_processed)
-                job.total_stored = result.get("total_stored", job.total_stored)
+        except Exception as exc:
+            logger.error("import_job_failed", job_id=job_id, error=str(exc))
+            db.session.rollback()
+            job = db.session.get(HistoricalImportJob, job_id)
+            if job:
+                job.status = HistoricalImportJob.STATUS_FAILED
+                job.error_message = str(exc)
                 job.updated_at = datetime.now(UTC)
                 db.session.commit()
-            except Exception as exc:
-                logger.error("import_job_failed", job_id=job_id, error=str(exc))
-                db.session.rollback()
-                job = HistoricalImportJob.query.get(job_id)
-                if job:
-                    job.status = HistoricalImportJob.STATUS_FAILED
-                    job.error_message = str(exc)
-                    job.updated_at = datetime.now(UTC)
-                    db.session.commit()
-            finally:
-                job = HistoricalImportJob.query.get(job_id)
-                if job:
-                    job.finished_at = datetime.now(UTC)
-                    job.updated_at = datetime.now(UTC)
-                    db.session.commit()
-
-            # Clean up completed jobs
-            job = HistoricalImportJob.query.get(job_id)
-            if job and job.status == HistoricalImportJob.STATUS_COMPLETED:
-                db.session.delete(job)
+        finally:
+            job = db.session.get(HistoricalImportJob, job_id)
+            if job:
+                job.finished_at = datetime.now(UTC)
+                job.updated_at = datetime.now(UTC)
                 db.session.commit()
 
+        # Clean up completed jobs
+        job = db.session.get(HistoricalImportJob, job_id)
+        if job and job.status == HistoricalImportJob.STATUS_COMPLETED:
+            db.session.delete(job)
+            db.session.commit()
+
     def get_import_statistics(self) -> dict[str, Any]:
         """Get statistics about imported historical data."""
         try:
@@ -439,4 +620,46 @@ class HistoricalDataService:
             return {"success": False, "error": str(e), "deleted_count": 0}
 
 
-__all__ = ["HistoricalDataService"]
+def _wake_import_worker() -> threading.Thread | None:
+    """Run the import task now if this process owns the scheduler.
+
+    Other processes that registered the scheduler jobs leave the job queued;
+    the leader picks it up on its next ``HISTORICAL_IMPORT_POLL_SECONDS`` tick.
+    When the scheduler is disabled altogether (``WIZARR_DISABLE_SCHEDULER``)
+    nothing would ever poll, so the queue is drained in a background thread
+    instead. Jobs are claimed with a conditional update either way, so a job
+    is never run twice.
+    """
+    from app.extensions import scheduler
+
+    try:
+        if scheduler.running:
+            scheduler.modify_job(
+                "run_historical_imports", next_run_time=datetime.now(UTC)
+            )
+            return None
+    except Exception as exc:
+        logger.debug("import_worker_wake_failed", error=str(exc))
+        return None
+
+    if scheduler.app is not None:
+        # Scheduler configured here but led by another process.
+        return None
+
+    app = current_app._get_current_object()  # type: ignore[attr-defined]
+    if app.config.get("TESTING"):
+        return None
+
+    from app.tasks.historical_import import run_historical_imports
+
+    thread = threading.Thread(
+        target=run_historical_imports,
+        args=(app,),
+        name="historical-import",
+        daemon=True,
+    )
+    thread.start()
+    return thread
+
+
+__all__ = ["HISTORY_IMPORTERS", "HistoricalDataService"]
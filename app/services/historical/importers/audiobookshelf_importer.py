@@ -1,37 +1,39 @@
 """AudiobookShelf historical data importer."""
 
+from collections.abc import Iterator
 from datetime import UTC, datetime, timedelta
 from typing import Any
 
 import structlog
 
+from app.models import ActivitySession
+from app.services.historical.importers.base import BaseHistoricalImporter, Cutoff
 from app.services.historical.utils import build_activity_session
 
 logger = structlog.get_logger(__name__)
 
 
-class AudiobookShelfHistoricalImporter:
+class AudiobookShelfHistoricalImporter(BaseHistoricalImporter):
     """Handles importing historical listening session data from AudiobookShelf servers."""
 
-    def __init__(self, server_id: int, media_server):
-        self.server_id = server_id
-        self.media_server = media_server
-
-    def import_history(
+    def iter_pages(
         self,
         days_back: int,
         max_results: int | None,
-        job_id: int | None,
-        update_job_callback=None,
-    ) -> dict[str, Any]:
-        """Import historical listening session data from AudiobookShelf."""
+        checkpoint: dict[str, Any] | None = None,
+        since: datetime | None = None,
+    ) -> Iterator[list[ActivitySession]]:
+        """Yield imported sessions one listening-sessions page at a time.
+
+        The checkpoint keeps the number of the next page to request.
+        """
         from app.services.media import get_media_client
 
         client = get_media_client(
             self.media_server.server_type, media_server=self.media_server
         )
 
-        cutoff = datetime.now(UTC) - timedelta(days=days_back)
+        cutoff = self._start(days_back, checkpoint, since)
         logger.info(
             "abs_import_started",
             days_back=days_back,
@@ -39,126 +41,78 @@ class AudiobookShelfHistoricalImporter:
         )
 
         endpoint = f"{client.API_PREFIX}/sessions"
-        imported_sessions: list = []
-        total_seen = 0
-        entries_seen = 0
-        page = 0
-        items_per_page = 100
-        total_sessions: int | None = None
-
-        def maybe_stop() -> bool:
-            return max_results is not None and total_seen >= max_results
-
-        try:
-            while not maybe_stop():
-                query_params = {
-                    "itemsPerPage": str(items_per_page),
-                    "page": str(page),
-                    "desc": 1,
-                }
-
-                try:
-                    response = client.get(endpoint, params=query_params)
-                    response.raise_for_status()
-                    data = response.json()
-                except Exception as exc:
-                    logger.warning(
-                        "page_fetch_failed",
-                        page=page,
-                        error=str(exc),
-                    )
-                    break
+        page_number = int(self.checkpoint.get("page", 0))
 
-                sessions = data.get("sessions", [])
-                if not sessions:
-                    break
-
-                total_sessions = data.get("total", total_sessions)
-                entries_seen += len(sessions)
+        while not self._limit_reached(self.total_processed, max_results):
+            query_params = {
+                "itemsPerPage": str(self.page_size),
+                "page": str(page_number),
+                "desc": 1,
+            }
 
-                logger.debug(
-                    "page_fetched",
-                    sessions_count=len(sessions),
-                    page=page,
+            try:
+                response = client.get(endpoint, params=query_params)
+                response.raise_for_status()
+                data = response.json()
+            except Exception as exc:
+                logger.warning(
+                    "page_fetch_failed",
+                    page=page_number,
+                    error=str(exc),
                 )
-
-                if job_id is not None and entries_seen % 100 == 0:
-                    expected_total = (
-                        total_sessions if total_sessions is not None else entries_seen
-                    )
-                    if update_job_callback:
-                        update_job_callback(
-                            job_id,
-                            total_fetched=expected_total,
-                            total_processed=len(imported_sessions),
-                        )
-
-                exhausted = False
-                for session in sessions:
-                    if maybe_stop() or exhausted:
-                        break
-
-                    result = self._process_session(session, cutoff)
-                    if result is None:
-                        continue
-                    if result == "exhausted":
-                        exhausted = True
-                        continue
-
-                    imported_sessions.append(result)
-                    total_seen += 1
-
-                    if (
-                        job_id is not None
-                        and total_seen % 25 == 0
-                        and update_job_callback
-                    ):
-                        update_job_callback(
-                            job_id,
-                            total_fetched=(
-                                total_sessions
-                                if total_sessions is not None
-                                else entries_seen
-                            ),
-                            total_processed=len(imported_sessions),
-                        )
-
-                if exhausted:
+                self.complete = False
+                break
+
+            sessions = data.get("sessions", [])
+            if not sessions:
+                break
+
+            self.total_fetched += len(sessions)
+            logger.debug(
+                "page_fetched",
+                sessions_count=len(sessions),
+                page=page_number,
+            )
+
+            page: list[ActivitySession] = []
+            exhausted = False
+            for session in sessions:
+                if self._limit_reached(self.total_processed, max_results):
                     break
 
-                page += 1
-                if len(sessions) < items_per_page:
+                result = self._process_session(session, cutoff)
+                if result is None:
+                    continue
+                if result is Cutoff.REACHED:
+                    exhausted = True
                     break
 
-        except Exception as exc:
-            logger.error("abs_import_failed", error=str(exc))
-            return {
-                "success": False,
-                "error": str(exc),
-                "sessions": [],
-                "total_fetched": 0,
-                "total_processed": 0,
-            }
+                page.append(result)
+                self.total_processed += 1
+
+            page_number += 1
+            self._save_position(page=page_number)
+
+            if page:
+                yield page
+
+            if exhausted or len(sessions) < self.page_size:
+                break
 
         logger.info(
             "abs_import_complete",
-            entries_seen=entries_seen,
-            sessions_processed=len(imported_sessions),
+            entries_seen=self.total_fetched,
+            sessions_processed=self.total_processed,
         )
 
-        return {
-            "success": True,
-            "sessions": imported_sessions,
-            "total_fetched": entries_seen,
-            "total_processed": len(imported_sessions),
-            "date_range": {
-                "from": cutoff.isoformat(),
-                "to": datetime.now(UTC).isoformat(),
-            },
-        }
+    def _process_session(
+        self, session: dict, cutoff: datetime
+    ) -> ActivitySession | Cutoff | None:
+        """Process a single AudiobookShelf session into ActivitySession.
 
-    def _process_session(self, session: dict, cutoff: datetime) -> Any:
-        """Process a single AudiobookShelf session into ActivitySession."""
+        Returns ``None`` for unusable sessions and ``Cutoff.REACHED`` for
+        sessions played before *cutoff*.
+        """
         if not isinstance(session, dict):
             return None
 
@@ -176,7 +130,8 @@ class AudiobookShelfHistoricalImporter:
 
         # Check date range
         if viewed_at < cutoff:
-            return "exhausted"
+            return Cutoff.REACHED
+        self._note_viewed(viewed_at)
 
         # Extract user information
         user_id = str(session.get("userId", ""))
@@ -0,0 +1,105 @@
+"""Shared plumbing for the page-yielding historical importers."""
+
+import copy
+from collections.abc import Iterator
+from datetime import UTC, datetime, timedelta
+from enum import Enum
+from typing import Any
+
+from app.models import ActivitySession
+
+
+class Cutoff(Enum):
+    """Returned for an entry played before the import window starts."""
+
+    REACHED = "reached"
+
+
+class BaseHistoricalImporter:
+    """Base class for importers that stream history one page at a time.
+
+    Subclasses implement :meth:`iter_pages`, yielding lists of unsaved
+    ``ActivitySession`` objects as each upstream page is fetched, and keep the
+    ``total_fetched``/``total_processed`` counters current so callers can
+    report progress between pages. ``newest_viewed_at`` tracks the latest play
+    seen, which becomes the server's delta-sync high-water mark, and
+    ``complete`` turns False when part of the history could not be fetched.
+
+    Before yielding a page, importers record in :attr:`checkpoint` where the
+    next page starts. A caller that persists a snapshot of the checkpoint
+    together with the sessions it has stored can later pass it back to
+    :meth:`iter_pages` to resume after those pages.
+    """
+
+    page_size = 100
+
+    def __init__(self, server_id: int, media_server):
+        self.server_id = server_id
+        self.media_server = media_server
+        self.total_fetched = 0
+        self.total_processed = 0
+        self.cutoff: datetime | None = None
+        self.newest_viewed_at: datetime | None = None
+        self.complete = True
+        self.checkpoint: dict[str, Any] = {}
+
+    def iter_pages(
+        self,
+        days_back: int,
+        max_results: int | None,
+        checkpoint: dict[str, Any] | None = None,
+        since: datetime | None = None,
+    ) -> Iterator[list[ActivitySession]]:
+        """Yield pages of sessions viewed in the last *days_back* days.
+
+        When *since* is given it replaces the ``days_back`` window, so only
+        plays newer than that moment are fetched.
+        """
+        raise NotImplementedError
+
+    def _start(
+        self,
+        days_back: int,
+        checkpoint: dict[str, Any] | None,
+        since: datetime | None = None,
+    ) -> datetime:
+        """Reset counters, or restore them and the cutoff from *checkpoint*."""
+        self.checkpoint = dict(checkpoint or {})
+        self.total_fetched = int(self.checkpoint.get("fetched", 0))
+        self.total_processed = int(self.checkpoint.get("processed", 0))
+        self.complete = True
+        newest = self.checkpoint.get("newest")
+        self.newest_viewed_at = datetime.fromisoformat(newest) if newest else None
+
+        cutoff = self.checkpoint.get("cutoff")
+        if cutoff:
+            self.cutoff = datetime.fromisoformat(cutoff)
+        else:
+            self.cutoff = since or datetime.now(UTC) - timedelta(days=days_back)
+            self.checkpoint["cutoff"] = self.cutoff.isoformat()
+        return self.cutoff
+
+    def _note_viewed(self, viewed_at: datetime) -> None:
+        if self.newest_viewed_at is None or viewed_at > self.newest_viewed_at:
+            self.newest_viewed_at = viewed_at
+
+    def _save_position(self, **cursor: Any) -> None:
+        """Record the resume position reached once the current page is stored."""
+        self.checkpoint.update(
+            cursor, fetched=self.total_fetched, processed=self.total_processed
+        )
+        if self.newest_viewed_at is not None:
+            self.checkpoint["newest"] = self.newest_viewed_at.isoformat()
+
+    def snapshot(self) -> dict[str, Any]:
+        return copy.deepcopy(self.checkpoint)
+
+    @staticmethod
+    def _limit_reached(count: int, max_results: int | None) -> bool:
+        return max_results is not None and count >= max_results
+
+    def date_range(self) -> dict[str, Any]:
+        return {
+            "from": self.cutoff.isoformat() if self.cutoff else None,
+            "to": datetime.now(UTC).isoformat(),
+        }
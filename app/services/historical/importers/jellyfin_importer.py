@@ -1,10 +1,21 @@
 """Jellyfin and Emby historical data importer."""
 
-from datetime import UTC, datetime, timedelta
+import os
+import queue
+import threading
+import time
+from collections.abc import Iterator
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
 from typing import Any
 
+import requests
 import structlog
+from flask import current_app
 
+from app.models import ActivitySession
+from app.services.historical.importers.base import BaseHistoricalImporter, Cutoff
 from app.services.historical.utils import (
     build_activity_session,
     parse_datetime,
@@ -15,70 +26,245 @@ from app.services.historical.utils import (
 logger = structlog.get_logger(__name__)
 
 
-class JellyfinHistoricalImporter:
-    """Handles importing historical playback data from Jellyfin/Emby servers."""
+def _env_int(name: str, default: int, minimum: int = 1) -> int:
+    try:
+        return max(int(os.getenv(name, default)), minimum)
+    except (TypeError, ValueError):
+        return default
 
-    def __init__(self, server_id: int, media_server):
-        self.server_id = server_id
-        self.media_server = media_server
 
-    def import_history(
+@dataclass
+class _UserPage:
+    """One page of a user's history, or the end of that user's stream."""
+
+    user_id: str
+    start_index: int
+    items: list[dict] = field(default_factory=list)
+    last: bool = False
+    failed: bool = False
+
+
+class AdaptiveThrottle:
+    """Cap in-flight requests and back off when the server pushes back.
+
+    Every 429 or 5xx halves the cap (never below one) and pauses new requests
+    for ``Retry-After`` or an exponential delay. Each run of successful
+    requests as long as the current cap raises it by one again, up to the
+    configured maximum.
+    """
+
+    MAX_DELAY = 30.0
+
+    def __init__(self, limit: int):
+        self.max_limit = max(limit, 1)
+        self.limit = self.max_limit
+        self._in_flight = 0
+        self._successes = 0
+        self._resume_at = 0.0
+        self._cond = threading.Condition()
+
+    def __enter__(self):
+        with self._cond:
+            while True:
+                delay = self._resume_at - time.monotonic()
+                if delay <= 0 and self._in_flight < self.limit:
+                    break
+                self._cond.wait(timeout=delay if delay > 0 else None)
+            self._in_flight += 1
+        return self
+
+    def __exit__(self, *_exc):
+        with self._cond:
+            self._in_flight -= 1
+            self._cond.notify_all()
+        return False
+
+    def succeeded(self) -> None:
+        with self._cond:
+            self._successes += 1
+            if self.limit < self.max_limit and self._successes >= self.limit:
+                self.limit += 1
+                self._successes = 0
+                self._cond.notify_all()
+
+    def throttled(self, attempt: int, retry_after: str | None = None) -> float:
+        try:
+            delay = float(retry_after) if retry_after else 2.0**attempt
+        except ValueError:
+            delay = 2.0**attempt
+        delay = min(max(delay, 0.0), self.MAX_DELAY)
+        with self._cond:
+            self.limit = max(self.limit // 2, 1)
+            self._successes = 0
+            self._resume_at = max(self._resume_at, time.monotonic() + delay)
+        return delay
+
+
+class JellyfinHistoricalImporter(BaseHistoricalImporter):
+    """Handles importing historical playback data from Jellyfin/Emby servers.
+
+    Several users' histories are fetched at once (``HISTORICAL_IMPORT_USER_CONCURRENCY``,
+    default 4) in pages of ``HISTORICAL_IMPORT_PAGE_SIZE`` items (default 500).
+    Worker threads only do HTTP; pages are turned into sessions and yielded on
+    the calling thread, so the database is never touched off-thread.
+    """
+
+    page_size = _env_int("HISTORICAL_IMPORT_PAGE_SIZE", 500)
+    concurrency = _env_int("HISTORICAL_IMPORT_USER_CONCURRENCY", 4)
+    max_retries = 5
+    THROTTLE_STATUSES = frozenset({429, 500, 502, 503, 504})
+
+    def iter_pages(
         self,
         days_back: int,
         max_results: int | None,
-        job_id: int | None,
-        update_job_callback=None,
-    ) -> dict[str, Any]:
-        """Import historical playback data from Jellyfin/Emby."""
+        checkpoint: dict[str, Any] | None = None,
+        since: datetime | None = None,
+    ) -> Iterator[list[ActivitySession]]:
+        """Yield imported sessions one ``/Users/{id}/Items`` page at a time.
+
+        Pages from different users arrive interleaved, but each user's pages
+        arrive in order. The checkpoint keeps the next ``StartIndex`` per user
+        id and the ids of users whose history is complete.
+        """
         from app.services.media import get_media_client
 
         client = get_media_client(
             self.media_server.server_type, media_server=self.media_server
         )
 
-        cutoff = datetime.now(UTC) - timedelta(days=days_back)
+        cutoff = self._start(days_back, checkpoint, since)
+        # Delta runs also let the server skip items whose user data (and
+        # so play state) has not changed since the mark.
+        self._min_saved = since
+        start_indexes: dict[str, int] = self.checkpoint.setdefault("start_index", {})
+        done_users: list[str] = self.checkpoint.setdefault("done_users", [])
         logger.info(
             "jellyfin_import_started",
             server_type=self.media_server.server_type.title(),
             days_back=days_back,
             max_results=max_results or "unlimited",
+            concurrency=self.concurrency,
         )
 
+        users = {
+            user["Id"]: (user.get("Name") or "Unknown").strip() or "Unknown"
+            for user in client.get("/Users").json()
+            if user.get("Id") and user["Id"] not in done_users
+        }
+        if not users or self._limit_reached(self.total_processed, max_results):
+            return
+
+        pages: queue.Queue[_UserPage] = queue.Queue(maxsize=self.concurrency * 2)
+        stop = threading.Event()
+        throttle = AdaptiveThrottle(self.concurrency)
+        executor = ThreadPoolExecutor(
+            max_workers=min(self.concurrency, len(users)),
+            thread_name_prefix="jellyfin-history",
+        )
+        app = current_app._get_current_object()  # type: ignore[attr-defined]
+        for user_id in users:
+            executor.submit(
+                self._fetch_user_history,
+                app,
+                client,
+                user_id,
+                int(start_indexes.get(user_id, 0)),
+                cutoff,
+                pages,
+                stop,
+                throttle,
+            )
+
+        remaining = len(users)
+        per_user: dict[str, int] = {}
         try:
-            users_response = client.get("/Users").json()
-        except Exception as exc:
-            logger.error("users_fetch_failed", error=str(exc))
-            return {
-                "success": False,
-                "error": str(exc),
-                "sessions": [],
-                "total_fetched": 0,
-                "total_processed": 0,
-            }
-
-        imported_sessions: list = []
-        total_seen = 0
-        entries_seen = 0
-        total_record_count: int | None = None
-
-        def maybe_stop() -> bool:
-            return max_results is not None and total_seen >= max_results
-
-        for user in users_response:
-            if maybe_stop():
-                break
-
-            user_id = user.get("Id")
-            if not user_id:
-                continue
+            while remaining:
+                result = pages.get()
+                user_id = result.user_id
+                user_name = users[user_id]
+
+                page: list[ActivitySession] = []
+                exhausted = False
+                for item in result.items:
+                    if self._limit_reached(self.total_processed, max_results):
+                        break
+                    session = self._process_item(item, user_name, user_id, cutoff)
+                    if session is None:
+                        continue
+                    if session is Cutoff.REACHED:
+                        exhausted = True
+                        continue
+                    page.append(session)
+                    self.total_processed += 1
+
+                self.total_fetched += len(result.items)
+                per_user[user_id] = per_user.get(user_id, 0) + len(page)
+                user_done = result.last or exhausted
+                if result.failed:
+                    self.complete = False
+                    user_done = True
+                elif user_done:
+                    start_indexes.pop(user_id, None)
+                    done_users.append(user_id)
+                else:
+                    start_indexes[user_id] = result.start_index + len(result.items)
+                self._save_position()
+
+                if user_done:
+                    remaining -= 1
+                    if per_user[user_id]:
+                        logger.debug(
+                            "user_import_complete",
+                            server_type=self.media_server.server_type,
+                            user_name=user_name,
+                            sessions_count=per_user[user_id],
+                        )
 
-            user_name = (user.get("Name") or "Unknown").strip() or "Unknown"
-            start_index = 0
-            page_size = 100
-            exhausted = False
-            user_sessions_before = len(imported_sessions)
+                if page:
+                    yield page
+                if self._limit_reached(self.total_processed, max_results):
+                    break
+        finally:
+            stop.set()
+            executor.shutdown(wait=False, cancel_futures=True)
 
-            while not exhausted and not maybe_stop():
+        logger.info(
+            "jellyfin_import_complete",
+            server_type=self.media_server.server_type.title(),
+            entries_seen=self.total_fetched,
+            sessions_processed=self.total_processed,
+        )
+
+    def _fetch_user_history(
+        self,
+        app,
+        client,
+        user_id: str,
+        start_index: int,
+        cutoff: datetime,
+        pages: queue.Queue,
+        stop: threading.Event,
+        throttle: AdaptiveThrottle,
+    ) -> None:
+        """Worker: page through one user's history until the cutoff or the end."""
+        with app.app_context():
+            self._page_user_history(
+                client, user_id, start_index, cutoff, pages, stop, throttle
+            )
+
+    def _page_user_history(
+        self,
+        client,
+        user_id: str,
+        start_index: int,
+        cutoff: datetime,
+        pages: queue.Queue,
+        stop: threading.Event,
+        throttle: AdaptiveThrottle,
+    ) -> None:
+        try:
+            while not stop.is_set():
                 params = {
                     "Filters": "IsPlayed",
                     "SortBy": "DatePlayed",
@@ -86,116 +272,90 @@ class JellyfinHistoricalImporter:
                     "IncludeItemTypes": "Movie,Episode",
                     "Recursive": "true",
                     "StartIndex": start_index,
-                    "Limit": page_size,
+                    "Limit": self.page_size,
                     "Fields": "UserData,SeriesInfo,SeasonInfo,BasicSyncInfo",
                 }
-
-                try:
-                    response = client.get(
-                        f"/Users/{user_id}/Items", params=params
-                    ).json()
-                except Exception as exc:
-                    logger.warning(
-                        "user_history_fetch_failed",
-                        user_id=user_id,
-                        error=str(exc),
-                    )
-                    break
-
+                if self._min_saved is not None:
+                    params["MinDateLastSavedForUser"] = self._min_saved.isoformat()
+                response = self._get_throttled(
+                    client, f"/Users/{user_id}/Items", params, throttle
+                )
                 items = response.get("Items", [])
-                if not items:
-                    break
-
                 logger.debug(
                     "page_fetched",
-                    server_type=self.media_server.server_type,
-                    user_name=user_name,
+                    server_id=self.server_id,
+                    user_id=user_id,
                     items_count=len(items),
                     start_index=start_index,
                 )
-
-                entries_seen += len(items)
-                total_record_count = response.get(
-                    "TotalRecordCount", total_record_count
+                # Items are newest first, so once a page reaches past the
+                # cutoff there is nothing more to fetch for this user.
+                last = len(items) < self.page_size or any(
+                    (viewed_at := self._viewed_at(item)) is not None
+                    and viewed_at < cutoff
+                    for item in items
                 )
-
-                if job_id is not None and entries_seen % 100 == 0:
-                    expected_total = (
-                        total_record_count
-                        if total_record_count is not None
-                        else entries_seen
-                    )
-                    if update_job_callback:
-                        update_job_callback(
-                            job_id,
-                            total_fetched=expected_total,
-                            total_processed=len(imported_sessions),
-                        )
-
-                for item in items:
-                    if maybe_stop():
-                        break
-
-                    session = self._process_item(
-                        item, user_name, user_id, cutoff, exhausted
-                    )
-                    if session is None:
-                        continue
-
-                    if session == "exhausted":
-                        exhausted = True
-                        continue
-
-                    imported_sessions.append(session)
-                    total_seen += 1
-
+                if not self._put(
+                    pages, stop, _UserPage(user_id, start_index, items, last)
+                ):
+                    return
+                if last:
+                    return
+                start_index += len(items)
+        except Exception as exc:
+            logger.warning(
+                "user_history_fetch_failed",
+                user_id=user_id,
+                error=str(exc),
+            )
+            self._put(pages, stop, _UserPage(user_id, start_index, failed=True))
+
+    def _get_throttled(
+        self, client, path: str, params: dict, throttle: AdaptiveThrottle
+    ) -> dict:
+        attempt = 0
+        while True:
+            with throttle:
+                try:
+                    response = client.get(path, params=params)
+                except requests.HTTPError as exc:
+                    status = getattr(exc.response, "status_code", None)
                     if (
-                        job_id is not None
-                        and total_seen % 25 == 0
-                        and update_job_callback
+                        status not in self.THROTTLE_STATUSES
+                        or attempt >= self.max_retries
                     ):
-                        update_job_callback(
-                            job_id,
-                            total_fetched=(
-                                total_record_count
-                                if total_record_count is not None
-                                else entries_seen
-                            ),
-                            total_processed=len(imported_sessions),
-                        )
-
-                if maybe_stop() or exhausted:
-                    break
-
-                start_index += len(items)
-                if len(items) < page_size:
-                    break
-
-            if len(imported_sessions) - user_sessions_before > 0:
-                logger.debug(
-                    "user_import_complete",
-                    server_type=self.media_server.server_type,
-                    user_name=user_name,
-                    sessions_count=len(imported_sessions) - user_sessions_before,
-                )
-
-        logger.info(
-            "jellyfin_import_complete",
-            server_type=self.media_server.server_type.title(),
-            entries_seen=entries_seen,
-            sessions_processed=len(imported_sessions),
-        )
+                        raise
+                    retry_after = exc.response.headers.get("Retry-After")
+                else:
+                    throttle.succeeded()
+                    return response.json()
+            delay = throttle.throttled(attempt, retry_after)
+            logger.info(
+                "jellyfin_history_throttled",
+                status=status,
+                delay=delay,
+                concurrency=throttle.limit,
+            )
+            attempt += 1
+
+    @staticmethod
+    def _put(pages: queue.Queue, stop: threading.Event, page: _UserPage) -> bool:
+        """Hand a page to the consumer; give up once the import has stopped."""
+        while not stop.is_set():
+            try:
+                pages.put(page, timeout=0.5)
+                return True
+            except queue.Full:
+                continue
+        return False
 
-        return {
-            "success": True,
-            "sessions": imported_sessions,
-            "total_fetched": entries_seen,
-            "total_processed": len(imported_sessions),
-            "date_range": {
-                "from": cutoff.isoformat(),
-                "to": datetime.now(UTC).isoformat(),
-            },
-        }
+    @staticmethod
+    def _viewed_at(item: dict) -> datetime | None:
+        user_data = item.get("UserData") or {}
+        viewed_at = parse_datetime(user_data.get("LastPlayedDate"))
+        if viewed_at is None:
+            viewed_at = ticks_to_datetime(user_data.get("LastPlayedDateTicks"))
+        return viewed_at
 
     def _process_item(
         self,
@@ -203,19 +363,20 @@ class JellyfinHistoricalImporter:
         user_name: str,
         user_id: str,
         cutoff: datetime,
-        _exhausted: bool,
-    ) -> Any:
-        """Process a single Jellyfin/Emby item into ActivitySession."""
+    ) -> ActivitySession | Cutoff | None:
+        """Process a single Jellyfin/Emby item into ActivitySession.
+
+        Returns ``None`` for items without a play date and ``Cutoff.REACHED``
+        for items played before *cutoff*.
+        """
         user_data = item.get("UserData") or {}
-        last_played_raw = user_data.get("LastPlayedDate")
-        viewed_at = parse_datetime(last_played_raw)
-        if viewed_at is None:
-            viewed_at = ticks_to_datetime(user_data.get("LastPlayedDateTicks"))
+        viewed_at = self._viewed_at(item)
         if not viewed_at:
             return None
 
         if viewed_at < cutoff:
-            return "exhausted"
+            return Cutoff.REACHED
+        self._note_viewed(viewed_at)
 
         runtime_ms = ticks_to_ms(item.get("RunTimeTicks"))
         position_ms = ticks_to_ms(user_data.get("PlaybackPositionTicks"))
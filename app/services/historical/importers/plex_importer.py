@@ -1,125 +1,103 @@
 """Plex historical data importer."""
 
+from collections.abc import Iterator
 from datetime import UTC, datetime, timedelta
 from typing import Any
 
 import structlog
+from plexapi.utils import joinArgs
 
-from app.models import ActivitySession, HistoricalImportJob
+from app.models import ActivitySession
+from app.services.historical.importers.base import BaseHistoricalImporter
 
 logger = structlog.get_logger(__name__)
 
 
-class PlexHistoricalImporter:
+class PlexHistoricalImporter(BaseHistoricalImporter):
     """Handles importing historical viewing data from Plex servers."""
 
+    HISTORY_KEY = "/status/sessions/history/all"
+
     def __init__(self, server_id: int, media_server):
-        self.server_id = server_id
-        self.media_server = media_server
+        super().__init__(server_id, media_server)
         self._duration_cache: dict[str, int] = {}
 
-    def import_history(
+    def iter_pages(
         self,
         days_back: int,
         max_results: int | None,
-        job_id: int | None,
-        update_job_callback=None,
-    ) -> dict[str, Any]:
+        checkpoint: dict[str, Any] | None = None,
+        since: datetime | None = None,
+    ) -> Iterator[list[ActivitySession]]:
         """
-        Import historical viewing data from Plex.
+        Yield imported Plex history one container page at a time.
+
+        ``PlexServer.history()`` loads the whole history into memory before
+        returning, so pages are requested directly with
+        ``X-Plex-Container-Start``/``X-Plex-Container-Size``. The checkpoint
+        keeps the container offset of the next page.
 
         Args:
             days_back: Number of days back to import history
             max_results: Maximum number of entries to import (None for unlimited)
-            job_id: Optional job identifier for progress updates
-            update_job_callback: Callback to update job progress
-
-        Returns:
-            Dictionary with import results
+            checkpoint: Position saved by an earlier, interrupted run
         """
         if self.media_server.server_type != "plex":
             raise ValueError("Server is not a Plex server")
 
-        try:
-            from app.services.media import get_media_client
-
-            client = get_media_client(
-                self.media_server.server_type, media_server=self.media_server
-            )
-            if not hasattr(client, "server"):
-                raise ValueError("Plex client not properly configured")
-
-            # Calculate date range
-            min_date = datetime.now(UTC) - timedelta(days=days_back)
-
-            logger.info(
-                "plex_import_started",
-                days_back=days_back,
-                max_results=max_results,
+        from app.services.media import get_media_client
+
+        client = get_media_client(
+            self.media_server.server_type, media_server=self.media_server
+        )
+        if not hasattr(client, "server"):
+            raise ValueError("Plex client not properly configured")
+
+        min_date = self._start(days_back, checkpoint, since)
+        logger.info(
+            "plex_import_started",
+            days_back=days_back,
+            max_results=max_results,
+        )
+
+        account_lookup = self._build_account_lookup(client)
+        self._duration_cache.clear()
+
+        key = self.HISTORY_KEY + joinArgs(
+            {"sort": "viewedAt:desc", "viewedAt>": int(min_date.timestamp())}
+        )
+        offset = int(self.checkpoint.get("offset", 0))
+        while not self._limit_reached(self.total_fetched, max_results):
+            size = self.page_size
+            if max_results is not None:
+                size = min(size, max_results - self.total_fetched)
+            entries = client.server.fetchItems(
+                key, container_start=offset, container_size=size, maxresults=size
             )
+            if not entries:
+                break
 
-            # Get history from Plex
-            history_kwargs: dict[str, Any] = {"mindate": min_date}
-            if max_results:
-                history_kwargs["maxresults"] = max_results
-
-            history_entries = client.server.history(**history_kwargs)
-            total_entries = len(history_entries)
-
-            if job_id is not None and update_job_callback:
-                update_job_callback(
-                    job_id,
-                    status=HistoricalImportJob.STATUS_RUNNING,
-                    total_fetched=total_entries,
-                    total_processed=0,
-                    total_stored=0,
-                    error_message=None,
-                )
-
-            account_lookup = self._build_account_lookup(client)
-            self._duration_cache.clear()
-
-            imported_sessions = []
-            for entry in history_entries:
+            self.total_fetched += len(entries)
+            page: list[ActivitySession] = []
+            for entry in entries:
                 try:
                     activity_session = self._process_history_entry(
                         entry, account_lookup, client
                     )
-                    if activity_session:
-                        imported_sessions.append(activity_session)
-                        if (
-                            job_id is not None
-                            and len(imported_sessions) % 25 == 0
-                            and update_job_callback
-                        ):
-                            update_job_callback(
-                                job_id,
-                                total_processed=len(imported_sessions),
-                            )
                 except Exception as e:
                     logger.warning("entry_process_failed", error=str(e))
                     continue
+                if activity_session:
+                    page.append(activity_session)
+            self.total_processed += len(page)
+            offset += len(entries)
+            self._save_position(offset=offset)
 
-            return {
-                "success": True,
-                "sessions": imported_sessions,
-                "total_fetched": total_entries,
-                "total_processed": len(imported_sessions),
-                "date_range": {
-                    "from": min_date.isoformat(),
-                    "to": datetime.now(UTC).isoformat(),
-                },
-            }
+            if page:
+                yield page
 
-        except Exception as e:
-            logger.error("plex_import_failed", error=str(e))
-            return {
-                "success": False,
-                "error": str(e),
-                "sessions": [],
-                "total_fetched": 0,
-                "total_processed": 0,
-            }
+            if len(entries) < size:
+                break
 
     def _build_account_lookup(self, client) -> dict[str, str]:
         """Build mapping from Plex account ID to human friendly name."""
@@ -209,6 +187,7 @@ class PlexHistoricalImporter:
                 viewed_at = datetime.fromtimestamp(viewed_at, UTC)
             elif not viewed_at.tzinfo:
                 viewed_at = viewed_at.replace(tzinfo=UTC)
+            self._note_viewed(viewed_at)
 
             # Extract duration
             duration_ms, duration_source = self._extract_duration(entry, client)
@@ -0,0 +1,357 @@
+"""
+Persistent on-disk tier for the image proxy cache.
+
+``ImageProxyService`` keeps a small per-process LRU in memory, so with several
+Gunicorn workers the same poster was fetched from the media server once per
+worker per hour and everything was lost on restart. This tier stores artwork
+under ``DATABASE_DIR/image_cache`` where every worker can see it:
+
+* entries are keyed by a hash of ``(server_id, upstream URL)`` rather than the
+  proxy token, so they survive token-bucket rotation and restarts;
+* each entry is a data file plus a JSON sidecar holding the content type, the
+  upstream ``ETag``/``Last-Modified`` validators and the fetch time;
+* writes go to a temp file and are published with ``os.replace``, so readers in
+  other workers never observe a half-written image;
+* bodies can be teed in while they are streamed to the client
+  (:class:`DiskCacheWriter`), which also records a SHA-256 digest of the bytes
+  for strong browser ``ETag``s;
+* the data file's mtime doubles as the LRU clock and the directory is trimmed
+  oldest-first once it grows past ``IMAGE_DISK_CACHE_MAX_BYTES``.
+
+Stale entries are not discarded: the route revalidates them upstream with
+``If-None-Match``/``If-Modified-Since`` and a 304 simply refreshes the sidecar.
+"""
+
+from __future__ import annotations
+
+import contextlib
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+import threading
+import time
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import IO, ClassVar
+
+import structlog
+from flask import current_app
+
+
+@dataclass
+class DiskCacheEntry:
+    """Metadata for one cached upstream image."""
+
+    key: str
+    content_type: str
+    size: int
+    fetched_at: float
+    etag: str | None = None
+    last_modified: str | None = None
+    digest: str | None = None
+
+    def is_fresh(self, max_age: float) -> bool:
+        return time.time() - self.fetched_at <= max_age
+
+    def validators(self) -> dict[str, str]:
+        """Conditional request headers for revalidating this entry upstream."""
+        headers = {}
+        if self.etag:
+            headers["If-None-Match"] = self.etag
+        if self.last_modified:
+            headers["If-Modified-Since"] = self.last_modified
+        return headers
+
+
+class ImageDiskCache:
+    """Cross-worker, size-bounded image cache stored on the filesystem."""
+
+    # Per-process estimate of the directory size; other workers' writes are
+    # picked up whenever a trim rescans the directory.
+    _approx_bytes: ClassVar[int | None] = None
+    _lock: ClassVar[threading.Lock] = threading.Lock()
+
+    TRIM_TARGET_RATIO = 0.9  # Trim to 90% of the budget to avoid thrashing
+    STALE_TEMP_SECONDS = 3600  # Leftover temp files from crashed writers
+
+    @staticmethod
+    def key_for(url: str, server_id: int | None, variant: str = "") -> str:
+        raw = f"{server_id or ''}\n{url}"
+        if variant:
+            raw += f"\n{variant}"
+        return hashlib.sha256(raw.encode()).hexdigest()
+
+    @classmethod
+    def _root(cls) -> Path | None:
+        directory = current_app.config.get("IMAGE_DISK_CACHE_DIR")
+        if not directory or cls._max_bytes() <= 0:
+            return None
+        return Path(directory)
+
+    @staticmethod
+    def _max_bytes() -> int:
+        return int(current_app.config.get("IMAGE_DISK_CACHE_MAX_BYTES", 0) or 0)
+
+    @staticmethod
+    def _paths(root: Path, key: str) -> tuple[Path, Path]:
+        bucket = root / key[:2]
+        return bucket / key, bucket / f"{key}.json"
+
+    @classmethod
+    def lookup(
+        cls, url: str, server_id: int | None, variant: str = ""
+    ) -> DiskCacheEntry | None:
+        """Return the cached entry for *url*, or None when absent or unreadable.
+
+        *variant* distinguishes resized/re-encoded copies of the same image.
+        """
+        root = cls._root()
+        if root is None:
+            return None
+
+        key = cls.key_for(url, server_id, variant)
+        data_path, meta_path = cls._paths(root, key)
+        try:
+            meta = json.loads(meta_path.read_text())
+            entry = DiskCacheEntry(key=key, **meta)
+            if data_path.stat().st_size != entry.size:
+                return None  # Mid-replace by another worker; treat as a miss
+            os.utime(data_path)  # Mark as recently used for LRU eviction
+        except (OSError, ValueError, TypeError):
+            return None
+        return entry
+
+    @classmethod
+    def open(cls, entry: DiskCacheEntry) -> IO[bytes] | None:
+        """Open the entry's data file for serving.
+
+        The handle stays valid even if another worker evicts the file while the
+        response is being sent.
+        """
+        root = cls._root()
+        if root is None:
+            return None
+        data_path, _ = cls._paths(root, entry.key)
+        try:
+            return data_path.open("rb")
+        except OSError:
+            return None
+
+    @classmethod
+    def writer(
+        cls,
+        url: str,
+        server_id: int | None,
+        content_type: str,
+        *,
+        etag: str | None = None,
+        last_modified: str | None = None,
+        variant: str = "",
+    ) -> DiskCacheWriter | None:
+        """Start an incremental write for a streamed body; None when disabled."""
+        root = cls._root()
+        if root is None:
+            return None
+        entry = DiskCacheEntry(
+            key=cls.key_for(url, server_id, variant),
+            content_type=content_type,
+            size=0,
+            fetched_at=time.time(),
+            etag=etag,
+            last_modified=last_modified,
+        )
+        try:
+            return DiskCacheWriter(root, entry, cls._max_bytes())
+        except OSError as exc:
+            structlog.get_logger().warning(
+                "image disk cache write failed", error=str(exc)
+            )
+            return None
+
+    @classmethod
+    def store(
+        cls,
+        url: str,
+        server_id: int | None,
+        data: bytes,
+        content_type: str,
+        *,
+        etag: str | None = None,
+        last_modified: str | None = None,
+        variant: str = "",
+    ) -> DiskCacheEntry | None:
+        """Atomically write *data* and its metadata; returns None when disabled."""
+        writer = cls.writer(
+            url,
+            server_id,
+            content_type,
+            etag=etag,
+            last_modified=last_modified,
+            variant=variant,
+        )
+        if writer is None:
+            return None
+        writer.write(data)
+        return writer.commit()
+
+    @classmethod
+    def mark_revalidated(cls, entry: DiskCacheEntry) -> None:
+        """Record a successful upstream 304 so the entry is fresh again."""
+        root = cls._root()
+        if root is None:
+            return
+        entry.fetched_at = time.time()
+        _, meta_path = cls._paths(root, entry.key)
+        with contextlib.suppress(OSError):
+            cls._write_meta(meta_path, entry)
+
+    @classmethod
+    def clear(cls) -> None:
+        """Remove every cached image (used by tests and cache resets)."""
+        root = cls._root()
+        with cls._lock:
+            cls._approx_bytes = None
+        if root is not None and root.exists():
+            shutil.rmtree(root, ignore_errors=True)
+
+    @staticmethod
+    def _atomic_write(path: Path, data: bytes) -> None:
+        fd, tmp_name = tempfile.mkstemp(dir=path.parent, prefix=".tmp-")
+        try:
+            with os.fdopen(fd, "wb") as fh:
+                fh.write(data)
+            Path(tmp_name).replace(path)
+        except BaseException:
+            with contextlib.suppress(OSError):
+                Path(tmp_name).unlink()
+            raise
+
+    @classmethod
+    def _write_meta(cls, path: Path, entry: DiskCacheEntry) -> None:
+        meta = asdict(entry)
+        meta.pop("key")
+        cls._atomic_write(path, json.dumps(meta).encode())
+
+    @classmethod
+    def _account(cls, root: Path, added: int, max_bytes: int) -> None:
+        with cls._lock:
+            if cls._approx_bytes is None:
+                cls._approx_bytes = cls._scan(root)[1]
+            else:
+                cls._approx_bytes += added
+            if cls._approx_bytes <= max_bytes:
+                return
+            cls._approx_bytes = cls._trim(root, max_bytes)
+
+    @classmethod
+    def _scan(cls, root: Path) -> tuple[list[tuple[float, int, Path]], int]:
+        """Return ``(mtime, size, path)`` for every data file plus their total.
+
+        Sidecars are small and not counted against the byte budget.
+        """
+        files: list[tuple[float, int, Path]] = []
+        total = 0
+        now = time.time()
+        for bucket in root.iterdir() if root.exists() else ():
+            if not bucket.is_dir():
+                continue
+            for item in os.scandir(bucket):
+                try:
+                    stat = item.stat()
+                except OSError:
+                    continue
+                if item.name.startswith(".tmp-"):
+                    if now - stat.st_mtime > cls.STALE_TEMP_SECONDS:
+                        with contextlib.suppress(OSError):
+                            Path(item.path).unlink()
+                    continue
+                if not item.name.endswith(".json"):
+                    total += stat.st_size
+                    files.append((stat.st_mtime, stat.st_size, Path(item.path)))
+        return files, total
+
+    @classmethod
+    def _trim(cls, root: Path, max_bytes: int) -> int:
+        """Evict least-recently-used entries until under the byte budget."""
+        files, total = cls._scan(root)
+        target = max_bytes * cls.TRIM_TARGET_RATIO
+        files.sort(key=lambda item: item[0])
+        for _mtime, size, data_path in files:
+            if total <= target:
+                break
+            meta_path = data_path.with_name(f"{data_path.name}.json")
+            with contextlib.suppress(OSError):
+                data_path.unlink()
+                total -= size
+            with contextlib.suppress(OSError):
+                meta_path.unlink()
+        return total
+
+
+class DiskCacheWriter:
+    """Tee target for a streamed upstream body.
+
+    Chunks go to a temp file next to the final path and are hashed as they
+    arrive; :meth:`commit` publishes the file atomically and records the
+    SHA-256 digest used for strong ETags. Bodies larger than the cache budget
+    are abandoned rather than written out in full. Writers capture their
+    configuration up front, so they can run inside a streaming response
+    generator without an app context.
+    """
+
+    def __init__(self, root: Path, entry: DiskCacheEntry, max_bytes: int):
+        self.root = root
+        self.entry = entry
+        self.max_bytes = max_bytes
+        self._hash = hashlib.sha256()
+        self._data_path, self._meta_path = ImageDiskCache._paths(root, entry.key)
+        self._data_path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp_name = tempfile.mkstemp(dir=self._data_path.parent, prefix=".tmp-")
+        self._tmp_path = Path(tmp_name)
+        self._fh: IO[bytes] | None = os.fdopen(fd, "wb")
+
+    def write(self, chunk: bytes) -> None:
+        if self._fh is None:
+            return
+        self.entry.size += len(chunk)
+        if self.entry.size > self.max_bytes:
+            self.abort()
+            return
+        try:
+            self._fh.write(chunk)
+        except OSError:
+            self.abort()
+            return
+        self._hash.update(chunk)
+
+    def commit(self) -> DiskCacheEntry | None:
+        """Publish the written body; returns None if the write was abandoned."""
+        if self._fh is None:
+            return None
+        try:
+            self._fh.close()
+            self._fh = None
+            self.entry.digest = self._hash.hexdigest()
+            self._tmp_path.replace(self._data_path)
+            ImageDiskCache._write_meta(self._meta_path, self.entry)
+        except OSError as exc:
+            structlog.get_logger().warning(
+                "image disk cache write failed", error=str(exc)
+            )
+            self.abort()
+            return None
+        ImageDiskCache._account(self.root, self.entry.size, self.max_bytes)
+        return self.entry
+
+    def abort(self) -> None:
+        if self._fh is not None:
+            with contextlib.suppress(OSError):
+                self._fh.close()
+            self._fh = None
+        with contextlib.suppress(OSError):
+            self._tmp_path.unlink()
+
+
+__all__ = ["DiskCacheEntry", "DiskCacheWriter", "ImageDiskCache"]
@@ -50,6 +50,9 @@ class ImageProxyService:
     IMAGE_CACHE_MAX_BYTES = 20 * 1024 * 1024  # 20 MB
     IMAGE_CACHE_MAX_SINGLE_BYTES = 4 * 1024 * 1024  # Skip caching images >4 MB
     IMAGE_PROXY_MAX_BYTES = 25 * 1024 * 1024  # Hard cap on a single upstream fetch
+    IMAGE_PROXY_STREAM_THRESHOLD = 256 * 1024  # Stream bodies larger than this
+    THUMBNAIL_WIDTH = 400  # ~200px posters at 2x device pixel ratio
+    THUMBNAIL_MIN_WIDTH = 16
     SERVER_HEADER_TTL = 300  # 5 minutes
     SESSION_CACHE_MAX_ENTRIES = 12
 
@@ -133,25 +136,33 @@ class ImageProxyService:
         hostname prevents a key intended for one service reaching another
         service on the same host.
         """
+        return cls._server_info(server_id)["origin"]
+
+    @classmethod
+    def _server_info(cls, server_id: int) -> dict[str, Any]:
+        """Return the cached origin and server type for a media server."""
         now = time.time()
         with cls._server_url_cache_lock:
             cached = cls._server_url_cache.get(server_id)
             if cached and (now - cached["timestamp"] < cls.SERVER_HEADER_TTL):
-                return cached["origin"]
+                return cached
 
         from app.extensions import db
         from app.models import MediaServer  # Local import to avoid circulars
 
         server = db.session.get(MediaServer, server_id)
-        origin = cls._canonical_origin(server.url) if server and server.url else None
+        info = {
+            "origin": (
+                cls._canonical_origin(server.url) if server and server.url else None
+            ),
+            "server_type": server.server_type if server else None,
+            "timestamp": now,
+        }
 
         with cls._server_url_cache_lock:
-            cls._server_url_cache[server_id] = {
-                "origin": origin,
-                "timestamp": now,
-            }
+            cls._server_url_cache[server_id] = info
 
-        return origin
+        return info
 
     @classmethod
     def _strip_credentials(
@@ -216,7 +227,13 @@ class ImageProxyService:
         return bucket_diff * cls.TOKEN_BUCKET_SECONDS < cls.TOKEN_EXPIRY
 
     @classmethod
-    def generate_token(cls, url: str, server_id: int | None = None) -> str:
+    def generate_token(
+        cls,
+        url: str,
+        server_id: int | None = None,
+        width: int | None = None,
+        quality: int | None = None,
+    ) -> str:
         """
         Generate a stateless encrypted token for an image URL.
 
@@ -228,6 +245,8 @@ class ImageProxyService:
         Args:
             url: The internal/media server URL to proxy
             server_id: Optional media server ID for authentication
+            width: Optional thumbnail width; the proxy serves a resized variant
+            quality: Optional encoder quality (1-100) for the resized variant
 
         Returns:
             Opaque token that can be used with /image-proxy?token=...
@@ -241,12 +260,17 @@ class ImageProxyService:
         if server_id is not None:
             url = cls._strip_credentials(url, cls._server_origin(server_id))
 
-        # Create payload with URL, server_id, and expiry info
+        # Create payload with URL, server_id, and expiry info. Size hints live
+        # inside the ciphertext so clients cannot request arbitrary variants.
         payload = {
             "url": url,
             "server_id": server_id,
             "bucket": bucket,
         }
+        if width:
+            payload["w"] = min(max(int(width), cls.THUMBNAIL_MIN_WIDTH), 4096)
+        if quality:
+            payload["q"] = min(max(int(quality), 1), 100)
 
         payload_json = json.dumps(payload, separators=(",", ":")).encode()
 
@@ -265,6 +289,8 @@ class ImageProxyService:
                 "server_id": server_id,
                 "bucket": bucket,
                 "cipher_key": cipher_key,
+                "w": payload.get("w"),
+                "q": payload.get("q"),
             }
             cls._cleanup_token_cache_locked()
 
@@ -279,7 +305,8 @@ class ImageProxyService:
             token: The token to validate (base64url of AES-SIV ciphertext)
 
         Returns:
-            Dict with 'url' and 'server_id' if valid, None otherwise
+            Dict with 'url' and 'server_id' (plus 'width'/'quality' for
+            thumbnail tokens) if valid, None otherwise
         """
         if not token:
             return None
@@ -299,10 +326,7 @@ class ImageProxyService:
             and cached_mapping.get("cipher_key") == cipher_key
             and cls._bucket_within_expiry(cached_mapping.get("bucket"))
         ):
-            return {
-                "url": cached_mapping["url"],
-                "server_id": cached_mapping.get("server_id"),
-            }
+            return cls._mapping(cached_mapping)
 
         # Decrypt payload. AES-SIV rejects any tampering via its auth tag, so a
         # separate signature check is unnecessary.
@@ -343,10 +367,50 @@ class ImageProxyService:
                 "server_id": payload.get("server_id"),
                 "bucket": payload.get("bucket"),
                 "cipher_key": cipher_key,
+                "w": payload.get("w"),
+                "q": payload.get("q"),
             }
             cls._cleanup_token_cache_locked()
 
-        return {"url": payload["url"], "server_id": payload.get("server_id")}
+        return cls._mapping(payload)
+
+    @staticmethod
+    def _mapping(payload: dict[str, Any]) -> dict[str, Any]:
+        mapping = {"url": payload["url"], "server_id": payload.get("server_id")}
+        if payload.get("w"):
+            mapping["width"] = payload["w"]
+        if payload.get("q"):
+            mapping["quality"] = payload["q"]
+        return mapping
+
+    @classmethod
+    def plan_variant(cls, mapping: dict[str, Any], accept: str | None):
+        """Decide how to produce the (possibly resized) image for *mapping*.
+
+        Server-native resizing is only used when the URL targets the media
+        server's own origin, mirroring the credential-scoping rules.
+        """
+        from app.services.image_resize import plan_variant
+
+        url = mapping["url"]
+        server_id = mapping.get("server_id")
+        server_type = None
+        same_origin = False
+        if server_id is not None and mapping.get("width"):
+            info = cls._server_info(server_id)
+            server_type = info["server_type"]
+            same_origin = (
+                info["origin"] is not None
+                and cls._canonical_origin(url) == info["origin"]
+            )
+        return plan_variant(
+            url,
+            mapping.get("width"),
+            mapping.get("quality"),
+            server_type=server_type,
+            same_origin=same_origin,
+            accept=accept,
+        )
 
     @classmethod
     def get_cached_image(cls, token: str) -> dict | None:
@@ -372,14 +436,28 @@ class ImageProxyService:
             return {
                 "data": cached["data"],
                 "content_type": cached["content_type"],
+                "etag": cached.get("etag"),
+                "last_modified": cached.get("last_modified"),
             }
 
     @classmethod
-    def cache_image(cls, token: str, data: bytes, content_type: str) -> None:
-        """Cache image data for a token."""
+    def cache_image(
+        cls,
+        token: str,
+        data: bytes,
+        content_type: str,
+        last_modified: str | None = None,
+    ) -> str | None:
+        """Cache image data for a token.
+
+        Returns:
+            Strong ETag derived from the bytes, or None if the image is too
+            large for the in-memory tier.
+        """
         image_size = len(data)
         if image_size > cls.IMAGE_CACHE_MAX_SINGLE_BYTES:
-            return
+            return None
+        etag = cls.strong_etag(hashlib.sha256(data).hexdigest())
 
         with cls._image_cache_lock:
             existing = cls._image_cache.pop(token, None)
@@ -392,10 +470,29 @@ class ImageProxyService:
                 "content_type": content_type,
                 "timestamp": time.time(),
                 "size": image_size,
+                "etag": etag,
+                "last_modified": last_modified,
             }
             cls._image_cache.move_to_end(token)
             cls._total_image_bytes += image_size
             cls._enforce_image_cache_limits_locked()
+        return etag
+
+    @staticmethod
+    def strong_etag(digest: str) -> str:
+        """Quote a content digest as a strong HTTP entity tag."""
+        return f'"{digest[:32]}"'
+
+    @classmethod
+    def browser_max_age(cls) -> int:
+        """Browser cache lifetime for proxied images.
+
+        Tokens are stable within a ``TOKEN_BUCKET_SECONDS`` bucket and pages
+        embed a fresh token after that, so a proxy URL is never requested
+        again once its bucket has passed; caching it for the whole bucket
+        costs nothing in freshness.
+        """
+        return cls.TOKEN_BUCKET_SECONDS
 
     @classmethod
     def get_server_headers(
@@ -477,6 +574,34 @@ class ImageProxyService:
             cls._trim_session_cache_locked()
             return session
 
+    @classmethod
+    def forget_server(cls, server_id: int | None = None) -> None:
+        """Drop cached origin, headers and pooled session for an edited server.
+
+        Called by :class:`~app.services.media.client_cache.MediaClientCache`
+        when a server's credentials change; ``None`` forgets every server.
+        """
+        with cls._server_url_cache_lock:
+            if server_id is None:
+                cls._server_url_cache.clear()
+            else:
+                cls._server_url_cache.pop(server_id, None)
+        with cls._server_header_cache_lock:
+            if server_id is None:
+                cls._server_header_cache.clear()
+            else:
+                cls._server_header_cache.pop(server_id, None)
+        with cls._session_cache_lock:
+            keys = [
+                key
+                for key in cls._session_cache
+                if key[0] == "server" and server_id in (None, key[1])
+            ]
+            for key in keys:
+                session = cls._session_cache.pop(key).get("session")
+                if session:
+                    session.close()
+
     @classmethod
     def _session_cache_key(
         cls, url: str, server_id: int | None
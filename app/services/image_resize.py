@@ -0,0 +1,212 @@
+"""
+Thumbnail variants for the image proxy.
+
+Posters are rendered at roughly 200px in the wizard, the now-playing cards and
+the activity grid, yet the proxy used to relay full-resolution artwork. A
+proxy token can now carry a target ``width`` (and ``quality``), and this module
+decides how that variant is produced:
+
+* Plex artwork on the server's own origin goes through Plex's native photo
+  transcoder (``/photo/:/transcode``);
+* Jellyfin and Emby image endpoints accept ``maxWidth``/``quality`` (and, for
+  Jellyfin, ``format=Webp``) directly;
+* anything else is resized locally with Pillow, on a small bounded worker
+  pool so concurrent requests cannot saturate every core. Images Pillow cannot
+  decode are served unchanged.
+
+Output formats are negotiated from the browser's ``Accept`` header; every
+(width, quality, format) combination is cached as its own entry.
+"""
+
+from __future__ import annotations
+
+import io
+import logging
+import os
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from threading import Lock
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+from PIL import Image, features
+
+RESIZE_TIMEOUT = 10.0  # seconds to wait for a pooled resize
+
+_MIME_TYPES = {"webp": "image/webp", "avif": "image/avif", "jpeg": "image/jpeg"}
+_PIL_FORMATS = {"webp": "WEBP", "avif": "AVIF", "jpeg": "JPEG"}
+
+
+@dataclass(frozen=True)
+class ImageVariant:
+    """How to fetch and post-process one sized image request.
+
+    ``key`` distinguishes the variant in the proxy caches; ``local_format``
+    is set when the proxy itself must resize the fetched bytes.
+    """
+
+    fetch_url: str
+    key: str
+    width: int | None = None
+    quality: int | None = None
+    local_format: str | None = None
+    negotiated: bool = False
+
+
+def _pillow_formats() -> list[str]:
+    formats = ["jpeg"]
+    if features.check("webp"):
+        formats.insert(0, "webp")
+    if features.check("avif"):
+        formats.insert(0, "avif")
+    return formats
+
+
+def negotiate_format(accept: str | None, available: list[str]) -> str | None:
+    """Pick the first format in *available* that the ``Accept`` header allows."""
+    accepted = {
+        part.split(";", 1)[0].strip().lower() for part in (accept or "").split(",")
+    }
+    for fmt in available:
+        if fmt != "jpeg" and _MIME_TYPES[fmt] in accepted:
+            return fmt
+    return None
+
+
+def _with_query(url: str, **params: object) -> str:
+    parts = urlsplit(url)
+    query = [
+        (key, value)
+        for key, value in parse_qsl(parts.query, keep_blank_values=True)
+        if key not in params
+    ]
+    query.extend((key, str(value)) for key, value in params.items())
+    return urlunsplit(parts._replace(query=urlencode(query)))
+
+
+def plan_variant(
+    url: str,
+    width: int | None,
+    quality: int | None,
+    *,
+    server_type: str | None,
+    same_origin: bool,
+    accept: str | None,
+) -> ImageVariant:
+    """Choose how to produce *url* at *width* for this browser."""
+    if not width:
+        return ImageVariant(fetch_url=url, key="")
+
+    size_key = f"w{width}q{quality or ''}"
+
+    if same_origin and server_type == "plex":
+        parts = urlsplit(url)
+        path = urlunsplit(("", "", parts.path, parts.query, ""))
+        origin = urlunsplit((parts.scheme, parts.netloc, "", "", ""))
+        params = {
+            "url": path,
+            "width": width,
+            "height": width * 3 // 2,  # Poster aspect ratio; never upscaled
+            "minSize": 1,
+            "upscale": 0,
+        }
+        return ImageVariant(
+            fetch_url=f"{origin}/photo/:/transcode?{urlencode(params)}",
+            key=f"plex:{size_key}",
+            width=width,
+            quality=quality,
+        )
+
+    if same_origin and server_type in {"jellyfin", "emby"}:
+        params: dict[str, object] = {"maxWidth": width}
+        if quality:
+            params["quality"] = quality
+        fmt = None
+        if server_type == "jellyfin":
+            fmt = negotiate_format(accept, ["webp"])
+            if fmt:
+                params["format"] = "Webp"
+        return ImageVariant(
+            fetch_url=_with_query(url, **params),
+            key=f"{server_type}:{size_key}:{fmt or ''}",
+            width=width,
+            quality=quality,
+            negotiated=server_type == "jellyfin",
+        )
+
+    fmt = negotiate_format(accept, _pillow_formats()) or "jpeg"
+    return ImageVariant(
+        fetch_url=url,
+        key=f"local:{size_key}:{fmt}",
+        width=width,
+        quality=quality,
+        local_format=fmt,
+        negotiated=True,
+    )
+
+
+def _resize(data: bytes, width: int, quality: int, fmt: str) -> tuple[bytes, str]:
+    with Image.open(io.BytesIO(data)) as img:
+        img.draft("RGB", (width, width * 3))  # Cheap JPEG downscale on decode
+        if img.width > width:
+            height = max(round(img.height * width / img.width), 1)
+            img = img.resize((width, height), Image.Resampling.LANCZOS)
+        if fmt == "jpeg" and img.mode not in {"RGB", "L"}:
+            img = img.convert("RGB")
+        out = io.BytesIO()
+        img.save(out, format=_PIL_FORMATS[fmt], quality=quality)
+    return out.getvalue(), _MIME_TYPES[fmt]
+
+
+def _max_workers() -> int:
+    try:
+        return max(int(os.getenv("IMAGE_RESIZE_WORKERS", "2")), 1)
+    except ValueError:
+        return 2
+
+
+_executor: ThreadPoolExecutor | None = None
+_executor_lock = Lock()
+
+
+def _get_executor() -> ThreadPoolExecutor:
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(
+                max_workers=_max_workers(), thread_name_prefix="image-resize"
+            )
+        return _executor
+
+
+def resize_image(
+    data: bytes, variant: ImageVariant, default_quality: int = 80
+) -> tuple[bytes, str] | None:
+    """Resize *data* for *variant* on the worker pool.
+
+    Returns ``(bytes, content_type)``, or None when the image could not be
+    decoded or the pool did not finish in time; callers then serve the
+    original bytes.
+    """
+    if not variant.local_format or not variant.width:
+        return None
+    future = _get_executor().submit(
+        _resize,
+        data,
+        variant.width,
+        variant.quality or default_quality,
+        variant.local_format,
+    )
+    try:
+        return future.result(timeout=RESIZE_TIMEOUT)
+    except Exception as exc:
+        future.cancel()
+        logging.warning("Image resize failed: %s", exc)
+        return None
+
+
+__all__ = [
+    "ImageVariant",
+    "negotiate_format",
+    "plan_variant",
+    "resize_image",
+]
@@ -3,18 +3,27 @@ Simple workflow implementations for invitation flows.
 """
 
 import logging
+import os
 from abc import ABC, abstractmethod
 from typing import Any
 
 from flask import session, url_for
 
-from app.models import Invitation, MediaServer
+from app.extensions import db
+from app.models import Invitation, MediaServer, User
+from app.services.expiry import cleanup_expired_user_by_email
+from app.services.media.fanout import fan_out
 from app.services.media.service import get_client_for_media_server
-from app.services.ombi_client import invite_user_to_connections
+from app.services.ombi_client import queue_connection_invites
 
 from .results import InvitationResult, ProcessingStatus, ServerResult
 from .strategies import StrategyFactory
 
+# Join multi-server invites concurrently; set to "false" to go one by one.
+CONCURRENT_PROVISIONING = os.getenv(
+    "INVITE_CONCURRENT_PROVISIONING", "true"
+).strip().lower() not in {"0", "false", "no", "off"}
+
 
 def _get_server_colors(server_type: str | None) -> dict[str, str]:
     """Get color scheme for a specific server type.
@@ -124,109 +133,169 @@ class InvitationWorkflow(ABC):
         form_data: dict[str, Any],
         invitation_code: str,
     ) -> tuple[list[ServerResult], list[ServerResult]]:
-        """Process account creation for multiple servers."""
-        successful = []
-        failed = []
+        """Process account creation for multiple servers.
+
+        Accounts are created on every server first, concurrently when there is
+        more than one, so the invitee waits for the slowest server rather than
+        the sum of all of them. Invitation usage for the servers that succeeded
+        is then recorded in one transaction, and companion-app invites are
+        handed to a background queue.
+        """
+        join_kwargs = {
+            "username": form_data.get("username", ""),
+            "password": form_data.get("password", ""),
+            "confirm": form_data.get("confirm_password", ""),
+            "email": form_data.get("email", ""),
+            "code": invitation_code,
+        }
+
+        if CONCURRENT_PROVISIONING and len(servers) > 1:
+            results = self._join_concurrently(servers, join_kwargs)
+        else:
+            results = [self._join_server(server, join_kwargs) for server in servers]
 
-        for server in servers:
+        successful = [r for r in results if r.success]
+        failed = [r for r in results if not r.success]
+
+        if successful:
             try:
-                client = get_client_for_media_server(server)
-                ok, msg = client.join(
-                    username=form_data.get("username", ""),
-                    password=form_data.get("password", ""),
-                    confirm=form_data.get("confirm_password", ""),
-                    email=form_data.get("email", ""),
-                    code=invitation_code,
+                with db.session.begin_nested():
+                    self._record_invitation_usage(
+                        successful, join_kwargs["username"], invitation_code
+                    )
+            except Exception as e:
+                self.logger.error(
+                    f"Failed to record invitation {invitation_code} usage: {e}"
                 )
-
-                result = ServerResult(
-                    server=server, success=ok, message=msg, user_created=ok
+            # One commit for the usage and the local rows of concurrent joins.
+            try:
+                db.session.commit()
+            except Exception as e:
+                db.session.rollback()
+                self.logger.error(
+                    f"Failed to save invitation {invitation_code} results: {e}"
                 )
 
-                if ok:
-                    successful.append(result)
-
-                    # Mark invitation as used for this server
-                    from app.models import Invitation
-                    from app.services.invites import mark_server_used
-
-                    invitation = Invitation.query.filter_by(
-                        code=invitation_code
-                    ).first()
-                    if invitation:
-                        # Find the user that was created for this server
-                        # Flush and commit to ensure we can see the newly created user
-                        from app.extensions import db
-                        from app.models import User
-
-                        db.session.flush()
-                        db.session.commit()
-
-                        user = User.query.filter_by(
-                            username=form_data.get("username"), server_id=server.id
-                        ).first()
-
-                        # If user not found, log debug info
-                        if not user:
-                            import logging
-
-                            all_users_for_server = User.query.filter_by(
-                                server_id=server.id
-                            ).all()
-                            all_users_with_code = User.query.filter_by(
-                                code=invitation_code
-                            ).all()
-                            logging.error(
-                                f"User lookup failed for code={invitation_code}, server_id={server.id}. "
-                                f"Server has {len(all_users_for_server)} users, "
-                                f"code has {len(all_users_with_code)} users globally."
-                            )
-                        # Only set used_by for unlimited invites if not already set
-                        # For limited invites, used_by should track the single user
-                        if user and (
-                            not invitation.unlimited or not invitation.used_by
-                        ):
-                            invitation.used_by = user  # type: ignore
-                        mark_server_used(invitation, server.id, user)
-
-                    # Invite user to connected external services (Ombi/Overseerr)
-                    try:
-                        connection_results = invite_user_to_connections(
-                            username=form_data.get("username", ""),
-                            email=form_data.get("email", ""),
-                            server_id=server.id,
-                            password=form_data.get("password", ""),
-                        )
-
-                        # Log connection results for debugging
-                        for conn_result in connection_results:
-                            if conn_result["status"] == "success":
-                                self.logger.info(
-                                    f"User {form_data.get('username')} invited to {conn_result['connection_name']}"
-                                )
-                            elif conn_result["status"] == "error":
-                                self.logger.warning(
-                                    f"Failed to invite user to {conn_result['connection_name']}: {conn_result['message']}"
-                                )
-                    except Exception as e:
-                        self.logger.error(
-                            f"Error inviting user to connections for server {server.name}: {e}"
-                        )
-                else:
-                    failed.append(result)
+            queue_connection_invites(
+                username=join_kwargs["username"],
+                email=join_kwargs["email"],
+                server_ids=[r.server.id for r in successful],
+                password=join_kwargs["password"],
+            )
 
-            except Exception as e:
-                self.logger.error(f"Failed to process server {server.name}: {e}")
-                failed.append(
+        return successful, failed
+
+    def _join_server(
+        self, server: MediaServer, join_kwargs: dict[str, str]
+    ) -> ServerResult:
+        """Create the account on one server in the request thread."""
+        try:
+            client = get_client_for_media_server(server)
+            ok, msg = client.join(**join_kwargs)
+            # Make the new local user visible to the bookkeeping step
+            db.session.commit()
+        except Exception as e:
+            db.session.rollback()
+            self.logger.error(f"Failed to process server {server.name}: {e}")
+            return ServerResult(
+                server=server,
+                success=False,
+                message=f"Error: {e!s}",
+                user_created=False,
+            )
+        return ServerResult(server=server, success=ok, message=msg, user_created=ok)
+
+    def _join_concurrently(
+        self, servers: list[MediaServer], join_kwargs: dict[str, str]
+    ) -> list[ServerResult]:
+        """Create the account on every server at once via :func:`fan_out`.
+
+        Workers only create the remote accounts; the local ``User`` rows they
+        would write come back as data and are added here, on the request
+        thread, for ``_process_servers`` to commit with the invitation usage.
+        """
+        # Expired-user cleanup deletes shared rows; do it once, up front, and
+        # commit so the workers' duplicate-user checks no longer see them.
+        cleanup_expired_user_by_email(join_kwargs["email"])
+        db.session.commit()
+
+        # No deadline: a join that finished after we stopped waiting would
+        # leave an account on the server with no invitation bookkeeping.
+        outcome = fan_out(
+            servers,
+            lambda client, _server: client.join_remote(**join_kwargs),
+            timeout=None,
+        )
+
+        results = []
+        for server in servers:
+            if server.id in outcome.results:
+                ok, msg, rows = outcome.results[server.id]
+                if ok and (error := self._add_joined_users(server, rows)):
+                    ok, msg = False, f"Error: {error}"
+                results.append(
+                    ServerResult(
+                        server=server, success=ok, message=msg, user_created=ok
+                    )
+                )
+            else:
+                error = outcome.errors.get(server.id, "no response")
+                self.logger.error(f"Failed to process server {server.name}: {error}")
+                results.append(
                     ServerResult(
                         server=server,
                         success=False,
-                        message=f"Error: {e!s}",
+                        message=f"Error: {error}",
                         user_created=False,
                     )
                 )
-
-        return successful, failed
+        return results
+
+    def _add_joined_users(
+        self, server: MediaServer, rows: list[tuple[dict, bool]]
+    ) -> str | None:
+        """Add one server's joined users in a savepoint; the caller commits.
+
+        Returns the error message when the rows could not be added.
+        """
+        try:
+            with db.session.begin_nested():
+                get_client_for_media_server(server).add_joined_users(rows)
+        except Exception as e:
+            self.logger.error(f"Failed to save the user for server {server.name}: {e}")
+            return str(e)
+        return None
+
+    def _record_invitation_usage(
+        self, successful: list[ServerResult], username: str, invitation_code: str
+    ) -> None:
+        """Mark the invitation used on every successful server; the caller commits."""
+        from app.services.invites import mark_server_used
+
+        invitation = Invitation.query.filter_by(code=invitation_code).first()
+        if not invitation:
+            return
+
+        server_ids = [r.server.id for r in successful]
+        users = {
+            u.server_id: u
+            for u in User.query.filter(
+                User.username == username, User.server_id.in_(server_ids)
+            )
+        }
+
+        for server_id in server_ids:
+            user = users.get(server_id)
+            if not user:
+                self.logger.error(
+                    f"User lookup failed for code={invitation_code}, "
+                    f"server_id={server_id}."
+                )
+            # Only set used_by for unlimited invites if not already set
+            # For limited invites, used_by should track the single user
+            if user and (not invitation.unlimited or not invitation.used_by):
+                invitation.used_by = user  # type: ignore
+            mark_server_used(invitation, server_id, user, commit=False)
 
     def _validate_join_form(
         self, form_data: dict[str, Any]
@@ -602,28 +671,10 @@ class MixedWorkflow(InvitationWorkflow):
                 )
             form_data = validated_data
 
-        # Process all servers
-        all_successful = []
-        all_failed = []
-
-        # Process Plex servers with OAuth token
-        if plex_servers:
-            plex_data = dict(form_data)
-            plex_data["oauth_token"] = plex_token
-
-            plex_successful, plex_failed = self._process_servers(
-                plex_servers, plex_data, invitation.code
-            )
-            all_successful.extend(plex_successful)
-            all_failed.extend(plex_failed)
-
-        # Process other servers with form data
-        if other_servers:
-            other_successful, other_failed = self._process_servers(
-                other_servers, form_data, invitation.code
-            )
-            all_successful.extend(other_successful)
-            all_failed.extend(other_failed)
+        # Provision Plex and local servers in one pass so they run concurrently
+        all_successful, all_failed = self._process_servers(
+            plex_servers + other_servers, form_data, invitation.code
+        )
 
         if all_successful:
             return self._create_success_result(invitation, all_successful, all_failed)
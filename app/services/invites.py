@@ -211,7 +211,11 @@ def create_invite(form: Any) -> Invitation:
 
 
 def mark_server_used(
-    inv: Invitation, server_id: int, user: "User | None" = None
+    inv: Invitation,
+    server_id: int,
+    user: "User | None" = None,
+    *,
+    commit: bool = True,
 ) -> None:
     """Mark the invitation as used for a specific server.
 
@@ -223,6 +227,9 @@ def mark_server_used(
 
     After marking as used, it syncs users from the media server to ensure the
     newly created user appears in the users list.
+
+    Pass ``commit=False`` to leave the changes in the session so several
+    servers can be recorded in one transaction.
     """
     db.session.execute(
         invitation_servers.update()
@@ -312,4 +319,5 @@ def mark_server_used(
         inv.used = True
         inv.used_at = datetime.datetime.now(datetime.UTC)
 
-    db.session.commit()
+    if commit:
+        db.session.commit()
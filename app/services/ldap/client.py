@@ -1,8 +1,10 @@
 import logging
 import ssl
+from collections.abc import Iterator
+from contextlib import contextmanager
 from typing import Any
 
-from ldap3 import ALL, BASE, MODIFY_REPLACE, SUBTREE, Connection, Server, Tls
+from ldap3 import BASE, MODIFY_REPLACE, NONE, SUBTREE, Connection, Server, Tls
 from ldap3.core.exceptions import (
     LDAPBindError,
     LDAPException,
@@ -23,6 +25,7 @@ class LDAPClient:
     def __init__(self, config: LDAPConfiguration):
         self.config = config
         self._server = self._create_server()
+        self._shared_conn: Connection | None = None
 
     def _create_server(self) -> Server:
         tls_config = None
@@ -34,7 +37,9 @@ class LDAPClient:
             self.config.server_url,
             use_ssl=self.config.use_tls,
             tls=tls_config,
-            get_info=ALL,
+            # Reading the root DSE and schema costs extra round trips on every
+            # bind and nothing here relies on schema-typed attribute values.
+            get_info=NONE,
         )
 
     def build_user_dn(self, username: str) -> str:
@@ -138,8 +143,7 @@ class LDAPClient:
             logger.exception("Error searching for user DN")
             return None
         finally:
-            if conn:
-                conn.unbind()
+            self._release(conn)
 
     def _fetch_user_attributes(self, conn: Connection, user_dn: str) -> dict:
         attributes = [
@@ -201,8 +205,7 @@ class LDAPClient:
             logger.exception("Error creating/updating LDAP user")
             return False, f"LDAP error: {e}"
         finally:
-            if conn:
-                conn.unbind()
+            self._release(conn)
 
     def _update_existing_user(
         self,
@@ -308,8 +311,7 @@ class LDAPClient:
             logger.exception("Error deleting LDAP user: %s", user_dn)
             return False, f"LDAP error: {e}"
         finally:
-            if conn:
-                conn.unbind()
+            self._release(conn)
 
     def change_password(self, user_dn: str, new_password: str) -> tuple[bool, str]:
         if not user_dn:
@@ -342,8 +344,7 @@ class LDAPClient:
             logger.exception("Error changing LDAP user password: %s", user_dn)
             return False, f"LDAP error: {e}"
         finally:
-            if conn:
-                conn.unbind()
+            self._release(conn)
 
     def search_groups(self) -> list[dict]:
         if not self.config.group_base_dn:
@@ -397,8 +398,7 @@ class LDAPClient:
             logger.exception("Error searching LDAP groups: %s", e)
             return []
         finally:
-            if conn:
-                conn.unbind()
+            self._release(conn)
 
     def get_user_groups(self, user_dn: str) -> list[dict]:
         """Get groups where user is a member. Requires group_base_dn."""
@@ -441,11 +441,65 @@ class LDAPClient:
             logger.exception("Error fetching user groups")
             return []
         finally:
+            self._release(conn)
+
+    @contextmanager
+    def shared_connection(self) -> Iterator[Connection | None]:
+        """Bind the service account once and reuse it for every call inside.
+
+        Bulk operations such as user sync would otherwise open and bind a new
+        connection for each lookup. Yields ``None`` if the bind fails.
+        """
+        if self._shared_conn is not None:
+            yield self._shared_conn
+            return
+
+        self._shared_conn = self.service_connection()
+        try:
+            yield self._shared_conn
+        finally:
+            conn, self._shared_conn = self._shared_conn, None
             if conn:
                 conn.unbind()
 
+    def _release(self, conn: Connection | None) -> None:
+        """Unbind *conn* unless it is the connection shared by the caller."""
+        if conn and conn is not self._shared_conn:
+            conn.unbind()
+
+    def paged_search(
+        self,
+        conn: Connection,
+        search_filter: str,
+        attributes: list[str],
+        page_size: int,
+    ) -> Iterator[dict[str, Any]]:
+        """Yield user entries page by page using Simple Paged Results (RFC 2696).
+
+        Raises ``LDAPException`` if the server rejects any page of the search.
+        """
+        for response in conn.extend.standard.paged_search(
+            search_base=self.config.user_base_dn,
+            search_filter=search_filter,
+            search_scope=SUBTREE,
+            attributes=attributes,
+            paged_size=page_size,
+            generator=True,
+        ):
+            if response.get("type") == "searchResEntry":
+                yield response
+
+        if conn.result and conn.result.get("result") != 0:
+            raise LDAPException(f"LDAP search failed: {conn.result}")
+
     def service_connection(self) -> Connection | None:
-        """Create an authenticated connection using the service account."""
+        """Create an authenticated connection using the service account.
+
+        Inside :meth:`shared_connection` the shared connection is returned.
+        """
+        if self._shared_conn is not None:
+            return self._shared_conn
+
         try:
             if not self.config.service_account_dn:
                 logger.error("Service account DN not configured")
@@ -2,8 +2,13 @@
 
 import logging
 import uuid
+from collections.abc import Iterator
+from datetime import UTC, datetime
 from typing import Any
 
+from ldap3 import Connection
+from ldap3.core.exceptions import LDAPException
+
 from app.extensions import db
 from app.models import LDAPConfiguration, User
 from app.services.ldap.client import LDAPClient
@@ -11,49 +16,89 @@ from app.services.ldap.client import LDAPClient
 logger = logging.getLogger(__name__)
 
 
+# Entries per page of a paged search. Active Directory caps pages at 1000
+# (MaxPageSize) by default, so stay well below that.
+SYNC_PAGE_SIZE = 500
+
+# Usernames per ``IN (...)`` lookup, below SQLite's bound-parameter limit.
+EXISTING_LOOKUP_CHUNK = 500
+
+
+def _entry_value(attributes: dict[str, Any], name: str) -> Any:
+    value = attributes.get(name)
+    if isinstance(value, list):
+        return value[0] if value else None
+    return value
+
+
+def _parse_timestamp(value: Any) -> datetime | None:
+    """Parse an LDAP GeneralizedTime into an aware UTC datetime."""
+    if isinstance(value, datetime):
+        if value.tzinfo is None:
+            return value.replace(tzinfo=UTC)
+        return value.astimezone(UTC)
+    if not value:
+        return None
+    # Directories report modifyTimestamp in UTC ("20260101120000Z" or, on
+    # Active Directory, "20260101120000.0Z"); the first 14 digits suffice.
+    try:
+        return datetime.strptime(f"{str(value)[:14]}+0000", "%Y%m%d%H%M%S%z")
+    except ValueError:
+        return None
+
+
+def iter_ldap_users(
+    client: LDAPClient,
+    conn: Connection,
+    since: datetime | None = None,
+    page_size: int | None = None,
+) -> Iterator[dict[str, Any]]:
+    """Yield users from the directory, fetched one page at a time.
+
+    With *since*, only entries whose ``modifyTimestamp`` is at or after it are
+    returned. Each user dict carries ``username``, ``email``, ``dn`` and
+    ``modified`` (the parsed ``modifyTimestamp``, if the server exposes it).
+    """
+    config = client.config
+    search_filter = f"(objectClass={config.user_object_class})"
+    if since is not None:
+        search_filter = f"(&{search_filter}(modifyTimestamp>={since:%Y%m%d%H%M%S}Z))"
+
+    attributes = [config.username_attribute, config.email_attribute]
+    for response in client.paged_search(
+        conn,
+        search_filter,
+        [*attributes, "modifyTimestamp"],
+        page_size or SYNC_PAGE_SIZE,
+    ):
+        entry = response.get("attributes") or {}
+        username = _entry_value(entry, config.username_attribute)
+        if not username:
+            continue
+        email = _entry_value(entry, config.email_attribute)
+        yield {
+            "username": str(username),
+            "email": str(email) if email else "",
+            "dn": str(response.get("dn", "")),
+            "modified": _parse_timestamp(_entry_value(entry, "modifyTimestamp")),
+        }
+
+
 def list_ldap_users() -> tuple[bool, list[dict[str, Any]] | str]:
-    conn = None
     try:
         ldap_config = LDAPConfiguration.query.filter_by(enabled=True).first()
         if not ldap_config:
             return False, "LDAP is not configured"
 
         client = LDAPClient(ldap_config)
-        conn = client.service_connection()
-        if not conn:
-            return False, "Cannot connect to LDAP server"
-
-        # Search for all users
-        search_filter = f"(objectClass={ldap_config.user_object_class})"
-        success = conn.search(
-            search_base=ldap_config.user_base_dn,
-            search_filter=search_filter,
-            attributes=[
-                ldap_config.username_attribute,
-                ldap_config.email_attribute,
-            ],
-        )
+        with client.shared_connection() as conn:
+            if not conn:
+                return False, "Cannot connect to LDAP server"
 
-        if not success:
-            return False, f"LDAP search failed: {conn.result}"
-
-        users = []
-        for entry in conn.entries:
-            username = getattr(entry, ldap_config.username_attribute, None)
-            email = getattr(entry, ldap_config.email_attribute, None)
-
-            # Get the value (ldap3 returns single values directly)
-            username = username.value if hasattr(username, "value") else username
-            email = email.value if hasattr(email, "value") else email
-
-            if username:
-                users.append(
-                    {
-                        "username": str(username),
-                        "email": str(email) if email else "",
-                        "dn": str(entry.entry_dn),
-                    }
-                )
+            users = [
+                {key: user[key] for key in ("username", "email", "dn")}
+                for user in iter_ldap_users(client, conn)
+            ]
 
         logger.info("Found %d users in LDAP", len(users))
         return True, users
@@ -61,9 +106,101 @@ def list_ldap_users() -> tuple[bool, list[dict[str, Any]] | str]:
     except Exception as e:
         logger.exception("Error listing LDAP users")
         return False, f"Error: {e}"
-    finally:
-        if conn:
-            conn.unbind()
+
+
+def _existing_usernames(usernames: list[str]) -> set[str]:
+    existing: set[str] = set()
+    for start in range(0, len(usernames), EXISTING_LOOKUP_CHUNK):
+        chunk = usernames[start : start + EXISTING_LOOKUP_CHUNK]
+        existing.update(
+            name
+            for (name,) in db.session.query(User.username).filter(
+                User.username.in_(chunk)
+            )
+        )
+    return existing
+
+
+def _collect_directory_users(
+    client: LDAPClient, conn: Connection, since: datetime | None
+) -> tuple[dict[str, str], int, datetime | None]:
+    """Return ``{username: email}``, the entry count and the newest timestamp."""
+    users: dict[str, str] = {}
+    checked = 0
+    newest = since
+    for user in iter_ldap_users(client, conn, since):
+        checked += 1
+        users.setdefault(user["username"], user["email"])
+        modified = user["modified"]
+        if modified is not None and (newest is None or modified > newest):
+            newest = modified
+    return users, checked, newest
+
+
+def sync_ldap_directory(
+    incremental: bool = False,
+) -> tuple[bool, dict[str, int] | str]:
+    """Import every directory user that is not in Wizarr yet.
+
+    The directory is read through one service connection with a paged search,
+    existing usernames are looked up in batches, and all new users are
+    inserted in a single commit. With *incremental*, only entries modified
+    since the previous sync's high-water mark are searched; directories that
+    cannot filter on ``modifyTimestamp`` fall back to a full search.
+
+    Returns counts of ``checked`` entries, ``imported`` and ``skipped`` users.
+    """
+    try:
+        ldap_config = LDAPConfiguration.query.filter_by(enabled=True).first()
+        if not ldap_config:
+            return False, "LDAP is not configured"
+
+        since = None
+        if incremental and ldap_config.users_synced_until is not None:
+            since = ldap_config.users_synced_until.replace(tzinfo=UTC)
+        client = LDAPClient(ldap_config)
+        with client.shared_connection() as conn:
+            if not conn:
+                return False, "Cannot connect to LDAP server"
+
+            try:
+                users, checked, newest = _collect_directory_users(client, conn, since)
+            except LDAPException:
+                if since is None:
+                    raise
+                logger.warning(
+                    "Incremental LDAP search failed, falling back to a full sync",
+                    exc_info=True,
+                )
+                users, checked, newest = _collect_directory_users(client, conn, None)
+
+        existing = _existing_usernames(list(users))
+        new_users = [
+            User(
+                username=username,
+                email=email,
+                token=str(uuid.uuid4()),
+                code="",
+                is_ldap_user=True,
+            )
+            for username, email in users.items()
+            if username not in existing
+        ]
+        db.session.add_all(new_users)
+        if newest is not None:
+            ldap_config.users_synced_until = newest
+        db.session.commit()
+
+        return True, {
+            "checked": checked,
+            "imported": len(new_users),
+            "skipped": len(users) - len(new_users),
+        }
+
+    except Exception as e:
+        db.session.rollback()
+        logger.exception("Error syncing LDAP users")
+        return False, f"Error: {e}"
 
 
 def import_ldap_user(username: str) -> tuple[bool, str]:
@@ -77,17 +214,16 @@ def import_ldap_user(username: str) -> tuple[bool, str]:
         if existing_user:
             return False, f"User {username} already exists in Wizarr"
 
-        # Verify user exists in LDAP and fetch attributes
+        # Verify user exists in LDAP and fetch attributes over one bind
         client = LDAPClient(ldap_config)
-        user_dn = client.find_user_dn(username)
-        if not user_dn:
-            return False, f"User {username} not found in LDAP"
+        with client.shared_connection() as conn:
+            if not conn:
+                return False, "Cannot connect to LDAP server"
 
-        conn = client.service_connection()
-        if not conn:
-            return False, "Cannot connect to LDAP server"
+            user_dn = client.find_user_dn(username)
+            if not user_dn:
+                return False, f"User {username} not found in LDAP"
 
-        try:
             conn.search(
                 search_base=user_dn,
                 search_filter="(objectClass=*)",
@@ -103,8 +239,6 @@ def import_ldap_user(username: str) -> tuple[bool, str]:
             entry = conn.entries[0]
             email_attr = getattr(entry, ldap_config.email_attribute, None)
             email = email_attr.value if hasattr(email_attr, "value") else email_attr
-        finally:
-            conn.unbind()
 
         # Create User record without server association
         new_user = User(
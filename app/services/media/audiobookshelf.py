@@ -11,6 +11,7 @@ from sqlalchemy import or_
 
 from app.extensions import db
 from app.models import Invitation, Library, User
+from app.services.image_proxy import ImageProxyService
 from app.services.invites import is_invite_valid
 
 from .client_base import RestApiMixin, register_media_client
@@ -237,7 +238,10 @@ class AudiobookshelfClient(RestApiMixin):
                                     )
 
                                     # Generate secure proxy URL with opaque token
-                                    thumb_url = self.generate_image_proxy_url(cover_url)
+                                    thumb_url = self.generate_image_proxy_url(
+                                        cover_url,
+                                        width=ImageProxyService.THUMBNAIL_WIDTH,
+                                    )
 
                                     # Extract metadata
                                     metadata = media.get("metadata", {})
@@ -296,10 +300,6 @@ class AudiobookshelfClient(RestApiMixin):
 
     # --- users ---------------------------------------------------------
 
-    def _get_server_users(self) -> list[User]:
-        """Get all users for this server from database."""
-        return User.query.filter(User.server_id == self.server_id).all()
-
     def _extract_abs_permissions(self, abs_user: dict) -> dict[str, bool]:
         """Extract all permissions from an Audiobookshelf user object."""
         permissions = abs_user.get("permissions", {}) or {}
@@ -318,46 +318,51 @@ class AudiobookshelfClient(RestApiMixin):
             "allow_camera_upload": False,  # ABS doesn't have camera upload
         }
 
-    def _get_user_library_access(self, abs_user: dict) -> tuple[list[str] | None, bool]:
-        """Extract library access: (library_names | None, has_full_access)."""
+    def _get_user_library_access(
+        self, abs_user: dict, libraries: dict[str, str] | None = None
+    ) -> tuple[list[str] | None, bool]:
+        """Extract library access: (library_names | None, has_full_access).
+
+        *libraries* maps external ids to names; pass it when syncing many users
+        so the library table is read once rather than per library.
+        """
         if (abs_user.get("permissions", {}) or {}).get("accessAllLibraries", False):
             return None, True
 
         if not (accessible_libs := abs_user.get("librariesAccessible", []) or []):
             return [], False
 
+        if libraries is None:
+            libraries = self._library_names_by_external_id()
         library_names = [
-            lib.name
-            for lib_id in accessible_libs
-            if (
-                lib := Library.query.filter_by(
-                    external_id=lib_id, server_id=self.server_id
-                ).first()
-            )
+            libraries[lib_id] for lib_id in accessible_libs if lib_id in libraries
         ]
         return library_names, False
 
-    def _sync_user_permissions(self, user: User, abs_user: dict) -> None:
+    def _sync_user_permissions(
+        self, user: User, abs_user: dict, libraries: dict[str, str] | None = None
+    ) -> None:
         """Sync permissions and library access from Audiobookshelf to database user."""
-        user.username = abs_user.get("username", user.username)
-        user.email = abs_user.get("email", user.email)
-
-        # Store permissions in SQL columns
         perms = self._extract_abs_permissions(abs_user)
-        user.is_admin = perms["is_admin"]
-        user.allow_downloads = perms["allow_downloads"]
-        user.allow_live_tv = perms["allow_live_tv"]
-        user.allow_camera_upload = perms["allow_camera_upload"]
+        self._assign_changed(
+            user,
+            username=abs_user.get("username", user.username),
+            email=abs_user.get("email", user.email),
+            # Store permissions in SQL columns
+            is_admin=perms["is_admin"],
+            allow_downloads=perms["allow_downloads"],
+            allow_live_tv=perms["allow_live_tv"],
+            allow_camera_upload=perms["allow_camera_upload"],
+        )
 
         # Store library access
-        library_names, has_full_access = self._get_user_library_access(abs_user)
+        library_names, has_full_access = self._get_user_library_access(
+            abs_user, libraries
+        )
         user.set_accessible_libraries(library_names if not has_full_access else None)
 
-    def list_users(self) -> list[User]:
-        """Sync users from Audiobookshelf to database with all permissions and library access."""
-        if not self.server_id:
-            return []
-
+    def fetch_remote_users(self) -> dict[str, dict] | None:
+        """Read Audiobookshelf users keyed by their ABS id."""
         try:
             response = self.get(f"{self.API_PREFIX}/users")
             response.raise_for_status()
@@ -365,46 +370,30 @@ class AudiobookshelfClient(RestApiMixin):
             raw_users = data if isinstance(data, list) else data.get("users", [])
         except Exception as exc:
             logging.warning("ABS: failed to list users – %s", exc)
-            return self._get_server_users()
-
-        abs_users_by_id = {u["id"]: u for u in raw_users}
+            return None
+        return {u["id"]: u for u in raw_users}
 
+    def apply_remote_users(self, remote_users: dict[str, dict]) -> None:
+        """Sync Audiobookshelf users to the database with permissions and library access."""
         known_users = self._get_server_users()
-        if self._skip_prune_on_empty_remote(not abs_users_by_id, known_users):
-            return known_users
-
-        # Remove users no longer in Audiobookshelf, add new users
-        for db_user in known_users:
-            if db_user.token not in abs_users_by_id:
-                db.session.delete(db_user)
-
-        for uid, abs_user in abs_users_by_id.items():
-            if not User.query.filter_by(token=uid, server_id=self.server_id).first():
-                db.session.add(
-                    User(
-                        token=uid,
-                        username=abs_user.get("username", "abs-user"),
-                        email=abs_user.get("email", ""),
-                        code="empty",
-                        server_id=self.server_id,
-                    )
-                )
-
-        # Sync all permissions and library access
-        for user in self._get_server_users():
-            if abs_user := abs_users_by_id.get(user.token):
-                self._sync_user_permissions(user, abs_user)
-
-        try:
-            db.session.commit()
-            logging.info(
-                f"Synced {len(abs_users_by_id)} Audiobookshelf users to database"
-            )
-        except Exception as e:
-            logging.error(f"Failed to sync Audiobookshelf user metadata: {e}")
-            db.session.rollback()
+        if self._skip_prune_on_empty_remote(not remote_users, known_users):
+            return
 
-        return self._get_server_users()
+        libraries = self._library_names_by_external_id()
+        self._reconcile_users(
+            remote_users,
+            known_users,
+            build_user=lambda uid, abs_user: User(
+                token=uid,
+                username=abs_user.get("username", "abs-user"),
+                email=abs_user.get("email", ""),
+                code="empty",
+                server_id=self.server_id,
+            ),
+            sync_user=lambda user, abs_user: self._sync_user_permissions(
+                user, abs_user, libraries
+            ),
+        )
 
     # --- user management ------------------------------------------------
 
@@ -863,15 +852,17 @@ class AudiobookshelfClient(RestApiMixin):
             )
 
             # Store locally
-            local = User(
-                token=user_id,
-                username=username,
-                email=email,
-                code=code,
-                expires=expires,
-                server_id=server_id,
+            self._add_joined_user(
+                {
+                    "token": user_id,
+                    "username": username,
+                    "email": email,
+                    "code": code,
+                    "expires": expires,
+                    "server_id": server_id,
+                },
+                link_identity=False,
             )
-            db.session.add(local)
             db.session.commit()
 
             return True, ""
@@ -12,12 +12,12 @@ from __future__ import annotations
 
 import logging
 from abc import ABC, abstractmethod
-from typing import TYPE_CHECKING
-
-import requests
+from collections.abc import Callable
+from typing import TYPE_CHECKING, Any
 
 from app.extensions import db
-from app.models import MediaServer, Settings, User
+from app.models import Library, MediaServer, Settings, User
+from app.services.media.http_pool import HttpSessionRegistry
 from app.services.notifications import notify
 
 if TYPE_CHECKING:
@@ -67,6 +67,9 @@ class MediaClient(ABC):
     url: str | None
     token: str | None
 
+    # Local rows held back by join_remote(); None outside of it.
+    _deferred_users: list[tuple[dict, bool]] | None = None
+
     # NOTE: keep *url_key* & *token_key* keyword arguments so older subclass
     # calls (e.g. super().__init__(url_key="server_url")) continue to work.
 
@@ -141,12 +144,66 @@ class MediaClient(ABC):
             return True
         return False
 
-    def generate_image_proxy_url(self, image_url: str) -> str:
+    def _reconcile_users(
+        self,
+        remote_users: dict[str, dict],
+        known_users: list[User],
+        build_user: Callable[[str, dict], User],
+        sync_user: Callable[[User, dict], None],
+        key_attr: str = "token",
+    ) -> None:
+        """Apply a remote user set to this server's local ``User`` rows.
+
+        *known_users* is the single prefetch of local rows; the diff happens
+        in memory, so a sync costs a constant number of queries instead of a
+        lookup per remote user. *remote_users* is keyed by the ``User``
+        attribute named *key_attr*. Rows missing upstream are deleted, new
+        remote users are added, and *sync_user* is applied to every remaining
+        user. Callers commit.
+        """
+        known_by_key = {getattr(user, key_attr): user for user in known_users}
+        for user in known_users:
+            if getattr(user, key_attr) not in remote_users:
+                db.session.delete(user)
+
+        for key, remote in remote_users.items():
+            user = known_by_key.get(key)
+            if user is None:
+                user = build_user(key, remote)
+                db.session.add(user)
+            sync_user(user, remote)
+
+    def _library_names_by_external_id(self) -> dict[str, str]:
+        """Map this server's library external ids to names in one query."""
+        return dict(
+            db.session.query(Library.external_id, Library.name).filter(
+                Library.server_id == getattr(self, "server_id", None)
+            )
+        )
+
+    @staticmethod
+    def _assign_changed(obj, **values) -> bool:
+        """Set only the attributes whose value differs.
+
+        Assigning an equal value still puts the row in ``session.dirty``, which
+        triggers flush-time cache invalidation and update bookkeeping for
+        nothing. Returns True when anything changed.
+        """
+        changed = False
+        for name, value in values.items():
+            if getattr(obj, name) != value:
+                setattr(obj, name, value)
+                changed = True
+        return changed
+
+    def generate_image_proxy_url(self, image_url: str, width: int | None = None) -> str:
         """
         Generate a secure proxy URL for an image.
 
         Args:
             image_url: The raw image URL from the media server
+            width: Optional thumbnail width; the proxy then serves a resized
+                variant instead of full-resolution artwork
 
         Returns:
             Secure proxy URL with opaque token: /image-proxy?token=xxx
@@ -156,7 +213,9 @@ class MediaClient(ABC):
         from app.services.image_proxy import ImageProxyService
 
         # Generate opaque token for this URL
-        token = ImageProxyService.generate_token(image_url, server_id=self.server_id)
+        token = ImageProxyService.generate_token(
+            image_url, server_id=self.server_id, width=width
+        )
 
         # Return proxy URL with token
         return f"/image-proxy?token={quote_plus(token)}"
@@ -212,6 +271,50 @@ class MediaClient(ABC):
         db.session.add(new_user)
         return new_user
 
+    def _add_joined_user(
+        self, user_kwargs: dict, *, link_identity: bool = True
+    ) -> User:
+        """Add the local ``User`` row for an account a join just created.
+
+        Under :meth:`join_remote` the row is recorded for the caller instead
+        and a transient ``User`` is returned.
+        """
+        if self._deferred_users is not None:
+            self._deferred_users.append((dict(user_kwargs), link_identity))
+            return User(**user_kwargs)
+        if link_identity:
+            return self._create_user_with_identity_linking(user_kwargs)
+        new_user = User(**user_kwargs)
+        db.session.add(new_user)
+        return new_user
+
+    def join_remote(
+        self,
+        username: str,
+        password: str,
+        confirm: str,
+        email: str,
+        code: str,
+    ) -> tuple[bool, str, list[tuple[dict, bool]]]:
+        """Run :meth:`join` without writing its local ``User`` rows.
+
+        The account is created on the server as usual, but the rows the join
+        would add are returned as plain data for :meth:`add_joined_users`, so
+        several joins can run on worker threads while a single thread writes
+        the database.
+        """
+        self._deferred_users = []
+        try:
+            ok, msg = self.join(username, password, confirm, email, code)
+            return ok, msg, self._deferred_users
+        finally:
+            self._deferred_users = None
+
+    def add_joined_users(self, rows: list[tuple[dict, bool]]) -> None:
+        """Write the rows returned by :meth:`join_remote`. Callers commit."""
+        for user_kwargs, link_identity in rows:
+            self._add_joined_user(user_kwargs, link_identity=link_identity)
+
     @abstractmethod
     def libraries(self):
         raise NotImplementedError
@@ -412,11 +515,46 @@ class MediaClient(ABC):
         # Default implementation uses token (works for most servers)
         return user.token if user.token else None
 
-    @abstractmethod
-    def list_users(self, *args, **kwargs):
-        """Return a list of users for this media server. Subclasses must implement."""
+    def fetch_remote_users(self) -> dict[str, Any] | None:
+        """Read this server's users upstream, keyed like ``apply_remote_users``.
+
+        Network only: ``list_users_all_servers`` calls this on fan-out worker
+        threads, so it must not touch the database. Returns None when the
+        server could not be read.
+        """
         raise NotImplementedError
 
+    def apply_remote_users(self, remote_users: dict[str, Any]) -> None:
+        """Reconcile a ``fetch_remote_users`` result into local rows.
+
+        Database only and runs on the caller's thread. Callers commit.
+        """
+        raise NotImplementedError
+
+    def _get_server_users(self) -> list[User]:
+        """Get all users for this server from database."""
+        return User.query.filter(
+            User.server_id == getattr(self, "server_id", None)
+        ).all()
+
+    def list_users(self) -> list[User]:
+        """Sync users from this server into the local DB and return its rows."""
+        if not getattr(self, "server_id", None):
+            return []
+
+        remote_users = self.fetch_remote_users()
+        if remote_users is None:
+            return self._get_server_users()
+
+        self.apply_remote_users(remote_users)
+        try:
+            db.session.commit()
+        except Exception as e:
+            logging.error("%s: failed to sync users – %s", type(self).__name__, e)
+            db.session.rollback()
+
+        return self._get_server_users()
+
     @abstractmethod
     def now_playing(self):
         """Return a list of currently playing sessions for this media server.
@@ -666,7 +804,7 @@ class RestApiMixin(MediaClient):
         }
 
     # ------------------------------------------------------------------
-    # Thin wrappers around ``requests`` so subclasses never import it
+    # Thin wrappers around pooled ``requests`` sessions
     # ------------------------------------------------------------------
 
     def _request(self, method: str, path: str, **kwargs):
@@ -679,8 +817,14 @@ class RestApiMixin(MediaClient):
 
         logging.info("%s %s", method.upper(), url)
         try:
-            response = requests.request(
-                method, url, headers=headers, timeout=60, **kwargs
+            # Pooled keep-alive session per server instead of a new connection
+            # per call; see HttpSessionRegistry for timeouts and retries.
+            response = HttpSessionRegistry.request(
+                method,
+                url,
+                server_id=getattr(self, "server_id", None),
+                headers=headers,
+                **kwargs,
             )
             logging.info("→ %s", response.status_code)
             response.raise_for_status()
@@ -0,0 +1,147 @@
+"""
+Long-lived media clients shared by activity monitoring and now-playing.
+
+``get_client_for_media_server`` builds a fresh client on every call. For Plex
+that means a new ``PlexServer`` handshake the first time the client is used,
+and the activity collectors, the session enrichment lookups and the
+now-playing facade called it on every poll. Those hot paths now share one
+client per ``MediaServer`` from :class:`MediaClientCache` instead.
+
+A cached client is tied to the credentials it was built from (server type,
+URL and API key). A caller holding a row with different credentials gets a
+new client, which is how other workers notice an edit. Commits that edit or
+delete a ``MediaServer`` also drop its client, and the image proxy's cached
+origin and auth headers, at once in the committing process.
+"""
+
+from __future__ import annotations
+
+import threading
+from dataclasses import dataclass
+from typing import Any, ClassVar
+
+from sqlalchemy import event, inspect
+from sqlalchemy.orm import Session
+
+from app.models import MediaServer
+
+# Attributes a client is built from; changing any of them needs a new client.
+CREDENTIAL_FIELDS = ("server_type", "url", "api_key")
+
+
+def credentials_fingerprint(server: MediaServer) -> tuple:
+    """Return the values a media client for ``server`` is built from."""
+    return tuple(getattr(server, name) for name in CREDENTIAL_FIELDS)
+
+
+@dataclass(frozen=True)
+class _Entry:
+    client: Any
+    fingerprint: tuple
+
+
+class MediaClientCache:
+    """One media client per ``MediaServer``, rebuilt when credentials change."""
+
+    _clients: ClassVar[dict[int, _Entry]] = {}
+    _lock: ClassVar[threading.Lock] = threading.Lock()
+
+    @classmethod
+    def get(cls, server: MediaServer):
+        """Return the shared client for ``server``, building it if needed."""
+        from app.services.media.service import get_client_for_media_server
+
+        # Keyed by id only: collectors call this from pool threads, which may
+        # have no app context. The fingerprint already separates servers that
+        # share an id but not their credentials.
+        key = server.id
+        fingerprint = credentials_fingerprint(server)
+        with cls._lock:
+            entry = cls._clients.get(key)
+        if entry is not None and entry.fingerprint == fingerprint:
+            return entry.client
+
+        client = get_client_for_media_server(server)
+        with cls._lock:
+            # Keep a client another thread built for the same credentials.
+            entry = cls._clients.get(key)
+            if entry is not None and entry.fingerprint == fingerprint:
+                return entry.client
+            cls._clients[key] = _Entry(client, fingerprint)
+        return client
+
+    @classmethod
+    def invalidate(cls, server_id: int | None = None) -> None:
+        """Drop the client for ``server_id``, or every client."""
+        with cls._lock:
+            if server_id is None:
+                cls._clients.clear()
+            else:
+                cls._clients.pop(server_id, None)
+
+        from app.services.image_proxy import ImageProxyService
+
+        ImageProxyService.forget_server(server_id)
+
+
+def _changed_servers(session) -> set[int]:
+    changed = set()
+    for obj in session.deleted:
+        if isinstance(obj, MediaServer) and obj.id is not None:
+            changed.add(obj.id)
+    for obj in session.dirty:
+        if not isinstance(obj, MediaServer) or obj.id is None:
+            continue
+        attrs = inspect(obj).attrs
+        if any(attrs[name].history.has_changes() for name in CREDENTIAL_FIELDS):
+            changed.add(obj.id)
+    return changed
+
+
+def _record_changes(session) -> None:
+    # Also runs on ``before_commit``, ahead of the final flush, to catch
+    # changes that are still pending.
+    changed = _changed_servers(session)
+    if changed:
+        session.info.setdefault("media_servers_changed", set()).update(changed)
+
+
+def _track_flush(session, _flush_context, _instances) -> None:
+    _record_changes(session)
+
+
+def _track_bulk_delete(orm_execute_state) -> None:
+    """Bulk ``query.delete()`` never reaches the flush hook."""
+    if not orm_execute_state.is_delete:
+        return
+    mapper = orm_execute_state.bind_mapper
+    if mapper is not None and mapper.class_ is MediaServer:
+        # ``None`` stands for "every server".
+        orm_execute_state.session.info.setdefault("media_servers_changed", set()).add(
+            None
+        )
+
+
+def _after_commit(session) -> None:
+    changed = session.info.pop("media_servers_changed", None)
+    if not changed:
+        return
+    if None in changed:
+        MediaClientCache.invalidate()
+        return
+    for server_id in changed:
+        MediaClientCache.invalidate(server_id)
+
+
+def _after_rollback(session) -> None:
+    session.info.pop("media_servers_changed", None)
+
+
+event.listen(Session, "before_flush", _track_flush)
+event.listen(Session, "do_orm_execute", _track_bulk_delete)
+event.listen(Session, "before_commit", _record_changes)
+event.listen(Session, "after_commit", _after_commit)
+event.listen(Session, "after_rollback", _after_rollback)
+
+
+__all__ = ["MediaClientCache", "credentials_fingerprint"]
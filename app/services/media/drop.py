@@ -87,89 +87,50 @@ class DropClient(RestApiMixin):
     # Wizarr API – users
     # ------------------------------------------------------------------
 
-    def list_users(self) -> list[User]:
-        """Sync Drop users into local DB.
+    def fetch_remote_users(self) -> dict[str, dict] | None:
+        """Read Drop users keyed by their Drop id.
 
         Requires the supplied API token to have 'user:read' scope.
         """
         try:
-            # Get users from Drop API
             response = self.get("/api/v1/admin/users")
             remote_users: list[dict[str, Any]] = response.json()
-
-            if not isinstance(remote_users, list):
-                logging.warning(
-                    "Drop: unexpected /admin/users payload: %s", remote_users
-                )
-                return []
-
-            remote_by_id = {str(u.get("id")): u for u in remote_users if u.get("id")}
-
-            known_users = User.query.filter(
-                User.server_id == getattr(self, "server_id", None)
-            ).all()
-            if self._skip_prune_on_empty_remote(not remote_by_id, known_users):
-                return known_users
-
-            # Upsert user rows in local DB
-            for user_id, drop_user in remote_by_id.items():
-                db_row: User | None = User.query.filter_by(
-                    token=user_id, server_id=getattr(self, "server_id", None)
-                ).first()
-
-                if not db_row:
-                    db_row = User(
-                        token=user_id,
-                        username=drop_user.get("username", "drop-user"),
-                        email=drop_user.get("email", ""),
-                        code="drop",  # placeholder – no invite code
-                        server_id=getattr(self, "server_id", None),
-                    )
-                    db.session.add(db_row)
-                else:
-                    # Update existing user
-                    db_row.username = drop_user.get("username", db_row.username)
-                    db_row.email = drop_user.get("email", db_row.email)
-
-            db.session.commit()
-
-            # Remove local users that no longer exist upstream
-            for local in User.query.filter(
-                User.server_id == getattr(self, "server_id", None)
-            ).all():
-                if local.token not in remote_by_id:
-                    db.session.delete(local)
-            db.session.commit()
-
-            # Get users with default policy information
-            users = User.query.filter(
-                User.server_id == getattr(self, "server_id", None)
-            ).all()
-
-            # Add policy attributes based on actual Drop user data
-            for user in users:
-                # Get the corresponding Drop user data
-                drop_user = remote_by_id.get(user.token, {})
-
-                # Update standardized User model columns
-                user.allow_downloads = True  # Drop supports downloads by default
-                user.allow_live_tv = False  # Drop doesn't support live TV
-                user.allow_camera_upload = False  # Drop doesn't support camera upload
-                user.is_admin = drop_user.get("admin", False)
-
-            # Single commit for all metadata updates
-            try:
-                db.session.commit()
-            except Exception as e:
-                logging.error("Drop: failed to update user metadata – %s", e)
-                db.session.rollback()
-                return []
-
-            return users
-
         except Exception as exc:
             logging.warning("Drop: failed to list users – %s", exc, exc_info=True)
-            return []
+            return None
+
+        if not isinstance(remote_users, list):
+            logging.warning("Drop: unexpected /admin/users payload: %s", remote_users)
+            return None
+
+        return {str(u.get("id")): u for u in remote_users if u.get("id")}
+
+    def apply_remote_users(self, remote_users: dict[str, dict]) -> None:
+        """Sync Drop users into the local DB."""
+        known_users = self._get_server_users()
+        if self._skip_prune_on_empty_remote(not remote_users, known_users):
+            return
+
+        self._reconcile_users(
+            remote_users,
+            known_users,
+            build_user=lambda user_id, drop_user: User(
+                token=user_id,
+                username=drop_user.get("username", "drop-user"),
+                email=drop_user.get("email", ""),
+                code="drop",  # placeholder – no invite code
+                server_id=getattr(self, "server_id", None),
+            ),
+            sync_user=lambda user, drop_user: self._assign_changed(
+                user,
+                username=drop_user.get("username", user.username),
+                email=drop_user.get("email", user.email),
+                allow_downloads=True,  # Drop supports downloads by default
+                allow_live_tv=False,  # Drop doesn't support live TV
+                allow_camera_upload=False,  # Drop doesn't support camera upload
+                is_admin=drop_user.get("admin", False),
+            ),
+        )
 
     def create_user(
         self, username: str, password: str, email: str | None = None
@@ -506,7 +467,7 @@ class DropClient(RestApiMixin):
                 else None
             )
 
-            self._create_user_with_identity_linking(
+            self._add_joined_user(
                 {
                     "username": username,
                     "email": email,
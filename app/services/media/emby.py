@@ -4,10 +4,8 @@ from typing import TYPE_CHECKING
 
 import requests
 import structlog
-from sqlalchemy import or_
 
-from app.extensions import db
-from app.models import Invitation, MediaServer, User
+from app.services.image_proxy import ImageProxyService
 
 from .auth_headers import media_browser_auth_headers
 from .client_base import register_media_client
@@ -168,7 +166,11 @@ class EmbyClient(JellyfinClient):
                         # ImageProxyService.get_server_headers), so the admin
                         # token is never exposed to the client.
                         poster_url = f"{self.url}/Items/{item_id}/Images/Primary"
-                        poster_urls.append(self.generate_image_proxy_url(poster_url))
+                        poster_urls.append(
+                            self.generate_image_proxy_url(
+                                poster_url, width=ImageProxyService.THUMBNAIL_WIDTH
+                            )
+                        )
 
         except Exception as e:
             import logging
@@ -265,64 +267,9 @@ class EmbyClient(JellyfinClient):
         current.update(policy_patch)
         self.set_policy(user_id, current)
 
-    def join(
-        self, username: str, password: str, confirm: str, email: str, code: str
-    ) -> tuple[bool, str]:
-        """Override join method to handle universal download and live TV settings."""
-        # Call the parent join method first
-        success, message = super().join(username, password, confirm, email, code)
-
-        if not success:
-            return success, message
-
-        # Get the invitation and server information
-        inv = Invitation.query.filter_by(code=code).first()
-        if not inv:
-            return False, "Invalid invitation code."
-
-        server_id = getattr(self, "server_id", None)
-        if not server_id:
-            return success, message
-
-        current_server = db.session.get(MediaServer, server_id)
-        if not current_server:
-            return success, message
-
-        # Get the user that was just created
-        user = User.query.filter(
-            or_(User.username == username, User.email == email),
-            User.server_id == server_id,
-        ).first()
-
-        if not user:
-            return success, message
-
-        # Determine download, live TV, and mobile uploads settings using universal columns
-        allow_downloads = bool(getattr(inv, "allow_downloads", False))
-        allow_live_tv = bool(getattr(inv, "allow_live_tv", False))
+    def _extend_join_policy(self, policy: dict, inv, server) -> None:
+        """Apply the mobile uploads setting, falling back to the server default."""
         allow_mobile_uploads = bool(getattr(inv, "allow_mobile_uploads", False))
-
-        # Fall back to server defaults if not set on invitation
-        if not allow_downloads:
-            allow_downloads = bool(getattr(current_server, "allow_downloads", False))
-        if not allow_live_tv:
-            allow_live_tv = bool(getattr(current_server, "allow_live_tv", False))
         if not allow_mobile_uploads:
-            allow_mobile_uploads = bool(
-                getattr(current_server, "allow_mobile_uploads", False)
-            )
-
-        # Update the user policy with download, live TV, and mobile uploads settings
-        try:
-            current_policy = self.get(f"/Users/{user.token}").json().get("Policy", {})
-            current_policy["EnableContentDownloading"] = allow_downloads
-            current_policy["EnableLiveTvAccess"] = allow_live_tv
-            current_policy["AllowCameraUpload"] = allow_mobile_uploads
-            self.set_policy(user.token, current_policy)
-        except Exception as e:
-            logging.error(
-                f"Failed to set Emby download/live TV/mobile uploads permissions for user {username}: {e!s}"
-            )
-            # Don't fail the join process for this
-
-        return success, message
+            allow_mobile_uploads = bool(getattr(server, "allow_mobile_uploads", False))
+        policy["AllowCameraUpload"] = allow_mobile_uploads
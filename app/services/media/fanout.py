@@ -0,0 +1,152 @@
+"""Bounded concurrent fan-out across media servers.
+
+Multi-server facade functions used to call each ``MediaServer`` one after
+another, so a single slow Plex box plus a Kavita timeout could push a request
+past the Gunicorn worker timeout. :func:`fan_out` runs one call per server on
+a shared, bounded thread pool and waits at most ``timeout`` seconds, returning
+whatever finished in time (latency becomes max(server) instead of
+sum(server)).
+
+Each worker thread pushes its own app context and re-loads its ``MediaServer``
+row, so no ORM object ever crosses a thread boundary. Callables should
+therefore return plain data (dicts, ids); callers reconcile that data with the
+database on their own thread.
+"""
+
+from __future__ import annotations
+
+import logging
+import os
+from collections.abc import Callable, Iterable
+from concurrent.futures import ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
+from threading import Lock
+from typing import Any
+
+from flask import current_app
+
+from app.extensions import db
+from app.models import MediaServer
+
+DEFAULT_TIMEOUT = 30.0  # seconds
+
+
+def _max_workers() -> int:
+    try:
+        return max(int(os.getenv("MEDIA_FANOUT_WORKERS", "8")), 1)
+    except ValueError:
+        return 8
+
+
+_executor: ThreadPoolExecutor | None = None
+_executor_lock = Lock()
+
+
+def _get_executor() -> ThreadPoolExecutor:
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(
+                max_workers=_max_workers(), thread_name_prefix="media-fanout"
+            )
+        return _executor
+
+
+@dataclass
+class FanOutResult:
+    """Outcome of a fan-out call, keyed by ``MediaServer.id``.
+
+    ``results`` preserves the order of the servers passed in. Servers that
+    raised land in ``errors``; servers still running at the deadline land in
+    ``timed_out`` and their late results are discarded.
+    """
+
+    results: dict[int, Any] = field(default_factory=dict)
+    errors: dict[int, str] = field(default_factory=dict)
+    timed_out: list[int] = field(default_factory=list)
+
+    @property
+    def complete(self) -> bool:
+        return not self.errors and not self.timed_out
+
+
+def _run_for_server(
+    app,
+    server_id: int,
+    func: Callable[[Any, MediaServer], Any],
+    shared_clients: bool = False,
+):
+    from app.services.media.client_cache import MediaClientCache
+    from app.services.media.service import get_client_for_media_server
+
+    with app.app_context():
+        server = db.session.get(MediaServer, server_id)
+        if server is None:
+            raise LookupError(f"MediaServer {server_id} no longer exists")
+        if shared_clients:
+            client = MediaClientCache.get(server)
+        else:
+            client = get_client_for_media_server(server)
+        return func(client, server)
+
+
+def fan_out(
+    servers: Iterable[MediaServer],
+    func: Callable[[Any, MediaServer], Any],
+    *,
+    timeout: float | None = DEFAULT_TIMEOUT,
+    shared_clients: bool = False,
+) -> FanOutResult:
+    """Call ``func(client, server)`` for every server concurrently.
+
+    Args:
+        servers: MediaServer rows from the caller's session (only ids are used).
+        func: Remote operation; runs on a worker thread with its own app
+            context and must return plain data, not ORM instances.
+        timeout: Deadline in seconds for the whole fan-out, which is the
+            per-server deadline since all servers start together.
+        shared_clients: Use the long-lived clients from ``MediaClientCache``
+            instead of building one per call; for read-only hot paths.
+
+    Returns:
+        FanOutResult with partial results when some servers fail or time out.
+    """
+    targets = [(server.id, server.name) for server in servers]
+    outcome = FanOutResult()
+    if not targets:
+        return outcome
+
+    app = current_app._get_current_object()  # type: ignore[attr-defined]
+    executor = _get_executor()
+    futures = {
+        server_id: executor.submit(
+            _run_for_server, app, server_id, func, shared_clients
+        )
+        for server_id, _ in targets
+    }
+    wait(futures.values(), timeout=timeout)
+
+    for server_id, name in targets:
+        future = futures[server_id]
+        if not future.done():
+            future.cancel()
+            outcome.timed_out.append(server_id)
+            logging.warning(
+                "Media server %s (id=%s) did not respond within %ss",
+                name,
+                server_id,
+                timeout,
+            )
+            continue
+        try:
+            outcome.results[server_id] = future.result()
+        except Exception as exc:
+            outcome.errors[server_id] = str(exc)
+            logging.warning(
+                "Media server %s (id=%s) call failed: %s", name, server_id, exc
+            )
+
+    return outcome
+
+
+__all__ = ["DEFAULT_TIMEOUT", "FanOutResult", "fan_out"]
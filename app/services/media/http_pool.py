@@ -0,0 +1,213 @@
+"""Process-wide pooled HTTP sessions for REST media clients.
+
+``RestApiMixin._request`` used to call module-level ``requests.request`` for
+every API call, so the Jellyfin, Emby, Audiobookshelf, Kavita, Komga, RomM and
+Navidrome clients opened a fresh TCP (and TLS) connection per request - even
+inside loops over hundreds of users. :class:`HttpSessionRegistry` keeps one
+keep-alive ``requests.Session`` per ``MediaServer`` (or per origin when no
+server row is attached), the same approach ``ImageProxyService.get_session``
+uses for artwork.
+
+Defaults come from environment variables and can be overridden per server
+with :meth:`HttpSessionRegistry.configure_server`:
+
+``MEDIA_HTTP_POOL_SIZE``
+    Keep-alive connections kept per server (default 10).
+``MEDIA_HTTP_TIMEOUT``
+    Read timeout in seconds (default 60); connect timeout is capped at 10s.
+``MEDIA_HTTP_RETRIES`` / ``MEDIA_HTTP_BACKOFF``
+    Retries for idempotent requests on connection errors and 502/503/504,
+    with exponential backoff (defaults 2 and 0.5s).
+"""
+
+from __future__ import annotations
+
+import os
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Hashable
+from dataclasses import dataclass, replace
+from typing import Any, ClassVar
+from urllib.parse import urlparse
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+
+def _env_number(name: str, default: float) -> float:
+    try:
+        return float(os.getenv(name, default))
+    except (TypeError, ValueError):
+        return default
+
+
+@dataclass(frozen=True)
+class HttpPolicy:
+    """Pooling, timeout and retry settings for one media server."""
+
+    pool_size: int = 10
+    timeout: float = 60.0
+    connect_timeout: float = 10.0
+    retries: int = 2
+    backoff: float = 0.5
+
+    @classmethod
+    def from_env(cls) -> HttpPolicy:
+        return cls(
+            pool_size=max(int(_env_number("MEDIA_HTTP_POOL_SIZE", 10)), 1),
+            timeout=_env_number("MEDIA_HTTP_TIMEOUT", 60.0),
+            retries=max(int(_env_number("MEDIA_HTTP_RETRIES", 2)), 0),
+            backoff=_env_number("MEDIA_HTTP_BACKOFF", 0.5),
+        )
+
+    @property
+    def request_timeout(self) -> tuple[float, float]:
+        return (min(self.connect_timeout, self.timeout), self.timeout)
+
+
+class HttpSessionRegistry:
+    """Keep-alive ``requests.Session`` objects shared across the process."""
+
+    _sessions: ClassVar[OrderedDict[Hashable, dict[str, Any]]] = OrderedDict()
+    _lock: ClassVar[threading.Lock] = threading.Lock()
+    _overrides: ClassVar[dict[int, HttpPolicy]] = {}
+
+    MAX_SESSIONS = 32
+    RETRY_STATUSES: ClassVar[frozenset[int]] = frozenset({502, 503, 504})
+
+    @classmethod
+    def policy_for(cls, server_id: int | None) -> HttpPolicy:
+        """Return the effective policy for *server_id*."""
+        if server_id is not None and server_id in cls._overrides:
+            return cls._overrides[server_id]
+        return HttpPolicy.from_env()
+
+    @classmethod
+    def configure_server(cls, server_id: int, **changes: Any) -> HttpPolicy:
+        """Override pool size, timeouts or retries for one server."""
+        policy = replace(cls.policy_for(server_id), **changes)
+        with cls._lock:
+            cls._overrides[server_id] = policy
+        cls.invalidate(server_id)
+        return policy
+
+    @classmethod
+    def get_session(cls, url: str, server_id: int | None) -> requests.Session:
+        """Return the pooled session for *server_id* (or *url*'s origin)."""
+        key = cls._cache_key(url, server_id)
+
+        with cls._lock:
+            entry = cls._sessions.get(key)
+            if entry:
+                entry["last_used"] = time.time()
+                cls._sessions.move_to_end(key)
+                return entry["session"]
+
+            policy = cls.policy_for(server_id)
+            session = requests.Session()
+            adapter = HTTPAdapter(
+                pool_connections=1,
+                pool_maxsize=policy.pool_size,
+                max_retries=Retry(
+                    total=policy.retries,
+                    backoff_factor=policy.backoff,
+                    status_forcelist=cls.RETRY_STATUSES,
+                    allowed_methods=Retry.DEFAULT_ALLOWED_METHODS,
+                    raise_on_status=False,
+                    respect_retry_after_header=True,
+                ),
+            )
+            session.mount("http://", adapter)
+            session.mount("https://", adapter)
+
+            cls._sessions[key] = {
+                "session": session,
+                "adapter": adapter,
+                "server_id": server_id,
+                "requests": 0,
+                "last_used": time.time(),
+            }
+            cls._sessions.move_to_end(key)
+            cls._trim_locked()
+            return session
+
+    @classmethod
+    def request(
+        cls, method: str, url: str, server_id: int | None = None, **kwargs: Any
+    ) -> requests.Response:
+        """Perform a request through the pooled session for *server_id*."""
+        kwargs.setdefault("timeout", cls.policy_for(server_id).request_timeout)
+        session = cls.get_session(url, server_id)
+        with cls._lock:
+            entry = cls._sessions.get(cls._cache_key(url, server_id))
+            if entry:
+                entry["requests"] += 1
+        return session.request(method, url, **kwargs)
+
+    @classmethod
+    def invalidate(cls, server_id: int | None = None) -> None:
+        """Close pooled sessions for *server_id*, or all when None.
+
+        Call after a server's URL or credentials change so stale keep-alive
+        connections to the old endpoint are dropped.
+        """
+        with cls._lock:
+            keys = [
+                key
+                for key, entry in cls._sessions.items()
+                if server_id is None or entry["server_id"] == server_id
+            ]
+            for key in keys:
+                cls._sessions.pop(key)["session"].close()
+
+    @classmethod
+    def stats(cls) -> dict[str, dict[str, int]]:
+        """Return connection-reuse counters per pooled session."""
+        with cls._lock:
+            entries = list(cls._sessions.items())
+
+        result: dict[str, dict[str, int]] = {}
+        for key, entry in entries:
+            opened = cls._connections_opened(entry["adapter"])
+            result[cls._describe_key(key)] = {
+                "requests": entry["requests"],
+                "connections_opened": opened,
+                "connections_reused": max(entry["requests"] - opened, 0),
+            }
+        return result
+
+    @classmethod
+    def _connections_opened(cls, adapter: HTTPAdapter) -> int:
+        pools = adapter.poolmanager.pools
+        opened = 0
+        for pool_key in list(pools.keys()):
+            pool = pools.get(pool_key)
+            if pool is not None:
+                opened += getattr(pool, "num_connections", 0)
+        return opened
+
+    @classmethod
+    def _cache_key(cls, url: str, server_id: int | None) -> tuple[Hashable, ...]:
+        parsed = urlparse(url)
+        origin = (parsed.scheme or "http", parsed.netloc)
+        if server_id:
+            return ("server", server_id, origin)
+        return ("host", origin)
+
+    @staticmethod
+    def _describe_key(key: tuple[Hashable, ...]) -> str:
+        if key[0] == "server":
+            return f"server:{key[1]}"
+        scheme, netloc = key[1]  # type: ignore[misc]
+        return f"{scheme}://{netloc}"
+
+    @classmethod
+    def _trim_locked(cls) -> None:
+        while len(cls._sessions) > cls.MAX_SESSIONS:
+            _key, entry = cls._sessions.popitem(last=False)
+            entry["session"].close()
+
+
+__all__ = ["HttpPolicy", "HttpSessionRegistry"]
@@ -8,6 +8,7 @@ from sqlalchemy import or_
 
 from app.extensions import db
 from app.models import Invitation, Library, User
+from app.services.image_proxy import ImageProxyService
 from app.services.invites import is_invite_valid
 
 from .auth_headers import media_browser_auth_headers
@@ -366,10 +367,6 @@ class JellyfinClient(RestApiMixin):
             structlog.get_logger().error(f"Failed to disable Jellyfin user: {e}")
             return False
 
-    def _get_server_users(self) -> list[User]:
-        """Get all users for this server from database."""
-        return User.query.filter(User.server_id == self.server_id).all()
-
     def _extract_jellyfin_permissions(self, jf_user: dict) -> dict[str, bool]:
         """Extract all permissions from a Jellyfin user object."""
         policy = jf_user.get("Policy", {}) or {}
@@ -381,89 +378,79 @@ class JellyfinClient(RestApiMixin):
             "allow_camera_upload": policy.get("AllowCameraUpload", False),
         }
 
-    def _get_user_library_access(self, jf_user: dict) -> tuple[list[str] | None, bool]:
-        """Extract library access: (library_names | None, has_full_access)."""
+    def _get_user_library_access(
+        self, jf_user: dict, libraries: dict[str, str] | None = None
+    ) -> tuple[list[str] | None, bool]:
+        """Extract library access: (library_names | None, has_full_access).
+
+        *libraries* maps external ids to names; pass it when syncing many users
+        so the library table is read once rather than per folder.
+        """
         if (policy := jf_user.get("Policy", {}) or {}).get("EnableAllFolders", False):
             return None, True
 
         if not (enabled_folders := policy.get("EnabledFolders", []) or []):
             return None, True  # No restrictions = full access
 
-        # Map library IDs to names
+        if libraries is None:
+            libraries = self._library_names_by_external_id()
         library_names = [
-            lib.name
-            for lib_id in enabled_folders
-            if (
-                lib := Library.query.filter_by(
-                    external_id=lib_id, server_id=self.server_id
-                ).first()
-            )
+            libraries[lib_id] for lib_id in enabled_folders if lib_id in libraries
         ]
         return library_names, False
 
-    def _sync_user_permissions(self, user: User, jf_user: dict) -> None:
+    def _sync_user_permissions(
+        self, user: User, jf_user: dict, libraries: dict[str, str] | None = None
+    ) -> None:
         """Sync permissions and library access from Jellyfin to database user."""
-        user.username = jf_user.get("Name", user.username)
-        user.email = jf_user.get("Email", user.email)
-
-        # Store permissions in SQL columns
         perms = self._extract_jellyfin_permissions(jf_user)
-        user.is_admin = perms["is_admin"]
-        user.allow_downloads = perms["allow_downloads"]
-        user.allow_live_tv = perms["allow_live_tv"]
-        user.allow_camera_upload = perms["allow_camera_upload"]
+        self._assign_changed(
+            user,
+            username=jf_user.get("Name", user.username),
+            email=jf_user.get("Email", user.email),
+            # Store permissions in SQL columns
+            is_admin=perms["is_admin"],
+            allow_downloads=perms["allow_downloads"],
+            allow_live_tv=perms["allow_live_tv"],
+            allow_camera_upload=perms["allow_camera_upload"],
+        )
 
         # Store library access
-        library_names, has_full_access = self._get_user_library_access(jf_user)
+        library_names, has_full_access = self._get_user_library_access(
+            jf_user, libraries
+        )
         user.set_accessible_libraries(library_names if not has_full_access else None)
 
-    def list_users(self) -> list[User]:
-        """Sync users from Jellyfin to database with all permissions and library access."""
-        if not self.server_id:
-            return []
-
+    def fetch_remote_users(self) -> dict[str, dict] | None:
+        """Read Jellyfin users keyed by their Jellyfin id."""
         try:
             raw_users = self.get("/Users").json()
         except Exception as exc:
             logging.warning("Jellyfin: failed to list users – %s", exc)
-            return self._get_server_users()
-
-        jf_users_by_id = {u["Id"]: u for u in raw_users}
+            return None
+        return {u["Id"]: u for u in raw_users}
 
+    def apply_remote_users(self, remote_users: dict[str, dict]) -> None:
+        """Sync Jellyfin users to the database with permissions and library access."""
         known_users = self._get_server_users()
-        if self._skip_prune_on_empty_remote(not jf_users_by_id, known_users):
-            return known_users
-
-        # Remove users no longer in Jellyfin, add new users
-        for db_user in known_users:
-            if db_user.token not in jf_users_by_id:
-                db.session.delete(db_user)
-
-        for jf_id, jf_user in jf_users_by_id.items():
-            if not User.query.filter_by(token=jf_id, server_id=self.server_id).first():
-                db.session.add(
-                    User(
-                        token=jf_id,
-                        username=jf_user.get("Name", "jf-user"),
-                        email="empty",
-                        code="empty",
-                        server_id=self.server_id,
-                    )
-                )
-
-        # Sync all permissions and library access
-        for user in self._get_server_users():
-            if jf_user := jf_users_by_id.get(user.token):
-                self._sync_user_permissions(user, jf_user)
-
-        try:
-            db.session.commit()
-            logging.info(f"Synced {len(jf_users_by_id)} Jellyfin users to database")
-        except Exception as e:
-            logging.error(f"Failed to sync Jellyfin user metadata: {e}")
-            db.session.rollback()
-
-        return self._get_server_users()
+        if self._skip_prune_on_empty_remote(not remote_users, known_users):
+            return
+
+        libraries = self._library_names_by_external_id()
+        self._reconcile_users(
+            remote_users,
+            known_users,
+            build_user=lambda jf_id, jf_user: User(
+                token=jf_id,
+                username=jf_user.get("Name", "jf-user"),
+                email="empty",
+                code="empty",
+                server_id=self.server_id,
+            ),
+            sync_user=lambda user, jf_user: self._sync_user_permissions(
+                user, jf_user, libraries
+            ),
+        )
 
     def _password_for_db(self, password: str) -> str:
         return password
@@ -575,6 +562,7 @@ class JellyfinClient(RestApiMixin):
             allow_downloads = bool(getattr(inv, "allow_downloads", False))
             allow_live_tv = bool(getattr(inv, "allow_live_tv", False))
 
+            current_server = None
             if server_id:
                 from app.models import MediaServer
 
@@ -598,6 +586,7 @@ class JellyfinClient(RestApiMixin):
             if max_sessions is not None:
                 current_policy["MaxActiveSessions"] = max_sessions
 
+            self._extend_join_policy(current_policy, inv, current_server)
             self.set_policy(user_id, current_policy)
 
             from app.services.expiry import calculate_user_expiry
@@ -608,7 +597,7 @@ class JellyfinClient(RestApiMixin):
                 else None
             )
 
-            self._create_user_with_identity_linking(
+            self._add_joined_user(
                 {
                     "username": username,
                     "email": email,
@@ -627,6 +616,9 @@ class JellyfinClient(RestApiMixin):
             db.session.rollback()
             return False, "An unexpected error occurred."
 
+    def _extend_join_policy(self, policy: dict, inv, server) -> None:
+        """Hook for subclasses to adjust a joining user's policy before it is saved."""
+
     def _get_artwork_urls(
         self, item_id: str, media_type: str = "", series_id: str | None = None
     ) -> dict[str, str | None]:
@@ -697,7 +689,11 @@ class JellyfinClient(RestApiMixin):
                         # ImageProxyService.get_server_headers), so the admin
                         # token is never exposed to the client.
                         poster_url = f"{self.url}/Items/{item_id}/Images/Primary"
-                        poster_urls.append(self.generate_image_proxy_url(poster_url))
+                        poster_urls.append(
+                            self.generate_image_proxy_url(
+                                poster_url, width=ImageProxyService.THUMBNAIL_WIDTH
+                            )
+                        )
 
         except Exception as e:
             import logging
@@ -708,166 +704,169 @@ class JellyfinClient(RestApiMixin):
 
     def now_playing(self) -> list[dict]:
         try:
-            sessions = self.get("/Sessions").json()
-            now_playing_sessions = []
-
-            for session in sessions:
-                if session.get("NowPlayingItem") is None:
-                    continue
-
-                now_playing_item = session["NowPlayingItem"]
-                play_state = session.get("PlayState", {})
-
-                progress = 0.0
-                if play_state.get("PositionTicks") and now_playing_item.get(
-                    "RunTimeTicks"
-                ):
-                    progress = max(
-                        0.0,
-                        min(
-                            1.0,
-                            play_state["PositionTicks"]
-                            / now_playing_item["RunTimeTicks"],
-                        ),
-                    )
+            return self.parse_sessions(self.get("/Sessions").json())
+        except Exception as e:
+            logging.error(f"Failed to get now playing from Jellyfin: {e}")
+            return []
 
-                media_type = now_playing_item.get("Type", "unknown").lower()
-
-                # Extract series info for episodes (both for formatting and separate fields)
-                series_name = None
-                season_num = None
-                episode_num = None
-                media_title = now_playing_item.get("Name", "Unknown")
-
-                if media_type == "episode":
-                    series_name = now_playing_item.get("SeriesName")
-                    season_num = now_playing_item.get("ParentIndexNumber")
-                    episode_num = now_playing_item.get("IndexNumber")
-
-                    # Format title for display
-                    if series_name:
-                        media_title = f"{series_name}"
-                        if season_num and episode_num:
-                            media_title += f" S{season_num:02d}E{episode_num:02d}"
-                        media_title += f" - {now_playing_item.get('Name', '')}"
-
-                state = "stopped"
-                if play_state.get("IsPaused"):
-                    state = "paused"
-                elif play_state.get("PositionTicks") is not None:
-                    state = "playing"
-
-                # Extract user and session info
-                user_info = session.get("UserName", "Unknown User")
-                user_id = session.get("UserId")
-                session_id = session.get("Id", "")
-
-                # Extract device and platform info
-                ip_address = session.get("RemoteEndPoint")
-                platform = session.get("DeviceType")
-                player_version = session.get("ApplicationVersion")
-
-                item_id = now_playing_item.get("Id")
-                series_id = now_playing_item.get("SeriesId")
-                artwork_info = self._get_artwork_urls(item_id, media_type, series_id)
-
-                transcoding_info: dict[str, Any] = {
-                    "is_transcoding": False,
-                    "video_codec": None,
-                    "audio_codec": None,
-                    "container": None,
-                    "video_resolution": None,
-                    "transcoding_speed": None,
-                    "direct_play": True,
-                }
+    def parse_sessions(self, sessions: list[dict]) -> list[dict]:
+        """Convert raw ``/Sessions`` entries into now-playing dicts.
 
-                if session.get("TranscodingInfo"):
-                    transcode_info = session["TranscodingInfo"]
-                    transcoding_info["is_transcoding"] = True
-                    transcoding_info["direct_play"] = False
-                    transcoding_info["video_codec"] = transcode_info.get("VideoCodec")
-                    transcoding_info["audio_codec"] = transcode_info.get("AudioCodec")
-                    transcoding_info["container"] = transcode_info.get("Container")
-                    transcoding_info["transcoding_speed"] = transcode_info.get(
-                        "TranscodingFramerate"
-                    )
+        Shared by :meth:`now_playing` and the activity WebSocket collector,
+        which receives the same entries in ``Sessions`` messages.
+        """
+        now_playing_sessions = []
+
+        for session in sessions:
+            if session.get("NowPlayingItem") is None:
+                continue
+
+            now_playing_item = session["NowPlayingItem"]
+            play_state = session.get("PlayState", {})
+
+            progress = 0.0
+            if play_state.get("PositionTicks") and now_playing_item.get("RunTimeTicks"):
+                progress = max(
+                    0.0,
+                    min(
+                        1.0,
+                        play_state["PositionTicks"] / now_playing_item["RunTimeTicks"],
+                    ),
+                )
 
-                if session.get("PlayMethod"):
-                    play_method = session["PlayMethod"]
-                    if play_method == "DirectPlay":
-                        transcoding_info["direct_play"] = True
-                        transcoding_info["is_transcoding"] = False
-                    elif play_method in ["DirectStream", "Transcode"]:
-                        transcoding_info["direct_play"] = False
-                        if play_method == "Transcode":
-                            transcoding_info["is_transcoding"] = True
-
-                if now_playing_item.get("MediaStreams"):
-                    for stream in now_playing_item["MediaStreams"]:
-                        if (
-                            stream.get("Type") == "Video"
-                            and not transcoding_info["video_codec"]
-                        ):
-                            transcoding_info["video_codec"] = stream.get("Codec")
-                            transcoding_info["video_resolution"] = (
-                                stream.get("DisplayTitle")
-                                or f"{stream.get('Width', '?')}x{stream.get('Height', '?')}"
-                            )
-                        elif (
-                            stream.get("Type") == "Audio"
-                            and not transcoding_info["audio_codec"]
-                        ):
-                            transcoding_info["audio_codec"] = stream.get("Codec")
-
-                if not transcoding_info["container"]:
-                    transcoding_info["container"] = now_playing_item.get("Container")
-
-                session_info = {
-                    # Required fields
-                    "user_name": user_info,
-                    "media_title": media_title,
-                    "session_id": session_id,
-                    # User info
-                    "user_id": user_id,
-                    # Media info
-                    "media_type": media_type,
-                    "media_id": item_id,
-                    "series_name": series_name,
-                    "season_number": season_num,
-                    "episode_number": episode_num,
-                    # Playback info
-                    "progress": progress,
-                    "state": state,
-                    "position_ms": play_state.get("PositionTicks", 0) // 10000,
-                    "duration_ms": now_playing_item.get("RunTimeTicks", 0) // 10000,
-                    # Device info
-                    "client": session.get("Client", ""),
-                    "device_name": session.get("DeviceName", ""),
-                    "ip_address": ip_address,
-                    "platform": platform,
-                    "player_version": player_version,
-                    # Artwork
-                    "artwork_url": artwork_info["artwork_url"],
-                    "fallback_artwork_url": artwork_info["fallback_artwork_url"],
-                    "thumbnail_url": artwork_info["thumbnail_url"],
-                    # Transcoding
-                    "transcoding_info": transcoding_info,
-                    # Metadata
-                    "metadata": {
-                        "jellyfin_session_id": session_id,
-                        "jellyfin_item_id": item_id,
-                        "jellyfin_series_id": series_id,
-                        "play_method": session.get("PlayMethod"),
-                    },
-                }
+            media_type = now_playing_item.get("Type", "unknown").lower()
+
+            # Extract series info for episodes (both for formatting and separate fields)
+            series_name = None
+            season_num = None
+            episode_num = None
+            media_title = now_playing_item.get("Name", "Unknown")
+
+            if media_type == "episode":
+                series_name = now_playing_item.get("SeriesName")
+                season_num = now_playing_item.get("ParentIndexNumber")
+                episode_num = now_playing_item.get("IndexNumber")
+
+                # Format title for display
+                if series_name:
+                    media_title = f"{series_name}"
+                    if season_num and episode_num:
+                        media_title += f" S{season_num:02d}E{episode_num:02d}"
+                    media_title += f" - {now_playing_item.get('Name', '')}"
+
+            state = "stopped"
+            if play_state.get("IsPaused"):
+                state = "paused"
+            elif play_state.get("PositionTicks") is not None:
+                state = "playing"
+
+            # Extract user and session info
+            user_info = session.get("UserName", "Unknown User")
+            user_id = session.get("UserId")
+            session_id = session.get("Id", "")
+
+            # Extract device and platform info
+            ip_address = session.get("RemoteEndPoint")
+            platform = session.get("DeviceType")
+            player_version = session.get("ApplicationVersion")
+
+            item_id = now_playing_item.get("Id")
+            series_id = now_playing_item.get("SeriesId")
+            artwork_info = self._get_artwork_urls(item_id, media_type, series_id)
+
+            transcoding_info: dict[str, Any] = {
+                "is_transcoding": False,
+                "video_codec": None,
+                "audio_codec": None,
+                "container": None,
+                "video_resolution": None,
+                "transcoding_speed": None,
+                "direct_play": True,
+            }
 
-                now_playing_sessions.append(session_info)
+            if session.get("TranscodingInfo"):
+                transcode_info = session["TranscodingInfo"]
+                transcoding_info["is_transcoding"] = True
+                transcoding_info["direct_play"] = False
+                transcoding_info["video_codec"] = transcode_info.get("VideoCodec")
+                transcoding_info["audio_codec"] = transcode_info.get("AudioCodec")
+                transcoding_info["container"] = transcode_info.get("Container")
+                transcoding_info["transcoding_speed"] = transcode_info.get(
+                    "TranscodingFramerate"
+                )
 
-            return now_playing_sessions
+            if session.get("PlayMethod"):
+                play_method = session["PlayMethod"]
+                if play_method == "DirectPlay":
+                    transcoding_info["direct_play"] = True
+                    transcoding_info["is_transcoding"] = False
+                elif play_method in ["DirectStream", "Transcode"]:
+                    transcoding_info["direct_play"] = False
+                    if play_method == "Transcode":
+                        transcoding_info["is_transcoding"] = True
+
+            if now_playing_item.get("MediaStreams"):
+                for stream in now_playing_item["MediaStreams"]:
+                    if (
+                        stream.get("Type") == "Video"
+                        and not transcoding_info["video_codec"]
+                    ):
+                        transcoding_info["video_codec"] = stream.get("Codec")
+                        transcoding_info["video_resolution"] = (
+                            stream.get("DisplayTitle")
+                            or f"{stream.get('Width', '?')}x{stream.get('Height', '?')}"
+                        )
+                    elif (
+                        stream.get("Type") == "Audio"
+                        and not transcoding_info["audio_codec"]
+                    ):
+                        transcoding_info["audio_codec"] = stream.get("Codec")
+
+            if not transcoding_info["container"]:
+                transcoding_info["container"] = now_playing_item.get("Container")
+
+            session_info = {
+                # Required fields
+                "user_name": user_info,
+                "media_title": media_title,
+                "session_id": session_id,
+                # User info
+                "user_id": user_id,
+                # Media info
+                "media_type": media_type,
+                "media_id": item_id,
+                "series_name": series_name,
+                "season_number": season_num,
+                "episode_number": episode_num,
+                # Playback info
+                "progress": progress,
+                "state": state,
+                "position_ms": play_state.get("PositionTicks", 0) // 10000,
+                "duration_ms": now_playing_item.get("RunTimeTicks", 0) // 10000,
+                # Device info
+                "client": session.get("Client", ""),
+                "device_name": session.get("DeviceName", ""),
+                "ip_address": ip_address,
+                "platform": platform,
+                "player_version": player_version,
+                # Artwork
+                "artwork_url": artwork_info["artwork_url"],
+                "fallback_artwork_url": artwork_info["fallback_artwork_url"],
+                "thumbnail_url": artwork_info["thumbnail_url"],
+                # Transcoding
+                "transcoding_info": transcoding_info,
+                # Metadata
+                "metadata": {
+                    "jellyfin_session_id": session_id,
+                    "jellyfin_item_id": item_id,
+                    "jellyfin_series_id": series_id,
+                    "play_method": session.get("PlayMethod"),
+                },
+            }
 
-        except Exception as e:
-            logging.error(f"Failed to get now playing from Jellyfin: {e}")
-            return []
+            now_playing_sessions.append(session_info)
+
+        return now_playing_sessions
 
     def get_recent_items(
         self, library_id: str | None = None, limit: int = 10
@@ -914,7 +913,9 @@ class JellyfinClient(RestApiMixin):
 
                 if thumb_url:
                     # Generate secure proxy URL with opaque token
-                    thumb_url = self.generate_image_proxy_url(thumb_url)
+                    thumb_url = self.generate_image_proxy_url(
+                        thumb_url, width=ImageProxyService.THUMBNAIL_WIDTH
+                    )
 
                     # Only add items that have images
                     items.append(
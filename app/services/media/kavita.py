@@ -633,86 +633,65 @@ class KavitaClient(RestApiMixin):
                     f"Failed to grant library {library_id} access to user {user_id}: {e}"
                 )
 
-    def list_users(self) -> list[User]:
-        """Sync users from Kavita into the local DB and return the list of User records."""
+    def fetch_remote_users(self) -> dict[str, dict] | None:
+        """Read Kavita users keyed by their Kavita id (as a string)."""
         try:
             response = self.get("/api/Users")
+        except Exception as e:
+            logging.error(f"Failed to sync Kavita users: {e}")
+            return None
 
-            # Kavita sometimes returns empty body when JWT is expired
-            if not response.text or not response.text.strip():
-                logging.warning(
-                    "Kavita /api/User returned an empty response – skipping user sync"
-                )
-                return []
-
-            try:
-                kavita_users = response.json()
-            except Exception as json_exc:
-                logging.error(f"Failed to decode Kavita users JSON: {json_exc}")
-                return []
-
-            if not isinstance(kavita_users, list):
-                logging.warning(
-                    "Unexpected response format from Kavita /api/User – expected list"
-                )
-                return []
-
-            users_dict = {str(u["id"]): u for u in kavita_users}
-
-            known_users = User.query.filter(
-                User.server_id == getattr(self, "server_id", None)
-            ).all()
-            if self._skip_prune_on_empty_remote(not users_dict, known_users):
-                return known_users
-
-            for kavita_user in users_dict.values():
-                existing = User.query.filter_by(token=str(kavita_user["id"])).first()
-                if not existing:
-                    new = User(
-                        token=str(kavita_user["id"]),
-                        username=kavita_user.get("username")
-                        or kavita_user.get("userName", "kavita-user"),
-                        email=kavita_user.get("email", "empty"),
-                        code="empty",
-                        server_id=getattr(self, "server_id", None),
-                    )
-                    db.session.add(new)
-            db.session.commit()
+        # Kavita sometimes returns empty body when JWT is expired
+        if not response.text or not response.text.strip():
+            logging.warning(
+                "Kavita /api/User returned an empty response – skipping user sync"
+            )
+            return None
 
-            # Delete local users that no longer exist upstream
-            to_check = User.query.filter(
-                User.server_id == getattr(self, "server_id", None)
-            ).all()
-            for dbu in to_check:
-                if dbu.token not in users_dict:
-                    db.session.delete(dbu)
-            db.session.commit()
+        try:
+            kavita_users = response.json()
+        except Exception as json_exc:
+            logging.error(f"Failed to decode Kavita users JSON: {json_exc}")
+            return None
 
-            users = User.query.filter(
-                User.server_id == getattr(self, "server_id", None)
-            ).all()
+        if not isinstance(kavita_users, list):
+            logging.warning(
+                "Unexpected response format from Kavita /api/User – expected list"
+            )
+            return None
 
-            for user in users:
-                permissions = StandardizedPermissions.for_basic_server(
-                    server_type="kavita",
-                    is_admin=False,
-                    allow_downloads=True,
-                )
-                user.allow_downloads = permissions.allow_downloads
-                user.allow_live_tv = permissions.allow_live_tv
-                user.is_admin = permissions.is_admin
+        return {str(u["id"]): u for u in kavita_users}
 
-            try:
-                db.session.commit()
-            except Exception as e:
-                logging.error("Kavita: failed to update user metadata – %s", e)
-                db.session.rollback()
-                return []
+    def apply_remote_users(self, remote_users: dict[str, dict]) -> None:
+        """Sync Kavita users into the local DB."""
+        server_id = getattr(self, "server_id", None)
+        known_users = self._get_server_users()
+        if self._skip_prune_on_empty_remote(not remote_users, known_users):
+            return
 
-            return users
-        except Exception as e:
-            logging.error(f"Failed to sync Kavita users: {e}")
-            return []
+        permissions = StandardizedPermissions.for_basic_server(
+            server_type="kavita",
+            is_admin=False,
+            allow_downloads=True,
+        )
+        self._reconcile_users(
+            remote_users,
+            known_users,
+            build_user=lambda token, kavita_user: User(
+                token=token,
+                username=kavita_user.get("username")
+                or kavita_user.get("userName", "kavita-user"),
+                email=kavita_user.get("email", "empty"),
+                code="empty",
+                server_id=server_id,
+            ),
+            sync_user=lambda user, _kavita_user: self._assign_changed(
+                user,
+                allow_downloads=permissions.allow_downloads,
+                allow_live_tv=permissions.allow_live_tv,
+                is_admin=permissions.is_admin,
+            ),
+        )
 
     # --- helpers -----------------------------------------------------
 
@@ -766,7 +745,7 @@ class KavitaClient(RestApiMixin):
 
             expires = calculate_user_expiry(inv, current_server_id) if inv else None
 
-            self._create_user_with_identity_linking(
+            self._add_joined_user(
                 {
                     "username": username,
                     "email": email or "empty",
@@ -11,6 +11,7 @@ from sqlalchemy import or_
 
 from app.extensions import db
 from app.models import Invitation, Library, User
+from app.services.image_proxy import ImageProxyService
 from app.services.invites import is_invite_valid
 
 from .client_base import RestApiMixin, register_media_client
@@ -213,82 +214,58 @@ class KomgaClient(RestApiMixin):
             is_enabled=True,  # Komga doesn't have a disabled state in API
         )
 
-    def list_users(self) -> list[User]:
-        """Sync users from Komga into the local DB and return the list of User records."""
+    def fetch_remote_users(self) -> dict[str, dict] | None:
+        """Read Komga users keyed by their Komga id.
+
+        Users shared on every library get ``sharedLibrariesIds`` filled in
+        here, so the metadata cache never calls the server while syncing.
+        """
         try:
             response = self.get("/api/v2/users")
             komga_users = {u["id"]: u for u in response.json()}
+            if any(u.get("sharedAllLibraries") for u in komga_users.values()):
+                all_library_ids = list(self.libraries())
+                for komga_user in komga_users.values():
+                    if komga_user.get("sharedAllLibraries"):
+                        komga_user["sharedLibrariesIds"] = all_library_ids
+        except Exception as e:
+            logging.error(f"Failed to list Komga users: {e}")
+            return None
+        return komga_users
 
-            known_users = User.query.filter(
-                User.server_id == getattr(self, "server_id", None)
-            ).all()
-            if self._skip_prune_on_empty_remote(not komga_users, known_users):
-                return known_users
-
-            for komga_user in komga_users.values():
-                existing = User.query.filter_by(token=komga_user["id"]).first()
-                if not existing:
-                    new_user = User(
-                        token=komga_user["id"],
-                        username=komga_user["email"],
-                        email=komga_user["email"],
-                        code="empty",
-                        server_id=getattr(self, "server_id", None),
-                    )
-                    db.session.add(new_user)
-            db.session.commit()
-
-            to_check = User.query.filter(
-                User.server_id == getattr(self, "server_id", None)
-            ).all()
-            for db_user in to_check:
-                if db_user.token not in komga_users:
-                    db.session.delete(db_user)
-            db.session.commit()
-
-            # Get users with default policy information
-            users = User.query.filter(
-                User.server_id == getattr(self, "server_id", None)
-            ).all()
-
-            # Add policy attributes including library access from Komga
-            for user in users:
-                # Get the full user data from Komga to extract library info
-                komga_user_data = komga_users.get(user.token, {})
-                roles = komga_user_data.get("roles", [])
+    def apply_remote_users(self, remote_users: dict[str, dict]) -> None:
+        """Sync Komga users into the local DB, caching their metadata."""
+        known_users = self._get_server_users()
+        if self._skip_prune_on_empty_remote(not remote_users, known_users):
+            return
 
+        def sync_user(user: User, komga_user: dict) -> None:
+            roles = komga_user.get("roles", [])
+            self._assign_changed(
+                user,
                 # Check for FILE_DOWNLOAD role to determine download permission
-                allow_downloads = "FILE_DOWNLOAD" in roles
-
-                # Update standardized User model columns
-                user.allow_downloads = allow_downloads
-                user.allow_live_tv = False  # Komga doesn't have Live TV
-                user.is_admin = "ADMIN" in roles
-
-            # Single commit for all metadata updates
-            try:
-                db.session.commit()
-            except Exception as e:
-                logging.error("Komga: failed to update user metadata – %s", e)
-                db.session.rollback()
-                return []
-
-            # Cache detailed metadata for all users (including library access)
-            self._cache_user_metadata_from_bulk_response(users, komga_users)
+                allow_downloads="FILE_DOWNLOAD" in roles,
+                allow_live_tv=False,  # Komga doesn't have Live TV
+                is_admin="ADMIN" in roles,
+            )
 
-            # Commit the standardized metadata updates
-            try:
-                db.session.commit()
-            except Exception as e:
-                logging.error(
-                    f"Komga: failed to commit standardized metadata updates: {e}"
-                )
-                db.session.rollback()
+        self._reconcile_users(
+            remote_users,
+            known_users,
+            build_user=lambda token, komga_user: User(
+                token=token,
+                username=komga_user["email"],
+                email=komga_user["email"],
+                code="empty",
+                server_id=getattr(self, "server_id", None),
+            ),
+            sync_user=sync_user,
+        )
 
-            return users
-        except Exception as e:
-            logging.error(f"Failed to list Komga users: {e}")
-            return []
+        # Cache detailed metadata for all users (including library access)
+        self._cache_user_metadata_from_bulk_response(
+            self._get_server_users(), remote_users
+        )
 
     def _cache_user_metadata_from_bulk_response(
         self, users: list[User], komga_users: dict
@@ -326,14 +303,9 @@ class KomgaClient(RestApiMixin):
                     allow_downloads="FILE_DOWNLOAD" in roles,
                 )
 
-                # Handle library access - always return actual library names
-                if raw_user.get("sharedAllLibraries", False):
-                    # User has access to all libraries - fetch all library IDs from server
-                    all_libraries = self.libraries()  # Returns {id: name} mapping
-                    shared_library_ids = list(all_libraries.keys())
-                else:
-                    # User has restricted library access
-                    shared_library_ids = raw_user.get("sharedLibrariesIds", [])
+                # Handle library access - always return actual library names;
+                # fetch_remote_users resolves "all libraries" to their ids
+                shared_library_ids = raw_user.get("sharedLibrariesIds", [])
 
                 # Always create restricted access with the actual library IDs
                 server_id: int = getattr(self, "server_id", 0)
@@ -455,7 +427,7 @@ class KomgaClient(RestApiMixin):
 
             expires = calculate_user_expiry(inv, current_server_id) if inv else None
 
-            self._create_user_with_identity_linking(
+            self._add_joined_user(
                 {
                     "username": username,
                     "email": email,
@@ -656,7 +628,9 @@ class KomgaClient(RestApiMixin):
                     )
 
                     # Generate secure proxy URL with opaque token
-                    thumb_url = self.generate_image_proxy_url(thumb_url)
+                    thumb_url = self.generate_image_proxy_url(
+                        thumb_url, width=ImageProxyService.THUMBNAIL_WIDTH
+                    )
 
                     items.append(
                         {
@@ -128,12 +128,8 @@ class NavidromeClient(RestApiMixin):
             logging.warning("Navidrome: failed to scan libraries – %s", exc)
             return {}
 
-    def list_users(self) -> list[User]:
-        """Read users from Navidrome and reflect them locally."""
-        server_id = getattr(self, "server_id", None)
-        if server_id is None:
-            return []
-
+    def fetch_remote_users(self) -> dict[str, dict] | None:
+        """Read Navidrome users keyed by username (Navidrome's user token)."""
         try:
             result = self._subsonic_request("getUsers")
             users_data = result.get("users", {}).get("user", [])
@@ -143,79 +139,41 @@ class NavidromeClient(RestApiMixin):
                 users_data = [users_data]
         except Exception as exc:
             logging.warning("Navidrome: failed to list users – %s", exc)
-            return []
-
-        users_by_name = {u["username"]: u for u in users_data}
-
-        known_users = User.query.filter(User.server_id == server_id).all()
-        if self._skip_prune_on_empty_remote(not users_by_name, known_users):
-            return known_users
-
-        try:
-            # Add new users or update existing ones
-            for username, remote in users_by_name.items():
-                db_row = User.query.filter_by(
-                    username=username, server_id=server_id
-                ).first()
-                if not db_row:
-                    db_row = User(
-                        token=username,  # Use username as token for Navidrome
-                        username=username,
-                        email=remote.get("email", ""),
-                        code="empty",
-                        server_id=server_id,
-                    )
-                    db.session.add(db_row)
-                else:
-                    db_row.email = remote.get("email", db_row.email)
-
-            # Remove users that no longer exist upstream
-            to_check = User.query.filter(User.server_id == server_id).all()
-            for local in to_check:
-                if local.username not in users_by_name:
-                    db.session.delete(local)
-
-            db.session.commit()
-
-        except Exception as exc:
-            logging.error("Navidrome: failed to sync users – %s", exc)
-            db.session.rollback()
-            return []
+            return None
 
-        # Get users with policy information
-        users = User.query.filter(User.server_id == server_id).all()
+        return {u["username"]: u for u in users_data}
 
-        # Enhance users with policy data from Navidrome
-        for user in users:
-            if user.username in users_by_name:
-                navidrome_user = users_by_name[user.username]
-
-                # Use standardized permissions helper for consistency
-                permissions = StandardizedPermissions.for_navidrome(navidrome_user)
-
-                # Update standardized User model columns
-                user.allow_downloads = permissions.allow_downloads
-                user.allow_live_tv = permissions.allow_live_tv
-                user.is_admin = permissions.is_admin
-            else:
-                # Default values if user data not found - use standardized helper
-                default_permissions = StandardizedPermissions.for_basic_server(
-                    "navidrome"
-                )
-
-                # Update standardized User model columns with defaults
-                user.allow_downloads = default_permissions.allow_downloads
-                user.allow_live_tv = default_permissions.allow_live_tv
-                user.is_admin = default_permissions.is_admin
+    def apply_remote_users(self, remote_users: dict[str, dict]) -> None:
+        """Reflect Navidrome users locally, with their permissions."""
+        server_id = getattr(self, "server_id", None)
+        known_users = self._get_server_users()
+        if self._skip_prune_on_empty_remote(not remote_users, known_users):
+            return
+
+        def sync_user(user: User, remote: dict) -> None:
+            # Use standardized permissions helper for consistency
+            permissions = StandardizedPermissions.for_navidrome(remote)
+            self._assign_changed(
+                user,
+                email=remote.get("email", user.email),
+                allow_downloads=permissions.allow_downloads,
+                allow_live_tv=permissions.allow_live_tv,
+                is_admin=permissions.is_admin,
+            )
 
-        # Single commit for all metadata updates
-        try:
-            db.session.commit()
-        except Exception as e:
-            logging.error("Navidrome: failed to update user metadata – %s", e)
-            db.session.rollback()
-            return []
-        return users
+        self._reconcile_users(
+            remote_users,
+            known_users,
+            build_user=lambda username, remote: User(
+                token=username,  # Use username as token for Navidrome
+                username=username,
+                email=remote.get("email", ""),
+                code="empty",
+                server_id=server_id,
+            ),
+            sync_user=sync_user,
+            key_attr="username",
+        )
 
     def create_user(
         self,
@@ -422,15 +380,17 @@ class NavidromeClient(RestApiMixin):
             )
 
             # Store locally
-            local = User(
-                token=user_id,
-                username=username,
-                email=email,
-                code=code,
-                expires=expires,
-                server_id=server_id,
+            self._add_joined_user(
+                {
+                    "token": user_id,
+                    "username": username,
+                    "email": email,
+                    "code": code,
+                    "expires": expires,
+                    "server_id": server_id,
+                },
+                link_identity=False,
             )
-            db.session.add(local)
             db.session.commit()
 
             return True, ""
@@ -10,6 +10,7 @@ from plexapi.server import PlexServer
 
 from app.extensions import db
 from app.models import Invitation, Library, MediaServer, User
+from app.services.image_proxy import ImageProxyService
 from app.services.media.service import get_client_for_media_server
 from app.services.notifications import notify
 
@@ -152,10 +153,6 @@ class PlexClient(MediaClient):
 
     # ─── Helper Methods ────────────────────────────────────────────────────────
 
-    def _get_server_users(self) -> list[User]:
-        """Get all users for this server from database."""
-        return db.session.query(User).filter(User.server_id == self.server_id).all()
-
     def _extract_plex_permissions(self, plex_user) -> dict[str, bool]:
         """Extract all permissions from a Plex user object."""
         return {
@@ -177,25 +174,33 @@ class PlexClient(MediaClient):
 
         return users_by_email
 
-    def _sync_user_permissions(self, user: User, plex_user) -> None:
-        """Sync permissions and library access from Plex to database user."""
-        # Update basic info
-        user.username = getattr(plex_user, "title", user.username)
-        user.photo = getattr(plex_user, "thumb", None)
-
-        # Update permissions
-        permissions = self._extract_plex_permissions(plex_user)
-        user.is_admin = permissions["is_admin"]
-        user.allow_downloads = permissions["allow_downloads"]
-        user.allow_live_tv = permissions["allow_live_tv"]
-        user.allow_camera_upload = permissions["allow_camera_upload"]
+    def _snapshot_plex_user(self, plex_user) -> dict[str, Any]:
+        """Copy what a user sync needs out of a Plex user object.
 
-        # Update library access
+        Share sections load lazily from plex.tv, so library access is resolved
+        here, with the fetch, rather than while the database is being updated.
+        """
         library_names, has_full_access = self._get_user_library_access(plex_user)
-        if has_full_access:
-            user.set_accessible_libraries(None)
-        else:
-            user.set_accessible_libraries(library_names or [])
+        return {
+            "title": getattr(plex_user, "title", None),
+            "thumb": getattr(plex_user, "thumb", None),
+            "permissions": self._extract_plex_permissions(plex_user),
+            "libraries": None if has_full_access else (library_names or []),
+        }
+
+    def _sync_user_permissions(self, user: User, remote: dict[str, Any]) -> None:
+        """Sync permissions and library access from a Plex user snapshot."""
+        permissions = remote["permissions"]
+        self._assign_changed(
+            user,
+            username=remote["title"] or user.username,
+            photo=remote["thumb"],
+            is_admin=permissions["is_admin"],
+            allow_downloads=permissions["allow_downloads"],
+            allow_live_tv=permissions["allow_live_tv"],
+            allow_camera_upload=permissions["allow_camera_upload"],
+        )
+        user.set_accessible_libraries(remote["libraries"])
 
     # ─── Library Access Methods ────────────────────────────────────────────────
 
@@ -281,7 +286,9 @@ class PlexClient(MediaClient):
                                 poster_url = f"{self.url.rstrip('/')}{poster_url}"
 
                             # Generate secure proxy URL with opaque token
-                            proxied_url = self.generate_image_proxy_url(poster_url)
+                            proxied_url = self.generate_image_proxy_url(
+                                poster_url, width=ImageProxyService.THUMBNAIL_WIDTH
+                            )
                             poster_urls.append(proxied_url)
 
                         if len(poster_urls) >= limit:
@@ -339,7 +346,9 @@ class PlexClient(MediaClient):
                                 thumb_url = f"{self.url.rstrip('/')}{thumb_url}"
 
                             # Generate secure proxy URL with opaque token
-                            thumb_url = self.generate_image_proxy_url(thumb_url)
+                            thumb_url = self.generate_image_proxy_url(
+                                thumb_url, width=ImageProxyService.THUMBNAIL_WIDTH
+                            )
 
                             # Extract year from releaseDate
                             year = None
@@ -917,51 +926,47 @@ class PlexClient(MediaClient):
     @cached(cache=TTLCache(maxsize=1024, ttl=600))
     def list_users(self) -> list[User]:
         """Sync users from Plex to database with all permissions and library access."""
+        return super().list_users()
+
+    def fetch_remote_users(self) -> dict[str, dict[str, Any]] | None:
+        """Read the Plex users shared on this server, keyed by email."""
         try:
             admin_users = self.admin.users()
         except (ConnectionError, Exception) as e:
             logging.error(f"Failed to connect to Plex admin API: {e}")
-            return self._get_server_users()
-
-        plex_users_by_email = self._filter_users_for_server(
-            admin_users, self.server.machineIdentifier
-        )
-
-        known_users = self._get_server_users()
-        if self._skip_prune_on_empty_remote(not plex_users_by_email, known_users):
-            return known_users
-
-        # Remove users no longer in Plex, add new users
-        known_emails = set(plex_users_by_email.keys())
-        for db_user in known_users:
-            if db_user.email not in known_emails:
-                db.session.delete(db_user)
-
-        for email, plex_user in plex_users_by_email.items():
-            if not User.query.filter_by(email=email, server_id=self.server_id).first():
-                db.session.add(
-                    User(
-                        email=email,
-                        username=getattr(plex_user, "title", "Unknown"),
-                        token="None",  # noqa: S106  # Placeholder string, not actual password
-                        code="None",
-                        server_id=self.server_id,
-                    )
-                )
-
-        # Sync all permissions and library access
-        for user in self._get_server_users():
-            if plex_user := plex_users_by_email.get(user.email):
-                self._sync_user_permissions(user, plex_user)
+            return None
 
         try:
-            db.session.commit()
-            logging.info(f"Synced {len(plex_users_by_email)} Plex users to database")
+            plex_users_by_email = self._filter_users_for_server(
+                admin_users, self.server.machineIdentifier
+            )
+            return {
+                email: self._snapshot_plex_user(plex_user)
+                for email, plex_user in plex_users_by_email.items()
+            }
         except Exception as e:
-            logging.error(f"Failed to sync Plex user metadata: {e}")
-            db.session.rollback()
+            logging.error(f"Failed to read Plex users: {e}")
+            return None
+
+    def apply_remote_users(self, remote_users: dict[str, dict[str, Any]]) -> None:
+        """Remove users no longer in Plex, add new ones and sync the rest."""
+        known_users = self._get_server_users()
+        if self._skip_prune_on_empty_remote(not remote_users, known_users):
+            return
 
-        return self._get_server_users()
+        self._reconcile_users(
+            remote_users,
+            known_users,
+            build_user=lambda email, remote: User(
+                email=email,
+                username=remote.get("title") or "Unknown",
+                token="None",  # noqa: S106  # Placeholder string, not actual password
+                code="None",
+                server_id=self.server_id,
+            ),
+            sync_user=self._sync_user_permissions,
+            key_attr="email",
+        )
 
     def _get_user_identifier_for_details(self, user: User) -> str | int | None:
         """Plex uses database ID for get_user_details."""
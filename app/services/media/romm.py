@@ -112,8 +112,8 @@ class RommClient(RestApiMixin):
     # Wizarr API – users (read-only)
     # ------------------------------------------------------------------
 
-    def list_users(self) -> list[User]:
-        """Sync RomM users into local DB (read-only).
+    def fetch_remote_users(self) -> dict[str, dict] | None:
+        """Read RomM users keyed by their RomM id (read-only).
 
         Requires the supplied API token to belong to a RomM *admin* user as
         `/api/users` is admin-only.
@@ -145,64 +145,37 @@ class RommClient(RestApiMixin):
                 skip += take
         except Exception as exc:
             logging.warning("ROMM: failed to list users – %s", exc, exc_info=True)
-            return []
-
-        remote_by_id = {str(u.get("id") or u["username"]): u for u in remote_users}
-
-        known_users = User.query.filter(
-            User.server_id == getattr(self, "server_id", None)
-        ).all()
-        if self._skip_prune_on_empty_remote(not remote_by_id, known_users):
-            return known_users
-
-        # 1) upsert basic user rows so Wizarr UI has something to show
-        for romm_id, ru in remote_by_id.items():
-            db_row: User | None = User.query.filter_by(
-                token=romm_id, server_id=getattr(self, "server_id", None)
-            ).first()
-            if not db_row:
-                db_row = User(
-                    token=romm_id,
-                    username=ru.get("username", "romm-user"),
-                    email=ru.get("email", ""),
-                    code="romm",  # placeholder – no invite code
-                    password="romm",  # noqa: S106  # Placeholder string, not actual password
-                    server_id=getattr(self, "server_id", None),
-                )
-                db.session.add(db_row)
-            else:
-                db_row.username = ru.get("username", db_row.username)
-                db_row.email = ru.get("email", db_row.email)
-        db.session.commit()
-
-        # 2) Remove local users that no longer exist upstream
-        for local in User.query.filter(
-            User.server_id == getattr(self, "server_id", None)
-        ).all():
-            if local.token not in remote_by_id:
-                db.session.delete(local)
-        db.session.commit()
-
-        # Get users with default policy information
-        users = User.query.filter(
-            User.server_id == getattr(self, "server_id", None)
-        ).all()
-
-        # Add default policy attributes (RomM doesn't have specific download/live TV policies)
-        for user in users:
-            # Update standardized User model columns
-            user.allow_downloads = True  # Default for gaming apps
-            user.allow_live_tv = False  # RomM doesn't have Live TV
-            user.is_admin = False  # Would need API call to determine
-
-        # Single commit for all metadata updates
-        try:
-            db.session.commit()
-        except Exception as e:
-            logging.error("RomM: failed to update user metadata – %s", e)
-            db.session.rollback()
-            return []
-        return users
+            return None
+
+        return {str(u.get("id") or u["username"]): u for u in remote_users}
+
+    def apply_remote_users(self, remote_users: dict[str, dict]) -> None:
+        """Sync RomM users into the local DB."""
+        known_users = self._get_server_users()
+        if self._skip_prune_on_empty_remote(not remote_users, known_users):
+            return
+
+        self._reconcile_users(
+            remote_users,
+            known_users,
+            build_user=lambda romm_id, ru: User(
+                token=romm_id,
+                username=ru.get("username", "romm-user"),
+                email=ru.get("email", ""),
+                code="romm",  # placeholder – no invite code
+                password="romm",  # noqa: S106  # Placeholder string, not actual password
+                server_id=getattr(self, "server_id", None),
+            ),
+            # RomM doesn't have specific download/live TV policies
+            sync_user=lambda user, ru: self._assign_changed(
+                user,
+                username=ru.get("username", user.username),
+                email=ru.get("email", user.email),
+                allow_downloads=True,  # Default for gaming apps
+                allow_live_tv=False,  # RomM doesn't have Live TV
+                is_admin=False,  # Would need API call to determine
+            ),
+        )
 
     # ------------------------------------------------------------------
     # Un-implemented mutating operations
@@ -484,7 +457,7 @@ class RommClient(RestApiMixin):
                 else None
             )
 
-            self._create_user_with_identity_linking(
+            self._add_joined_user(
                 {
                     "username": username,
                     "email": email,
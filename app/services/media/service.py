@@ -9,6 +9,7 @@ import copy
 import logging
 import re
 from collections import defaultdict
+from datetime import UTC, datetime
 from time import monotonic
 from typing import Any
 
@@ -16,8 +17,12 @@ from app.extensions import db
 from app.models import Identity, MediaServer, Settings, User
 
 from .client_base import CLIENTS
+from .client_cache import MediaClientCache
+from .fanout import fan_out
 
 _NOW_PLAYING_CACHE_TTL = 5.0  # seconds
+_NOW_PLAYING_TIMEOUT = 10.0  # seconds per fan-out
+_LIST_USERS_TIMEOUT = 90.0  # seconds per fan-out, below the Gunicorn timeout
 _now_playing_cache: dict[str, Any] = {"timestamp": 0.0, "sessions": []}
 
 
@@ -137,7 +142,25 @@ def list_users():
 
 def list_users_for_server(server: MediaServer):
     """List users for a specific MediaServer instance."""
-    return get_client_for_media_server(server).list_users()
+    users = get_client_for_media_server(server).list_users()
+    _mark_synced([server.id])
+    return users
+
+
+def _mark_synced(server_ids) -> None:
+    """Stamp ``last_synced_at`` on servers whose user list was just pulled."""
+    _stamp_synced(server_ids)
+    db.session.commit()
+
+
+def _stamp_synced(server_ids) -> None:
+    server_ids = list(server_ids)
+    if not server_ids:
+        return
+    MediaServer.query.filter(MediaServer.id.in_(server_ids)).update(
+        {MediaServer.last_synced_at: datetime.now(UTC)},
+        synchronize_session=False,
+    )
 
 
 def delete_user(db_id: int) -> None:
@@ -480,26 +503,23 @@ def get_now_playing_all_servers(
 
     all_sessions = []
 
-    # Get all configured media servers
+    # Query every server concurrently; a slow or dead server only costs the
+    # deadline instead of adding its latency to everyone else's.
     servers = db.session.query(MediaServer).all()
+    outcome = fan_out(
+        servers,
+        lambda client, _server: client.now_playing(),
+        timeout=_NOW_PLAYING_TIMEOUT,
+        shared_clients=True,
+    )
 
     for server in servers:
-        try:
-            client = get_client_for_media_server(server)
-            sessions = client.now_playing()
-
+        for session in outcome.results.get(server.id) or []:
             # Add server information to each session
-            for session in sessions:
-                session["server_name"] = server.name
-                session["server_type"] = server.server_type
-                session["server_id"] = server.id
-                all_sessions.append(session)
-
-        except Exception as exc:
-            logging.warning(
-                f"Failed to get now playing from server {server.name} ({server.server_type}): {exc}"
-            )
-            continue
+            session["server_name"] = server.name
+            session["server_type"] = server.server_type
+            session["server_id"] = server.id
+            all_sessions.append(session)
 
     if use_cache:
         _now_playing_cache["timestamp"] = monotonic()
@@ -523,7 +543,7 @@ def get_now_playing_for_server(server_id: int):
         return []
 
     try:
-        client = get_client_for_media_server(server)
+        client = MediaClientCache.get(server)
         sessions = client.now_playing()
 
         # Add server information to each session
@@ -580,12 +600,38 @@ def _auto_link_identities():
 
 
 def list_users_all_servers():
-    """Return users for all servers (mapping server -> list)."""
+    """Return users for all servers (mapping server -> list).
+
+    Servers are read concurrently, but the workers only fetch remote user
+    data; every server is reconciled here, on the caller's thread, in one
+    transaction. Servers that fail or miss the deadline map to ``[]`` and
+    anything they return later is discarded without touching the database.
+    """
     _auto_link_identities()
-    res = {}
-    for server in db.session.query(MediaServer).all():
-        try:
-            res[server.id] = list_users_for_server(server)
-        except Exception:
-            res[server.id] = []
-    return res
+    servers = db.session.query(MediaServer).all()
+    outcome = fan_out(
+        servers,
+        lambda client, _server: client.fetch_remote_users(),
+        timeout=_LIST_USERS_TIMEOUT,
+    )
+
+    synced = []
+    for server in servers:
+        remote_users = outcome.results.get(server.id)
+        if remote_users is None:
+            continue
+        get_client_for_media_server(server).apply_remote_users(remote_users)
+        synced.append(server.id)
+    _stamp_synced(synced)
+    try:
+        db.session.commit()
+    except Exception as exc:
+        logging.error("Failed to sync users from media servers: %s", exc)
+        db.session.rollback()
+        synced = []
+
+    users_by_server: dict[int, list[User]] = {server_id: [] for server_id in synced}
+    if synced:
+        for user in User.query.filter(User.server_id.in_(synced)).all():
+            users_by_server[user.server_id].append(user)
+    return {server.id: users_by_server.get(server.id, []) for server in servers}
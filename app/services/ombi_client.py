@@ -1,27 +1,27 @@
 import logging
+from concurrent.futures import Future, ThreadPoolExecutor
+from threading import Lock
 
 import requests
+from flask import current_app
 
-from app.models import Connection, Settings, User
+from app.models import Connection, User
 from app.services.companions import get_companion_client
+from app.services.settings_cache import SettingsCache
 
 __all__ = [
     "delete_user",
     "delete_user_from_connections",
     "get_connection_for_server",
     "invite_user_to_connections",
+    "queue_connection_invites",
     "run_user_importer",
 ]
 
 
 def _cfg():
     """Fetch Ombi/Overseerr URL and API key from the DB (legacy fallback)."""
-    url_row = Settings.query.filter_by(key="overseerr_url").first()
-    key_row = Settings.query.filter_by(key="ombi_api_key").first()
-    return (
-        url_row.value if url_row else None,
-        key_row.value if key_row else None,
-    )
+    return SettingsCache.get("overseerr_url"), SettingsCache.get("ombi_api_key")
 
 
 def get_connection_for_server(
@@ -86,6 +86,78 @@ def invite_user_to_connections(
     return results
 
 
+_invite_executor: ThreadPoolExecutor | None = None
+_invite_executor_lock = Lock()
+
+
+def _get_invite_executor() -> ThreadPoolExecutor:
+    global _invite_executor
+    with _invite_executor_lock:
+        if _invite_executor is None:
+            # One worker keeps companion invites in submission order.
+            _invite_executor = ThreadPoolExecutor(
+                max_workers=1, thread_name_prefix="companion-invites"
+            )
+        return _invite_executor
+
+
+def _run_connection_invites(
+    username: str, email: str, server_ids: list[int], password: str
+) -> None:
+    for server_id in server_ids:
+        try:
+            results = invite_user_to_connections(
+                username=username,
+                email=email,
+                server_id=server_id,
+                password=password,
+            )
+        except Exception as exc:
+            logging.error(
+                "Error inviting %s to connections for server %s: %s",
+                username,
+                server_id,
+                exc,
+            )
+            continue
+
+        for result in results:
+            if result["status"] == "success":
+                logging.info(
+                    "User %s invited to %s", username, result["connection_name"]
+                )
+            elif result["status"] == "error":
+                logging.warning(
+                    "Failed to invite user to %s: %s",
+                    result["connection_name"],
+                    result["message"],
+                )
+
+
+def queue_connection_invites(
+    username: str, email: str, server_ids: list[int], password: str = ""
+) -> Future | None:
+    """Invite a new user to every companion app of *server_ids* in the background.
+
+    Ombi/Overseerr invites are not needed to finish the invitation, so they run
+    on a single background worker instead of holding up the invitee's request.
+    Under ``TESTING`` they run inline and ``None`` is returned.
+    """
+    if not server_ids:
+        return None
+
+    app = current_app._get_current_object()  # type: ignore[attr-defined]
+    if app.config.get("TESTING"):
+        _run_connection_invites(username, email, list(server_ids), password)
+        return None
+
+    def _job():
+        with app.app_context():
+            _run_connection_invites(username, email, list(server_ids), password)
+
+    return _get_invite_executor().submit(_job)
+
+
 def run_user_importer(name: str):
     """Legacy function - now uses fallback global settings."""
     url, key = _cfg()
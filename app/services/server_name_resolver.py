@@ -4,7 +4,8 @@ This module handles the logic for determining what name to display in invitation
 falling back from global Display Name to actual server names when needed.
 """
 
-from app.models import MediaServer, Settings
+from app.models import MediaServer
+from app.services.settings_cache import SettingsCache
 
 
 def resolve_invitation_server_name(servers: list[MediaServer]) -> str:
@@ -27,16 +28,11 @@ def resolve_invitation_server_name(servers: list[MediaServer]) -> str:
         return "Unknown Server"
 
     # Check for global Display Name setting first
-    display_name_setting = Settings.query.filter_by(key="server_name").first()
-
-    if (
-        display_name_setting
-        and display_name_setting.value
-        and display_name_setting.value.strip()
-        and display_name_setting.value != "Wizarr"
-    ):
+    display_name = SettingsCache.get("server_name")
+
+    if display_name and display_name.strip() and display_name != "Wizarr":
         # Use custom global Display Name for all invitations
-        return display_name_setting.value
+        return display_name
 
     # Single server: Use the actual server name
     if len(servers) == 1:
@@ -74,8 +70,7 @@ def get_display_name_info(servers: list[MediaServer]) -> dict:
             - uses_global_setting: Whether global setting is being used
             - global_setting_value: Current global setting value
     """
-    display_name_setting = Settings.query.filter_by(key="server_name").first()
-    global_setting_value = display_name_setting.value if display_name_setting else None
+    global_setting_value = SettingsCache.get("server_name")
 
     # Check if we're using the global setting
     uses_global_setting = bool(
@@ -0,0 +1,157 @@
+"""
+Process-wide cache of the ``settings`` key/value table.
+
+Every page request used to query ``Settings`` at least twice: the onboarding
+middleware read ``admin_username`` and the template context processor read
+``server_name``. Many routes then loaded the whole table again. Hot paths now
+read from an in-memory snapshot instead.
+
+Every commit that writes a ``Settings`` row also writes a new random token to
+the ``settings_version`` row in the same transaction. The committing process
+drops its snapshot at once. Every other Gunicorn worker compares the token at
+most once per ``SETTINGS_CACHE_CHECK_SECONDS`` and reloads when it changed, so
+steady-state requests make no settings queries at all.
+"""
+
+from __future__ import annotations
+
+import os
+import threading
+import time
+import uuid
+from dataclasses import dataclass
+from typing import ClassVar
+
+from sqlalchemy import event, insert, update
+from sqlalchemy.orm import Session
+
+from app.extensions import db
+from app.models import Settings
+
+VERSION_KEY = "settings_version"
+
+_TRUE_VALUES = {"1", "true", "yes", "on"}
+
+
+@dataclass(frozen=True)
+class _Snapshot:
+    values: dict[str, str | None]
+    version: str | None
+    checked_at: float
+
+
+class SettingsCache:
+    """Read settings from memory, reloading only when the version changes."""
+
+    _snapshots: ClassVar[dict[str, _Snapshot]] = {}
+    _lock: ClassVar[threading.Lock] = threading.Lock()
+
+    CHECK_SECONDS = float(os.getenv("SETTINGS_CACHE_CHECK_SECONDS", "5"))
+
+    @classmethod
+    def _values(cls) -> dict[str, str | None]:
+        # Keyed by database so test apps with their own databases never mix.
+        db_key = str(db.engine.url)
+        now = time.monotonic()
+        with cls._lock:
+            snapshot = cls._snapshots.get(db_key)
+        if snapshot is not None and now - snapshot.checked_at < cls.CHECK_SECONDS:
+            return snapshot.values
+
+        with db.session.no_autoflush:
+            version = (
+                db.session.query(Settings.value).filter_by(key=VERSION_KEY).scalar()
+            )
+            if snapshot is not None and snapshot.version == version:
+                values = snapshot.values
+            else:
+                values = {
+                    key: value
+                    for key, value in db.session.query(Settings.key, Settings.value)
+                    if key != VERSION_KEY
+                }
+
+        with cls._lock:
+            cls._snapshots[db_key] = _Snapshot(values, version, now)
+        return values
+
+    @classmethod
+    def get(cls, key: str, default: str | None = None) -> str | None:
+        value = cls._values().get(key)
+        return default if value is None else value
+
+    @classmethod
+    def get_bool(cls, key: str, default: bool = False) -> bool:
+        value = cls._values().get(key)
+        if value is None:
+            return default
+        return str(value).strip().lower() in _TRUE_VALUES
+
+    @classmethod
+    def get_int(cls, key: str, default: int = 0) -> int:
+        try:
+            return int(cls._values().get(key))  # type: ignore[arg-type]
+        except (TypeError, ValueError):
+            return default
+
+    @classmethod
+    def all(cls) -> dict[str, str | None]:
+        """Return a copy of every setting, safe for the caller to modify."""
+        return dict(cls._values())
+
+    @classmethod
+    def invalidate(cls) -> None:
+        with cls._lock:
+            cls._snapshots.clear()
+
+
+def _touches_settings(session) -> bool:
+    return any(
+        isinstance(obj, Settings) and obj.key != VERSION_KEY
+        for obj in (*session.new, *session.dirty, *session.deleted)
+    )
+
+
+def _track_flush(session, _flush_context, _instances) -> None:
+    if _touches_settings(session):
+        session.info["settings_changed"] = True
+
+
+def _track_bulk_write(orm_execute_state) -> None:
+    """Bulk ``query.update()``/``query.delete()`` never reach the flush hook."""
+    if not (orm_execute_state.is_update or orm_execute_state.is_delete):
+        return
+    mapper = orm_execute_state.bind_mapper
+    if mapper is not None and mapper.class_ is Settings:
+        orm_execute_state.session.info["settings_changed"] = True
+
+
+def _bump_version(session) -> None:
+    # ``before_commit`` runs ahead of the final flush, so look at pending
+    # objects as well as what earlier flushes recorded.
+    if not (session.info.get("settings_changed") or _touches_settings(session)):
+        return
+    session.info["settings_changed"] = True
+    table = Settings.__table__
+    token = uuid.uuid4().hex
+    result = session.execute(
+        update(table).where(table.c.key == VERSION_KEY).values(value=token)
+    )
+    if result.rowcount == 0:
+        session.execute(insert(table).values(key=VERSION_KEY, value=token))
+
+
+def _after_commit(session) -> None:
+    if session.info.pop("settings_changed", False):
+        SettingsCache.invalidate()
+
+
+def _after_rollback(session) -> None:
+    session.info.pop("settings_changed", None)
+
+
+event.listen(Session, "before_flush", _track_flush)
+event.listen(Session, "do_orm_execute", _track_bulk_write)
+event.listen(Session, "before_commit", _bump_version)
+event.listen(Session, "after_commit", _after_commit)
+event.listen(Session, "after_rollback", _after_rollback)
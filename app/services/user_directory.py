@@ -0,0 +1,161 @@
+"""
+Read-only, cached user listings served from the local database.
+
+``GET /api/users`` used to run identity linking and a full remote sync of
+every media server inside the request. Listings now come straight from the
+``user`` table, which the background ``sync_users`` job (or an explicit
+``?sync=true``) keeps current; each server's ``last_synced_at`` tells clients
+how fresh the data is.
+
+Serialised pages are cached per filter/page combination. ORM writes to users
+or servers in this process clear the cache; writes from other workers are
+picked up when ``USER_LIST_CACHE_TTL`` expires.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, ClassVar
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from app.extensions import db
+from app.models import MediaServer, User
+
+MAX_PER_PAGE = 500
+
+
+@dataclass(frozen=True)
+class UserListQuery:
+    """Filters and pagination for a user listing."""
+
+    username: str | None = None
+    email: str | None = None
+    server_id: int | None = None
+    page: int | None = None
+    per_page: int | None = None
+
+    @property
+    def paginated(self) -> bool:
+        return self.page is not None or self.per_page is not None
+
+
+@dataclass(frozen=True)
+class UserListing:
+    payload: dict[str, Any]
+    etag: str
+
+
+def _isoformat(value) -> str | None:
+    return value.isoformat() if value else None
+
+
+class UserDirectory:
+    """Process-wide cache of serialised user listings."""
+
+    _cache: ClassVar[OrderedDict[UserListQuery, tuple[UserListing, float]]] = (
+        OrderedDict()
+    )
+    _lock: ClassVar[threading.Lock] = threading.Lock()
+
+    CACHE_TTL = float(os.getenv("USER_LIST_CACHE_TTL", "30"))
+    MAX_ENTRIES = 64
+
+    @classmethod
+    def list_users(cls, query: UserListQuery) -> UserListing:
+        """Return the listing for *query*, from cache when still valid."""
+        now = time.monotonic()
+        with cls._lock:
+            cached = cls._cache.get(query)
+            if cached and cached[1] > now:
+                cls._cache.move_to_end(query)
+                return cached[0]
+
+        listing = cls._build(query)
+        with cls._lock:
+            cls._cache[query] = (listing, now + cls.CACHE_TTL)
+            cls._cache.move_to_end(query)
+            while len(cls._cache) > cls.MAX_ENTRIES:
+                cls._cache.popitem(last=False)
+        return listing
+
+    @classmethod
+    def invalidate(cls) -> None:
+        with cls._lock:
+            cls._cache.clear()
+
+    @classmethod
+    def _build(cls, query: UserListQuery) -> UserListing:
+        base = (
+            db.session.query(User, MediaServer.name, MediaServer.server_type)
+            .join(MediaServer, User.server_id == MediaServer.id)
+            .order_by(User.id)
+        )
+        if query.username:
+            base = base.filter(User.username == query.username)
+        if query.email:
+            base = base.filter(User.email == query.email)
+        if query.server_id is not None:
+            base = base.filter(User.server_id == query.server_id)
+
+        payload: dict[str, Any] = {}
+        if query.paginated:
+            page = max(query.page or 1, 1)
+            per_page = min(max(query.per_page or 50, 1), MAX_PER_PAGE)
+            payload.update(total=base.count(), page=page, per_page=per_page)
+            base = base.offset((page - 1) * per_page).limit(per_page)
+
+        users = [
+            {
+                "id": user.id,
+                "username": user.username,
+                "email": user.email,
+                "server": server_name,
+                "server_type": server_type,
+                "expires": _isoformat(user.expires),
+                "created_at": _isoformat(getattr(user, "created_at", None)),
+            }
+            for user, server_name, server_type in base.all()
+        ]
+        payload["users"] = users
+        payload["count"] = len(users)
+        payload.setdefault("total", len(users))
+        payload["servers"] = [
+            {"id": sid, "name": name, "last_synced_at": _isoformat(synced)}
+            for sid, name, synced in db.session.query(
+                MediaServer.id, MediaServer.name, MediaServer.last_synced_at
+            ).order_by(MediaServer.id)
+        ]
+
+        body = json.dumps(payload, sort_keys=True, default=str).encode()
+        return UserListing(payload=payload, etag=hashlib.sha256(body).hexdigest()[:32])
+
+
+def _invalidate_on_flush(session, _flush_context) -> None:
+    for obj in (*session.new, *session.dirty, *session.deleted):
+        if isinstance(obj, User | MediaServer):
+            UserDirectory.invalidate()
+            return
+
+
+def _invalidate_on_bulk_write(orm_execute_state) -> None:
+    """Bulk ``query.update()``/``query.delete()`` never reach the flush hook."""
+    if not (orm_execute_state.is_update or orm_execute_state.is_delete):
+        return
+    mapper = orm_execute_state.bind_mapper
+    if mapper is not None and mapper.class_ in (User, MediaServer):
+        UserDirectory.invalidate()
+
+
+event.listen(Session, "after_flush", _invalidate_on_flush)
+event.listen(Session, "do_orm_execute", _invalidate_on_bulk_write)
+
+
+__all__ = ["MAX_PER_PAGE", "UserDirectory", "UserListQuery", "UserListing"]
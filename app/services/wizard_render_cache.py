@@ -0,0 +1,177 @@
+"""
+Compiled-template and rendered-fragment cache for wizard steps.
+
+Rendering a wizard step used to convert card delimiters, compile the step's
+Jinja source and run ``markdown.markdown()`` on every view, so a mass invite
+recompiled the same markdown for each invitee. The static work is now cached:
+
+* Card conversion and Jinja compilation are cached per step source. Widget
+  placeholders are swapped for HTML-comment sentinels first, so widgets stay
+  out of the compiled template. Only the sentinels that survive the Jinja
+  pass are rendered, so widgets in untaken ``{% if %}`` branches cost nothing.
+* The markdown conversion is cached per Jinja output. Invitees who see the same
+  settings and locale produce the same text and share one conversion.
+
+Only the Jinja render with per-invite context and the widgets run per request.
+Keys are content hashes, so an edited step can never be served stale. Writes to
+``WizardStep`` (admin save, import, reset) also clear the cache so it does not
+keep templates for steps that no longer exist.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import re
+import threading
+from collections import OrderedDict
+from collections.abc import Callable
+from dataclasses import dataclass
+from typing import ClassVar
+
+import markdown
+from flask import current_app
+from jinja2 import Environment, Template
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from app.models import WizardStep
+from app.services.wizard_widgets import process_card_delimiters
+
+MARKDOWN_EXTENSIONS = ["fenced_code", "tables", "attr_list"]
+
+_WIDGET_PATTERN = re.compile(r"\{\{\s*(widget:[^}]+)\s*\}\}")
+
+
+_SENTINEL_PATTERN = re.compile(r"<!--wizarr-widget-(\d+)-->")
+
+
+def _sentinel(index: int) -> str:
+    return f"<!--wizarr-widget-{index}-->"
+
+
+@dataclass(frozen=True)
+class CompiledStep:
+    """A step's compiled template plus the widget placeholders it contains."""
+
+    env: Environment
+    template: Template
+    widgets: tuple[str, ...]
+
+
+def _digest(text: str) -> str:
+    return hashlib.sha256(text.encode()).hexdigest()
+
+
+def _environment() -> Environment:
+    """Return the app's non-escaping overlay, created once per app."""
+    app = current_app._get_current_object()  # type: ignore[attr-defined]
+    env = app.extensions.get("wizard_step_env")
+    if env is None:
+        env = app.jinja_env.overlay(autoescape=False)
+        app.extensions["wizard_step_env"] = env
+    return env
+
+
+class WizardRenderCache:
+    """Process-wide cache of compiled wizard steps and rendered markdown."""
+
+    _templates: ClassVar[OrderedDict[str, CompiledStep]] = OrderedDict()
+    _fragments: ClassVar[OrderedDict[str, str]] = OrderedDict()
+    _lock: ClassVar[threading.Lock] = threading.Lock()
+
+    MAX_TEMPLATES = 256
+    MAX_FRAGMENTS = 1024
+
+    @classmethod
+    def compile(cls, content: str) -> CompiledStep:
+        """Return the compiled template for a step's markdown *content*."""
+        env = _environment()
+        key = _digest(content)
+        with cls._lock:
+            compiled = cls._templates.get(key)
+            if compiled is not None and compiled.env is env:
+                cls._templates.move_to_end(key)
+                return compiled
+
+        # Cards first, exactly as before; widgets are then lifted out of the
+        # source so Jinja never parses their ``{{ widget:... }}`` syntax. The
+        # sentinel takes the placeholder's place as is, so markdown keeps an
+        # inline widget inside its paragraph.
+        widgets: list[str] = []
+
+        def _lift(match: re.Match) -> str:
+            widgets.append(match.group(0))
+            return _sentinel(len(widgets) - 1)
+
+        source = _WIDGET_PATTERN.sub(_lift, process_card_delimiters(content))
+        compiled = CompiledStep(env, env.from_string(source), tuple(widgets))
+
+        with cls._lock:
+            cls._templates[key] = compiled
+            while len(cls._templates) > cls.MAX_TEMPLATES:
+                cls._templates.popitem(last=False)
+        return compiled
+
+    @classmethod
+    def markdown(cls, text: str) -> str:
+        """Convert rendered step *text* to HTML, reusing earlier conversions."""
+        key = _digest(text)
+        with cls._lock:
+            html = cls._fragments.get(key)
+            if html is not None:
+                cls._fragments.move_to_end(key)
+                return html
+
+        html = markdown.markdown(text, extensions=MARKDOWN_EXTENSIONS)
+
+        with cls._lock:
+            cls._fragments[key] = html
+            while len(cls._fragments) > cls.MAX_FRAGMENTS:
+                cls._fragments.popitem(last=False)
+        return html
+
+    @staticmethod
+    def fill_widgets(
+        html: str, widgets: tuple[str, ...], render: Callable[[str], str]
+    ) -> str:
+        """Replace each widget sentinel left in *html* with ``render(placeholder)``.
+
+        Widgets whose sentinel the Jinja pass dropped are never rendered.
+        """
+        rendered: dict[int, str] = {}
+
+        def _fill(match: re.Match) -> str:
+            index = int(match.group(1))
+            if index >= len(widgets):
+                return ""
+            if index not in rendered:
+                rendered[index] = render(widgets[index])
+            return rendered[index]
+
+        return _SENTINEL_PATTERN.sub(_fill, html)
+
+    @classmethod
+    def invalidate(cls) -> None:
+        with cls._lock:
+            cls._templates.clear()
+            cls._fragments.clear()
+
+
+def _invalidate_on_flush(session, _flush_context) -> None:
+    for obj in (*session.new, *session.dirty, *session.deleted):
+        if isinstance(obj, WizardStep):
+            WizardRenderCache.invalidate()
+            return
+
+
+def _invalidate_on_bulk_write(orm_execute_state) -> None:
+    """Bulk ``query.update()``/``query.delete()`` never reach the flush hook."""
+    if not (orm_execute_state.is_update or orm_execute_state.is_delete):
+        return
+    mapper = orm_execute_state.bind_mapper
+    if mapper is not None and mapper.class_ is WizardStep:
+        WizardRenderCache.invalidate()
+
+
+event.listen(Session, "after_flush", _invalidate_on_flush)
+event.listen(Session, "do_orm_execute", _invalidate_on_bulk_write)
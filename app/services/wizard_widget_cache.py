@@ -0,0 +1,157 @@
+"""
+Stale-while-revalidate data cache for wizard widgets.
+
+Widgets such as *recently added media* used to call the media server while the
+wizard page rendered, so a slow server made every invitee's page slow. Widget
+data now lives in the ``widget_data_cache`` table, shared by all workers:
+
+* The scheduled ``refresh_wizard_widgets`` job refetches every server.
+* Page renders only read the table. A stale or missing row is returned as-is,
+  or as empty, and a background thread in that worker refetches it.
+
+Artwork URLs are stored as image-proxy URLs. Their tokens are created at
+refresh time, so rendering never has to mint them. Rows older than the token
+lifetime are not served at all.
+"""
+
+from __future__ import annotations
+
+import logging
+import os
+import threading
+import time
+from datetime import UTC, datetime, timedelta
+from typing import Any, ClassVar
+
+from flask import current_app
+from sqlalchemy.exc import IntegrityError
+
+from app.extensions import db
+from app.models import MediaServer, WidgetDataCache
+from app.services.image_proxy import ImageProxyService
+
+logger = logging.getLogger(__name__)
+
+RECENT_ITEMS_WIDGET = "recently_added_media"
+
+# Items fetched per server; widgets asking for fewer get a prefix of them.
+RECENT_ITEMS_FETCH_LIMIT = 12
+
+
+class WizardWidgetCache:
+    """Reads and refreshes cached widget data per media server."""
+
+    _refreshing: ClassVar[set[int]] = set()
+    _failed_at: ClassVar[dict[int, float]] = {}
+    _lock: ClassVar[threading.Lock] = threading.Lock()
+
+    STALE_AFTER = timedelta(
+        seconds=int(os.getenv("WIZARD_WIDGET_STALE_SECONDS", "1800"))
+    )
+    # Proxy tokens embedded in the payload stop validating after this.
+    MAX_AGE = timedelta(
+        seconds=ImageProxyService.TOKEN_EXPIRY - ImageProxyService.TOKEN_BUCKET_SECONDS
+    )
+    FAILURE_BACKOFF = 300  # seconds before retrying a server that failed
+
+    @classmethod
+    def recent_items(cls, server_id: int, limit: int) -> list[dict[str, Any]]:
+        """Return cached recently added items for *server_id*, never blocking."""
+        row = WidgetDataCache.query.filter_by(
+            server_id=server_id, widget=RECENT_ITEMS_WIDGET
+        ).first()
+        if row is None:
+            cls.revalidate(server_id)
+            return []
+
+        age = datetime.now(UTC) - row.refreshed_at.replace(tzinfo=UTC)
+        if age > cls.STALE_AFTER:
+            cls.revalidate(server_id)
+        if age > cls.MAX_AGE:
+            return []
+        return row.get_payload()[:limit]
+
+    @classmethod
+    def revalidate(cls, server_id: int) -> threading.Thread | None:
+        """Refresh *server_id* in a background thread unless one is running."""
+        app = current_app._get_current_object()  # type: ignore[attr-defined]
+        if app.config.get("TESTING"):
+            return None
+
+        with cls._lock:
+            failed_at = cls._failed_at.get(server_id)
+            if server_id in cls._refreshing or (
+                failed_at is not None
+                and time.monotonic() - failed_at < cls.FAILURE_BACKOFF
+            ):
+                return None
+            cls._refreshing.add(server_id)
+
+        def _run():
+            try:
+                with app.app_context():
+                    cls.refresh(server_id)
+            finally:
+                with cls._lock:
+                    cls._refreshing.discard(server_id)
+
+        thread = threading.Thread(
+            target=_run, name=f"widget-refresh-{server_id}", daemon=True
+        )
+        thread.start()
+        return thread
+
+    @classmethod
+    def refresh(cls, server_id: int) -> bool:
+        """Fetch fresh widget data for *server_id* and store it."""
+        from app.services.media.service import get_media_client
+
+        server = db.session.get(MediaServer, server_id)
+        if server is None:
+            return False
+
+        try:
+            client = get_media_client(server.server_type, server)
+            items = client.get_recent_items(limit=RECENT_ITEMS_FETCH_LIMIT) or []
+        except Exception as exc:
+            logger.warning(
+                "Widget data refresh failed for server %s: %s", server_id, exc
+            )
+            with cls._lock:
+                cls._failed_at[server_id] = time.monotonic()
+            return False
+
+        cls._store(server_id, RECENT_ITEMS_WIDGET, items)
+        with cls._lock:
+            cls._failed_at.pop(server_id, None)
+        return True
+
+    @classmethod
+    def refresh_all(cls) -> int:
+        """Refresh every server's widget data; returns how many succeeded."""
+        server_ids = [sid for (sid,) in db.session.query(MediaServer.id)]
+        return sum(1 for server_id in server_ids if cls.refresh(server_id))
+
+    @staticmethod
+    def _store(server_id: int, widget: str, payload: Any) -> None:
+        for _attempt in range(2):
+            row = WidgetDataCache.query.filter_by(
+                server_id=server_id, widget=widget
+            ).first()
+            if row is None:
+                row = WidgetDataCache(server_id=server_id, widget=widget)
+                db.session.add(row)
+            row.set_payload(payload)
+            row.refreshed_at = datetime.now(UTC)
+            try:
+                db.session.commit()
+                return
+            except IntegrityError:
+                # Another worker inserted the row first; update theirs.
+                db.session.rollback()
+
+    @classmethod
+    def reset(cls) -> None:
+        with cls._lock:
+            cls._refreshing.clear()
+            cls._failed_at.clear()
@@ -5,6 +5,9 @@ Provides scheduled tasks for activity data maintenance, cleanup,
 and monitoring health checks.
 """
 
+import os
+from datetime import UTC, datetime
+
 try:
     from flask import Flask
 except ImportError:  # pragma: no cover
@@ -71,6 +74,35 @@ def end_stale_sessions_task(app: Flask, timeout_hours: int = 24):
         return 0
 
 
+def roll_up_activity_task(app: Flask):
+    """
+    Fold ended sessions into the dashboard rollups, rebuilding them if needed.
+
+    Sessions ended by live monitoring are rolled up immediately; this picks up
+    the rest (historical imports, sessions ended elsewhere) and performs the
+    full rebuild requested after rolled-up sessions were deleted.
+
+    Args:
+        app: Flask application instance
+    """
+    logger = structlog.get_logger(__name__)
+
+    try:
+        with app.app_context():
+            from app.services.activity.rollups import ActivityRollupService
+
+            result = ActivityRollupService().run()
+            logger.info(
+                f"Activity rollups updated: {result['rolled_up']} sessions "
+                f"({'rebuilt' if result['rebuilt'] else 'incremental'})"
+            )
+            return result
+
+    except Exception as e:
+        logger.error(f"Failed to update activity rollups: {e}", exc_info=True)
+        return None
+
+
 def monitor_health_check_task(app: Flask):
     """
     Check the health of activity monitoring connections.
@@ -122,6 +154,7 @@ def monitor_health_check_task(app: Flask):
                 if total_connections > 0
                 else 0,
                 "issues": issues,
+                "ingestion": monitor.get_ingestion_stats(),
             }
 
             if issues:
@@ -217,6 +250,14 @@ def get_stale_session_cleanup_interval() -> int:
     return 6
 
 
+def get_rollup_interval() -> int:
+    """Get the interval for the activity rollup task in minutes."""
+    try:
+        return max(int(os.getenv("ACTIVITY_ROLLUP_INTERVAL_MINUTES", "5")), 1)
+    except ValueError:
+        return 5
+
+
 def get_health_check_interval() -> int:
     """Get the interval for health check task in minutes."""
     # Run every 15 minutes
@@ -260,6 +301,18 @@ def register_activity_tasks(app: Flask, scheduler):
             max_instances=1,
         )
 
+        # Dashboard rollups; runs at startup too so fresh installs and
+        # upgrades get their initial backfill straight away
+        scheduler.add_job(
+            id="activity_rollups",
+            func=lambda: roll_up_activity_task(app),
+            trigger="interval",
+            minutes=get_rollup_interval(),
+            next_run_time=datetime.now(UTC),
+            replace_existing=True,
+            max_instances=1,
+        )
+
         # Health monitoring
         scheduler.add_job(
             id="activity_health_check",
@@ -0,0 +1,54 @@
+"""Scheduler-owned worker for queued historical import jobs."""
+
+import logging
+import os
+
+logger = logging.getLogger(__name__)
+
+
+def _get_historical_import_poll_interval():
+    """Get how often the leader looks for queued or abandoned import jobs.
+
+    Returns:
+        int: Interval in seconds
+    """
+    env_interval = os.getenv("HISTORICAL_IMPORT_POLL_SECONDS")
+    if env_interval:
+        try:
+            return max(int(env_interval), 5)
+        except ValueError:
+            logger.warning(
+                "Invalid HISTORICAL_IMPORT_POLL_SECONDS value: %s, using default",
+                env_interval,
+            )
+    return 30
+
+
+def run_historical_imports(app=None):
+    """Run queued historical imports and resume ones left behind by a restart.
+
+    Args:
+        app: Flask application instance. If None, will try to get from current context.
+    """
+    if app is None:
+        from flask import current_app
+
+        try:
+            app = current_app._get_current_object()  # type: ignore
+        except RuntimeError:
+            logger.error(
+                "run_historical_imports called outside application context and no app provided"
+            )
+            return
+
+    with app.app_context():
+        from app.services.historical import HistoricalDataService
+
+        try:
+            processed = HistoricalDataService.run_pending_jobs()
+        except Exception as exc:
+            logger.error("Historical import worker failed: %s", exc)
+            return
+
+        if processed:
+            logger.info("Processed %d historical import jobs", processed)
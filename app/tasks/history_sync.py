@@ -0,0 +1,92 @@
+"""Scheduled delta sync of media server watch history."""
+
+import logging
+import os
+
+logger = logging.getLogger(__name__)
+
+
+def _get_history_sync_interval():
+    """Get the interval for the watch-history delta sync.
+
+    Returns:
+        int: Interval in minutes for the delta sync
+    """
+    env_interval = os.getenv("HISTORY_SYNC_INTERVAL_MINUTES")
+    if env_interval:
+        try:
+            return max(int(env_interval), 1)
+        except ValueError:
+            logger.warning(
+                "Invalid HISTORY_SYNC_INTERVAL_MINUTES value: %s, using default",
+                env_interval,
+            )
+    return 60
+
+
+def sync_recent_history(app=None):
+    """Import plays newer than each server's high-water mark.
+
+    Keeps ``ActivitySession`` complete for playback that happened while
+    Wizarr was not monitoring. Servers with a historical import job still
+    queued or running are skipped; that job advances the mark when it
+    finishes.
+
+    Args:
+        app: Flask application instance. If None, will try to get from current context.
+    """
+    if app is None:
+        from flask import current_app
+
+        try:
+            app = current_app._get_current_object()  # type: ignore
+        except RuntimeError:
+            logger.error(
+                "sync_recent_history called outside application context and no app provided"
+            )
+            return
+
+    with app.app_context():
+        from app.models import HistoricalImportJob, MediaServer
+        from app.services.historical import HISTORY_IMPORTERS, HistoricalDataService
+
+        busy = {
+            server_id
+            for (server_id,) in HistoricalImportJob.query.filter(
+                HistoricalImportJob.status.in_(
+                    [
+                        HistoricalImportJob.STATUS_QUEUED,
+                        HistoricalImportJob.STATUS_RUNNING,
+                    ]
+                )
+            ).with_entities(HistoricalImportJob.server_id)
+        }
+        server_ids = [
+            server_id
+            for server_id, server_type in MediaServer.query.with_entities(
+                MediaServer.id, MediaServer.server_type
+            )
+            if (server_type or "").lower() in HISTORY_IMPORTERS
+            and server_id not in busy
+        ]
+
+        for server_id in server_ids:
+            try:
+                result = HistoricalDataService(server_id).sync_recent_history()
+            except Exception as exc:
+                logger.error(
+                    "History delta sync failed for server %s: %s", server_id, exc
+                )
+                continue
+            if not result.get("success"):
+                logger.warning(
+                    "History delta sync failed for server %s: %s",
+                    server_id,
+                    result.get("error"),
+                )
+            elif result.get("total_stored"):
+                logger.info(
+                    "Imported %d recent plays from server %s",
+                    result["total_stored"],
+                    server_id,
+                )
@@ -30,10 +30,11 @@ def _get_ldap_sync_interval():
 
 
 def sync_ldap_users(app=None):
-    """Automatically sync all users from LDAP server.
+    """Automatically sync new users from the LDAP server.
 
     This task runs periodically to import new LDAP users into Wizarr.
-    Existing users are skipped, only new users are imported.
+    Existing users are skipped, only new users are imported. After the first
+    run only entries modified since the previous sync are searched.
 
     Args:
         app: Flask application instance. If None, will try to get from current context.
@@ -50,8 +51,8 @@ def sync_ldap_users(app=None):
             return
 
     with app.app_context():
-        from app.models import LDAPConfiguration, User
-        from app.services.ldap.user_sync import import_ldap_user, list_ldap_users
+        from app.models import LDAPConfiguration
+        from app.services.ldap.user_sync import sync_ldap_directory
 
         # Check if LDAP is enabled
         ldap_config = LDAPConfiguration.query.filter_by(enabled=True).first()
@@ -59,50 +60,21 @@ def sync_ldap_users(app=None):
             # LDAP not configured, skip silently
             return
 
-        # Get all LDAP users
-        success, result = list_ldap_users()
+        success, result = sync_ldap_directory(incremental=True)
         if not success:
             logger.warning("LDAP sync failed: %s", result)
             return
 
-        ldap_users = result
-
-        # Import each user that doesn't exist yet
-        imported_count = 0
-        skipped_count = 0
-        error_count = 0
-
-        for ldap_user in ldap_users:
-            username = ldap_user["username"]
-
-            # Check if user already exists
-            existing = User.query.filter_by(username=username).first()
-            if existing:
-                skipped_count += 1
-                continue
-
-            # Import the user
-            import_success, import_msg = import_ldap_user(username)
-            if import_success:
-                imported_count += 1
-                logger.info("LDAP sync: Imported user %s", username)
-            else:
-                error_count += 1
-                logger.warning(
-                    "LDAP sync: Failed to import %s: %s", username, import_msg
-                )
-
         # Log summary
-        if imported_count > 0:
+        if result["imported"] > 0:
             logger.info(
-                "LDAP sync: Imported %d new user(s), skipped %d existing, %d error(s)",
-                imported_count,
-                skipped_count,
-                error_count,
+                "LDAP sync: Imported %d new user(s), skipped %d existing",
+                result["imported"],
+                result["skipped"],
             )
         elif os.getenv("FLASK_ENV") == "development":
             # Only log in development mode to avoid spam
             logger.debug(
                 "LDAP sync: No new users (checked %d LDAP users)",
-                len(ldap_users),
+                result["checked"],
             )
@@ -0,0 +1,60 @@
+"""Background sync of media server user lists into the local database."""
+
+import logging
+import os
+
+logger = logging.getLogger(__name__)
+
+
+def _get_user_sync_interval():
+    """Get the interval for the media server user sync.
+
+    Returns:
+        int: Interval in minutes for user sync
+    """
+    env_interval = os.getenv("USER_SYNC_INTERVAL_MINUTES")
+    if env_interval:
+        try:
+            return max(int(env_interval), 1)
+        except ValueError:
+            logger.warning(
+                "Invalid USER_SYNC_INTERVAL_MINUTES value: %s, using default",
+                env_interval,
+            )
+    return 30
+
+
+def sync_media_server_users(app=None):
+    """Pull users from every media server so API reads can stay local.
+
+    Each server that answers gets its ``last_synced_at`` stamped; servers that
+    fail or time out keep their previous timestamp.
+
+    Args:
+        app: Flask application instance. If None, will try to get from current context.
+    """
+    if app is None:
+        from flask import current_app
+
+        try:
+            app = current_app._get_current_object()  # type: ignore
+        except RuntimeError:
+            logger.error(
+                "sync_media_server_users called outside application context and no app provided"
+            )
+            return
+
+    with app.app_context():
+        from app.services.media.service import list_users_all_servers
+
+        try:
+            users_by_server = list_users_all_servers()
+        except Exception as exc:
+            logger.error("Media server user sync failed: %s", exc)
+            return
+
+        logger.info(
+            "Synced %d users from %d media servers",
+            sum(len(users) for users in users_by_server.values()),
+            len(users_by_server),
+        )
@@ -0,0 +1,51 @@
+"""Scheduled refresh of the wizard widget data cache."""
+
+import logging
+import os
+
+logger = logging.getLogger(__name__)
+
+
+def _get_wizard_widget_refresh_interval():
+    """Get the interval for refreshing wizard widget data.
+
+    Returns:
+        int: Interval in minutes between refreshes
+    """
+    env_interval = os.getenv("WIZARD_WIDGET_REFRESH_MINUTES")
+    if env_interval:
+        try:
+            return max(int(env_interval), 1)
+        except ValueError:
+            logger.warning(
+                "Invalid WIZARD_WIDGET_REFRESH_MINUTES value: %s, using default",
+                env_interval,
+            )
+    return 15
+
+
+def refresh_wizard_widgets(app=None):
+    """Refetch widget data (e.g. recently added media) for every server.
+
+    Wizard pages only read the cached rows, so this keeps them current
+    without an invitee ever waiting on a media server.
+
+    Args:
+        app: Flask application instance. If None, will try to get from current context.
+    """
+    if app is None:
+        from flask import current_app
+
+        try:
+            app = current_app._get_current_object()  # type: ignore
+        except RuntimeError:
+            logger.error(
+                "refresh_wizard_widgets called outside application context and no app provided"
+            )
+            return
+
+    with app.app_context():
+        from app.services.wizard_widget_cache import WizardWidgetCache
+
+        refreshed = WizardWidgetCache.refresh_all()
+        logger.debug("Refreshed wizard widget data for %d server(s)", refreshed)
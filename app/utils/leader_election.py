@@ -0,0 +1,164 @@
+"""
+Cross-process leader election for background work.
+
+Every Gunicorn process builds its own Flask app, but only one of them should
+own the APScheduler jobs and the activity collectors - the others just serve
+HTTP. Leadership is an exclusive ``flock`` on a file next to the database, so
+the kernel releases it automatically when the leader exits or crashes and a
+follower can take over on its next retry.
+
+Set ``WIZARR_LEADER_ELECTION=false`` to make every process a leader (the
+pre-election behaviour, useful for single-process setups on exotic
+filesystems).
+"""
+
+import contextlib
+import logging
+import os
+import threading
+from collections.abc import Callable
+from pathlib import Path
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - Windows has no flock
+    fcntl = None  # type: ignore
+
+logger = logging.getLogger(__name__)
+
+
+def _election_enabled() -> bool:
+    return os.getenv("WIZARR_LEADER_ELECTION", "true").lower() not in (
+        "false",
+        "0",
+        "no",
+    )
+
+
+class LeaderElection:
+    """Hold an exclusive file lock and run callbacks once leadership is won."""
+
+    def __init__(self, lock_path: Path | str, retry_interval: float = 30.0):
+        self.lock_path = Path(lock_path)
+        self.retry_interval = retry_interval
+        self._lock = threading.Lock()
+        self._fd: int | None = None
+        self._owner_pid: int | None = None
+        self._callbacks: list[Callable[[], None]] = []
+        self._watcher: threading.Thread | None = None
+        self._stop_event = threading.Event()
+
+        # flock locks are shared with forked children through the inherited
+        # descriptor; make sure a child never believes it is the leader.
+        if hasattr(os, "register_at_fork"):
+            os.register_at_fork(after_in_child=self._reset_after_fork)
+
+    @property
+    def is_leader(self) -> bool:
+        """Return True when this process currently owns the lock."""
+        if not _election_enabled() or fcntl is None:
+            return True
+        return self._fd is not None and self._owner_pid == os.getpid()
+
+    def try_acquire(self) -> bool:
+        """Attempt to take the lock without blocking."""
+        if not _election_enabled() or fcntl is None:
+            return True
+
+        with self._lock:
+            if self.is_leader:
+                return True
+
+            try:
+                self.lock_path.parent.mkdir(parents=True, exist_ok=True)
+                fd = os.open(self.lock_path, os.O_RDWR | os.O_CREAT, 0o600)
+            except OSError as exc:
+                # Unwritable data dir - degrade to the old behaviour rather
+                # than leaving the instance without any background work.
+                logger.warning("Leader lock unavailable (%s); assuming leader", exc)
+                self._owner_pid = os.getpid()
+                self._fd = -1
+                return True
+
+            try:
+                fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except OSError:
+                os.close(fd)
+                return False
+
+            os.ftruncate(fd, 0)
+            os.write(fd, str(os.getpid()).encode())
+            self._fd = fd
+            self._owner_pid = os.getpid()
+            logger.info("Process %s elected leader for background work", os.getpid())
+            return True
+
+    def on_elected(self, callback: Callable[[], None]) -> None:
+        """Run *callback* now if leader, otherwise as soon as leadership is won."""
+        if self.try_acquire():
+            self._run_callback(callback)
+            return
+
+        with self._lock:
+            self._callbacks.append(callback)
+            if self._watcher is None or not self._watcher.is_alive():
+                self._stop_event.clear()
+                self._watcher = threading.Thread(
+                    target=self._watch_loop, name="leader-election", daemon=True
+                )
+                self._watcher.start()
+
+    def release(self) -> None:
+        """Give up leadership and stop waiting for it."""
+        self._stop_event.set()
+        with self._lock:
+            if self._fd is not None and self._fd >= 0:
+                try:
+                    fcntl.flock(self._fd, fcntl.LOCK_UN)  # type: ignore[union-attr]
+                finally:
+                    os.close(self._fd)
+            self._fd = None
+            self._owner_pid = None
+            self._callbacks.clear()
+
+    def _watch_loop(self) -> None:
+        while not self._stop_event.wait(self.retry_interval):
+            if not self.try_acquire():
+                continue
+            with self._lock:
+                callbacks, self._callbacks = self._callbacks, []
+            for callback in callbacks:
+                self._run_callback(callback)
+            return
+
+    def _run_callback(self, callback: Callable[[], None]) -> None:
+        try:
+            callback()
+        except Exception as exc:
+            logger.error("Leader callback failed: %s", exc, exc_info=True)
+
+    def _reset_after_fork(self) -> None:
+        # Closing our copy of the descriptor does not release the parent's lock.
+        if self._fd is not None and self._fd >= 0:
+            with contextlib.suppress(OSError):
+                os.close(self._fd)
+        self._fd = None
+        self._owner_pid = None
+        self._callbacks = []
+        self._watcher = None
+        self._lock = threading.Lock()
+        self._stop_event = threading.Event()
+
+
+def _default_lock_path() -> Path:
+    from app.config import DATABASE_DIR
+
+    return DATABASE_DIR / "wizarr-leader.lock"
+
+
+leader_election = LeaderElection(_default_lock_path())
+
+
+def is_leader() -> bool:
+    """Return True when this process owns the scheduler and collectors."""
+    return leader_election.is_leader
@@ -14,6 +14,8 @@ errorlog = "-"  # Only errors to stderr
 
 # Make workers configurable (default 4, but allow override for resource-constrained systems)
 workers = int(os.getenv("GUNICORN_WORKERS", "4"))
+# Scheduled jobs and activity collectors run in a single elected process
+# (see app/utils/leader_election.py); the remaining workers only serve HTTP.
 worker_class = "sync"
 
 # Worker timeout - kill workers that don't respond within this time
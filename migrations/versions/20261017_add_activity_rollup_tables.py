@@ -0,0 +1,134 @@
+"""Add activity rollup tables
+
+Pre-aggregated per-day activity counters read by the activity dashboard
+instead of scanning activity_session, plus the activity_session.rolled_up
+flag that marks sessions already counted. The rollups are filled by the
+activity_rollups job on first start.
+
+Revision ID: 20261017_activity_rollups
+Revises: 20261017_widget_data_cache
+Create Date: 2026-10-17 18:00:00.000000
+
+"""
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "20261017_activity_rollups"
+down_revision = "20261017_widget_data_cache"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table("activity_session", schema=None) as batch_op:
+        batch_op.add_column(
+            sa.Column(
+                "rolled_up", sa.Boolean(), nullable=False, server_default=sa.false()
+            )
+        )
+        batch_op.create_index(
+            batch_op.f("ix_activity_session_rolled_up"), ["rolled_up"], unique=False
+        )
+
+    op.create_table(
+        "activity_daily_rollup",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("day", sa.Date(), nullable=False),
+        sa.Column("server_id", sa.Integer(), nullable=False),
+        sa.Column("user_name", sa.String(), nullable=False),
+        sa.Column("media_type", sa.String(), nullable=False),
+        sa.Column("sessions", sa.Integer(), nullable=False),
+        sa.Column("watched_sessions", sa.Integer(), nullable=False),
+        sa.Column("watch_ms", sa.BigInteger(), nullable=False),
+        sa.ForeignKeyConstraint(["server_id"], ["media_server.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("id"),
+        sa.UniqueConstraint(
+            "day",
+            "server_id",
+            "user_name",
+            "media_type",
+            name="uq_activity_daily_rollup_key",
+        ),
+    )
+    op.create_index(
+        op.f("ix_activity_daily_rollup_day"),
+        "activity_daily_rollup",
+        ["day"],
+        unique=False,
+    )
+
+    op.create_table(
+        "activity_content_rollup",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("day", sa.Date(), nullable=False),
+        sa.Column("server_id", sa.Integer(), nullable=False),
+        sa.Column("title", sa.String(), nullable=False),
+        sa.Column("content_type", sa.String(), nullable=False),
+        sa.Column("plays", sa.Integer(), nullable=False),
+        sa.Column("watch_ms", sa.BigInteger(), nullable=False),
+        sa.ForeignKeyConstraint(["server_id"], ["media_server.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("id"),
+        sa.UniqueConstraint(
+            "day",
+            "server_id",
+            "title",
+            "content_type",
+            name="uq_activity_content_rollup_key",
+        ),
+    )
+    op.create_index(
+        op.f("ix_activity_content_rollup_day"),
+        "activity_content_rollup",
+        ["day"],
+        unique=False,
+    )
+
+    op.create_table(
+        "activity_hourly_rollup",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("day", sa.Date(), nullable=False),
+        sa.Column("server_id", sa.Integer(), nullable=False),
+        sa.Column("hour", sa.Integer(), nullable=False),
+        sa.Column("sessions", sa.Integer(), nullable=False),
+        sa.ForeignKeyConstraint(["server_id"], ["media_server.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("id"),
+        sa.UniqueConstraint(
+            "day", "server_id", "hour", name="uq_activity_hourly_rollup_key"
+        ),
+    )
+    op.create_index(
+        op.f("ix_activity_hourly_rollup_day"),
+        "activity_hourly_rollup",
+        ["day"],
+        unique=False,
+    )
+
+    op.create_table(
+        "activity_rollup_state",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("rebuild_requested", sa.Boolean(), nullable=False),
+        sa.Column("rebuilt_at", sa.DateTime(), nullable=True),
+        sa.PrimaryKeyConstraint("id"),
+    )
+
+
+def downgrade():
+    op.drop_table("activity_rollup_state")
+    op.drop_index(
+        op.f("ix_activity_hourly_rollup_day"), table_name="activity_hourly_rollup"
+    )
+    op.drop_table("activity_hourly_rollup")
+    op.drop_index(
+        op.f("ix_activity_content_rollup_day"), table_name="activity_content_rollup"
+    )
+    op.drop_table("activity_content_rollup")
+    op.drop_index(
+        op.f("ix_activity_daily_rollup_day"), table_name="activity_daily_rollup"
+    )
+    op.drop_table("activity_daily_rollup")
+
+    with op.batch_alter_table("activity_session", schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f("ix_activity_session_rolled_up"))
+        batch_op.drop_column("rolled_up")
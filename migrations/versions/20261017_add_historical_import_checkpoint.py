@@ -0,0 +1,30 @@
+"""Add checkpoint to historical_import_job
+
+Stores each import's resume position (per-user Jellyfin StartIndex, Plex
+history offset, AudiobookShelf page) so an interrupted job continues from
+its last committed chunk.
+
+Revision ID: 20261017_import_checkpoint
+Revises: 20261017_last_synced
+Create Date: 2026-10-17 12:00:00.000000
+
+"""
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "20261017_import_checkpoint"
+down_revision = "20261017_last_synced"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table("historical_import_job", schema=None) as batch_op:
+        batch_op.add_column(sa.Column("checkpoint", sa.Text(), nullable=True))
+
+
+def downgrade():
+    with op.batch_alter_table("historical_import_job", schema=None) as batch_op:
+        batch_op.drop_column("checkpoint")
@@ -0,0 +1,31 @@
+"""Add users_synced_until to ldap_configuration
+
+High-water mark for incremental LDAP user syncs: the newest modifyTimestamp
+returned by the directory, so scheduled syncs only search changed entries.
+
+Revision ID: 20261017_ldap_sync_mark
+Revises: 20261017_history_mark
+Create Date: 2026-10-17 16:00:00.000000
+
+"""
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "20261017_ldap_sync_mark"
+down_revision = "20261017_history_mark"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table("ldap_configuration", schema=None) as batch_op:
+        batch_op.add_column(
+            sa.Column("users_synced_until", sa.DateTime(), nullable=True)
+        )
+
+
+def downgrade():
+    with op.batch_alter_table("ldap_configuration", schema=None) as batch_op:
+        batch_op.drop_column("users_synced_until")
@@ -0,0 +1,31 @@
+"""Add history_synced_until to media_server
+
+High-water mark for watch-history delta syncs: the newest play imported
+from each server, so scheduled syncs only fetch history after it.
+
+Revision ID: 20261017_history_mark
+Revises: 20261017_import_checkpoint
+Create Date: 2026-10-17 15:00:00.000000
+
+"""
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "20261017_history_mark"
+down_revision = "20261017_import_checkpoint"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table("media_server", schema=None) as batch_op:
+        batch_op.add_column(
+            sa.Column("history_synced_until", sa.DateTime(), nullable=True)
+        )
+
+
+def downgrade():
+    with op.batch_alter_table("media_server", schema=None) as batch_op:
+        batch_op.drop_column("history_synced_until")
@@ -0,0 +1,29 @@
+"""Add last_synced_at to media_server
+
+Records when each server's user list was last synced, so the users API can
+serve from the local database and report how fresh that data is.
+
+Revision ID: 20261017_last_synced
+Revises: 20260401_repair
+Create Date: 2026-10-17 09:00:00.000000
+
+"""
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "20261017_last_synced"
+down_revision = "20260401_repair"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table("media_server", schema=None) as batch_op:
+        batch_op.add_column(sa.Column("last_synced_at", sa.DateTime(), nullable=True))
+
+
+def downgrade():
+    with op.batch_alter_table("media_server", schema=None) as batch_op:
+        batch_op.drop_column("last_synced_at")
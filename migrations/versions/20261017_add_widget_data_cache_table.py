@@ -0,0 +1,37 @@
+"""Add widget_data_cache table
+
+Media-server data behind wizard widgets (e.g. recently added media), kept
+current by a scheduled refresh so wizard pages never call the media server.
+
+Revision ID: 20261017_widget_data_cache
+Revises: 20261017_ldap_sync_mark
+Create Date: 2026-10-17 17:00:00.000000
+
+"""
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "20261017_widget_data_cache"
+down_revision = "20261017_ldap_sync_mark"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        "widget_data_cache",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("server_id", sa.Integer(), nullable=False),
+        sa.Column("widget", sa.String(length=64), nullable=False),
+        sa.Column("payload", sa.Text(), nullable=False),
+        sa.Column("refreshed_at", sa.DateTime(), nullable=False),
+        sa.ForeignKeyConstraint(["server_id"], ["media_server.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("id"),
+        sa.UniqueConstraint("server_id", "widget", name="uq_widget_data_server"),
+    )
+
+
+def downgrade():
+    op.drop_table("widget_data_cache")
@@ -0,0 +1,102 @@
+"""Tests for the cached single-pass activity aggregation engine."""
+
+from datetime import UTC, datetime
+
+import pytest
+
+from app.activity.domain.models import ActivityEvent
+from app.models import ActivitySession, MediaServer
+from app.services.activity import ActivityService
+from app.services.activity.aggregation import ActivityAggregationEngine
+from app.services.activity.ingestion import ActivityIngestionService
+from app.services.activity.queries import ActivityQueryService
+from app.services.activity.rollups import ActivityRollupService
+
+HOUR_MS = 60 * 60 * 1000
+
+
+@pytest.fixture
+def servers(session):
+    servers = [
+        MediaServer(name="Plex", server_type="plex", url="http://plex"),
+        MediaServer(name="Jelly", server_type="jellyfin", url="http://jelly"),
+    ]
+    session.add_all(servers)
+    session.commit()
+    return servers
+
+
+@pytest.fixture
+def history(session, servers):
+    started = datetime.now(UTC).replace(hour=9, minute=0, second=0, microsecond=0)
+    session.add_all(
+        ActivitySession(
+            server_id=server.id,
+            session_id=f"s-{server.id}-{user}",
+            user_name=user,
+            media_title="Alien",
+            media_type="movie",
+            active=False,
+            duration_ms=HOUR_MS,
+            started_at=started,
+        )
+        for server, user in [
+            (servers[0], "alice"),
+            (servers[0], "bob"),
+            (servers[1], "carol"),
+        ]
+    )
+    session.commit()
+    ActivityRollupService().run()
+
+
+def test_aggregate_is_cached_until_ingestion_changes_it(
+    app, session, servers, history, monkeypatch
+):
+    queries = ActivityQueryService()
+    first = queries.get_activity_aggregate(days=7)
+    assert first.total_sessions == 3
+
+    calls = []
+    compute = ActivityAggregationEngine.compute
+    monkeypatch.setattr(
+        ActivityAggregationEngine,
+        "compute",
+        lambda days, server_id=None: calls.append(days) or compute(days, server_id),
+    )
+    assert queries.get_activity_aggregate(days=7) is first
+    assert ActivityService().get_dashboard_stats(days=7)["total_sessions"] == 3
+    assert calls == []
+
+    base = {
+        "server_id": servers[1].id,
+        "session_id": "live-1",
+        "user_name": "dave",
+        "media_title": "Heat",
+        "media_type": "movie",
+        "timestamp": datetime.now(UTC),
+    }
+    ingestion = ActivityIngestionService()
+    ingestion.record_activity_event(ActivityEvent(event_type="session_start", **base))
+    playing = queries.get_activity_aggregate(days=7)
+    assert (playing.total_sessions, playing.playing) == (4, 1)
+
+    ingestion.record_activity_event(
+        ActivityEvent(event_type="session_end", duration_ms=HOUR_MS, **base)
+    )
+    ended = queries.get_activity_aggregate(days=7)
+    assert (ended.total_sessions, ended.playing, ended.watch_ms) == (4, 0, 4 * HOUR_MS)
+    assert calls == [7, 7]
+
+
+def test_stats_can_be_limited_to_one_server(app, servers, history):
+    aggregate = ActivityQueryService().get_activity_aggregate(
+        days=7, server_id=servers[0].id
+    )
+    assert aggregate.total_sessions == 2
+    assert set(aggregate.users) == {"alice", "bob"}
+    assert set(aggregate.servers) == {servers[0].id}
+
+    stats = ActivityService().get_dashboard_stats(days=7, server_id=servers[1].id)
+    assert stats["total_sessions"] == 1
+    assert [s["id"] for s in stats["server_stats"]] == [servers[1].id]
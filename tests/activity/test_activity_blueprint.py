@@ -30,7 +30,7 @@ def test_activity_dashboard_tab_uses_service(logged_activity_client):
 
     assert response.status_code == 200
     assert "dashboard" in body.lower()
-    mocked.assert_called_once_with(days=7)
+    mocked.assert_called_once_with(days=7, server_id=None)
 
 
 def test_activity_grid_returns_table(logged_activity_client):
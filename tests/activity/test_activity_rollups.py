@@ -0,0 +1,171 @@
+"""Tests for the pre-aggregated activity rollups behind the dashboard."""
+
+from datetime import UTC, datetime, timedelta
+
+import pytest
+
+from app.activity.domain.models import ActivityEvent
+from app.models import (
+    ActivityDailyRollup,
+    ActivityRollupState,
+    ActivitySession,
+    MediaServer,
+)
+from app.services.activity import ActivityService
+from app.services.activity.ingestion import ActivityIngestionService
+from app.services.activity.rollups import ActivityRollupService
+
+HOUR_MS = 60 * 60 * 1000
+
+
+@pytest.fixture
+def server(session):
+    server = MediaServer(name="Plex", server_type="plex", url="http://plex")
+    session.add(server)
+    session.commit()
+    return server
+
+
+def _session(server, started_at, **values):
+    defaults = {
+        "server_id": server.id,
+        "session_id": f"s-{started_at.timestamp()}-{values.get('user_name')}",
+        "user_name": "alice",
+        "media_title": "Alien",
+        "media_type": "movie",
+        "active": False,
+        "duration_ms": HOUR_MS,
+        "started_at": started_at,
+    }
+    return ActivitySession(**(defaults | values))
+
+
+@pytest.fixture
+def history(session, server):
+    today = datetime.now(UTC).replace(hour=20, minute=0, second=0, microsecond=0)
+    yesterday = today - timedelta(days=1)
+    rows = [
+        _session(server, yesterday),
+        _session(server, yesterday, user_name="bob", duration_ms=2 * HOUR_MS),
+        _session(
+            server,
+            today,
+            user_name="bob",
+            media_title="Pilot",
+            media_type="episode",
+            series_name="Lost",
+        ),
+        _session(server, today, user_name="Unknown"),
+        _session(server, today, user_name="carol", active=True, duration_ms=None),
+        _session(server, today - timedelta(days=60)),
+    ]
+    session.add_all(rows)
+    session.commit()
+    return rows
+
+
+def test_dashboard_reads_rollups_plus_playing_sessions(app, history):
+    assert ActivityRollupService().run()["rebuilt"] is True
+
+    stats = ActivityService().get_dashboard_stats(days=7)
+
+    # Three valid ended sessions in the window plus carol's live one.
+    assert stats["total_sessions"] == 4
+    assert stats["unique_users"] == 3
+    assert stats["total_watch_time"] == pytest.approx(4.0)
+    assert stats["avg_session_length"] == pytest.approx(4.0 / 3)
+    assert stats["time_series_data"][-2:] == [2, 2]
+    assert stats["hourly_data"][20] == 4
+    assert sum(stats["weekday_data"]) == 4
+    assert dict(
+        zip(stats["media_type_labels"], stats["media_type_data"], strict=True)
+    ) == {
+        "episode": 1,
+        "movie": 3,
+    }
+    assert [
+        (c["title"], c["media_type"], c["play_count"]) for c in stats["top_content"]
+    ] == [
+        ("Alien", "Movie", 3),
+        ("Lost", "Series", 1),
+    ]
+    assert [u["username"] for u in stats["top_users"]] == ["bob", "alice", "carol"]
+    assert stats["server_stats"][0]["session_count"] == 4
+    assert stats["server_stats"][0]["unique_users"] == 3
+
+    all_time = ActivityService().get_activity_stats(days=0)
+    assert all_time["total_sessions"] == 5
+    assert all_time["active_sessions"] == 1
+
+
+def test_ending_a_session_rolls_it_up_at_once(app, session, server):
+    ActivityRollupService().run()
+    ingestion = ActivityIngestionService()
+    started = datetime.now(UTC)
+    base = {
+        "server_id": server.id,
+        "session_id": "live-1",
+        "user_name": "dave",
+        "media_title": "Heat",
+        "media_type": "movie",
+        "timestamp": started,
+    }
+    ingestion.record_activity_event(ActivityEvent(event_type="session_start", **base))
+    assert ActivityDailyRollup.query.count() == 0
+
+    ingestion.record_activity_event(
+        ActivityEvent(event_type="session_end", duration_ms=HOUR_MS, **base)
+    )
+
+    row = ActivityDailyRollup.query.one()
+    assert (row.user_name, row.sessions, row.watch_ms) == ("dave", 1, HOUR_MS)
+    assert ActivitySession.query.one().rolled_up is True
+    assert ActivityRollupService().run()["rolled_up"] == 0
+
+
+def test_deleting_rolled_up_sessions_requests_a_rebuild(app, session, history):
+    service = ActivityRollupService()
+    service.run()
+    assert ActivityService().get_dashboard_stats(days=7)["total_sessions"] == 4
+
+    ActivitySession.query.filter_by(user_name="bob").delete()
+    session.commit()
+    assert session.get(ActivityRollupState, 1).rebuild_requested is True
+
+    assert service.run()["rebuilt"] is True
+    assert ActivityService().get_dashboard_stats(days=7)["total_sessions"] == 2
+
+
+def test_retention_cleanup_drops_old_rollup_days(app, session, history):
+    ActivityRollupService().run()
+    assert ActivityService().get_dashboard_stats(days=0)["total_sessions"] == 5
+
+    ActivityService().cleanup_old_activity(retention_days=30)
+
+    assert session.get(ActivityRollupState, 1).rebuild_requested is False
+    assert ActivityService().get_dashboard_stats(days=0)["total_sessions"] == 4
+
+
+def test_renaming_a_rolled_up_session_requests_a_rebuild(app, session, history):
+    service = ActivityRollupService()
+    service.run()
+
+    # Identity resolution rewrites the user name of sessions already counted.
+    for row in ActivitySession.query.filter_by(user_name="bob"):
+        row.user_name = "Bob Smith"
+    session.commit()
+    assert session.get(ActivityRollupState, 1).rebuild_requested is True
+
+    assert service.run()["rebuilt"] is True
+    users = {r.user_name for r in ActivityDailyRollup.query}
+    assert "Bob Smith" in users
+    assert "bob" not in users
+
+
+def test_updating_an_active_session_keeps_the_rollups(app, session, history):
+    ActivityRollupService().run()
+
+    carol = ActivitySession.query.filter_by(user_name="carol").one()
+    carol.media_title = "Aliens"
+    session.commit()
+    assert session.get(ActivityRollupState, 1).rebuild_requested is False
@@ -0,0 +1,141 @@
+"""Tests for the in-memory identity resolution index."""
+
+import pytest
+from sqlalchemy import event
+
+import app.services.activity.identity_resolution as resolution
+from app.extensions import db
+from app.models import ActivitySession, Identity, MediaServer, User
+from app.services.activity.identity_resolution import (
+    apply_identity_resolution_bulk,
+    identity_index,
+    resolve_user_identity,
+)
+
+
+@pytest.fixture
+def media_server(session):
+    server = MediaServer(
+        name="Identity Jellyfin",
+        server_type="jellyfin",
+        url="http://localhost:8096",
+        api_key="key",
+        verified=True,
+    )
+    session.add(server)
+    session.commit()
+    identity_index.invalidate()
+    return server
+
+
+def _add_user(session, server, username, identity=None):
+    user = User(
+        token=f"tok-{username}",
+        username=username,
+        email=f"{username}@example.com",
+        code="CODE",
+        server_id=server.id,
+        identity=identity,
+    )
+    session.add(user)
+    session.commit()
+    return user
+
+
+@pytest.fixture
+def count_queries():
+    statements = []
+
+    def _record(_conn, _cursor, statement, *_args):
+        statements.append(statement)
+
+    event.listen(db.engine, "before_cursor_execute", _record)
+    yield statements
+    event.remove(db.engine, "before_cursor_execute", _record)
+
+
+def test_resolves_username_nickname_and_primary_username(session, media_server):
+    identity = Identity(nickname="Bobby", primary_username="robert")
+    user = _add_user(session, media_server, "bob", identity)
+
+    for name in ("BOB", "bobby", "Robert"):
+        assert resolve_user_identity(media_server.id, None, name) == (
+            user.id,
+            identity.id,
+            "Bobby",
+        )
+
+    assert resolve_user_identity(media_server.id, None, "nobody") == (
+        None,
+        None,
+        "nobody",
+    )
+
+
+def test_lookups_are_served_from_memory(session, media_server, count_queries):
+    _add_user(session, media_server, "carol")
+    resolve_user_identity(media_server.id, None, "carol")
+
+    count_queries.clear()
+    for _ in range(5):
+        resolve_user_identity(media_server.id, None, "carol")
+        resolve_user_identity(media_server.id, None, "unknown user")
+
+    assert count_queries == []
+
+
+def test_user_changes_invalidate_index(session, media_server):
+    assert resolve_user_identity(media_server.id, None, "dave")[0] is None
+
+    user = _add_user(session, media_server, "dave")
+    assert resolve_user_identity(media_server.id, None, "dave")[0] == user.id
+
+    user.username = "david"
+    session.commit()
+    assert resolve_user_identity(media_server.id, None, "dave")[0] is None
+
+
+def test_bulk_resolution_queries_users_once_per_server(
+    session, media_server, count_queries
+):
+    user = _add_user(session, media_server, "erin")
+    sessions = [
+        ActivitySession(
+            server_id=media_server.id,
+            session_id=f"s{i}",
+            user_name="erin",
+            media_title="Movie",
+        )
+        for i in range(20)
+    ]
+    identity_index.invalidate()
+    count_queries.clear()
+
+    assert apply_identity_resolution_bulk(sessions)
+    assert all(s.wizarr_user_id == user.id for s in sessions)
+    assert len([q for q in count_queries if "FROM user" in q]) == 1
+
+
+def test_bulk_resolution_skips_sessions_that_fail(session, media_server, monkeypatch):
+    user = _add_user(session, media_server, "frank")
+    sessions = [
+        ActivitySession(
+            server_id=media_server.id,
+            session_id=f"s{i}",
+            user_name=name,
+            media_title="Movie",
+        )
+        for i, name in enumerate(("broken", "frank"))
+    ]
+    real_resolve = resolution.resolve_user_identity
+
+    def resolve(server_id, user_id, user_name):
+        if user_name == "broken":
+            raise RuntimeError("bad session")
+        return real_resolve(server_id, user_id, user_name)
+
+    monkeypatch.setattr(resolution, "resolve_user_identity", resolve)
+
+    assert apply_identity_resolution_bulk(sessions) is True
+    assert sessions[0].wizarr_user_id is None
+    assert sessions[1].wizarr_user_id == user.id
@@ -0,0 +1,144 @@
+"""Tests for the Jellyfin/Emby WebSocket session collectors."""
+
+import json
+
+import pytest
+import websocket
+
+from app.activity.monitoring.collectors import jellyfin as jellyfin_collector
+from app.activity.monitoring.collectors.emby import EmbyCollector
+from app.activity.monitoring.collectors.jellyfin import JellyfinCollector
+from app.models import MediaServer
+
+
+class _Client:
+    def __init__(self):
+        self.polls = 0
+        self.playing = []
+
+    def parse_sessions(self, raw):
+        return [
+            {
+                "session_id": s["Id"],
+                "user_name": s["UserName"],
+                "media_title": "Heat",
+                "state": "paused" if s.get("IsPaused") else "playing",
+                "position_ms": s["PositionMs"],
+            }
+            for s in raw
+        ]
+
+    def now_playing(self):
+        self.polls += 1
+        return self.parse_sessions(self.playing)
+
+
+class _Socket:
+    def __init__(self, collector, messages):
+        self.collector = collector
+        self.messages = list(messages)
+        self.sent = []
+
+    def settimeout(self, _timeout):
+        pass
+
+    def send(self, message):
+        self.sent.append(json.loads(message))
+
+    def recv(self):
+        if not self.messages:
+            self.collector.running = False
+            raise websocket.WebSocketTimeoutException("idle")
+        return json.dumps(self.messages.pop(0))
+
+    def close(self):
+        pass
+
+
+def _sessions(*sessions):
+    return {"MessageType": "Sessions", "Data": list(sessions)}
+
+
+def _session(paused=False, position_ms=1000):
+    return {
+        "Id": "abc",
+        "UserName": "alice",
+        "IsPaused": paused,
+        "PositionMs": position_ms,
+    }
+
+
+@pytest.fixture
+def server():
+    return MediaServer(
+        id=5, name="Jelly", server_type="jellyfin", url="https://jf/base/", api_key="k"
+    )
+
+
+@pytest.fixture
+def events():
+    return []
+
+
+def test_events_follow_session_changes_not_time(server, events, monkeypatch):
+    collector = JellyfinCollector(server, events.append)
+    client = _Client()
+    monkeypatch.setattr(collector, "_get_media_client", lambda: client)
+    ws = _Socket(collector, [])
+
+    for message in [
+        _sessions(_session()),
+        _sessions(_session(position_ms=11000)),  # progress tick, throttled
+        _sessions(_session(paused=True, position_ms=12000)),
+        {"MessageType": "ForceKeepAlive", "Data": 60},
+        _sessions(),
+    ]:
+        collector._handle_message(ws, json.dumps(message))
+
+    assert [e.event_type for e in events] == [
+        "session_start",
+        "session_pause",
+        "session_end",
+    ]
+    assert events[-1].duration_ms == 12000
+    assert ws.sent == [{"MessageType": "KeepAlive"}]
+    assert collector.keepalive_interval == 30
+    assert client.polls == 0
+
+    client.playing = [_session()]
+    collector._handle_message(ws, json.dumps({"MessageType": "PlaybackStart"}))
+    assert client.polls == 1
+    assert events[-1].event_type == "session_start"
+
+
+def test_emby_polls_until_the_socket_connects(server, events, monkeypatch):
+    collector = EmbyCollector(server, events.append)
+    client = _Client()
+    monkeypatch.setattr(collector, "_get_media_client", lambda: client)
+    client.playing = [_session()]
+    sockets = []
+
+    def connect(url, timeout):
+        sockets.append(url)
+        if len(sockets) == 1:
+            raise ConnectionRefusedError("down")
+        ws = _Socket(collector, [_sessions()])
+        sockets.append(ws)
+        return ws
+
+    waits = []
+    monkeypatch.setattr(jellyfin_collector.websocket, "create_connection", connect)
+    monkeypatch.setattr(collector._stop_event, "wait", waits.append)
+
+    collector.running = True
+    collector._collect_loop()
+
+    assert sockets[0] == (
+        "wss://jf/base/embywebsocket?api_key=k&deviceId=wizarr-activity-5"
+    )
+    assert client.polls == 1
+    assert waits == [1]
+    assert sockets[2].sent[0] == {"MessageType": "SessionsStart", "Data": "0,1500"}
+    # The first Sessions message after connecting shows playback has ended.
+    assert [e.event_type for e in events] == ["session_start", "session_end"]
+    assert collector.is_connected() is False
@@ -0,0 +1,148 @@
+"""Tests for the Plex notification WebSocket collector."""
+
+import json
+
+import pytest
+import websocket
+
+from app.activity.monitoring.collectors import plex as plex_collector
+from app.activity.monitoring.collectors.plex import PlexCollector
+from app.models import MediaServer
+
+
+def _alert(session_key, state, view_offset=1000):
+    return json.dumps(
+        {
+            "NotificationContainer": {
+                "type": "playing",
+                "PlaySessionStateNotification": [
+                    {
+                        "sessionKey": session_key,
+                        "state": state,
+                        "viewOffset": view_offset,
+                        "ratingKey": "42",
+                    }
+                ],
+            }
+        }
+    )
+
+
+class _Client:
+    def __init__(self, sessions):
+        self.sessions = sessions
+
+    def now_playing(self):
+        return self.sessions
+
+
+class _Socket:
+    def __init__(self, collector, messages):
+        self.collector = collector
+        self.messages = list(messages)
+
+    def settimeout(self, _timeout):
+        pass
+
+    def recv(self):
+        if not self.messages:
+            self.collector.running = False
+            raise websocket.WebSocketTimeoutException("idle")
+        return self.messages.pop(0)
+
+    def close(self):
+        pass
+
+
+@pytest.fixture
+def events():
+    return []
+
+
+@pytest.fixture
+def collector(events):
+    server = MediaServer(
+        id=3, name="Plex", server_type="plex", url="https://plex:32400/", api_key="t"
+    )
+    collector = PlexCollector(server, events.append)
+    yield collector
+    collector.stop()
+
+
+def test_notifications_drive_sessions_and_hand_over_to_polling(
+    collector, events, monkeypatch
+):
+    monkeypatch.setattr(
+        collector.session_manager,
+        "_get_session_from_current_activity",
+        lambda key, server_id: {"username": "alice", "full_title": "Alien"},
+    )
+    assert collector._notifications_url() == (
+        "wss://plex:32400/:/websockets/notifications"
+    )
+
+    collector._handle_message(_alert("7", "playing"))
+    collector._handle_message(_alert("7", "paused", 5000))
+    collector._handle_message("not json")
+    assert [e.event_type for e in events] == [
+        "session_start",
+        "session_progress",
+        "session_pause",
+    ]
+    assert events[0].user_name == "alice"
+
+    collector._on_disconnected()
+    assert collector.session_manager.get_active_sessions() == {}
+    assert collector.fallback.active_sessions["7"]["state"] == "paused"
+
+    monkeypatch.setattr(collector.fallback, "_get_media_client", lambda: _Client([]))
+    collector.fallback._poll_sessions()
+    assert events[-1].event_type == "session_end"
+    assert (events[-1].session_id, events[-1].user_name) == ("7", "alice")
+
+
+def test_polls_with_backoff_until_the_socket_reconnects(collector, events, monkeypatch):
+    attempts = []
+
+    def connect(url, timeout, header):
+        attempts.append((url, header))
+        if len(attempts) < 3:
+            raise ConnectionRefusedError("down")
+        return _Socket(collector, [_alert("9", "playing")])
+
+    waits = []
+    monkeypatch.setattr(plex_collector.websocket, "create_connection", connect)
+    monkeypatch.setattr(collector._stop_event, "wait", waits.append)
+    monkeypatch.setattr(
+        collector.fallback,
+        "_get_media_client",
+        lambda: _Client(
+            [{"session_id": "9", "user_name": "bob", "media_title": "Heat"}]
+        ),
+    )
+    monkeypatch.setattr(
+        collector.session_manager,
+        "_get_session_from_current_activity",
+        lambda key, server_id: {},
+    )
+    collector.fallback.poll_interval = 0
+
+    collector.running = True
+    collector._collect_loop()
+
+    assert waits == [1, 2]
+    assert attempts[0] == (
+        "wss://plex:32400/:/websockets/notifications",
+        ["X-Plex-Token: t"],
+    )
+    # Polling started the session; the socket picked it up without a restart.
+    assert [e.event_type for e in events] == [
+        "session_start",
+        "session_progress",
+        "session_progress",
+    ]
+    assert events[-1].user_name == "bob"
+    assert collector.fallback.active_sessions == {}
+    adopted = collector.session_manager.get_active_sessions()["9"]
+    assert adopted["username"] == "bob"
+    assert adopted["started_at"] is not None
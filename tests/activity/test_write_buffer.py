@@ -0,0 +1,122 @@
+"""Tests for the write-behind activity buffer."""
+
+import threading
+from unittest.mock import MagicMock
+
+import pytest
+
+from app.activity.domain.models import ActivityEvent
+from app.extensions import db
+from app.models import ActivitySession, ActivitySnapshot, MediaServer
+from app.services.activity.ingestion import ActivityIngestionService
+from app.services.activity.write_buffer import ActivityWriteBuffer
+
+
+def _event(event_type, session_id="s1", position_ms=None, server_id=1):
+    return ActivityEvent(
+        event_type=event_type,
+        server_id=server_id,
+        session_id=session_id,
+        user_name="alice",
+        media_title="Movie",
+        position_ms=position_ms,
+        state="playing" if position_ms is not None else None,
+    )
+
+
+def test_progress_events_are_coalesced_per_session(app):
+    ingestion = MagicMock()
+    buffer = ActivityWriteBuffer(app, ingestion, flush_interval_ms=1000)
+
+    buffer.submit(_event("session_progress", position_ms=1000))
+    buffer.submit(_event("session_progress", position_ms=2000))
+    buffer.submit(_event("session_progress", session_id="s2", position_ms=500))
+    buffer.submit(_event("session_progress", position_ms=3000))
+
+    stats = buffer.get_stats()
+    assert stats["pending"] == 2
+    assert stats["coalesced"] == 2
+
+    assert buffer.flush() == 2
+    batch = ingestion.record_activity_events.call_args.args[0]
+    assert [(e.session_id, e.position_ms) for e in batch] == [
+        ("s1", 3000),
+        ("s2", 500),
+    ]
+
+
+def test_lifecycle_events_keep_order_and_are_never_dropped(app):
+    ingestion = MagicMock()
+    buffer = ActivityWriteBuffer(app, ingestion, max_pending=1)
+
+    assert buffer.submit(_event("session_start"))
+    assert not buffer.submit(_event("session_progress", "s2", position_ms=1))
+    assert buffer.submit(_event("session_end"))
+
+    buffer.flush()
+    batch = ingestion.record_activity_events.call_args.args[0]
+    assert [e.event_type for e in batch] == ["session_start", "session_end"]
+    assert buffer.get_stats()["dropped"] == 1
+
+
+@pytest.fixture
+def media_server(session):
+    server = MediaServer(
+        name="Buffered Jellyfin",
+        server_type="jellyfin",
+        url="http://localhost:8096",
+        api_key="key",
+        verified=True,
+    )
+    session.add(server)
+    session.commit()
+    return server
+
+
+def test_flush_persists_batch_in_one_transaction(app, session, media_server):
+    buffer = ActivityWriteBuffer(app, ActivityIngestionService())
+
+    buffer.submit(_event("session_start", server_id=media_server.id, position_ms=0))
+    buffer.submit(
+        _event("session_progress", server_id=media_server.id, position_ms=5000)
+    )
+    buffer.submit(
+        _event("session_progress", server_id=media_server.id, position_ms=9000)
+    )
+
+    assert buffer.flush() == 2
+
+    stored = ActivitySession.query.filter_by(server_id=media_server.id).all()
+    assert len(stored) == 1
+    assert stored[0].get_metadata()["last_known_position_ms"] == 9000
+    positions = sorted(
+        s.position_ms for s in ActivitySnapshot.query.filter_by(session_id=stored[0].id)
+    )
+    assert positions == [0, 9000]
+
+
+def test_batch_on_another_thread_does_not_defer_commits(app, session, media_server):
+    ingestion = ActivityIngestionService()
+    batch_open = threading.Event()
+    done = threading.Event()
+
+    def flusher():
+        # Hold a batch open, as the write buffer does during a flush.
+        ingestion._batch_depth += 1
+        batch_open.set()
+        done.wait(5)
+        ingestion._batch_depth -= 1
+
+    thread = threading.Thread(target=flusher)
+    thread.start()
+    try:
+        batch_open.wait(5)
+        ingestion.record_activity_event(
+            _event("session_start", server_id=media_server.id, position_ms=0)
+        )
+        # Committed by this thread, so a rollback keeps it.
+        db.session.rollback()
+        assert ActivitySession.query.filter_by(server_id=media_server.id).count() == 1
+    finally:
+        done.set()
+        thread.join()
@@ -21,6 +21,7 @@ class TestConfig(BaseConfig):
     # Use a temporary file database for better migration compatibility
     _temp_db_path = os.path.join(tempfile.gettempdir(), "wizarr_test.db")
     SQLALCHEMY_DATABASE_URI = f"sqlite:///{_temp_db_path}"
+    IMAGE_DISK_CACHE_DIR = os.path.join(tempfile.gettempdir(), "wizarr_test_images")
 
 
 class E2ETestConfig(BaseConfig):
@@ -94,6 +95,11 @@ def session(app):
         # Plus tables first
         db.session.execute(db.text("DELETE FROM activity_snapshot"))
         db.session.execute(db.text("DELETE FROM historical_import_job"))
+        db.session.execute(db.text("DELETE FROM widget_data_cache"))
+        db.session.execute(db.text("DELETE FROM activity_daily_rollup"))
+        db.session.execute(db.text("DELETE FROM activity_content_rollup"))
+        db.session.execute(db.text("DELETE FROM activity_hourly_rollup"))
+        db.session.execute(db.text("DELETE FROM activity_rollup_state"))
         db.session.query(ActivitySession).delete()
         db.session.query(ExpiredUser).delete()
         # Junction tables
@@ -123,6 +129,11 @@ def session(app):
         # Plus tables first
         db.session.execute(db.text("DELETE FROM activity_snapshot"))
         db.session.execute(db.text("DELETE FROM historical_import_job"))
+        db.session.execute(db.text("DELETE FROM widget_data_cache"))
+        db.session.execute(db.text("DELETE FROM activity_daily_rollup"))
+        db.session.execute(db.text("DELETE FROM activity_content_rollup"))
+        db.session.execute(db.text("DELETE FROM activity_hourly_rollup"))
+        db.session.execute(db.text("DELETE FROM activity_rollup_state"))
         db.session.query(ActivitySession).delete()
         db.session.query(ExpiredUser).delete()
         # Junction tables
@@ -170,3 +181,31 @@ def cleanup_redirect_loop_data(app):
     except Exception:
         # Silently ignore cleanup errors (e.g., if app context is not available)
         pass
+
+
+@pytest.fixture(autouse=True)
+def reset_process_caches():
+    """Process-wide read caches outlive a test, but ids repeat across test DBs."""
+    from app.services.activity.aggregation import ActivityAggregationEngine
+    from app.services.api_key_auth import ApiKeyAuthenticator
+    from app.services.media.client_cache import MediaClientCache
+    from app.services.settings_cache import SettingsCache
+    from app.services.user_directory import UserDirectory
+    from app.services.wizard_render_cache import WizardRenderCache
+    from app.services.wizard_widget_cache import WizardWidgetCache
+
+    ActivityAggregationEngine.invalidate()
+    ApiKeyAuthenticator.reset()
+    MediaClientCache.invalidate()
+    SettingsCache.invalidate()
+    UserDirectory.invalidate()
+    WizardRenderCache.invalidate()
+    WizardWidgetCache.reset()
+    yield
+    ActivityAggregationEngine.invalidate()
+    ApiKeyAuthenticator.reset()
+    MediaClientCache.invalidate()
+    SettingsCache.invalidate()
+    UserDirectory.invalidate()
+    WizardRenderCache.invalidate()
+    WizardWidgetCache.reset()
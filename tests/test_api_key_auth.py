@@ -0,0 +1,91 @@
+"""Tests for cached API key authentication and batched usage tracking."""
+
+import hashlib
+
+import pytest
+from sqlalchemy import event
+
+from app.extensions import db
+from app.models import AdminAccount, ApiKey
+from app.services.api_key_auth import ApiKeyAuthenticator
+
+RAW_KEY = "cached-auth-test-key"
+
+
+@pytest.fixture
+def api_key(app):
+    with app.app_context():
+        admin = AdminAccount.query.first()
+        if admin is None:
+            admin = AdminAccount(username="cache-admin")
+            admin.set_password("password")
+            db.session.add(admin)
+            db.session.commit()
+        row = ApiKey(
+            name="Automation",
+            key_hash=hashlib.sha256(RAW_KEY.encode()).hexdigest(),
+            created_by_id=admin.id,
+        )
+        db.session.add(row)
+        db.session.commit()
+        key_id = row.id
+    yield key_id
+    with app.app_context():
+        db.session.delete(db.session.get(ApiKey, key_id))
+        db.session.commit()
+
+
+def _count_api_key_statements():
+    statements = []
+
+    def _record(_conn, _cursor, statement, *_args):
+        if "api_key" in statement:
+            statements.append(statement.split()[0].upper())
+
+    event.listen(db.engine, "before_cursor_execute", _record)
+    return statements, lambda: event.remove(db.engine, "before_cursor_execute", _record)
+
+
+def test_repeat_calls_hit_the_cache_and_write_once(app, api_key):
+    with app.app_context():
+        statements, stop = _count_api_key_statements()
+        try:
+            for _ in range(20):
+                assert ApiKeyAuthenticator.authenticate(RAW_KEY).id == api_key
+        finally:
+            stop()
+
+    assert statements.count("SELECT") == 1
+    assert statements.count("UPDATE") == 1
+    assert list(ApiKeyAuthenticator._pending) == [api_key]
+
+
+def test_flush_writes_coalesced_usage(app, api_key):
+    with app.app_context():
+        ApiKeyAuthenticator.authenticate(RAW_KEY)
+        first = db.session.get(ApiKey, api_key).last_used_at
+        ApiKeyAuthenticator.authenticate(RAW_KEY)
+
+        assert ApiKeyAuthenticator.flush() == 1
+        assert ApiKeyAuthenticator.flush() == 0
+
+        db.session.expire_all()
+        assert db.session.get(ApiKey, api_key).last_used_at >= first
+
+
+def test_revoking_a_key_invalidates_the_cache(app, api_key):
+    with app.app_context():
+        assert ApiKeyAuthenticator.authenticate(RAW_KEY) is not None
+
+        db.session.get(ApiKey, api_key).is_active = False
+        db.session.commit()
+
+        assert ApiKeyAuthenticator.authenticate(RAW_KEY) is None
+
+
+def test_unknown_keys_are_not_cached(app):
+    with app.app_context():
+        assert ApiKeyAuthenticator.authenticate("nope") is None
+        assert ApiKeyAuthenticator.authenticate("") is None
+
+    assert ApiKeyAuthenticator._valid == {}
@@ -0,0 +1,128 @@
+"""Tests for the DB-backed, cached ``GET /api/users`` listing."""
+
+import hashlib
+
+import pytest
+
+from app.blueprints.api import api_routes
+from app.extensions import db
+from app.models import AdminAccount, ApiKey, MediaServer, User
+from app.services.media import service
+
+RAW_KEY = "users-listing-test-key"
+
+
+@pytest.fixture
+def headers(session):
+    admin = AdminAccount(username="listing-admin")
+    admin.set_password("password")
+    session.add(admin)
+    session.flush()
+    session.add(
+        ApiKey(
+            name="Listing",
+            key_hash=hashlib.sha256(RAW_KEY.encode()).hexdigest(),
+            created_by_id=admin.id,
+        )
+    )
+    session.commit()
+    return {"X-API-Key": RAW_KEY}
+
+
+@pytest.fixture
+def servers(session):
+    plex = MediaServer(name="Plex", server_type="plex", url="http://p", api_key="k")
+    jelly = MediaServer(name="Jelly", server_type="jellyfin", url="http://j")
+    session.add_all([plex, jelly])
+    session.flush()
+    for i in range(5):
+        session.add(
+            User(
+                token=f"t{i}",
+                username=f"user{i}",
+                email=f"user{i}@example.com",
+                code="CODE",
+                server_id=plex.id if i < 3 else jelly.id,
+            )
+        )
+    session.commit()
+    return plex, jelly
+
+
+@pytest.fixture
+def no_remote_sync(monkeypatch):
+    calls = []
+    monkeypatch.setattr(
+        api_routes, "list_users_all_servers", lambda: calls.append(1) or {}
+    )
+    return calls
+
+
+def test_listing_reads_the_local_database(client, headers, servers, no_remote_sync):
+    response = client.get("/api/users", headers=headers)
+
+    assert response.status_code == 200
+    data = response.get_json()
+    assert [u["username"] for u in data["users"]] == [f"user{i}" for i in range(5)]
+    assert data["count"] == data["total"] == 5
+    assert {s["name"] for s in data["servers"]} == {"Plex", "Jelly"}
+    assert no_remote_sync == []
+
+
+def test_filters_and_pagination(client, headers, servers, no_remote_sync):
+    plex, _jelly = servers
+
+    page = client.get(
+        f"/api/users?server_id={plex.id}&page=2&per_page=2", headers=headers
+    ).get_json()
+    by_email = client.get(
+        "/api/users?email=user4@example.com", headers=headers
+    ).get_json()
+
+    assert [u["username"] for u in page["users"]] == ["user2"]
+    assert (page["total"], page["page"], page["per_page"]) == (3, 2, 2)
+    assert [u["server"] for u in by_email["users"]] == ["Jelly"]
+
+
+def test_etag_revalidation_and_invalidation(
+    app, client, headers, servers, no_remote_sync
+):
+    first = client.get("/api/users", headers=headers)
+    etag = first.headers["ETag"]
+
+    cached = client.get("/api/users", headers={**headers, "If-None-Match": etag})
+    assert cached.status_code == 304
+
+    with app.app_context():
+        db.session.add(
+            User(token="t9", username="late", code="C", server_id=servers[0].id)
+        )
+        db.session.commit()
+
+    changed = client.get("/api/users", headers={**headers, "If-None-Match": etag})
+    assert changed.status_code == 200
+    assert changed.get_json()["count"] == 6
+
+
+def test_sync_is_opt_in(client, headers, servers, no_remote_sync):
+    client.get("/api/users", headers=headers)
+    client.get("/api/users?sync=true", headers=headers)
+
+    assert no_remote_sync == [1]
+
+
+def test_server_sync_stamps_last_synced_at(app, servers, monkeypatch):
+    plex, _jelly = servers
+
+    class _Client:
+        def list_users(self):
+            return []
+
+    monkeypatch.setattr(service, "get_client_for_media_server", lambda _s: _Client())
+
+    with app.app_context():
+        server = db.session.get(MediaServer, plex.id)
+        assert server.last_synced_at is None
+        service.list_users_for_server(server)
+        db.session.expire_all()
+        assert db.session.get(MediaServer, plex.id).last_synced_at is not None
@@ -0,0 +1,333 @@
+"""Tests for the streaming, chunked historical import pipeline."""
+
+import threading
+import time
+from datetime import UTC, datetime, timedelta
+
+import pytest
+import requests
+from sqlalchemy import event
+
+import app.services.historical as historical
+from app.extensions import db
+from app.models import ActivitySession, HistoricalImportJob, MediaServer
+from app.services import media
+from app.services.historical.importers import JellyfinHistoricalImporter
+from app.services.historical.importers.jellyfin_importer import AdaptiveThrottle
+
+
+class _Response:
+    def __init__(self, payload):
+        self._payload = payload
+
+    def json(self):
+        return self._payload
+
+    def raise_for_status(self):
+        return None
+
+
+class _JellyfinClient:
+    """Serves ``count`` played items per user, newest first, in pages."""
+
+    def __init__(self, users, count):
+        self.users = users
+        self.count = count
+        self.requests = []
+        self.params = []
+        self.now = datetime.now(UTC).replace(microsecond=0)
+
+    def get(self, path, params=None):
+        if path == "/Users":
+            return _Response([{"Id": u, "Name": u} for u in self.users])
+        self.requests.append((path, params["StartIndex"]))
+        self.params.append(params)
+        now = self.now
+        start, limit = params["StartIndex"], params["Limit"]
+        items = [
+            {
+                "Id": f"item{i}",
+                "Name": f"Item {i}",
+                "Type": "Movie",
+                "RunTimeTicks": 60 * 10_000_000,
+                "UserData": {
+                    "Played": True,
+                    "LastPlayedDate": (now - timedelta(hours=i)).isoformat(),
+                },
+            }
+            for i in range(start, min(start + limit, self.count))
+        ]
+        return _Response({"Items": items, "TotalRecordCount": self.count})
+
+
+@pytest.fixture
+def server(session):
+    server = MediaServer(name="Jelly", server_type="jellyfin", url="http://jf")
+    session.add(server)
+    session.commit()
+    return server
+
+
+@pytest.fixture
+def fake_client(monkeypatch):
+    client = _JellyfinClient(["alice", "bob"], 250)
+    monkeypatch.setattr(media, "get_media_client", lambda *_a, **_k: client)
+    # One user at a time and small pages keep page order deterministic.
+    monkeypatch.setattr(JellyfinHistoricalImporter, "page_size", 100)
+    monkeypatch.setattr(JellyfinHistoricalImporter, "concurrency", 1)
+    return client
+
+
+def _count_commits():
+    commits = []
+
+    def _record(_session):
+        commits.append(1)
+
+    event.listen(db.session, "after_commit", _record)
+    return commits, lambda: event.remove(db.session, "after_commit", _record)
+
+
+def test_import_commits_per_chunk_with_progress_and_checkpoint(
+    app, server, fake_client, monkeypatch
+):
+    monkeypatch.setattr(historical, "IMPORT_CHUNK_SIZE", 200)
+
+    with app.app_context():
+        job = HistoricalImportJob(server_id=server.id, days_back=30)
+        db.session.add(job)
+        db.session.commit()
+
+        commits, stop = _count_commits()
+        try:
+            result = historical.HistoricalDataService(server.id).import_history(
+                days_back=30, max_results=None, job_id=job.id
+            )
+        finally:
+            stop()
+
+        assert result["success"]
+        assert result["total_stored"] == result["total_processed"] == 500
+        assert ActivitySession.query.filter_by(server_id=server.id).count() == 500
+        # Chunks of 200, 200 and 100 rows, the high-water mark, then the
+        # final progress update.
+        assert len(commits) == 5
+        job = db.session.get(HistoricalImportJob, job.id)
+        assert job.total_stored == 500
+        assert job.get_checkpoint()["done_users"] == ["alice", "bob"]
+
+
+def test_reimport_skips_existing_sessions_without_writing(app, server, fake_client):
+    with app.app_context():
+        service = historical.HistoricalDataService(server.id)
+        first = service.import_history(days_back=30, max_results=None)
+
+        commits, stop = _count_commits()
+        try:
+            second = service.import_history(days_back=30, max_results=None)
+        finally:
+            stop()
+
+    assert first["total_stored"] == 500
+    assert second["total_stored"] == 0
+    assert commits == []
+
+
+def test_duplicates_within_a_chunk_are_stored_once(app, server):
+    with app.app_context():
+        service = historical.HistoricalDataService(server.id)
+        sessions = [
+            ActivitySession(
+                server_id=server.id,
+                session_id="dup",
+                user_name="alice",
+                media_title="Movie",
+                active=False,
+            )
+            for _ in range(3)
+        ]
+
+        assert service._store_activity_sessions(sessions) == 1
+        assert ActivitySession.query.filter_by(session_id="dup").count() == 1
+
+
+def test_max_results_stops_fetching_pages(app, server, fake_client):
+    with app.app_context():
+        result = historical.HistoricalDataService(server.id).import_history(
+            days_back=30, max_results=150
+        )
+
+    assert result["total_stored"] == 150
+    # alice's pages plus at most bob's first page, never all six pages.
+    assert fake_client.requests[:2] == [
+        ("/Users/alice/Items", 0),
+        ("/Users/alice/Items", 100),
+    ]
+    assert ("/Users/bob/Items", 200) not in fake_client.requests
+
+
+def test_users_are_fetched_concurrently(app, server, fake_client, monkeypatch):
+    monkeypatch.setattr(JellyfinHistoricalImporter, "concurrency", 3)
+    fake_client.users = ["alice", "bob", "carol"]
+    in_flight = []
+    peak = []
+    lock = threading.Lock()
+    real_get = fake_client.get
+
+    def slow_get(path, params=None):
+        if path == "/Users":
+            return real_get(path, params)
+        with lock:
+            in_flight.append(1)
+            peak.append(len(in_flight))
+        time.sleep(0.02)
+        with lock:
+            in_flight.pop()
+        return real_get(path, params)
+
+    monkeypatch.setattr(fake_client, "get", slow_get)
+    with app.app_context():
+        result = historical.HistoricalDataService(server.id).import_history(
+            days_back=30, max_results=None
+        )
+
+    assert result["total_stored"] == 750
+    assert max(peak) > 1
+
+
+def test_throttled_pages_are_retried(app, server, fake_client, monkeypatch):
+    real_get = fake_client.get
+    throttled = []
+
+    def throttling_get(path, params=None):
+        if path != "/Users" and not throttled:
+            throttled.append(path)
+            response = requests.Response()
+            response.status_code = 429
+            response.headers["Retry-After"] = "0"
+            raise requests.HTTPError(response=response)
+        return real_get(path, params)
+
+    monkeypatch.setattr(fake_client, "get", throttling_get)
+    with app.app_context():
+        result = historical.HistoricalDataService(server.id).import_history(
+            days_back=30, max_results=None
+        )
+
+    assert throttled == ["/Users/alice/Items"]
+    assert result["total_stored"] == 500
+
+
+def test_adaptive_throttle_halves_and_recovers():
+    throttle = AdaptiveThrottle(4)
+
+    assert throttle.throttled(0, retry_after="0") == 0
+    assert throttle.limit == 2
+    throttle.throttled(0, retry_after="0")
+    throttle.throttled(0, retry_after="0")
+    assert throttle.limit == 1
+
+    for _ in range(1 + 2 + 3):
+        throttle.succeeded()
+    assert throttle.limit == 4
+
+
+def test_delta_sync_fetches_only_plays_after_the_high_water_mark(
+    app, server, fake_client
+):
+    with app.app_context():
+        service = historical.HistoricalDataService(server.id)
+        service.import_history(days_back=30, max_results=None)
+        mark = db.session.get(MediaServer, server.id).history_synced_until
+        assert mark == fake_client.now.replace(tzinfo=None)
+
+        # Two hours of new plays: items 0-1 are new, item 2 lands on the
+        # old mark and falls inside the overlap window.
+        fake_client.now += timedelta(hours=2)
+        fake_client.requests.clear()
+        fake_client.params.clear()
+        result = service.sync_recent_history()
+
+        assert result["success"]
+        assert result["total_stored"] == 6
+        assert fake_client.requests == [
+            ("/Users/alice/Items", 0),
+            ("/Users/bob/Items", 0),
+        ]
+        assert all("MinDateLastSavedForUser" in p for p in fake_client.params)
+        db.session.expire_all()
+        assert db.session.get(
+            MediaServer, server.id
+        ).history_synced_until == fake_client.now.replace(tzinfo=None)
+
+
+class _Crash(BaseException):
+    """Stands in for the process dying mid-import."""
+
+
+def test_interrupted_job_resumes_from_its_checkpoint(
+    app, server, fake_client, monkeypatch
+):
+    monkeypatch.setattr(historical, "IMPORT_CHUNK_SIZE", 200)
+    real_store = historical.HistoricalDataService._store_activity_sessions
+    calls = []
+
+    def crashing_store(self, sessions, **kwargs):
+        calls.append(len(sessions))
+        if len(calls) == 2:
+            raise _Crash
+        return real_store(self, sessions, **kwargs)
+
+    with app.app_context():
+        job = historical.HistoricalDataService(server.id).start_async_import(30)
+        job_id = job.id
+
+        monkeypatch.setattr(
+            historical.HistoricalDataService, "_store_activity_sessions", crashing_store
+        )
+        with pytest.raises(_Crash):
+            historical.HistoricalDataService.run_pending_jobs()
+        monkeypatch.setattr(
+            historical.HistoricalDataService, "_store_activity_sessions", real_store
+        )
+        db.session.rollback()
+
+        db.session.expire_all()
+        job = db.session.get(HistoricalImportJob, job_id)
+        assert job.status == HistoricalImportJob.STATUS_RUNNING
+        assert job.total_stored == 200
+        assert job.get_checkpoint()["start_index"] == {"alice": 200}
+
+        # A fresh worker only takes the job over once it has gone stale.
+        assert historical.HistoricalDataService.run_pending_jobs() == 0
+        job.updated_at = datetime.now(UTC) - timedelta(hours=1)
+        db.session.commit()
+
+        fake_client.requests.clear()
+        assert historical.HistoricalDataService.run_pending_jobs() == 1
+
+        assert fake_client.requests[0] == ("/Users/alice/Items", 200)
+        assert ActivitySession.query.filter_by(server_id=server.id).count() == 500
+        # Completed jobs are removed.
+        assert db.session.get(HistoricalImportJob, job_id) is None
+
+
+def test_queued_import_runs_in_a_thread_without_a_scheduler(
+    app, server, fake_client, monkeypatch
+):
+    threads = []
+    wake = historical._wake_import_worker
+    monkeypatch.setattr(
+        historical, "_wake_import_worker", lambda: threads.append(wake())
+    )
+    monkeypatch.setitem(app.config, "TESTING", False)
+
+    with app.app_context():
+        job_id = historical.HistoricalDataService(server.id).start_async_import(30).id
+
+        assert threads[0] is not None
+        threads[0].join(timeout=30)
+
+        db.session.expire_all()
+        assert db.session.get(HistoricalImportJob, job_id) is None
+        assert ActivitySession.query.filter_by(server_id=server.id).count() == 500
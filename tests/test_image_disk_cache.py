@@ -0,0 +1,237 @@
+"""Tests for the image proxy cache tiers, streaming and conditional GET."""
+
+import os
+import time
+from typing import ClassVar
+
+import pytest
+
+from app.services.image_disk_cache import ImageDiskCache
+from app.services.image_proxy import ImageProxyService
+
+IMAGE_URL = "http://jellyfin.internal:8096/Items/abc/Images/Primary"
+
+
+@pytest.fixture(autouse=True)
+def _isolated_cache(app, tmp_path, monkeypatch):
+    monkeypatch.setitem(app.config, "IMAGE_DISK_CACHE_DIR", str(tmp_path / "images"))
+    monkeypatch.setitem(app.config, "IMAGE_DISK_CACHE_MAX_BYTES", 1024 * 1024)
+    ImageDiskCache._approx_bytes = None
+    ImageProxyService._token_cache.clear()
+    ImageProxyService._image_cache.clear()
+    ImageProxyService._total_image_bytes = 0
+    yield
+    ImageDiskCache._approx_bytes = None
+    ImageProxyService._image_cache.clear()
+    ImageProxyService._total_image_bytes = 0
+
+
+class _FakeResponse:
+    def __init__(self, status_code, body=b"", headers=None):
+        self.status_code = status_code
+        self.headers = headers or {}
+        self.body = body
+
+    def raise_for_status(self):
+        return None
+
+    def iter_content(self, chunk_size):
+        yield self.body
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+class _RecordingSession:
+    calls: ClassVar[list[dict]] = []
+
+    def __init__(self, response):
+        self.response = response
+
+    def get(self, url, headers=None, **kwargs):
+        _RecordingSession.calls.append(dict(headers or {}))
+        return self.response
+
+
+def _serve_upstream(monkeypatch, response):
+    _RecordingSession.calls = []
+    monkeypatch.setattr(
+        ImageProxyService,
+        "get_session",
+        classmethod(lambda cls, url, server_id: _RecordingSession(response)),
+    )
+
+
+def test_store_and_lookup_round_trip(app):
+    with app.app_context():
+        ImageDiskCache.store(
+            IMAGE_URL, 3, b"poster", "image/png", etag='"v1"', last_modified="x"
+        )
+        entry = ImageDiskCache.lookup(IMAGE_URL, 3)
+
+        assert entry.content_type == "image/png"
+        assert entry.validators() == {"If-None-Match": '"v1"', "If-Modified-Since": "x"}
+        with ImageDiskCache.open(entry) as fh:
+            assert fh.read() == b"poster"
+        # Entries are scoped per server.
+        assert ImageDiskCache.lookup(IMAGE_URL, 4) is None
+
+
+def test_trim_evicts_least_recently_used(app, monkeypatch):
+    monkeypatch.setitem(app.config, "IMAGE_DISK_CACHE_MAX_BYTES", 2500)
+    with app.app_context():
+        for name in ("old", "recent"):
+            ImageDiskCache.store(f"{IMAGE_URL}/{name}", 1, b"x" * 1000, "image/jpeg")
+        old = ImageDiskCache.lookup(f"{IMAGE_URL}/old", 1)
+        root = app.config["IMAGE_DISK_CACHE_DIR"]
+        past = time.time() - 60
+        os.utime(os.path.join(root, old.key[:2], old.key), (past, past))
+
+        ImageDiskCache.store(f"{IMAGE_URL}/new", 1, b"x" * 1000, "image/jpeg")
+
+        assert ImageDiskCache.lookup(f"{IMAGE_URL}/old", 1) is None
+        assert ImageDiskCache.lookup(f"{IMAGE_URL}/recent", 1) is not None
+        assert ImageDiskCache.lookup(f"{IMAGE_URL}/new", 1) is not None
+
+
+def test_proxy_serves_disk_hit_without_upstream_fetch(app, client, monkeypatch):
+    _serve_upstream(
+        monkeypatch,
+        _FakeResponse(200, b"artwork", {"Content-Type": "image/jpeg", "ETag": '"a"'}),
+    )
+    with app.app_context():
+        token = ImageProxyService.generate_token(IMAGE_URL)
+
+    assert client.get(f"/image-proxy?token={token}").data == b"artwork"
+
+    # A different worker has an empty memory tier but shares the disk tier.
+    ImageProxyService._image_cache.clear()
+    ImageProxyService._total_image_bytes = 0
+    response = client.get(f"/image-proxy?token={token}")
+
+    assert response.status_code == 200
+    assert response.data == b"artwork"
+    assert response.headers["X-Content-Type-Options"] == "nosniff"
+    assert len(_RecordingSession.calls) == 1
+
+
+def test_stale_entry_is_revalidated_with_a_conditional_request(
+    app, client, monkeypatch
+):
+    with app.app_context():
+        entry = ImageDiskCache.store(
+            IMAGE_URL, None, b"cached", "image/webp", etag='"v1"'
+        )
+        entry.fetched_at -= ImageProxyService.IMAGE_CACHE_EXPIRY + 1
+        ImageDiskCache._write_meta(
+            ImageDiskCache._paths(ImageDiskCache._root(), entry.key)[1], entry
+        )
+        token = ImageProxyService.generate_token(IMAGE_URL)
+
+    _serve_upstream(monkeypatch, _FakeResponse(304))
+    response = client.get(f"/image-proxy?token={token}")
+
+    assert response.status_code == 200
+    assert response.data == b"cached"
+    assert response.mimetype == "image/webp"
+    assert _RecordingSession.calls[0]["If-None-Match"] == '"v1"'
+    with app.app_context():
+        assert ImageDiskCache.lookup(IMAGE_URL, None).is_fresh(60)
+
+
+class _ChunkedResponse(_FakeResponse):
+    closed = False
+
+    def iter_content(self, chunk_size):
+        for offset in range(0, len(self.body), 4):
+            yield self.body[offset : offset + 4]
+
+    def __exit__(self, *exc):
+        _ChunkedResponse.closed = True
+        return False
+
+
+def test_large_bodies_are_streamed_and_teed_to_disk(app, client, monkeypatch):
+    monkeypatch.setattr(ImageProxyService, "IMAGE_PROXY_STREAM_THRESHOLD", 8)
+    body = b"0123456789abcdefghij"
+    _ChunkedResponse.closed = False
+    _serve_upstream(
+        monkeypatch, _ChunkedResponse(200, body, {"Content-Type": "image/jpeg"})
+    )
+    with app.app_context():
+        token = ImageProxyService.generate_token(IMAGE_URL)
+
+    response = client.get(f"/image-proxy?token={token}", buffered=False)
+    assert response.is_streamed
+    assert b"".join(response.response) == body
+    response.close()
+
+    assert _ChunkedResponse.closed
+    # Streamed bodies skip the memory tier but land on disk with a digest.
+    assert ImageProxyService.get_cached_image(token) is None
+    with app.app_context():
+        entry = ImageDiskCache.lookup(IMAGE_URL, None)
+    assert entry.size == len(body)
+    assert entry.digest is not None
+
+
+def test_repeat_requests_get_304_for_matching_etag(app, client, monkeypatch):
+    _serve_upstream(
+        monkeypatch, _FakeResponse(200, b"artwork", {"Content-Type": "image/png"})
+    )
+    with app.app_context():
+        token = ImageProxyService.generate_token(IMAGE_URL)
+
+    first = client.get(f"/image-proxy?token={token}")
+    etag = first.headers["ETag"]
+    assert first.headers["Cache-Control"] == (
+        f"public, max-age={ImageProxyService.TOKEN_BUCKET_SECONDS}"
+    )
+
+    # Served from the memory tier, then from the disk tier.
+    for clear_memory in (False, True):
+        if clear_memory:
+            ImageProxyService._image_cache.clear()
+            ImageProxyService._total_image_bytes = 0
+        response = client.get(
+            f"/image-proxy?token={token}", headers={"If-None-Match": etag}
+        )
+        assert response.status_code == 304
+        assert response.data == b""
+        assert response.headers["ETag"] == etag
+
+    mismatch = client.get(
+        f"/image-proxy?token={token}", headers={"If-None-Match": '"other"'}
+    )
+    assert mismatch.status_code == 200
+    assert len(_RecordingSession.calls) == 1
+
+
+def test_if_modified_since_uses_upstream_last_modified(app, client, monkeypatch):
+    last_modified = "Wed, 01 Jan 2025 00:00:00 GMT"
+    _serve_upstream(
+        monkeypatch,
+        _FakeResponse(
+            200,
+            b"artwork",
+            {"Content-Type": "image/png", "Last-Modified": last_modified},
+        ),
+    )
+    with app.app_context():
+        token = ImageProxyService.generate_token(IMAGE_URL)
+    client.get(f"/image-proxy?token={token}")
+
+    fresh = client.get(
+        f"/image-proxy?token={token}",
+        headers={"If-Modified-Since": "Thu, 02 Jan 2025 00:00:00 GMT"},
+    )
+    older = client.get(
+        f"/image-proxy?token={token}",
+        headers={"If-Modified-Since": "Tue, 31 Dec 2024 00:00:00 GMT"},
+    )
+
+    assert fresh.status_code == 304
+    assert older.status_code == 200
@@ -14,6 +14,7 @@ import pytest
 from requests.structures import CaseInsensitiveDict
 
 import app.services.image_proxy as image_proxy_module
+from app.services.image_disk_cache import ImageDiskCache
 from app.services.image_proxy import ImageProxyService
 from app.services.media.emby import EmbyClient
 from app.services.media.jellyfin import JellyfinClient
@@ -41,7 +42,7 @@ class _FrozenTime:
 
 
 @pytest.fixture(autouse=True)
-def _clear_caches():
+def _clear_caches(app):
     """validate_token() short-circuits on the token cache, so isolate every test."""
     ImageProxyService._token_cache.clear()
     ImageProxyService._image_cache.clear()
@@ -49,7 +50,11 @@ def _clear_caches():
     ImageProxyService._cipher_key_cache.clear()
     ImageProxyService._server_url_cache.clear()
     ImageProxyService._server_header_cache.clear()
+    with app.app_context():
+        ImageDiskCache.clear()
     yield
+    with app.app_context():
+        ImageDiskCache.clear()
     ImageProxyService._token_cache.clear()
     ImageProxyService._image_cache.clear()
     ImageProxyService._total_image_bytes = 0
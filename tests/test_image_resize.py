@@ -0,0 +1,216 @@
+"""Tests for thumbnail variants served by the image proxy."""
+
+import io
+from typing import ClassVar
+from urllib.parse import parse_qs, urlsplit
+
+import pytest
+from PIL import Image
+
+from app.models import MediaServer
+from app.services.image_proxy import ImageProxyService
+from app.services.image_resize import negotiate_format, plan_variant
+
+
+@pytest.fixture(autouse=True)
+def _isolated_caches(app, tmp_path, monkeypatch):
+    monkeypatch.setitem(app.config, "IMAGE_DISK_CACHE_DIR", str(tmp_path / "images"))
+    ImageProxyService._token_cache.clear()
+    ImageProxyService._image_cache.clear()
+    ImageProxyService._total_image_bytes = 0
+    ImageProxyService._server_url_cache.clear()
+    ImageProxyService._server_header_cache.clear()
+    yield
+    ImageProxyService._image_cache.clear()
+    ImageProxyService._total_image_bytes = 0
+    ImageProxyService._server_url_cache.clear()
+
+
+def _server(session, server_type, url):
+    server = MediaServer(
+        name=server_type.title(), server_type=server_type, url=url, api_key="key"
+    )
+    session.add(server)
+    session.commit()
+    return server
+
+
+def test_size_hints_round_trip_inside_the_token(app):
+    with app.app_context():
+        plain = ImageProxyService.generate_token("http://h/a.jpg")
+        sized = ImageProxyService.generate_token(
+            "http://h/a.jpg", width=300, quality=70
+        )
+        ImageProxyService._token_cache.clear()
+
+        assert sized != plain
+        assert ImageProxyService.validate_token(sized) == {
+            "url": "http://h/a.jpg",
+            "server_id": None,
+            "width": 300,
+            "quality": 70,
+        }
+        assert "width" not in ImageProxyService.validate_token(plain)
+
+
+def test_plex_variants_use_the_native_transcoder():
+    variant = plan_variant(
+        "http://plex.local:32400/library/metadata/7/thumb/99",
+        400,
+        None,
+        server_type="plex",
+        same_origin=True,
+        accept="image/webp,*/*",
+    )
+
+    parts = urlsplit(variant.fetch_url)
+    params = parse_qs(parts.query)
+    assert parts.path == "/photo/:/transcode"
+    assert params["url"] == ["/library/metadata/7/thumb/99"]
+    assert params["width"] == ["400"]
+    assert params["upscale"] == ["0"]
+    assert variant.local_format is None
+
+
+def test_jellyfin_variants_negotiate_webp():
+    kwargs = {"server_type": "jellyfin", "same_origin": True}
+    url = "http://jf:8096/Items/1/Images/Primary?maxHeight=400"
+
+    webp = plan_variant(url, 300, 80, accept="image/avif,image/webp", **kwargs)
+    jpeg = plan_variant(url, 300, 80, accept="image/png", **kwargs)
+
+    assert parse_qs(urlsplit(webp.fetch_url).query) == {
+        "maxHeight": ["400"],
+        "maxWidth": ["300"],
+        "quality": ["80"],
+        "format": ["Webp"],
+    }
+    assert "format" not in jpeg.fetch_url
+    assert webp.key != jpeg.key
+    assert webp.negotiated
+
+
+def test_negotiate_format_ignores_parameters_and_order():
+    assert negotiate_format("image/avif;q=0.9, image/webp", ["webp"]) == "webp"
+    assert negotiate_format("*/*", ["avif", "webp", "jpeg"]) is None
+
+
+def test_proxy_fetches_and_caches_each_variant_separately(
+    app, client, session, monkeypatch
+):
+    server = _server(session, "jellyfin", "http://jf.local:8096")
+    fetched = []
+
+    class _Response:
+        status_code = 200
+        headers: ClassVar = {"Content-Type": "image/jpeg"}
+
+        def raise_for_status(self):
+            return None
+
+        def iter_content(self, chunk_size):
+            yield b"resized-bytes"
+
+        def __enter__(self):
+            return self
+
+        def __exit__(self, *exc):
+            return False
+
+    class _Session:
+        def get(self, url, headers=None, **kwargs):
+            fetched.append(url)
+            return _Response()
+
+    monkeypatch.setattr(
+        ImageProxyService,
+        "get_session",
+        classmethod(lambda cls, url, server_id: _Session()),
+    )
+    with app.app_context():
+        token = ImageProxyService.generate_token(
+            f"{server.url}/Items/9/Images/Primary", server.id, width=200
+        )
+    webp = client.get(f"/image-proxy?token={token}", headers={"Accept": "image/webp"})
+    plain = client.get(f"/image-proxy?token={token}", headers={"Accept": "image/*"})
+    again = client.get(f"/image-proxy?token={token}", headers={"Accept": "image/webp"})
+
+    assert webp.status_code == plain.status_code == again.status_code == 200
+    assert "Accept" in webp.headers["Vary"]
+    assert len(fetched) == 2
+    assert "format=Webp" in fetched[0]
+    assert "maxWidth=200" in fetched[1]
+    assert "format" not in fetched[1]
+
+
+def _serve(monkeypatch, body, fetched):
+    class _Response:
+        status_code = 200
+        headers: ClassVar = {"Content-Type": "image/jpeg"}
+
+        def raise_for_status(self):
+            return None
+
+        def iter_content(self, chunk_size):
+            yield body
+
+        def __enter__(self):
+            return self
+
+        def __exit__(self, *exc):
+            return False
+
+    class _Session:
+        def get(self, url, headers=None, **kwargs):
+            fetched.append(url)
+            return _Response()
+
+    monkeypatch.setattr(
+        ImageProxyService,
+        "get_session",
+        classmethod(lambda cls, url, server_id: _Session()),
+    )
+
+
+def _poster_jpeg(width, height):
+    out = io.BytesIO()
+    Image.new("RGB", (width, height), (200, 30, 30)).save(out, format="JPEG")
+    return out.getvalue()
+
+
+def test_foreign_artwork_is_resized_locally(app, client, session, monkeypatch):
+    server = _server(session, "jellyfin", "http://jf.local:8096")
+    fetched = []
+    _serve(monkeypatch, _poster_jpeg(800, 1200), fetched)
+    with app.app_context():
+        token = ImageProxyService.generate_token(
+            "http://cdn.example/poster.jpg", server.id, width=200
+        )
+
+    webp = client.get(f"/image-proxy?token={token}", headers={"Accept": "image/webp"})
+    jpeg = client.get(f"/image-proxy?token={token}", headers={"Accept": "image/*"})
+
+    assert fetched == ["http://cdn.example/poster.jpg"] * 2
+    assert webp.headers["Content-Type"] == "image/webp"
+    assert jpeg.headers["Content-Type"] == "image/jpeg"
+    for response in (webp, jpeg):
+        with Image.open(io.BytesIO(response.data)) as img:
+            assert img.size == (200, 300)
+
+
+def test_failed_resize_is_not_cached_as_the_variant(app, client, session, monkeypatch):
+    server = _server(session, "jellyfin", "http://jf.local:8096")
+    fetched = []
+    _serve(monkeypatch, b"not-an-image", fetched)
+    with app.app_context():
+        token = ImageProxyService.generate_token(
+            "http://cdn.example/broken.jpg", server.id, width=200
+        )
+
+    first = client.get(f"/image-proxy?token={token}", headers={"Accept": "image/*"})
+    second = client.get(f"/image-proxy?token={token}", headers={"Accept": "image/*"})
+
+    assert first.data == second.data == b"not-an-image"
+    # Each request retries the resize instead of replaying the original.
+    assert len(fetched) == 2
+    assert not ImageProxyService._image_cache
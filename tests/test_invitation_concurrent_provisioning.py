@@ -0,0 +1,172 @@
+"""Tests for concurrent multi-server provisioning in invitation workflows."""
+
+import threading
+import time
+
+import pytest
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from app.extensions import db
+from app.models import Invitation, MediaServer, User
+from app.services import ombi_client
+from app.services.invitation_flow import workflows
+from app.services.invitation_flow.workflows import FormBasedWorkflow
+from app.services.media import service
+from app.services.media.jellyfin import JellyfinClient
+
+FORM = {
+    "username": "newuser",
+    "email": "new@example.com",
+    "password": "Testpass123",
+    "confirm_password": "Testpass123",
+}
+
+
+class _JoinClient(JellyfinClient):
+    """Creates no remote account but writes its local row like real backends."""
+
+    def __init__(self, server, threads, delay=0.3, fail=False):
+        super().__init__(media_server=server)
+        self.threads = threads
+        self.delay = delay
+        self.fail = fail
+
+    def _do_join(self, username, password, confirm, email, code):
+        self.threads.add(threading.current_thread().name)
+        time.sleep(self.delay)
+        if self.fail:
+            raise ConnectionError("server down")
+        self._add_joined_user(
+            {
+                "token": f"tok-{self.server_id}",
+                "username": username,
+                "email": email,
+                "code": code,
+                "server_id": self.server_id,
+            }
+        )
+        db.session.commit()
+        return True, "User created"
+
+
+def _patch_clients(monkeypatch, factory):
+    monkeypatch.setattr(service, "get_client_for_media_server", factory)
+    monkeypatch.setattr(workflows, "get_client_for_media_server", factory)
+
+
+@pytest.fixture
+def invitation(session):
+    servers = [
+        MediaServer(
+            name=f"Server {i}",
+            server_type="jellyfin",
+            url=f"http://server{i}:8096",
+            api_key="key",
+        )
+        for i in range(3)
+    ]
+    session.add_all(servers)
+    invite = Invitation(code="MULTI1", unlimited=False, servers=servers)
+    session.add(invite)
+    session.commit()
+    return invite
+
+
+@pytest.fixture
+def companion_calls(monkeypatch):
+    calls = []
+
+    def record(**kwargs):
+        calls.append(kwargs["server_id"])
+        return []
+
+    monkeypatch.setattr(ombi_client, "invite_user_to_connections", record)
+    return calls
+
+
+def test_servers_are_joined_concurrently_and_recorded_together(
+    app, invitation, companion_calls, monkeypatch
+):
+    servers = list(invitation.servers)
+    threads = set()
+    _patch_clients(
+        monkeypatch,
+        lambda server: _JoinClient(server, threads, fail=server.name == "Server 2"),
+    )
+    user_writes = []
+
+    def record_user_writes(session, _context, _instances):
+        if any(isinstance(obj, User) for obj in session.new):
+            user_writes.append(threading.current_thread().name)
+
+    event.listen(Session, "before_flush", record_user_writes)
+
+    commits = []
+    monkeypatch.setattr(
+        db.session, "commit", _counting(db.session.commit, commits), raising=False
+    )
+
+    with app.test_request_context():
+        started = time.monotonic()
+        successful, failed = FormBasedWorkflow()._process_servers(
+            servers, FORM, invitation.code
+        )
+        elapsed = time.monotonic() - started
+    event.remove(Session, "before_flush", record_user_writes)
+
+    assert elapsed < 0.8  # three 0.3s joins, not run back to back
+    assert len(threads) > 1
+    assert [r.server.name for r in successful] == ["Server 0", "Server 1"]
+    assert [r.server.name for r in failed] == ["Server 2"]
+    assert "server down" in failed[0].message
+    # The request thread commits once up front and once for all bookkeeping.
+    # It is also the only thread that writes User rows.
+    assert set(user_writes) == {threading.main_thread().name}
+    assert commits.count(threading.main_thread().name) == 2
+
+    db.session.expire_all()
+    invite = Invitation.query.filter_by(code="MULTI1").one()
+    users = User.query.filter_by(username="newuser").all()
+    assert {u.server_id for u in users} == {servers[0].id, servers[1].id}
+    assert invite.used_by_id in {u.id for u in users}
+    assert {u.id for u in invite.users} == {u.id for u in users}
+    assert invite.used is False  # Server 2 is still unused
+    assert companion_calls == [servers[0].id, servers[1].id]
+
+
+def test_companion_invites_are_queued_off_the_request(
+    app, invitation, companion_calls, monkeypatch
+):
+    server = invitation.servers[0]
+    _patch_clients(monkeypatch, lambda s: _JoinClient(s, set(), delay=0))
+    monkeypatch.setitem(app.config, "TESTING", False)
+    gate = threading.Event()
+
+    def slow_invite(**kwargs):
+        gate.wait(timeout=5)
+        companion_calls.append(kwargs["server_id"])
+        return []
+
+    monkeypatch.setattr(ombi_client, "invite_user_to_connections", slow_invite)
+
+    with app.test_request_context():
+        successful, failed = FormBasedWorkflow()._process_servers(
+            [server], FORM, invitation.code
+        )
+        assert [r.server.id for r in successful] == [server.id] and not failed
+        assert companion_calls == []
+
+    gate.set()
+    deadline = time.monotonic() + 5
+    while not companion_calls and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert companion_calls == [server.id]
+
+
+def _counting(commit, calls):
+    def wrapper():
+        calls.append(threading.current_thread().name)
+        return commit()
+
+    return wrapper
@@ -0,0 +1,139 @@
+"""Tests for paged, incremental LDAP user sync."""
+
+from datetime import UTC, datetime
+
+import pytest
+from ldap3 import MOCK_SYNC
+from ldap3 import Connection as Ldap3Connection
+from sqlalchemy import event
+
+import app.services.ldap.client as ldap_client
+import app.services.ldap.user_sync as user_sync
+from app.extensions import db
+from app.models import LDAPConfiguration, User
+from app.services.ldap.encryption import encrypt_credential
+
+SERVICE_DN = "cn=wizarr,dc=example,dc=com"
+BASE_DN = "ou=people,dc=example,dc=com"
+
+
+def _utc(*args):
+    return datetime(*args, tzinfo=UTC)
+
+
+class _Directory:
+    """Holds directory entries and serves them through ldap3's mock strategy."""
+
+    def __init__(self):
+        self.entries = {}
+        self.binds = 0
+        self.filters = []
+
+    def add_user(self, name, modified):
+        self.entries[f"uid={name},{BASE_DN}"] = {
+            "objectClass": ["inetOrgPerson"],
+            "uid": name,
+            "mail": f"{name}@example.com",
+            "modifyTimestamp": f"{modified:%Y%m%d%H%M%S}Z",
+        }
+
+    def connect(self, server, user=None, password=None, auto_bind=False):
+        conn = Ldap3Connection(
+            server, user=user, password=password, client_strategy=MOCK_SYNC
+        )
+        conn.strategy.add_entry(
+            SERVICE_DN, {"objectClass": "person", "userPassword": "secret"}
+        )
+        for dn, attributes in self.entries.items():
+            conn.strategy.add_entry(dn, attributes)
+        real_search = conn.search
+
+        def search(search_base, search_filter, *args, **kwargs):
+            self.filters.append(search_filter)
+            return real_search(search_base, search_filter, *args, **kwargs)
+
+        conn.search = search
+        if auto_bind:
+            conn.bind()
+        self.binds += 1
+        return conn
+
+
+@pytest.fixture
+def directory(monkeypatch):
+    directory = _Directory()
+    for i in range(7):
+        directory.add_user(f"user{i}", _utc(2026, 1, 1 + i, 12))
+    monkeypatch.setattr(ldap_client, "Connection", directory.connect)
+    monkeypatch.setattr(user_sync, "SYNC_PAGE_SIZE", 3)
+    return directory
+
+
+@pytest.fixture
+def ldap_config(app, session):
+    config = LDAPConfiguration(
+        enabled=True,
+        server_url="ldap://ldap.example.com:389",
+        use_tls=False,
+        service_account_dn=SERVICE_DN,
+        service_account_password_encrypted=encrypt_credential("secret"),
+        user_base_dn=BASE_DN,
+    )
+    session.add(config)
+    session.commit()
+    yield config
+    session.delete(config)
+    session.commit()
+
+
+def _count_commits():
+    commits = []
+
+    def _record(_session):
+        commits.append(1)
+
+    event.listen(db.session, "after_commit", _record)
+    return commits, lambda: event.remove(db.session, "after_commit", _record)
+
+
+def test_full_sync_imports_new_users_over_one_bind_and_commit(
+    app, ldap_config, directory, session
+):
+    session.add(User(username="user0", email="", token="t", code="c"))
+    session.commit()
+
+    commits, stop = _count_commits()
+    try:
+        success, result = user_sync.sync_ldap_directory()
+    finally:
+        stop()
+
+    assert success, result
+    assert result == {"checked": 7, "imported": 6, "skipped": 1}
+    assert directory.binds == 1
+    # Seven entries in pages of three.
+    assert len(directory.filters) == 3
+    assert len(commits) == 1
+    imported = User.query.filter_by(is_ldap_user=True).all()
+    assert sorted(u.username for u in imported) == [f"user{i}" for i in range(1, 7)]
+    assert all(u.email == f"{u.username}@example.com" for u in imported)
+    assert ldap_config.users_synced_until.replace(tzinfo=UTC) == _utc(2026, 1, 7, 12)
+
+
+def test_incremental_sync_only_searches_entries_changed_since_the_mark(
+    app, ldap_config, directory
+):
+    assert user_sync.sync_ldap_directory(incremental=True)[0]
+    assert "modifyTimestamp" not in directory.filters[0]
+
+    directory.add_user("late", _utc(2026, 2, 1, 8))
+    directory.filters.clear()
+    success, result = user_sync.sync_ldap_directory(incremental=True)
+
+    assert success, result
+    assert directory.filters == [
+        "(&(objectClass=inetOrgPerson)(modifyTimestamp>=20260107120000Z))"
+    ]
+    # The entry on the old mark is re-read and skipped; only "late" is new.
+    assert result == {"checked": 2, "imported": 1, "skipped": 1}
+    assert ldap_config.users_synced_until.replace(tzinfo=UTC) == _utc(2026, 2, 1, 8)
@@ -0,0 +1,68 @@
+"""Tests for the flock-based leader election used by scheduler and collectors."""
+
+import pytest
+
+from app.utils.leader_election import LeaderElection
+
+
+@pytest.fixture
+def lock_path(tmp_path):
+    return tmp_path / "leader.lock"
+
+
+@pytest.fixture(autouse=True)
+def _enable_election(monkeypatch):
+    monkeypatch.setenv("WIZARR_LEADER_ELECTION", "true")
+
+
+def test_first_process_wins(lock_path):
+    first = LeaderElection(lock_path)
+    second = LeaderElection(lock_path)
+    try:
+        assert first.try_acquire()
+        assert first.is_leader
+        assert not second.try_acquire()
+        assert not second.is_leader
+    finally:
+        first.release()
+        second.release()
+
+
+def test_callback_runs_immediately_for_leader(lock_path):
+    election = LeaderElection(lock_path)
+    calls = []
+    try:
+        election.on_elected(lambda: calls.append("started"))
+        assert calls == ["started"]
+    finally:
+        election.release()
+
+
+def test_follower_takes_over_after_release(lock_path):
+    leader = LeaderElection(lock_path)
+    follower = LeaderElection(lock_path, retry_interval=0.01)
+    calls = []
+    try:
+        assert leader.try_acquire()
+        follower.on_elected(lambda: calls.append("started"))
+        assert calls == []
+
+        leader.release()
+        follower._watcher.join(timeout=2)
+
+        assert calls == ["started"]
+        assert follower.is_leader
+    finally:
+        leader.release()
+        follower.release()
+
+
+def test_disabled_election_makes_everyone_leader(lock_path, monkeypatch):
+    monkeypatch.setenv("WIZARR_LEADER_ELECTION", "false")
+    first = LeaderElection(lock_path)
+    second = LeaderElection(lock_path)
+
+    assert first.try_acquire()
+    assert second.try_acquire()
+    assert first.is_leader
+    assert second.is_leader
@@ -0,0 +1,134 @@
+"""Tests for the shared per-server media client cache."""
+
+import threading
+
+import pytest
+
+from app.models import MediaServer
+from app.services.image_proxy import ImageProxyService
+from app.services.media import service
+from app.services.media.client_cache import MediaClientCache
+
+
+class _FakeClient:
+    def __init__(self, server):
+        self.token = server.api_key
+        self.calls = 0
+
+    def now_playing(self):
+        self.calls += 1
+        return [{"session_id": "s-1", "user_name": "alice"}]
+
+
+@pytest.fixture
+def built(monkeypatch):
+    clients = []
+
+    def factory(server):
+        clients.append(_FakeClient(server))
+        return clients[-1]
+
+    monkeypatch.setattr(service, "get_client_for_media_server", factory)
+    return clients
+
+
+@pytest.fixture
+def server(session):
+    server = MediaServer(
+        name="Jelly", server_type="jellyfin", url="http://jf:8096", api_key="old"
+    )
+    session.add(server)
+    session.commit()
+    return server
+
+
+def test_now_playing_reuses_one_client_per_server(app, server, built):
+    with app.app_context():
+        service.get_now_playing_for_server(server.id)
+        service.get_now_playing_all_servers(use_cache=False)
+        service.get_now_playing_for_server(server.id)
+
+    assert len(built) == 1
+    assert built[0].calls == 3
+
+
+def test_editing_a_server_replaces_its_client(app, session, server, built):
+    first = MediaClientCache.get(server)
+    ImageProxyService._server_header_cache[server.id] = {"headers": {}, "timestamp": 0}
+
+    server.name = "Renamed"
+    session.commit()
+    assert MediaClientCache.get(server) is first
+
+    server.api_key = "new"
+    session.commit()
+    assert server.id not in ImageProxyService._server_header_cache
+
+    second = MediaClientCache.get(server)
+    assert second is not first
+    assert second.token == "new"
+
+
+def test_rows_with_other_credentials_get_their_own_client(app, server, built):
+    first = MediaClientCache.get(server)
+
+    # Another worker committed an edit; this process never saw the flush.
+    edited = MediaServer(
+        id=server.id, name="Jelly", server_type="jellyfin", url="http://jf:8096"
+    )
+    edited.api_key = "rotated"
+
+    assert MediaClientCache.get(edited).token == "rotated"
+    assert MediaClientCache.get(edited) is not first
+
+
+def test_collectors_get_clients_on_threads_without_app_context(server):
+    from app.activity.monitoring.collectors.jellyfin import JellyfinCollector
+    from app.services.media.jellyfin import JellyfinClient
+
+    collector = JellyfinCollector(server, lambda _event: None)
+    clients = []
+    thread = threading.Thread(
+        target=lambda: clients.extend(
+            [collector._get_media_client(), collector._get_media_client()]
+        )
+    )
+    thread.start()
+    thread.join()
+
+    assert isinstance(clients[0], JellyfinClient)
+    assert clients[1] is clients[0]
+
+
+def test_collectors_use_a_fresh_app_context_per_poll(app, server):
+    from flask import has_app_context
+
+    from app.activity.monitoring.collectors.polling import PollingCollector
+    from app.activity.monitoring.monitor import WebSocketMonitor
+    from app.extensions import db
+
+    WebSocketMonitor(app)
+    seen = []
+
+    class _Client:
+        def now_playing(self):
+            seen.append((has_app_context(), db.session()))
+            return []
+
+    collector = PollingCollector(server, lambda _event: None)
+    collector._get_media_client = _Client
+
+    def poll_twice():
+        collector._poll_sessions()
+        collector._poll_sessions()
+        seen.append(has_app_context())
+
+    thread = threading.Thread(target=poll_twice)
+    thread.start()
+    thread.join()
+
+    (first_ctx, first), (second_ctx, second), after = seen
+    assert first_ctx and second_ctx
+    # Each poll gets its own DB session, and nothing is left pushed.
+    assert first is not second
+    assert after is False
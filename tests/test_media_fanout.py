@@ -0,0 +1,152 @@
+"""Tests for concurrent multi-server fan-out in the media service facade."""
+
+import threading
+import time
+
+import pytest
+
+from app.extensions import db
+from app.models import MediaServer, User
+from app.services.media import service
+from app.services.media.fanout import fan_out
+
+
+class _FakeClient:
+    def __init__(self, server, delay=0.0, fail=False):
+        self.server = server
+        self.delay = delay
+        self.fail = fail
+
+    def now_playing(self):
+        time.sleep(self.delay)
+        if self.fail:
+            raise ConnectionError("server down")
+        return [{"session_id": f"s-{self.server.id}", "user_name": "alice"}]
+
+    def fetch_remote_users(self):
+        time.sleep(self.delay)
+        if self.fail:
+            raise ConnectionError("server down")
+        # Workers must not write: record the thread that read the server.
+        _fetch_threads.append(threading.get_ident())
+        return {f"tok-{self.server.id}": {"name": f"user-{self.server.id}"}}
+
+    def apply_remote_users(self, remote_users):
+        _apply_threads.append(threading.get_ident())
+        for token, remote in remote_users.items():
+            db.session.add(
+                User(
+                    token=token,
+                    username=remote["name"],
+                    email=f"{token}@example.com",
+                    code="CODE",
+                    server_id=self.server.id,
+                )
+            )
+
+
+_fetch_threads: list[int] = []
+_apply_threads: list[int] = []
+
+
+@pytest.fixture
+def servers(session):
+    rows = [
+        MediaServer(
+            name=f"Server {i}",
+            server_type="jellyfin",
+            url=f"http://server{i}:8096",
+            api_key="key",
+            verified=True,
+        )
+        for i in range(3)
+    ]
+    session.add_all(rows)
+    session.commit()
+    return rows
+
+
+def _patch_clients(monkeypatch, behaviour):
+    def factory(server):
+        delay, fail = behaviour.get(server.name, (0.0, False))
+        return _FakeClient(server, delay=delay, fail=fail)
+
+    monkeypatch.setattr(service, "get_client_for_media_server", factory)
+
+
+def test_fan_out_runs_servers_concurrently(app, servers, monkeypatch):
+    _patch_clients(monkeypatch, {s.name: (0.3, False) for s in servers})
+
+    with app.app_context():
+        started = time.monotonic()
+        outcome = fan_out(servers, lambda client, _s: client.now_playing())
+        elapsed = time.monotonic() - started
+
+    assert outcome.complete
+    assert list(outcome.results) == [s.id for s in servers]
+    assert elapsed < 0.8
+
+
+def test_fan_out_returns_partial_results(app, servers, monkeypatch):
+    slow, broken, healthy = servers
+    _patch_clients(
+        monkeypatch,
+        {slow.name: (1.0, False), broken.name: (0.0, True)},
+    )
+
+    with app.app_context():
+        outcome = fan_out(servers, lambda client, _s: client.now_playing(), timeout=0.3)
+
+    assert list(outcome.results) == [healthy.id]
+    assert outcome.timed_out == [slow.id]
+    assert "server down" in outcome.errors[broken.id]
+
+
+def test_now_playing_all_servers_tags_sessions(app, servers, monkeypatch):
+    _patch_clients(monkeypatch, {servers[1].name: (0.0, True)})
+
+    with app.app_context():
+        sessions = service.get_now_playing_all_servers(use_cache=False)
+
+    assert {s["server_id"] for s in sessions} == {servers[0].id, servers[2].id}
+    assert all(s["server_name"].startswith("Server") for s in sessions)
+
+
+def test_list_users_all_servers_returns_caller_bound_rows(app, servers, monkeypatch):
+    _patch_clients(monkeypatch, {})
+    _fetch_threads.clear()
+    _apply_threads.clear()
+
+    with app.app_context():
+        result = service.list_users_all_servers()
+
+        assert set(result) == {s.id for s in servers}
+        for server in servers:
+            (user,) = result[server.id]
+            assert user in db.session
+            assert user.username == f"user-{server.id}"
+
+    # Remote reads ran on the pool; every database write ran on this thread.
+    assert threading.get_ident() not in _fetch_threads
+    assert set(_apply_threads) == {threading.get_ident()}
+
+
+def test_list_users_all_servers_discards_late_servers(app, servers, monkeypatch):
+    slow, broken, healthy = servers
+    _patch_clients(
+        monkeypatch,
+        {slow.name: (0.6, False), broken.name: (0.0, True)},
+    )
+    monkeypatch.setattr(service, "_LIST_USERS_TIMEOUT", 0.2)
+
+    with app.app_context():
+        result = service.list_users_all_servers()
+        assert [u.username for u in result[healthy.id]] == [f"user-{healthy.id}"]
+        assert result[slow.id] == []
+        assert result[broken.id] == []
+
+        time.sleep(0.6)  # let the slow worker finish after the deadline
+        db.session.expire_all()
+        assert User.query.filter_by(server_id=slow.id).count() == 0
+        assert db.session.get(MediaServer, slow.id).last_synced_at is None
+        assert db.session.get(MediaServer, healthy.id).last_synced_at is not None
@@ -0,0 +1,88 @@
+"""Tests for the pooled HTTP transport used by REST media clients."""
+
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from app.services.media.http_pool import HttpSessionRegistry
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # keep-alive
+    failures_left = 0
+
+    def do_GET(self):
+        if _Handler.failures_left > 0:
+            _Handler.failures_left -= 1
+            status, body = 503, b"busy"
+        else:
+            status, body = 200, b'{"ok": true}'
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *_args):
+        pass
+
+
+@pytest.fixture
+def upstream():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_address[1]}"
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture(autouse=True)
+def _reset_registry():
+    HttpSessionRegistry.invalidate()
+    HttpSessionRegistry._overrides.clear()
+    _Handler.failures_left = 0
+    yield
+    HttpSessionRegistry.invalidate()
+    HttpSessionRegistry._overrides.clear()
+
+
+def test_requests_reuse_one_connection_per_server(upstream):
+    for _ in range(5):
+        response = HttpSessionRegistry.request("GET", f"{upstream}/x", server_id=7)
+        assert response.status_code == 200
+
+    stats = HttpSessionRegistry.stats()["server:7"]
+    assert stats == {
+        "requests": 5,
+        "connections_opened": 1,
+        "connections_reused": 4,
+    }
+
+
+def test_servers_get_separate_pools(upstream):
+    HttpSessionRegistry.request("GET", f"{upstream}/a", server_id=1)
+    HttpSessionRegistry.request("GET", f"{upstream}/b", server_id=2)
+
+    assert HttpSessionRegistry.get_session(
+        upstream, 1
+    ) is not HttpSessionRegistry.get_session(upstream, 2)
+    assert set(HttpSessionRegistry.stats()) == {"server:1", "server:2"}
+
+
+def test_idempotent_requests_retry_on_503(upstream):
+    HttpSessionRegistry.configure_server(3, retries=2, backoff=0)
+    _Handler.failures_left = 2
+
+    response = HttpSessionRegistry.request("GET", f"{upstream}/retry", server_id=3)
+
+    assert response.status_code == 200
+    assert _Handler.failures_left == 0
+
+
+def test_invalidate_drops_server_sessions(upstream):
+    session = HttpSessionRegistry.get_session(upstream, 4)
+    HttpSessionRegistry.invalidate(4)
+
+    assert HttpSessionRegistry.get_session(upstream, 4) is not session
@@ -0,0 +1,112 @@
+"""User sync must cost a constant number of queries, however many users exist."""
+
+from sqlalchemy import event
+
+from app.extensions import db
+from app.models import Library, MediaServer, User
+from app.services.media.audiobookshelf import AudiobookshelfClient
+from app.services.media.jellyfin import JellyfinClient
+
+
+class _Resp:
+    status_code = 200
+
+    def __init__(self, payload):
+        self._payload = payload
+        self.text = "x"
+
+    def json(self):
+        return self._payload
+
+    def raise_for_status(self):
+        return None
+
+
+def _server(session, server_type):
+    server = MediaServer(
+        name=server_type, server_type=server_type, url="http://m", api_key="k"
+    )
+    session.add(server)
+    session.flush()
+    session.add_all(
+        Library(external_id=f"lib{i}", name=f"Library {i}", server_id=server.id)
+        for i in range(3)
+    )
+    session.commit()
+    return server
+
+
+def _client(cls, server):
+    client = cls.__new__(cls)
+    client.server_id = server.id
+    return client
+
+
+def _jellyfin_users(count):
+    return [
+        {
+            "Id": f"jf{i}",
+            "Name": f"user{i}",
+            "Policy": {"EnableAllFolders": False, "EnabledFolders": ["lib0", "lib2"]},
+        }
+        for i in range(count)
+    ]
+
+
+def _record_statements():
+    statements = []
+
+    def _record(_conn, _cursor, statement, *_args):
+        statements.append(statement.split()[0].upper())
+
+    event.listen(db.engine, "before_cursor_execute", _record)
+    return statements, lambda: event.remove(db.engine, "before_cursor_execute", _record)
+
+
+def _sync(client, users):
+    client.get = lambda *_a, **_k: _Resp(users)
+    statements, stop = _record_statements()
+    try:
+        client.list_users()
+    finally:
+        stop()
+    return statements
+
+
+def test_jellyfin_sync_query_count_does_not_grow_with_users(session):
+    small = _client(JellyfinClient, _server(session, "jellyfin"))
+    large = _client(JellyfinClient, _server(session, "emby"))
+
+    few = _sync(small, _jellyfin_users(2))
+    many = _sync(large, _jellyfin_users(60))
+
+    assert few.count("SELECT") == many.count("SELECT")
+    user = User.query.filter_by(server_id=large.server_id, token="jf7").one()
+    assert user.get_accessible_libraries() == ["Library 0", "Library 2"]
+
+
+def test_unchanged_resync_writes_nothing(session):
+    client = _client(JellyfinClient, _server(session, "jellyfin"))
+    users = _jellyfin_users(5)
+    _sync(client, users)
+
+    statements = _sync(client, users)
+
+    assert "UPDATE" not in statements
+    assert "INSERT" not in statements
+
+
+def test_resync_applies_changes_and_removals(session):
+    server = _server(session, "audiobookshelf")
+    client = _client(AudiobookshelfClient, server)
+    client.API_PREFIX = "/api"
+    users = [
+        {"id": f"abs{i}", "username": f"reader{i}", "type": "user"} for i in range(3)
+    ]
+    _sync(client, users)
+
+    users = [dict(users[0], username="renamed"), users[1]]
+    _sync(client, users)
+
+    names = {u.token: u.username for u in User.query.filter_by(server_id=server.id)}
+    assert names == {"abs0": "renamed", "abs1": "reader1"}
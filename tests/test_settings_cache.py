@@ -0,0 +1,89 @@
+"""Tests for the versioned, process-wide settings cache."""
+
+import pytest
+from sqlalchemy import event, text
+
+from app.extensions import db
+from app.models import Settings
+from app.services.settings_cache import VERSION_KEY, SettingsCache
+
+
+@pytest.fixture
+def settings_queries(app):
+    statements = []
+
+    def _record(_conn, _cursor, statement, *_args):
+        if "settings" in statement.lower():
+            statements.append(statement)
+
+    with app.app_context():
+        engine = db.engine
+    event.listen(engine, "before_cursor_execute", _record)
+    yield statements
+    event.remove(engine, "before_cursor_execute", _record)
+
+
+def _version():
+    return db.session.execute(
+        text("SELECT value FROM settings WHERE key = :key"), {"key": VERSION_KEY}
+    ).scalar()
+
+
+def test_steady_state_reads_make_no_queries(app, session, settings_queries):
+    session.add(Settings(key="server_name", value="My Server"))
+    session.add(Settings(key="admin_username", value="admin"))
+    session.commit()
+
+    assert SettingsCache.get("server_name") == "My Server"
+    settings_queries.clear()
+
+    for _ in range(5):
+        assert SettingsCache.get("admin_username") == "admin"
+        assert SettingsCache.get("missing", "fallback") == "fallback"
+    with app.test_client() as client:
+        client.get("/")
+
+    assert settings_queries == []
+    assert VERSION_KEY not in SettingsCache.all()
+
+
+def test_local_writes_bump_the_version_and_refresh_at_once(app, session):
+    session.add(Settings(key="wizard_acl_enabled", value="true"))
+    session.commit()
+    first = _version()
+    assert SettingsCache.get_bool("wizard_acl_enabled") is True
+
+    Settings.query.filter_by(key="wizard_acl_enabled").one().value = "false"
+    session.commit()
+
+    assert _version() not in (None, first)
+    assert SettingsCache.get_bool("wizard_acl_enabled") is False
+
+    second = _version()
+    Settings.query.filter_by(key="wizard_acl_enabled").delete()
+    session.commit()
+    assert _version() != second
+    assert SettingsCache.get("wizard_acl_enabled") is None
+
+
+def test_other_workers_writes_are_noticed_through_the_version_row(
+    app, session, monkeypatch
+):
+    session.add(Settings(key="server_name", value="Before"))
+    session.commit()
+    assert SettingsCache.get("server_name") == "Before"
+
+    # Another process changes the row without touching this process's hooks.
+    session.execute(
+        text("UPDATE settings SET value = 'After' WHERE key = 'server_name'")
+    )
+    session.execute(
+        text("UPDATE settings SET value = 'elsewhere' WHERE key = :key"),
+        {"key": VERSION_KEY},
+    )
+    session.commit()
+    assert SettingsCache.get("server_name") == "Before"
+
+    monkeypatch.setattr(SettingsCache, "CHECK_SECONDS", 0)
+    SettingsCache.get_int("unused")  # the next read checks the version
+    assert SettingsCache.get("server_name") == "After"
@@ -97,6 +97,7 @@ def test_genuine_removal_still_prunes(session):
             "_filter_users_for_server",
             return_value={"keep@example.com": keeper},
         ),
+        patch.object(PlexClient, "_snapshot_plex_user", return_value={"title": "keep"}),
         patch.object(PlexClient, "_sync_user_permissions", return_value=None),
     ):
         admin.return_value.users.return_value = [keeper]
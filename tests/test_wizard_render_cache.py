@@ -0,0 +1,117 @@
+"""Tests for the compiled wizard step render cache."""
+
+import pytest
+
+import app.services.wizard_render_cache as render_cache
+import app.services.wizard_widgets as wizard_widgets
+from app.blueprints.wizard.routes import _render
+from app.extensions import db
+from app.models import WizardStep
+from app.services.wizard_render_cache import WizardRenderCache
+
+STEP_MARKDOWN = """# Welcome to {{ settings.server_name }}
+
+|||
+## Card
+Inside a card
+|||
+
+{{ widget:button url="external_url" text="Open" }}
+"""
+
+
+class _Post:
+    def __init__(self, content):
+        self.content = content
+
+
+@pytest.fixture
+def conversions(monkeypatch):
+    calls = []
+    real_markdown = render_cache.markdown.markdown
+
+    def counting_markdown(text, **kwargs):
+        calls.append(text)
+        return real_markdown(text, **kwargs)
+
+    monkeypatch.setattr(render_cache.markdown, "markdown", counting_markdown)
+    return calls
+
+
+def _ctx(**values):
+    return {"server_name": "Plex", "external_url": "https://plex.example"} | values
+
+
+def test_repeat_renders_reuse_compiled_template_and_markdown(app, conversions):
+    with app.test_request_context():
+        first = _render(_Post(STEP_MARKDOWN), _ctx(), server_type="plex")
+        compiled = WizardRenderCache.compile(STEP_MARKDOWN)
+        second = _render(_Post(STEP_MARKDOWN), _ctx(), server_type="plex")
+
+        assert first == second
+        assert WizardRenderCache.compile(STEP_MARKDOWN) is compiled
+        # One conversion for the card, one for the page.
+        assert len(conversions) == 2
+
+        other = _render(_Post(STEP_MARKDOWN), _ctx(server_name="Jelly"), "plex")
+
+    assert "<h1>Welcome to Plex</h1>" in first
+    assert "<h1>Welcome to Jelly</h1>" in other
+    assert len(conversions) == 3
+
+
+def test_widgets_render_per_request_outside_the_template(app):
+    with app.test_request_context():
+        a = _render(_Post(STEP_MARKDOWN), _ctx(), server_type="plex")
+        b = _render(
+            _Post(STEP_MARKDOWN), _ctx(external_url="https://other.example"), "plex"
+        )
+
+    assert 'href="https://plex.example"' in a
+    assert 'href="https://other.example"' in b
+    assert "wizarr-widget" not in a
+    assert "card-widget" in a
+
+
+def test_wizard_step_writes_clear_the_cache(app, session):
+    step = WizardStep(
+        server_type="plex", category="post_invite", position=0, markdown="# Hi"
+    )
+    session.add(step)
+    session.commit()
+
+    with app.test_request_context():
+        WizardRenderCache.compile(step.markdown)
+        assert WizardRenderCache._templates
+
+        step.markdown = "# Changed"
+        db.session.commit()
+        assert not WizardRenderCache._templates
+
+        WizardRenderCache.compile(step.markdown)
+        WizardStep.query.filter_by(id=step.id).delete()
+        assert not WizardRenderCache._templates
+
+
+def test_only_widgets_in_rendered_branches_run(app, monkeypatch):
+    rendered = []
+    real = wizard_widgets.process_widget_placeholders
+
+    def counting(placeholder, server_type, context=None):
+        rendered.append(placeholder)
+        return real(placeholder, server_type, context=context)
+
+    monkeypatch.setattr(wizard_widgets, "process_widget_placeholders", counting)
+    content = """{% if settings.show_media %}
+{{ widget:recently_added_media }}
+{% endif %}
+Press {{ widget:button url="external_url" text="Open" }} to continue.
+"""
+
+    with app.test_request_context():
+        html = _render(_Post(content), _ctx(show_media=False), server_type="plex")
+
+    assert rendered == ['{{ widget:button url="external_url" text="Open" }}']
+    # The inline widget stays inside its paragraph.
+    assert html.startswith("<p>Press ")
+    assert html.rstrip().endswith("to continue.</p>")
@@ -0,0 +1,117 @@
+"""Tests for the stale-while-revalidate wizard widget data cache."""
+
+import threading
+from datetime import UTC, datetime, timedelta
+
+import pytest
+
+from app.extensions import db
+from app.models import MediaServer, WidgetDataCache
+from app.services.media import service as media_service
+from app.services.wizard_widget_cache import RECENT_ITEMS_WIDGET, WizardWidgetCache
+from app.services.wizard_widgets import WIDGET_REGISTRY
+
+
+class _Client:
+    def __init__(self, titles):
+        self.titles = titles
+        self.calls = 0
+        self.gate = None
+
+    def get_recent_items(self, library_id=None, limit=10):
+        self.calls += 1
+        if self.gate is not None:
+            self.gate.wait(timeout=5)
+        return [{"title": t, "thumb": f"/image-proxy?token={t}"} for t in self.titles][
+            :limit
+        ]
+
+
+@pytest.fixture
+def server(session):
+    server = MediaServer(name="Plex", server_type="plex", url="http://plex")
+    session.add(server)
+    session.commit()
+    return server
+
+
+@pytest.fixture
+def client(monkeypatch):
+    client = _Client(["Dune", "Alien"])
+    monkeypatch.setattr(media_service, "get_media_client", lambda *_a, **_k: client)
+    return client
+
+
+def _row(server):
+    return WidgetDataCache.query.filter_by(
+        server_id=server.id, widget=RECENT_ITEMS_WIDGET
+    ).one()
+
+
+def test_widget_renders_from_cache_without_calling_the_server(app, server, client):
+    with app.test_request_context():
+        assert WizardWidgetCache.refresh_all() == 1
+        assert client.calls == 1
+
+        html = WIDGET_REGISTRY["recently_added_media"].render("plex", limit=1)
+
+    assert client.calls == 1
+    assert 'alt="Dune"' in html
+    assert 'alt="Alien"' not in html
+
+
+def test_missing_data_renders_empty_instead_of_blocking(app, server, client):
+    with app.test_request_context():
+        html = WIDGET_REGISTRY["recently_added_media"].render("plex")
+
+    assert client.calls == 0
+    assert "No recent content available" in html
+
+
+def test_stale_data_is_served_while_a_background_refresh_runs(
+    app, server, client, monkeypatch
+):
+    monkeypatch.setitem(app.config, "TESTING", False)
+    with app.test_request_context():
+        WizardWidgetCache.refresh(server.id)
+        _row(server).refreshed_at = datetime.now(UTC) - timedelta(hours=2)
+        db.session.commit()
+        client.titles = ["Heat"]
+        client.gate = threading.Event()
+
+        threads = []
+        real_revalidate = WizardWidgetCache.revalidate.__func__
+
+        def tracking_revalidate(cls, server_id):
+            threads.append(real_revalidate(cls, server_id))
+            return threads[-1]
+
+        monkeypatch.setattr(
+            WizardWidgetCache, "revalidate", classmethod(tracking_revalidate)
+        )
+        items = WizardWidgetCache.recent_items(server.id, 6)
+        assert [i["title"] for i in items] == ["Dune", "Alien"]
+
+        # A second stale read while the refresh is running starts no other.
+        WizardWidgetCache.recent_items(server.id, 6)
+        assert threads[0] is not None and threads[1] is None
+
+        client.gate.set()
+        threads[0].join(timeout=5)
+
+        db.session.expire_all()
+        assert [i["title"] for i in _row(server).get_payload()] == ["Heat"]
+        assert client.calls == 2
+
+
+def test_failed_refresh_keeps_old_data_and_backs_off(app, server, client, monkeypatch):
+    with app.test_request_context():
+        WizardWidgetCache.refresh(server.id)
+
+        def failing_client(*_a, **_k):
+            raise ConnectionError("server down")
+
+        monkeypatch.setattr(media_service, "get_media_client", failing_client)
+        assert WizardWidgetCache.refresh(server.id) is False
+        assert server.id in WizardWidgetCache._failed_at
+        assert [i["title"] for i in _row(server).get_payload()] == ["Dune", "Alien"]